@@ -19,6 +19,33 @@
 #include <stddef.h>
 #include "simpleaudio.h"
 #include "fsk.h"
+#include "minimodem_simple.h"        /* MM_STATS_CONFIDENCE_* */
+
+/*
+ * Cumulative RX events counted by mm_rx_step. Kept in one struct so the
+ * wrapper can carry them across mm_build_config (which zeroes the ctx) on a
+ * set_baud.
+ */
+typedef struct mm_rx_counters {
+    unsigned long long carrier_acquired;
+    unsigned long long carrier_lost;
+    unsigned long long confidence_hist[MM_STATS_CONFIDENCE_BINS];
+    unsigned long long squelch_opened;
+    unsigned long long squelch_skipped;      /* samples advanced past unsearched */
+    unsigned long long squelch_open;         /* gauge, filled in by the wrapper */
+} mm_rx_counters;
+
+/*
+ * Sample FIFO for multi-carrier RX: the wrapper reads the device once and
+ * pushes the block into every carrier's FIFO; each carrier's mm_rx_step then
+ * refills from its FIFO instead of blocking on sa_in.
+ */
+typedef struct mm_sample_fifo {
+    float  *buf;
+    size_t  cap;
+    size_t  head;
+    size_t  len;
+} mm_sample_fifo;
 
 typedef struct minimodem_ctx {
 
@@ -27,9 +54,9 @@ typedef struct minimodem_ctx {
     float        bfsk_mark_f;               /* derived from baud */
     float        bfsk_space_f;              /* derived from baud */
     float        band_width;                /* derived from baud (clamped <= data_rate) */
-    unsigned int bfsk_n_data_bits;          /* = 8 */
+    unsigned int bfsk_n_data_bits;          /* = 8 (mm_set_char_framing) */
     int          bfsk_nstartbits;           /* = 1 */
-    float        bfsk_nstopbits;            /* = 1.0 */
+    float        bfsk_nstopbits;            /* = 1.0 (mm_set_char_framing) */
     unsigned int sample_rate;               /* = 48000 */
     float        fsk_confidence_threshold;  /* = 1.5  (minimodem.c:519) */
     float        fsk_confidence_search_limit;/* = 2.3 (minimodem.c:528) */
@@ -41,9 +68,41 @@ typedef struct minimodem_ctx {
     unsigned int nsamples_overscan;
     unsigned int frame_nsamples;
 
+    /* ---- MFSK (mm_set_tones; mfsk_tones == 0: binary FSK). Symbols run at
+     *      bfsk_data_rate; mark = the top tone (stop / idle), space = tone 0
+     *      (start), so leader, squelch and decimation see the frame tones. ---- */
+    unsigned int mfsk_tones;
+    unsigned int mfsk_bits;                  /* bits per data symbol */
+    unsigned int mfsk_data_symbols;          /* ceil(n_data_bits / mfsk_bits) */
+    float        mfsk_f[MM_MAX_TONES];       /* tone i, ascending */
+    float        mfsk_coeff[MM_MAX_TONES];   /* Goertzel 2cos(w) at the RX rate */
+
+    /* ---- HDLC framing (mm_set_framing_mode; MM_FRAMING_ASYNC: the
+     *      start/stop frames above). RX slides a one-bit DFT at the mark and
+     *      space tones per sample; sample indices count RX samples since the
+     *      plan was built, and carrier means locked on a flag. ---- */
+    int          framing;                    /* MM_FRAMING_* */
+    float       *hdlc_ring;                  /* hdlc_window x {mark re, im, space re, im} */
+    unsigned int hdlc_window;                /* DFT length: one bit, in RX samples */
+    unsigned int hdlc_ring_pos;
+    double       hdlc_sum[4];                /* the window's running DFT sums */
+    float        hdlc_osc[4];                /* mark / space oscillators (re, im) */
+    float        hdlc_rot[4];                /* their per-sample rotations */
+    unsigned long long hdlc_n;               /* RX samples seen */
+    unsigned long long hdlc_edge;            /* sample of the last tone change */
+    unsigned long long hdlc_pend;            /* first sample of a change not yet held */
+    int          hdlc_pending;
+    int          hdlc_level;                 /* tone held: 1 mark, 0 space */
+    int          hdlc_clocked;               /* hdlc_edge is a real tone change */
+    unsigned int hdlc_pat;                   /* last 8 bits, newest in bit 7 */
+    unsigned int hdlc_byte;                  /* data bits so far, LSB first */
+    unsigned int hdlc_nbits;
+    unsigned int hdlc_nbytes;                /* bytes since the frame's opening flag */
+
     /* ---- TX state (was file-scope globals at minimodem.c:49-58) ---- */
     simpleaudio *sa_out;
-    float        tx_bfsk_mark_f;
+    float        tx_bfsk_mark_f;            /* TX tones: the RX pair unless */
+    float        tx_bfsk_space_f;           /*   mm_set_tx_carrier moved them */
     unsigned int tx_bit_nsamples;
     int          tx_leader_bits_len;        /* = 2 */
     int          tx_trailer_bits_len;       /* = 2 */
@@ -63,8 +122,29 @@ typedef struct minimodem_ctx {
     unsigned int noconfidence;
     float        track_amplitude;
     float        peak_confidence;
+    float        band_share;                 /* 0, or MM_DUPLEX_BAND_SHARE (full duplex) */
     int          carrier_band;               /* PROMOTED from minimodem.c:1180 static */
     simpleaudio *sa_in;
+    mm_sample_fifo *src;                     /* if set, refill from here, not sa_in */
+    void       (*tap)(const float *samples, size_t n);   /* if set, sees every sa_in read */
+    mm_rx_counters counters;                 /* read by minimodem_simple_get_stats */
+
+    /* ---- RX decimation (mm_set_decimation): the demodulator, fskp and all
+     *      RX sample counts above run at rx_sample_rate = sample_rate / D ---- */
+    unsigned int rx_decimation;              /* D (1: no decimation) */
+    unsigned int rx_sample_rate;
+    int          rx_decimation_cap;          /* mm_set_decimation's max_factor */
+    int          detector;                   /* MM_DETECTOR_* (mm_set_detector) */
+    float       *dec_taps;                   /* anti-alias FIR, dec_ntaps long */
+    unsigned int dec_ntaps;
+    float       *dec_work;                   /* FIR history + one device read */
+
+    /* ---- Energy squelch (mm_set_squelch; levels are tone amplitudes) ---- */
+    float        squelch_open_level;         /* 0: gate disabled (always search) */
+    float        squelch_close_level;
+    int          squelch_open;
+    size_t       squelch_measured;           /* samplebuf[0..this) measured */
+    size_t       squelch_loud_end;           /* end of the last block >= close level */
 
     /* ---- Error reporting (for minimodem_simple_get_error) ---- */
     char         error[256];
@@ -109,14 +189,156 @@ mm_fsk_transmit_frame(
 int
 mm_build_config( minimodem_ctx *ctx, int baud, unsigned int sample_rate );
 
+/*
+ * mm_build_config_carrier — as mm_build_config, with the tone pair shifted into
+ * multi-carrier band `carrier` (0 = the single-carrier plan). Fails if the
+ * carrier does not fit below the band-plan ceiling at this baud.
+ */
+int
+mm_build_config_carrier( minimodem_ctx *ctx, int baud, unsigned int sample_rate,
+        int carrier );
+
+/*
+ * mm_max_carriers — how many carriers (1..MM_MAX_CARRIERS) fit the band plan
+ * at baud. Returns 0 for an invalid baud.
+ */
+int
+mm_max_carriers( int baud, unsigned int sample_rate );
+
+/*
+ * mm_set_tx_carrier — move ctx's TX tone pair into band `carrier` of its
+ * band plan, leaving the RX plan where it was built (full duplex: each
+ * direction on its own bands). mm_build_config_carrier starts TX on the RX
+ * band. Returns 0, or -1 (ctx->error set) if the band does not fit.
+ */
+int
+mm_set_tx_carrier( minimodem_ctx *ctx, int carrier );
+
+/*
+ * mm_max_tones — the most tones per symbol (MM_MAX_TONES, 4 or
+ * MM_TONES_BFSK) whose top tone stays below the band-plan ceiling at baud.
+ * Returns 0 for an invalid baud.
+ */
+int
+mm_max_tones( int baud, unsigned int sample_rate );
+
+/*
+ * mm_set_tones — switch a single-carrier ctx between binary FSK
+ * (MM_TONES_BFSK) and MFSK with 4 or MM_MAX_TONES tones, moving RX and TX
+ * tones and rebuilding the RX plan (loop-carried state resets; re-apply the
+ * detector, decimation and squelch after). MFSK frames are found and decoded
+ * by per-tone Goertzel filters whatever the detector. mm_build_config starts
+ * on binary FSK. Returns 0, or -1 (ctx->error set) if the tones do not fit.
+ */
+int
+mm_set_tones( minimodem_ctx *ctx, int tones );
+
+/*
+ * mm_set_char_framing — data bits per character (MM_DATA_BITS_ASCII or
+ * MM_DATA_BITS_DEFAULT) and stop bits after it (1..MM_STOP_BITS_MAX), for
+ * binary FSK and MFSK alike. A change rebuilds the RX plan as mm_set_tones
+ * does: the frame search steps a whole frame, stop bits included, past each
+ * character it decodes. Returns 0, or -1 (ctx->error set) if out of range.
+ */
+int
+mm_set_char_framing( minimodem_ctx *ctx, int data_bits, int stop_bits );
+
+/*
+ * mm_set_framing_mode — async start/stop frames (MM_FRAMING_ASYNC) or the
+ * HDLC synchronous bitstream (MM_FRAMING_HDLC: flags, bit stuffing, NRZI;
+ * see minimodem_simple.h) for TX and RX alike. HDLC needs binary FSK, and
+ * mm_set_tones refuses MFSK while it is on. A change rebuilds the RX plan as
+ * mm_set_tones does. Returns 0, or -1 (ctx->error set).
+ */
+int
+mm_set_framing_mode( minimodem_ctx *ctx, int mode );
+
+/*
+ * mm_set_detector — pick the RX bit detector (MM_DETECTOR_*) for ctx's fsk
+ * plan; it sticks across RX rebuilds. MM_DETECTOR_DEFAULT is the FFT when
+ * FFTW is linked (else Goertzel). Auto decimation only decimates for the
+ * FFT, so switching detector under MM_DECIMATION_AUTO may rebuild the RX
+ * plan. Returns 0, or -1 (ctx->error set) if that detector is not built in.
+ */
+int
+mm_set_detector( minimodem_ctx *ctx, int detector );
+
+/*
+ * mm_set_decimation — re-pick ctx's RX decimation with the factor capped at
+ * max_factor (MM_DECIMATION_AUTO: the engine's own cap; 1: none) and rebuild
+ * the RX plan if the rate changes (loop-carried RX state resets; counters,
+ * squelch levels and the detector survive). mm_build_config
+ * applies MM_DECIMATION_AUTO. Returns 0, or -1 (ctx->error set).
+ */
+int
+mm_set_decimation( minimodem_ctx *ctx, int max_factor );
+
+/*
+ * mm_free_rx — free the RX plan, sample buffer and decimation FIR (not the
+ * streams), e.g. before mm_build_config rebuilds a ctx with open streams.
+ */
+void
+mm_free_rx( minimodem_ctx *ctx );
+
+/*
+ * mm_set_squelch — set ctx's RX energy squelch: open at open_dbfs (tone
+ * amplitude in dBFS), close MM_SQUELCH_HYSTERESIS_DB below it;
+ * MM_SQUELCH_OFF disables it. mm_build_config applies
+ * MM_SQUELCH_DEFAULT_DBFS. Returns 0, or -1 (ctx->error set) if out of range.
+ */
+#define MM_SQUELCH_HYSTERESIS_DB 6
+#define MM_SQUELCH_MIN_DBFS      (-120)
+
+int
+mm_set_squelch( minimodem_ctx *ctx, int open_dbfs );
+
+/*
+ * Full-duplex band selectivity (ctx->band_share, set by the wrapper): a frame
+ * only counts if its tone amplitude holds at least this share of the frame's
+ * energy. A neighbouring band's tones leak a few percent into the mark/space
+ * bins -- enough to decode the local TX echo as bytes otherwise.
+ */
+#define MM_DUPLEX_BAND_SHARE 0.1f
+
 /*
  * mm_tx_bytes — transmit a byte buffer over ctx->sa_out: leader marks, then
- * per-byte 8-N-1 frames, then trailer marks. Returns 0 on success.
+ * per-byte 8-N-1 frames (HDLC: the flagged bitstream), then trailer marks.
+ * Returns 0 on success.
  * Requires ctx->sa_out to be an open playback stream.
  */
 int
 mm_tx_bytes( minimodem_ctx *ctx, const unsigned char *buf, size_t len );
 
+/*
+ * mm_tx_bytes_multi — stripe buf round-robin over ncarriers (byte i rides
+ * carrier i % ncarriers), pad the last stripe with NUL, and write the summed
+ * carriers (each at tx_amplitude / ncarriers) to ctxs[0]->sa_out in one
+ * write. All carriers frame in lockstep, so each sends ceil(len/n) frames.
+ */
+int
+mm_tx_bytes_multi( minimodem_ctx *const *ctxs, int ncarriers,
+        const unsigned char *buf, size_t len );
+
+/*
+ * mm_tx_render — what mm_tx_bytes (ncarriers 1) or mm_tx_bytes_multi would
+ * write for buf, captured into a malloc'd float buffer (*out, *nout samples;
+ * the caller frees it) instead of ctxs[0]->sa_out, which is left untouched.
+ * Uses the same TX state (tone table amplitude, leader/trailer lengths).
+ * Returns 0 on success, -1 on failure.
+ */
+int
+mm_tx_render( minimodem_ctx *const *ctxs, int ncarriers,
+        const unsigned char *buf, size_t len, float **out, size_t *nout );
+
+/*
+ * mm_fifo_* — bounded float FIFO (push drops the oldest samples on overrun;
+ * pop returns how many samples it copied).
+ */
+int    mm_fifo_init( mm_sample_fifo *fifo, size_t capacity );
+void   mm_fifo_free( mm_sample_fifo *fifo );
+void   mm_fifo_push( mm_sample_fifo *fifo, const float *samples, size_t n );
+size_t mm_fifo_pop( mm_sample_fifo *fifo, float *out, size_t n );
+
 /*
  * mm_rx_step — perform exactly ONE read-and-scan pass over ctx->sa_in and
  * append any decoded bytes to `out` (bounded by out_size). Returns the number
@@ -13,14 +13,80 @@
  *     and pushes decoded bytes into a mutex-guarded ring buffer, splitting on '\n'
  *     into complete lines that _receive() drains. This bridges minimodem's blocking
  *     read to AHK's non-blocking 10 ms process()/receive() poll.
+ *   - _receive_wait() parks the caller on a condition variable signalled by the
+ *     queue push, so a host that CAN block (the Python backend) sleeps in the
+ *     kernel until a line lands instead of polling.
+ *   - _wait_transmit_done() parks the caller on a second condition variable that
+ *     _send() broadcasts when it clears is_transmitting, so a sender on another
+ *     thread resumes the moment the FSK signal has played out.
  *   - _process() is a near no-op (the RX thread does the pumping; ggwave's _process
  *     pumped SDL). Kept so AHK's loop + the API signature are unchanged.
  *   - Half-duplex (Pitfall 3): while is_transmitting is set the RX thread still calls
  *     mm_rx_step to keep the device buffer drained but DISCARDS the bytes.
+ *   - Full duplex (_set_duplex): the band plan is split, RX ctxs are built on
+ *     one half and their TX tones moved to the other (mm_set_tx_carrier), so
+ *     our own transmission never lands in our RX bands and nothing is
+ *     discarded while is_transmitting is set.
  *   - Security V5: accumulated line length and queued-line count are capped; overflow
  *     resets the line / drops oldest rather than growing unbounded. _receive copies
- *     bounds-checked.
+ *     bounds-checked; _peek_length lets the caller size its buffer first. Both
+ *     caps are set by _set_line_limits and sized (accumulators + line ring) at init.
  *   - One mutex guards ALL queue access on both producer and consumer (Pitfall 7).
+ *   - Multi-carrier (_init_multi): carriers 1..N-1 get their own ctx (shifted
+ *     tone pairs). The RX thread reads the device once per pass, pushes the
+ *     block into every carrier's sample FIFO, runs each carrier's mm_rx_step
+ *     off its FIFO into a per-carrier stripe queue, and reassembles the byte
+ *     stream round-robin (NUL = TX padding, dropped). When every carrier has
+ *     lost carrier with a stripe still missing, the stranded bytes are dropped
+ *     and reassembly realigns on carrier 0.
+ *   - MFSK (_set_tones): the link ctx switches to 4 or 8 tones per symbol
+ *     (mm_set_tones), re-applied after every build like the RX options below;
+ *     single carrier, half duplex, no candidate-baud decoders.
+ *   - Character framing (_set_char_framing): data and stop bits per
+ *     character on every ctx (mm_set_char_framing), re-applied likewise; in
+ *     7-bit mode a send that is not 7-bit clean is refused.
+ *   - Link framing (_set_framing_mode): async start/stop frames, or the HDLC
+ *     synchronous bitstream on every ctx (mm_set_framing_mode), re-applied
+ *     likewise; binary FSK on a single carrier in half duplex.
+ *   - Bit detector (_set_detector): the FFT per bit, or Goertzel filters at
+ *     just the mark/space bins (fsk.c); the choice is re-applied to every
+ *     carrier's plan after each build.
+ *   - Energy squelch (_set_squelch, on by default): while no carrier is held,
+ *     mm_rx_step measures the mark/space tone level of each new block and
+ *     skips the frame search (and the quiet span) until it crosses the open
+ *     level, so an idle line costs one Goertzel pass per device read.
+ *   - RX decimation (_set_decimation, auto by default): each carrier's ctx
+ *     low-passes and downsamples its device reads to a per-baud RX rate
+ *     (mm_core.c). The multi-carrier fan-out still moves 48 kHz device
+ *     samples, so its block and FIFOs are re-sized whenever a carrier's
+ *     factor changes.
+ *   - Candidate bauds (_set_rx_bauds): ctx.tap (rx_tap) also copies every
+ *     capture read into the inbox of one decoder per extra baud. Each decoder
+ *     runs its own ctx on its own thread (so they spread over cores) and
+ *     feeds its own line accumulator; every queued line carries the baud that
+ *     decoded it (_receive_many_bauds). Decoders are rebuilt, with the RX
+ *     thread stopped, by every setter that rebuilds the link's RX plan.
+ *   - Line timestamps (_receive_many_timed): each producer stamps its last
+ *     carrier lock (a rise in ctx.counters.carrier_acquired after a pass) and
+ *     every queued line carries that stamp plus its decode pass's; the dequeue
+ *     time is taken as the lines are copied out. All on CLOCK_MONOTONIC, at
+ *     device-read granularity.
+ *   - RX capture (_capture_start): every raw device read is also copied into a
+ *     memory-mapped ring file (minimodem_simple_capture_header + float32 ring)
+ *     for offline replay. The tee (ctx.tap, or rx_multi_pass directly) takes
+ *     its own cap_mutex, never the queue mutex, so the RX path never waits on
+ *     a consumer.
+ *   - TX framing (_set_tx_framing) sets the leader/trailer mark bits of every
+ *     send. With an idle-carrier hold (_set_tx_hold) a carrier-hold thread
+ *     keeps writing mark tone after each transmission, paced just ahead of the
+ *     wall clock; a send inside the hold window skips its leader. tx_mutex
+ *     serialises the two writers on the playback stream.
+ *   - Pre-rendered TX (_render / _send_pcm): _render runs the same TX path
+ *     into memory (mm_tx_render) under tx_mutex, so the caller can cache the
+ *     waveform of a frame it will resend; _send_pcm is then one device write.
+ *   - Counters for _get_stats (queue, drops, carrier, confidence, TX time) live
+ *     in g.stats and are only touched under that same mutex; mm_rx_step's own
+ *     RX event counters are published into g.rx_counters once per pass.
  *
  * GPLv3 -- part of the minimodem_simple wrapper (links mm_core.c / vendored DSP).
  */
@@ -34,44 +100,152 @@
 #include "simpleaudio.h"
 
 #include <pthread.h>
+#include <errno.h>
+#include <limits.h>
+#include <time.h>
 #include <string.h>
 #include <stdlib.h>
 #include <stdio.h>
 
-/* ===== Tunables (Security V5 caps) ===== */
-#define MM_QUEUE_MAX_LINES    64       /* max complete newline-framed lines buffered */
-#define MM_LINE_MAX_LEN       8192     /* max accumulated bytes before a '\n' (drop on overflow) */
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#endif
+
+/* ===== Tunables (the Security V5 line caps are MM_*_DEFAULT in the header) ===== */
 #define MM_RX_STEP_BYTES      256      /* bytes pulled per mm_rx_step pass */
+#define MM_STRIPE_MAX_BYTES   1024     /* per-carrier bytes awaiting reassembly */
+#define MM_DECODER_INBOX_SAMPLES 48000 /* capture samples queued per candidate-baud decoder (1 s) */
+#define MM_TX_HOLD_BLOCK_MS   20       /* idle marks written per carrier-hold pass */
+#define MM_TX_HOLD_AHEAD_MS   40       /* hold audio kept queued ahead of the wall clock */
 
 /* ===== A complete received line (newline-stripped). ===== */
 typedef struct mm_line {
     char  *data;
     int    len;
+    int    baud;                       /* rate of the decoder that produced it */
+    double t_carrier;                  /* mono_now() of the carrier lock that carried it */
+    double t_decoded;                  /* mono_now() of the pass that decoded its '\n' */
 } mm_line;
 
+/* ===== One candidate-baud decoder (_set_rx_bauds) ===== */
+typedef struct mm_baud_decoder {
+    int             baud;
+    minimodem_ctx   ctx;               /* RX plan only; reads `fifo` (no streams) */
+    mm_sample_fifo  inbox;             /* capture samples from rx_tap (inbox_mutex) */
+    mm_sample_fifo  fifo;              /* the decoder thread's own copy (ctx.src) */
+    pthread_mutex_t inbox_mutex;
+    pthread_cond_t  inbox_cond;        /* signalled when rx_tap adds samples */
+    pthread_t       thread;
+    char           *accum;             /* partial line, line_cap bytes (guarded by g.mutex) */
+    int             accum_len;
+    double          t_carrier;         /* mono_now() of this decoder's last carrier lock */
+} mm_baud_decoder;
+
 /* ===== Module-level state ===== */
 static struct {
     int             initialized;
     int             baud;
+    int             detector;          /* MM_DETECTOR_* (sticky across init/set_baud) */
+    int             squelch_dbfs;      /* MM_SQUELCH_* open level (sticky likewise) */
+    int             decimation;        /* MM_DECIMATION_* RX cap (sticky likewise) */
+    int             rx_bauds[MM_MAX_RX_BAUDS];   /* candidate bauds (sticky likewise) */
+    int             n_rx_bauds;
+    int             line_max_len;      /* _set_line_limits (sticky; applied at init) */
+    int             queue_max_lines;
+    int             tx_leader_bits;    /* _set_tx_framing (sticky; read by every send) */
+    int             tx_trailer_bits;
+    int             tx_hold_ms;        /* _set_tx_hold (sticky; MM_TX_HOLD_OFF: no hold) */
+    int             duplex;            /* _set_duplex (sticky; applied at init) */
+    int             link_duplex;       /* MM_DUPLEX_* as of init */
+    int             tones;             /* _set_tones (sticky; MM_TONES_BFSK or MFSK) */
+    int             data_bits;         /* _set_char_framing (sticky likewise) */
+    int             stop_bits;
+    int             framing;           /* _set_framing_mode (sticky likewise) */
+
+    minimodem_ctx   ctx;               /* carrier 0 (owns the streams) */
 
-    minimodem_ctx   ctx;
+    /* multi-carrier mode (ncarriers > 1) */
+    int             ncarriers;
+    minimodem_ctx   extra[MM_MAX_CARRIERS - 1];        /* carriers 1..N-1 */
+    mm_sample_fifo  fifo[MM_MAX_CARRIERS];             /* per-carrier RX samples */
+    float          *rx_block;          /* one device read, fanned out to every fifo */
+    size_t          rx_block_len;
+    unsigned char   stripe[MM_MAX_CARRIERS][MM_STRIPE_MAX_BYTES];
+    int             stripe_head[MM_MAX_CARRIERS];
+    int             stripe_len[MM_MAX_CARRIERS];
+    int             stripe_next;       /* carrier holding the next byte */
+
+    /* candidate-baud decoders (single carrier only; rebuilt with the RX thread
+     * stopped, so rx_tap reads ndecoders without a lock) */
+    mm_baud_decoder decoders[MM_MAX_RX_BAUDS];
+    int             ndecoders;
+    volatile int    dec_run;           /* decoder threads keep looping while non-zero */
 
     pthread_t       rx_thread;
     pthread_mutex_t mutex;
+    pthread_cond_t  line_cond;         /* signalled when a complete line is queued */
+    pthread_cond_t  tx_cond;           /* signalled when a transmission finishes */
     volatile int    rx_run;            /* RX thread keeps looping while non-zero */
     volatile int    is_transmitting;   /* atomic-ish flag (guarded reads acceptable) */
+    int             closing;           /* cleanup under way: waiters return now (mutex) */
+    int             waiters;           /* callers inside a blocking wait (mutex) */
+
+    /* idle-carrier hold (guarded by mutex; hold_until zero: carrier down) */
+    pthread_t       hold_thread;
+    pthread_cond_t  hold_cond;         /* signalled when a hold starts / on shutdown */
+    volatile int    hold_run;
+    struct timespec hold_start;        /* CLOCK_MONOTONIC end of the last transmission */
+    struct timespec hold_until;        /* ...plus tx_hold_ms */
+    double          hold_emitted;      /* seconds of idle marks written since hold_start */
 
     /* line accumulator (bytes since the last '\n', not yet a complete line) */
-    char            accum[MM_LINE_MAX_LEN];
+    char           *accum;             /* line_cap bytes */
     int             accum_len;
+    double          t_carrier;         /* mono_now() of the link's last carrier lock (RX thread) */
+    int             line_cap;          /* line_max_len as of init */
 
     /* ring of complete lines ready for _receive */
-    mm_line         lines[MM_QUEUE_MAX_LINES];
+    mm_line        *lines;             /* queue_cap slots */
+    int             queue_cap;         /* queue_max_lines as of init */
     int             line_head;         /* index of oldest queued line */
     int             line_count;        /* number of queued lines */
 
+    /* cumulative counters for _get_stats (guarded by mutex) */
+    minimodem_simple_stats stats;
+    mm_rx_counters  rx_counters;       /* last published copy of ctx.counters */
+
     char            error[256];
-} g = {0};
+} g = { .squelch_dbfs    = MM_SQUELCH_DEFAULT_DBFS,
+        .line_max_len    = MM_LINE_MAX_LEN_DEFAULT,
+        .queue_max_lines = MM_QUEUE_MAX_LINES_DEFAULT,
+        .tx_leader_bits  = MM_TX_LEADER_BITS_DEFAULT,
+        .tx_trailer_bits = MM_TX_TRAILER_BITS_DEFAULT,
+        .tones           = MM_TONES_BFSK,
+        .data_bits       = MM_DATA_BITS_DEFAULT,
+        .stop_bits       = MM_STOP_BITS_DEFAULT,
+        .framing         = MM_FRAMING_ASYNC };
+
+/* Serialises every write to the playback stream: a send and the carrier-hold
+ * thread's idle marks. Taken before g.mutex, never while holding it. */
+static pthread_mutex_t tx_mutex = PTHREAD_MUTEX_INITIALIZER;
+
+/* ===== RX capture ring (guarded by cap_mutex; hdr == NULL: no capture) ===== */
+static struct {
+    minimodem_simple_capture_header *hdr;    /* start of the mapping */
+    float          *ring;              /* hdr->capacity samples after the header */
+    size_t          map_size;
+#ifdef _WIN32
+    HANDLE          file;
+    HANDLE          mapping;
+#else
+    int             fd;
+#endif
+} cap = {0};
+static pthread_mutex_t cap_mutex = PTHREAD_MUTEX_INITIALIZER;
 
 static void set_error(const char *msg)
 {
@@ -82,47 +256,647 @@ static void set_error(const char *msg)
 /* Queue helpers (caller MUST hold g.mutex).                         */
 /* ---------------------------------------------------------------- */
 
-/* Push one complete line (a copy of accum[0..accum_len)). Drops oldest on overflow. */
-static void queue_push_line_locked(const char *data, int len)
+/* Seconds on CLOCK_MONOTONIC -- the clock behind Python's time.monotonic(),
+ * so the line timestamps _receive_many_timed reports compare with the
+ * caller's own. */
+static double mono_now(void)
+{
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (double)now.tv_sec + (double)now.tv_nsec / 1e9;
+}
+
+/* Push one complete line (a copy of accum[0..accum_len)) decoded at baud,
+ * stamped with its carrier lock and decode times. Drops oldest on overflow. */
+static void queue_push_line_locked(const char *data, int len, int baud,
+                                   double t_carrier, double t_decoded)
 {
     char *copy = malloc((size_t)len + 1);
-    if ( !copy )
-        return;                        /* OOM: silently drop, do not crash */
+    if ( !copy ) {
+        g.stats.lines_dropped++;       /* OOM: silently drop, do not crash */
+        return;
+    }
     memcpy(copy, data, (size_t)len);
     copy[len] = '\0';
 
-    if ( g.line_count == MM_QUEUE_MAX_LINES ) {
+    if ( g.line_count == g.queue_cap ) {
         /* drop the oldest line to make room (DoS guard, Security V5) */
         free(g.lines[g.line_head].data);
         g.lines[g.line_head].data = NULL;
-        g.line_head = (g.line_head + 1) % MM_QUEUE_MAX_LINES;
+        g.line_head = (g.line_head + 1) % g.queue_cap;
         g.line_count--;
+        g.stats.lines_dropped++;
     }
 
-    int tail = (g.line_head + g.line_count) % MM_QUEUE_MAX_LINES;
+    int tail = (g.line_head + g.line_count) % g.queue_cap;
     g.lines[tail].data = copy;
     g.lines[tail].len  = len;
+    g.lines[tail].baud = baud;
+    g.lines[tail].t_carrier = t_carrier;
+    g.lines[tail].t_decoded = t_decoded;
     g.line_count++;
+    g.stats.lines_queued++;
+    if ( (unsigned long long)g.line_count > g.stats.queue_high_water )
+        g.stats.queue_high_water = (unsigned long long)g.line_count;
+
+    /* wake any caller parked in _receive_wait */
+    pthread_cond_broadcast(&g.line_cond);
+}
+
+/* Pop the oldest line into buffer (bounds-checked, NUL-terminated). Returns its
+ * length, or 0 if the queue is empty. */
+static int queue_pop_line_locked(char *buffer, int bufferSize)
+{
+    if ( g.line_count == 0 )
+        return 0;
+
+    mm_line *ln = &g.lines[g.line_head];
+    int len = ln->len;
+    /* bounds-checked copy: never overrun buffer (Security V5) */
+    if ( len > bufferSize - 1 )
+        len = bufferSize - 1;
+    memcpy(buffer, ln->data, (size_t)len);
+    buffer[len] = '\0';
+
+    /* dequeue */
+    free(ln->data);
+    ln->data = NULL;
+    g.line_head = (g.line_head + 1) % g.queue_cap;
+    g.line_count--;
+    return len;
+}
+
+/* Allocate the line accumulator and ring at the sticky line limits. Returns 0,
+ * or -1 with g.error set and nothing allocated. */
+static int queue_alloc(void)
+{
+    g.line_cap  = g.line_max_len;
+    g.queue_cap = g.queue_max_lines;
+    g.accum = malloc((size_t)g.line_cap);
+    g.lines = calloc((size_t)g.queue_cap, sizeof(mm_line));
+    if ( !g.accum || !g.lines ) {
+        free(g.accum);
+        free(g.lines);
+        g.accum = NULL;
+        g.lines = NULL;
+        set_error("Failed to allocate the receive queue");
+        return -1;
+    }
+    g.accum_len  = 0;
+    g.line_head  = 0;
+    g.line_count = 0;
+    return 0;
+}
+
+/* Free every queued line, the ring and the accumulator. */
+static void queue_free(void)
+{
+    for ( int i = 0; i < g.line_count; i++ )
+        free(g.lines[(g.line_head + i) % g.queue_cap].data);
+    free(g.lines);
+    free(g.accum);
+    g.lines = NULL;
+    g.accum = NULL;
+    g.line_head  = 0;
+    g.line_count = 0;
+    g.accum_len  = 0;
+}
+
+/* Absolute pthread_cond_timedwait deadline timeoutMs from now.
+ * CLOCK_REALTIME: the only clock pthread_cond_timedwait accepts on both
+ * glibc and winpthreads without a condattr. */
+static struct timespec deadline_after_ms(int timeoutMs)
+{
+    struct timespec deadline;
+    clock_gettime(CLOCK_REALTIME, &deadline);
+    deadline.tv_sec  += timeoutMs / 1000;
+    deadline.tv_nsec += (long)(timeoutMs % 1000) * 1000000L;
+    if ( deadline.tv_nsec >= 1000000000L ) {
+        deadline.tv_sec++;
+        deadline.tv_nsec -= 1000000000L;
+    }
+    return deadline;
 }
 
-/* Feed a freshly decoded byte buffer into the accumulator, splitting on '\n'. */
-static void feed_decoded_bytes_locked(const char *buf, int n)
+/* Bracket a blocking call's whole critical section (wait + reads of g.lines)
+ * so cleanup can wait for it to leave before freeing the queue and
+ * destroying the mutex. Caller MUST hold g.mutex; enter returns 0 (and counts
+ * nothing) once cleanup has started. */
+static int waiter_enter_locked(void)
 {
+    if ( g.closing )
+        return 0;
+    g.waiters++;
+    return 1;
+}
+
+static void waiter_leave_locked(void)
+{
+    /* cleanup waits on line_cond for the last one out */
+    if ( --g.waiters == 0 && g.closing )
+        pthread_cond_broadcast(&g.line_cond);
+}
+
+/* Block on line_cond until a line is queued, the module shuts down, or
+ * timeoutMs elapses. Caller MUST hold g.mutex. */
+static void queue_wait_line_locked(int timeoutMs)
+{
+    struct timespec deadline = deadline_after_ms(timeoutMs);
+
+    while ( g.line_count == 0 && g.rx_run && !g.closing ) {
+        if ( pthread_cond_timedwait(&g.line_cond, &g.mutex, &deadline) == ETIMEDOUT )
+            break;
+    }
+}
+
+/* Feed a freshly decoded byte buffer into an accumulator (the link's, or a
+ * candidate decoder's), splitting on '\n'; lines are tagged with baud and
+ * t_carrier (the producer's last carrier lock; 0: none seen, use now). */
+static void feed_decoded_bytes_locked(char *accum, int *accum_len, int baud,
+                                      double t_carrier, const char *buf, int n)
+{
+    double now = mono_now();
+    if ( t_carrier <= 0.0 || t_carrier > now )
+        t_carrier = now;
     for ( int i = 0; i < n; i++ ) {
         char c = buf[i];
         if ( c == '\n' ) {
             /* complete line (newline stripped) */
-            queue_push_line_locked(g.accum, g.accum_len);
-            g.accum_len = 0;
+            queue_push_line_locked(accum, *accum_len, baud, t_carrier, now);
+            *accum_len = 0;
         } else {
-            if ( g.accum_len < MM_LINE_MAX_LEN ) {
-                g.accum[g.accum_len++] = c;
+            if ( *accum_len < g.line_cap ) {
+                accum[(*accum_len)++] = c;
             } else {
                 /* line too long without a '\n' -> reset (Security V5) */
-                g.accum_len = 0;
+                *accum_len = 0;
+                g.stats.lines_truncated++;
+            }
+        }
+    }
+}
+
+/* ---------------------------------------------------------------- */
+/* Multi-carrier helpers (RX thread / setup only; no lock needed).   */
+/* ---------------------------------------------------------------- */
+static minimodem_ctx *carrier_ctx(int k)
+{
+    return k == 0 ? &g.ctx : &g.extra[k - 1];
+}
+
+/* Bands of the plan carrier k receives / transmits on: half duplex shares
+ * 0..N-1; full duplex puts one direction on 0..N-1, the other on N..2N-1. */
+static int rx_band(int k)
+{
+    return g.link_duplex == MM_DUPLEX_LOW ? g.ncarriers + k : k;
+}
+
+static int tx_band(int k)
+{
+    return g.link_duplex == MM_DUPLEX_HIGH ? g.ncarriers + k : k;
+}
+
+/* Refuse a baud whose band plan cannot hold the link's carriers (twice over
+ * in full duplex) or its MFSK tones, and HDLC framing off a single BFSK
+ * carrier in half duplex. Returns 0, or -1 with g.error set. */
+static int bands_fit(int baud)
+{
+    if ( g.framing != MM_FRAMING_ASYNC
+         && (g.ncarriers > 1 || g.link_duplex != MM_DUPLEX_HALF
+             || g.tones != MM_TONES_BFSK) ) {
+        set_error("HDLC framing needs a single BFSK carrier in half duplex");
+        return -1;
+    }
+    if ( g.tones != MM_TONES_BFSK ) {
+        if ( g.ncarriers > 1 || g.link_duplex != MM_DUPLEX_HALF ) {
+            set_error("MFSK needs a single carrier in half duplex");
+            return -1;
+        }
+        if ( g.tones > mm_max_tones(baud, 48000) ) {
+            set_error("Tones do not fit the band plan at this baud");
+            return -1;
+        }
+    }
+    int needed = g.link_duplex == MM_DUPLEX_HALF ? g.ncarriers : 2 * g.ncarriers;
+    if ( needed <= mm_max_carriers(baud, 48000) )
+        return 0;
+    set_error(g.link_duplex == MM_DUPLEX_HALF
+              ? "Carrier count does not fit the band plan at this baud"
+              : "Duplex bands do not fit the band plan at this baud");
+    return -1;
+}
+
+/* Move every carrier's TX tones to its tx_band (after each build). */
+static int tx_bands_apply(void)
+{
+    for ( int k = 0; k < (g.ncarriers > 1 ? g.ncarriers : 1); k++ ) {
+        if ( mm_set_tx_carrier(carrier_ctx(k), tx_band(k)) < 0 ) {
+            set_error(carrier_ctx(k)->error);
+            return -1;
+        }
+    }
+    return 0;
+}
+
+static void stripe_push(int k, const char *buf, int n)
+{
+    for ( int i = 0; i < n && g.stripe_len[k] < MM_STRIPE_MAX_BYTES; i++ ) {
+        int tail = (g.stripe_head[k] + g.stripe_len[k]) % MM_STRIPE_MAX_BYTES;
+        g.stripe[k][tail] = (unsigned char)buf[i];
+        g.stripe_len[k]++;
+    }
+}
+
+static void stripe_reset(void)
+{
+    for ( int k = 0; k < MM_MAX_CARRIERS; k++ )
+        g.stripe_head[k] = g.stripe_len[k] = 0;
+    g.stripe_next = 0;
+}
+
+/* Round-robin the stripes back into one byte stream (NUL padding dropped). */
+static int stripe_reassemble(char *out, int out_size, int any_carrier)
+{
+    int n = 0;
+    while ( n < out_size && g.stripe_len[g.stripe_next] > 0 ) {
+        int k = g.stripe_next;
+        unsigned char c = g.stripe[k][g.stripe_head[k]];
+        g.stripe_head[k] = (g.stripe_head[k] + 1) % MM_STRIPE_MAX_BYTES;
+        g.stripe_len[k]--;
+        g.stripe_next = (k + 1) % g.ncarriers;
+        if ( c != '\0' )
+            out[n++] = (char)c;
+    }
+    /* Every carrier idle but the next stripe never arrived: a frame was lost
+     * on that carrier, so realign on carrier 0 for the next message. */
+    if ( !any_carrier && g.stripe_len[g.stripe_next] == 0 )
+        stripe_reset();
+    return n;
+}
+
+/* ---------------------------------------------------------------- */
+/* RX capture ring.                                                  */
+/* ---------------------------------------------------------------- */
+/* ctx.tap / rx_multi_pass: append one device read to the ring (if capturing). */
+static void capture_tap(const float *samples, size_t n)
+{
+    pthread_mutex_lock(&cap_mutex);
+    if ( cap.hdr && n > 0 ) {
+        size_t capacity = (size_t)cap.hdr->capacity;
+        if ( n > capacity ) {          /* only the newest `capacity` samples survive */
+            cap.hdr->written += n - capacity;
+            samples += n - capacity;
+            n = capacity;
+        }
+        size_t pos   = (size_t)(cap.hdr->written % capacity);
+        size_t first = n < capacity - pos ? n : capacity - pos;
+        memcpy(cap.ring + pos, samples, first * sizeof(float));
+        memcpy(cap.ring, samples + first, (n - first) * sizeof(float));
+        cap.hdr->written += n;
+    }
+    pthread_mutex_unlock(&cap_mutex);
+}
+
+/* Flush + unmap the ring file. Caller holds cap_mutex. */
+static void capture_close_locked(void)
+{
+    if ( !cap.hdr )
+        return;
+#ifdef _WIN32
+    FlushViewOfFile(cap.hdr, 0);
+    UnmapViewOfFile(cap.hdr);
+    CloseHandle(cap.mapping);
+    CloseHandle(cap.file);
+#else
+    msync(cap.hdr, cap.map_size, MS_SYNC);
+    munmap(cap.hdr, cap.map_size);
+    close(cap.fd);
+#endif
+    memset(&cap, 0, sizeof(cap));
+}
+
+/* One multi-carrier RX pass: read the device once, fan the block out, drain
+ * every carrier's demodulator, and reassemble. Returns bytes in out. */
+static int rx_multi_pass(char *out, int out_size)
+{
+    ssize_t r = simpleaudio_read(g.ctx.sa_in, g.rx_block, g.rx_block_len);
+    if ( r < 0 )
+        return -1;
+    capture_tap(g.rx_block, (size_t)r);
+
+    char tmp[MM_RX_STEP_BYTES];
+    int any_carrier = 0;
+    for ( int k = 0; k < g.ncarriers; k++ ) {
+        minimodem_ctx *ctx = carrier_ctx(k);
+        mm_fifo_push(&g.fifo[k], g.rx_block, (size_t)r);
+        for ( ;; ) {
+            /* mm_rx_step returns 0 both for "no frame here" (it still moves
+             * on) and "need more samples" (nothing changes): stop at the latter. */
+            size_t   fifo_len = g.fifo[k].len;
+            size_t   nvalid   = ctx->samples_nvalid;
+            unsigned advance  = ctx->advance;
+            int n = mm_rx_step(ctx, tmp, sizeof(tmp));
+            if ( n < 0 )
+                break;
+            if ( n > 0 )
+                stripe_push(k, tmp, n);
+            else if ( g.fifo[k].len == fifo_len && ctx->samples_nvalid == nvalid
+                      && ctx->advance == advance )
+                break;
+        }
+        any_carrier |= ctx->carrier;
+    }
+    return stripe_reassemble(out, out_size, any_carrier);
+}
+
+/* Carriers 1..N-1 + the RX fan-out buffers (ncarriers > 1 only). Carrier 0
+ * (g.ctx) must already be built. Returns 0, or -1 with g.error set. */
+static void carriers_destroy(void);
+static int fanout_alloc(void);
+
+static int carriers_build(int baud)
+{
+    if ( g.ncarriers <= 1 )
+        return 0;
+
+    for ( int k = 1; k < g.ncarriers; k++ ) {
+        if ( mm_build_config_carrier(&g.extra[k - 1], baud, 48000, rx_band(k)) < 0 ) {
+            set_error(g.extra[k - 1].error);
+            carriers_destroy();
+            return -1;
+        }
+    }
+    if ( fanout_alloc() < 0 ) {
+        carriers_destroy();
+        return -1;
+    }
+    stripe_reset();
+    return 0;
+}
+
+/* (Re)size the RX fan-out for the carriers' current decimation: one device
+ * block per pass and a FIFO per carrier with room for four of the larger of
+ * that block and the carrier's own refill (both in device samples). Returns 0,
+ * or -1 with g.error set. */
+static int fanout_alloc(void)
+{
+    for ( int k = 0; k < MM_MAX_CARRIERS; k++ )
+        mm_fifo_free(&g.fifo[k]);
+    free(g.rx_block);
+
+    g.rx_block_len = g.ctx.samplebuf_size / 2 * g.ctx.rx_decimation;
+    g.rx_block = malloc(g.rx_block_len * sizeof(float));
+    if ( !g.rx_block ) {
+        set_error("Failed to allocate the multi-carrier RX block");
+        return -1;
+    }
+    for ( int k = 0; k < g.ncarriers; k++ ) {
+        minimodem_ctx *c = carrier_ctx(k);
+        size_t refill = c->samplebuf_size / 2 * c->rx_decimation;
+        size_t cap = 4 * (refill > g.rx_block_len ? refill : g.rx_block_len);
+        if ( mm_fifo_init(&g.fifo[k], cap) < 0 ) {
+            set_error("Failed to allocate a carrier sample FIFO");
+            return -1;
+        }
+        c->src = &g.fifo[k];
+    }
+    return 0;
+}
+
+static void carriers_destroy(void)
+{
+    for ( int k = 1; k < MM_MAX_CARRIERS; k++ )
+        mm_destroy(&g.extra[k - 1]);   /* plan + samplebuf only: no streams */
+    for ( int k = 0; k < MM_MAX_CARRIERS; k++ )
+        mm_fifo_free(&g.fifo[k]);
+    free(g.rx_block);
+    g.rx_block = NULL;
+    g.rx_block_len = 0;
+    g.ctx.src = NULL;
+    stripe_reset();
+}
+
+/* Apply the sticky RX options (character framing, tones, link framing,
+ * decimation, bit detector, squelch, duplex band selectivity) to every
+ * carrier's ctx (after each build: mm_build_config starts from the
+ * defaults). Both framings, tones and then decimation go first: each can
+ * rebuild the plan the detector lives in, and the fan-out buffers are
+ * re-sized to match. The RX thread must not be running. Returns 0, or -1
+ * with g.error set. */
+static int apply_ctx_options(minimodem_ctx *c)
+{
+    if ( mm_set_char_framing(c, g.data_bits, g.stop_bits) < 0
+         || mm_set_tones(c, g.tones) < 0
+         || mm_set_framing_mode(c, g.framing) < 0
+         || mm_set_decimation(c, g.decimation) < 0
+         || mm_set_detector(c, g.detector) < 0
+         || mm_set_squelch(c, g.squelch_dbfs) < 0 ) {
+        set_error(c->error);
+        return -1;
+    }
+    c->band_share = g.link_duplex != MM_DUPLEX_HALF ? MM_DUPLEX_BAND_SHARE : 0.0f;
+    return 0;
+}
+
+static int apply_rx_options(void)
+{
+    int n = g.ncarriers > 1 ? g.ncarriers : 1;
+    int resized = 0;
+    for ( int k = 0; k < n; k++ ) {
+        minimodem_ctx *c = carrier_ctx(k);
+        unsigned int was = c->rx_decimation;
+        if ( apply_ctx_options(c) < 0 )
+            return -1;
+        resized |= c->rx_decimation != was;
+    }
+    if ( resized && g.ncarriers > 1 )
+        return fanout_alloc();
+    return 0;
+}
+
+/* ---------------------------------------------------------------- */
+/* Candidate-baud decoders (_set_rx_bauds).                          */
+/* ---------------------------------------------------------------- */
+/* ctx.tap: tee one capture read into the ring file and every decoder inbox. */
+static void rx_tap(const float *samples, size_t n)
+{
+    capture_tap(samples, n);
+    for ( int i = 0; i < g.ndecoders; i++ ) {
+        mm_baud_decoder *d = &g.decoders[i];
+        pthread_mutex_lock(&d->inbox_mutex);
+        mm_fifo_push(&d->inbox, samples, n);
+        pthread_cond_signal(&d->inbox_cond);
+        pthread_mutex_unlock(&d->inbox_mutex);
+    }
+}
+
+/* One decoder thread: take everything rx_tap queued, demodulate it at this
+ * decoder's baud off the RX thread, and feed the bytes to its own line
+ * accumulator (discarded during TX, like the link's). */
+static void *decoder_thread_main(void *arg)
+{
+    mm_baud_decoder *d = arg;
+    char  tmp[MM_RX_STEP_BYTES];
+    float move[1024];
+
+    for ( ;; ) {
+        pthread_mutex_lock(&d->inbox_mutex);
+        while ( d->inbox.len == 0 && g.dec_run )
+            pthread_cond_wait(&d->inbox_cond, &d->inbox_mutex);
+        if ( !g.dec_run ) {
+            pthread_mutex_unlock(&d->inbox_mutex);
+            break;
+        }
+        size_t k;
+        while ( (k = mm_fifo_pop(&d->inbox, move, sizeof(move)/sizeof(move[0]))) > 0 )
+            mm_fifo_push(&d->fifo, move, k);
+        pthread_mutex_unlock(&d->inbox_mutex);
+
+        for ( ;; ) {
+            /* as rx_multi_pass: stop once a pass neither consumed nor moved */
+            size_t   fifo_len = d->fifo.len;
+            size_t   nvalid   = d->ctx.samples_nvalid;
+            unsigned advance  = d->ctx.advance;
+            unsigned long long acquired = d->ctx.counters.carrier_acquired;
+            int n = mm_rx_step(&d->ctx, tmp, sizeof(tmp));
+            if ( n < 0 )
+                break;
+            if ( d->ctx.counters.carrier_acquired != acquired )
+                d->t_carrier = mono_now();
+            if ( n > 0 ) {
+                pthread_mutex_lock(&g.mutex);
+                if ( !g.is_transmitting || g.link_duplex != MM_DUPLEX_HALF )
+                    feed_decoded_bytes_locked(d->accum, &d->accum_len, d->baud,
+                                              d->t_carrier, tmp, n);
+                else
+                    g.stats.bytes_discarded_tx += (unsigned long long)n;
+                pthread_mutex_unlock(&g.mutex);
+            } else if ( d->fifo.len == fifo_len && d->ctx.samples_nvalid == nvalid
+                        && d->ctx.advance == advance ) {
+                break;
             }
         }
     }
+    return NULL;
+}
+
+/* Stop and free every decoder. The RX thread must not be running. */
+static void decoders_stop(void)
+{
+    int n = g.ndecoders;
+    g.ndecoders = 0;
+    g.dec_run = 0;
+    for ( int i = 0; i < n; i++ ) {
+        mm_baud_decoder *d = &g.decoders[i];
+        pthread_mutex_lock(&d->inbox_mutex);
+        pthread_cond_broadcast(&d->inbox_cond);
+        pthread_mutex_unlock(&d->inbox_mutex);
+        pthread_join(d->thread, NULL);
+        pthread_cond_destroy(&d->inbox_cond);
+        pthread_mutex_destroy(&d->inbox_mutex);
+        mm_destroy(&d->ctx);           /* plan + samplebuf only: no streams */
+        mm_fifo_free(&d->inbox);
+        mm_fifo_free(&d->fifo);
+        free(d->accum);
+    }
+}
+
+/* Start one decoder per candidate baud other than the link's (single carrier
+ * only), with the sticky RX options applied. The RX thread must not be
+ * running. Returns 0, or -1 with g.error set and no decoder left running. */
+static int decoders_start(void)
+{
+    if ( g.ncarriers > 1 || g.tones != MM_TONES_BFSK )
+        return 0;
+    g.dec_run = 1;
+    for ( int i = 0; i < g.n_rx_bauds; i++ ) {
+        if ( g.rx_bauds[i] == g.baud )
+            continue;
+        mm_baud_decoder *d = &g.decoders[g.ndecoders];
+        memset(d, 0, sizeof(*d));
+        d->baud = g.rx_bauds[i];
+        if ( mm_build_config_carrier(&d->ctx, d->baud, 48000, rx_band(0)) < 0 ) {
+            set_error(d->ctx.error);
+            decoders_stop();
+            return -1;
+        }
+        if ( apply_ctx_options(&d->ctx) < 0 ) {
+            mm_destroy(&d->ctx);
+            decoders_stop();
+            return -1;
+        }
+        size_t refill = d->ctx.samplebuf_size / 2 * d->ctx.rx_decimation;
+        d->accum = malloc((size_t)g.line_cap);
+        if ( !d->accum
+             || mm_fifo_init(&d->inbox, MM_DECODER_INBOX_SAMPLES) < 0
+             || mm_fifo_init(&d->fifo, MM_DECODER_INBOX_SAMPLES + 2 * refill) < 0 ) {
+            set_error("Failed to allocate a decoder buffer");
+            free(d->accum);
+            mm_fifo_free(&d->inbox);
+            mm_destroy(&d->ctx);
+            decoders_stop();
+            return -1;
+        }
+        d->ctx.src = &d->fifo;
+        pthread_mutex_init(&d->inbox_mutex, NULL);
+        pthread_cond_init(&d->inbox_cond, NULL);
+        if ( pthread_create(&d->thread, NULL, decoder_thread_main, d) != 0 ) {
+            set_error("Failed to create a decoder thread");
+            pthread_cond_destroy(&d->inbox_cond);
+            pthread_mutex_destroy(&d->inbox_mutex);
+            free(d->accum);
+            mm_fifo_free(&d->inbox);
+            mm_fifo_free(&d->fifo);
+            mm_destroy(&d->ctx);
+            decoders_stop();
+            return -1;
+        }
+        g.ndecoders++;
+    }
+    return 0;
+}
+
+static void *rx_thread_main(void *arg);
+static void *hold_thread_main(void *arg);
+
+/* Pause the RX thread, re-apply the RX options, rebuild the candidate-baud
+ * decoders with them and restart it: for setters whose state the RX side
+ * reads and writes. Returns 0, -1 with g.error set (RX restarts on whatever
+ * could be applied), or -2 if the restart fails. */
+static int reapply_rx_options(void)
+{
+    int rc;
+    g.rx_run = 0;
+    pthread_join(g.rx_thread, NULL);
+    decoders_stop();
+    rc = apply_rx_options();
+    if ( decoders_start() < 0 && rc == 0 )
+        rc = -1;
+    g.rx_run = 1;
+    if ( pthread_create(&g.rx_thread, NULL, rx_thread_main, NULL) != 0 ) {
+        set_error("Failed to restart RX thread");
+        return -2;
+    }
+    return rc;
+}
+
+/* ctx.counters summed over every carrier. */
+static mm_rx_counters carriers_counters(void)
+{
+    mm_rx_counters sum = g.ctx.counters;
+    for ( int k = 1; k < g.ncarriers; k++ ) {
+        const mm_rx_counters *c = &g.extra[k - 1].counters;
+        sum.carrier_acquired += c->carrier_acquired;
+        sum.carrier_lost     += c->carrier_lost;
+        for ( int b = 0; b < MM_STATS_CONFIDENCE_BINS; b++ )
+            sum.confidence_hist[b] += c->confidence_hist[b];
+        sum.squelch_opened  += c->squelch_opened;
+        sum.squelch_skipped += c->squelch_skipped;
+    }
+    sum.squelch_open = 0;
+    for ( int k = 0; k < (g.ncarriers > 1 ? g.ncarriers : 1); k++ )
+        sum.squelch_open += carrier_ctx(k)->squelch_open || carrier_ctx(k)->carrier;
+    return sum;
 }
 
 /* ---------------------------------------------------------------- */
@@ -134,19 +908,30 @@ static void *rx_thread_main(void *arg)
     char tmp[MM_RX_STEP_BYTES];
 
     while ( g.rx_run ) {
-        /* mm_rx_step BLOCKS inside simpleaudio_read until samples arrive. */
-        int n = mm_rx_step(&g.ctx, tmp, sizeof(tmp));
+        /* mm_rx_step BLOCKS inside simpleaudio_read until samples arrive
+         * (rx_multi_pass blocks in its one device read). */
+        int n = g.ncarriers > 1 ? rx_multi_pass(tmp, sizeof(tmp))
+                                : mm_rx_step(&g.ctx, tmp, sizeof(tmp));
         if ( n < 0 ) {
             /* read error: brief settle, keep looping (device may recover). */
             continue;
         }
-        if ( n == 0 )
-            continue;
 
         pthread_mutex_lock(&g.mutex);
-        /* Half-duplex (Pitfall 3): keep the buffer drained during TX but discard. */
-        if ( !g.is_transmitting )
-            feed_decoded_bytes_locked(tmp, n);
+        /* mm_rx_step bumps ctx.counters outside the lock; publish a copy. A
+         * new carrier lock is stamped to this pass (one device read). */
+        mm_rx_counters counters = carriers_counters();
+        if ( counters.carrier_acquired > g.rx_counters.carrier_acquired )
+            g.t_carrier = mono_now();
+        g.rx_counters = counters;
+        if ( n > 0 ) {
+            g.stats.bytes_demodulated += (unsigned long long)n;
+            /* Half-duplex (Pitfall 3): keep the buffer drained during TX but discard. */
+            if ( !g.is_transmitting || g.link_duplex != MM_DUPLEX_HALF )
+                feed_decoded_bytes_locked(g.accum, &g.accum_len, g.baud, g.t_carrier, tmp, n);
+            else
+                g.stats.bytes_discarded_tx += (unsigned long long)n;
+        }
         pthread_mutex_unlock(&g.mutex);
     }
     return NULL;
@@ -187,6 +972,7 @@ extern int         mm_capture_device_count(void);
 extern const char *mm_playback_device_name(int deviceId);
 extern const char *mm_capture_device_name(int deviceId);
 extern int         mm_winmm_drain(simpleaudio *sa);   /* flush + wait for TX playout */
+extern int         mm_winmm_flush(simpleaudio *sa);   /* queue the partial buffer, no wait */
 #endif
 
 MINIMODEM_SIMPLE_API int minimodem_simple_get_playback_device_count(void)
@@ -235,18 +1021,44 @@ MINIMODEM_SIMPLE_API const char *minimodem_simple_get_capture_device_name(int de
 MINIMODEM_SIMPLE_API int minimodem_simple_init(int playbackDeviceId,
                                                int captureDeviceId,
                                                int baud)
+{
+    return minimodem_simple_init_multi(playbackDeviceId, captureDeviceId, baud, 1);
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_max_carriers(int baud)
+{
+    return mm_max_carriers(baud, 48000);
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_max_tones(int baud)
+{
+    return mm_max_tones(baud, 48000);
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_init_multi(int playbackDeviceId,
+                                                     int captureDeviceId,
+                                                     int baud, int carriers)
 {
     if ( g.initialized ) {
         set_error("Already initialized");
         return -1;
     }
+    if ( carriers < 1 ) {
+        set_error("Carrier count does not fit the band plan at this baud");
+        return -1;
+    }
+    g.ncarriers = carriers;
+    g.link_duplex = g.duplex;
+    if ( bands_fit(baud) < 0 )
+        return -1;
 
     /* Build the FSK config + RX plan from baud (mm_core.c). */
-    int rc = mm_build_config(&g.ctx, baud, 48000);
+    int rc = mm_build_config_carrier(&g.ctx, baud, 48000, rx_band(0));
     if ( rc < 0 ) {
         set_error(g.ctx.error);
         return rc;                     /* negative; tone-out-of-band etc. */
     }
+    g.ctx.tap = rx_tap;
     g.baud = baud;
 
     /* TX amplitude default until _send overrides it from volume. */
@@ -266,24 +1078,113 @@ MINIMODEM_SIMPLE_API int minimodem_simple_init(int playbackDeviceId,
         return -3;
     }
 
-    /* queue state */
-    g.accum_len  = 0;
-    g.line_head  = 0;
-    g.line_count = 0;
+    /* Multi-carrier: the other carriers' RX plans + the fan-out buffers;
+     * then every carrier's TX tones onto its own band. */
+    if ( carriers_build(baud) < 0 ) {
+        mm_destroy(&g.ctx);
+        return -3;
+    }
+    if ( tx_bands_apply() < 0 ) {
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -3;
+    }
+    if ( apply_rx_options() < 0 ) {
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -3;
+    }
+
+    /* queue state, sized by _set_line_limits (decoders_start needs line_cap) */
+    if ( queue_alloc() < 0 ) {
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -3;
+    }
     g.is_transmitting = 0;
+    g.closing = 0;
+    g.waiters = 0;
+    memset(&g.stats, 0, sizeof(g.stats));
+    memset(&g.rx_counters, 0, sizeof(g.rx_counters));
 
     if ( pthread_mutex_init(&g.mutex, NULL) != 0 ) {
         set_error("Failed to init mutex");
+        queue_free();
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -4;
+    }
+    if ( pthread_cond_init(&g.line_cond, NULL) != 0 ) {
+        set_error("Failed to init condition variable");
+        pthread_mutex_destroy(&g.mutex);
+        queue_free();
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -4;
+    }
+    if ( pthread_cond_init(&g.tx_cond, NULL) != 0 ) {
+        set_error("Failed to init condition variable");
+        pthread_cond_destroy(&g.line_cond);
+        pthread_mutex_destroy(&g.mutex);
+        queue_free();
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -4;
+    }
+    if ( pthread_cond_init(&g.hold_cond, NULL) != 0 ) {
+        set_error("Failed to init condition variable");
+        pthread_cond_destroy(&g.tx_cond);
+        pthread_cond_destroy(&g.line_cond);
+        pthread_mutex_destroy(&g.mutex);
+        queue_free();
+        carriers_destroy();
         mm_destroy(&g.ctx);
         return -4;
     }
 
+    /* Candidate-baud decoders (they feed the queue, so after the mutex). */
+    if ( decoders_start() < 0 ) {
+        pthread_cond_destroy(&g.hold_cond);
+        pthread_cond_destroy(&g.tx_cond);
+        pthread_cond_destroy(&g.line_cond);
+        pthread_mutex_destroy(&g.mutex);
+        queue_free();
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -5;
+    }
+
     /* Spin up the background RX thread. */
     g.rx_run = 1;
     if ( pthread_create(&g.rx_thread, NULL, rx_thread_main, NULL) != 0 ) {
         set_error("Failed to create RX thread");
         g.rx_run = 0;
+        decoders_stop();
+        pthread_cond_destroy(&g.hold_cond);
+        pthread_cond_destroy(&g.tx_cond);
+        pthread_cond_destroy(&g.line_cond);
+        pthread_mutex_destroy(&g.mutex);
+        queue_free();
+        carriers_destroy();
+        mm_destroy(&g.ctx);
+        return -5;
+    }
+
+    /* ...and the carrier-hold thread (idle until a transmission arms it). */
+    memset(&g.hold_until, 0, sizeof(g.hold_until));
+    g.hold_run = 1;
+    if ( pthread_create(&g.hold_thread, NULL, hold_thread_main, NULL) != 0 ) {
+        set_error("Failed to create carrier-hold thread");
+        g.hold_run = 0;
+        g.rx_run = 0;
+        pthread_join(g.rx_thread, NULL);
+        decoders_stop();
+        pthread_cond_destroy(&g.hold_cond);
+        pthread_cond_destroy(&g.tx_cond);
+        pthread_cond_destroy(&g.line_cond);
         pthread_mutex_destroy(&g.mutex);
+        queue_free();
+        carriers_destroy();
         mm_destroy(&g.ctx);
         return -5;
     }
@@ -295,31 +1196,196 @@ MINIMODEM_SIMPLE_API int minimodem_simple_init(int playbackDeviceId,
 /* ================================================================ */
 /* Send / Receive                                                   */
 /* ================================================================ */
-MINIMODEM_SIMPLE_API int minimodem_simple_send(const char *message, int volume)
+static double seconds_since(const struct timespec *t)
 {
-    if ( !g.initialized ) {
-        set_error("Not initialized");
-        return -1;
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (double)(now.tv_sec - t->tv_sec) + (double)(now.tv_nsec - t->tv_nsec) / 1e9;
+}
+
+/* True while the idle carrier from the last transmission is still up.
+ * Caller MUST hold g.mutex. */
+static int carrier_held_locked(void)
+{
+    if ( g.hold_until.tv_sec == 0 && g.hold_until.tv_nsec == 0 )
+        return 0;
+    return seconds_since(&g.hold_until) < 0.0;
+}
+
+/* Write nbits of idle mark tone on every carrier. Caller MUST hold tx_mutex. */
+static void emit_idle_marks(int nbits)
+{
+    if ( g.ncarriers > 1 ) {
+        minimodem_ctx *ctxs[MM_MAX_CARRIERS];
+        for ( int k = 0; k < g.ncarriers; k++ )
+            ctxs[k] = carrier_ctx(k);
+        g.ctx.tx_leader_bits_len  = nbits;      /* no bytes: all leader marks */
+        g.ctx.tx_trailer_bits_len = 0;
+        mm_tx_bytes_multi(ctxs, g.ncarriers, NULL, 0);
+    } else {
+        for ( int j = 0; j < nbits; j++ )       /* phase continues across passes */
+            simpleaudio_tone(g.ctx.sa_out, g.ctx.tx_bfsk_mark_f, g.ctx.tx_bit_nsamples);
     }
-    if ( !message || message[0] == '\0' ) {
-        set_error("Empty message");
-        return -2;
+#ifdef _WIN32
+    mm_winmm_flush(g.ctx.sa_out);               /* play now, not when the buffer fills */
+#endif
+}
+
+/* Carrier-hold thread: after each transmission (hold_cond), keep writing idle
+ * marks in MM_TX_HOLD_BLOCK_MS passes, paced to stay MM_TX_HOLD_AHEAD_MS ahead
+ * of the wall clock, until hold_until passes or a send takes over. */
+static void *hold_thread_main(void *arg)
+{
+    (void)arg;
+    pthread_mutex_lock(&g.mutex);
+    while ( g.hold_run ) {
+        if ( !carrier_held_locked() ) {
+            pthread_cond_wait(&g.hold_cond, &g.mutex);
+            continue;
+        }
+        double ahead = g.hold_emitted - seconds_since(&g.hold_start);
+        if ( ahead > MM_TX_HOLD_AHEAD_MS / 1000.0 ) {
+            struct timespec deadline =
+                deadline_after_ms((int)(ahead * 1000.0) - MM_TX_HOLD_AHEAD_MS + 1);
+            pthread_cond_timedwait(&g.hold_cond, &g.mutex, &deadline);
+            continue;
+        }
+        pthread_mutex_unlock(&g.mutex);
+
+        pthread_mutex_lock(&tx_mutex);
+        pthread_mutex_lock(&g.mutex);
+        int held = g.hold_run && carrier_held_locked();
+        struct timespec origin = g.hold_start;
+        pthread_mutex_unlock(&g.mutex);
+        int nbits = g.baud * MM_TX_HOLD_BLOCK_MS / 1000;
+        if ( nbits < 1 )
+            nbits = 1;
+        if ( held )
+            emit_idle_marks(nbits);
+        pthread_mutex_unlock(&tx_mutex);
+
+        pthread_mutex_lock(&g.mutex);
+        if ( held && origin.tv_sec == g.hold_start.tv_sec
+                  && origin.tv_nsec == g.hold_start.tv_nsec )
+            g.hold_emitted += (double)nbits * g.ctx.tx_bit_nsamples / g.ctx.sample_rate;
+    }
+    pthread_mutex_unlock(&g.mutex);
+    return NULL;
+}
+
+/* Drop the idle carrier now and wait out any idle marks being written, e.g.
+ * before set_baud rebuilds the ctx the hold thread writes from. */
+static void hold_drop(void)
+{
+    pthread_mutex_lock(&g.mutex);
+    memset(&g.hold_until, 0, sizeof(g.hold_until));
+    pthread_mutex_unlock(&g.mutex);
+    pthread_mutex_lock(&tx_mutex);
+    pthread_mutex_unlock(&tx_mutex);
+}
+
+/* 7-bit framing drops the top bit: refuse rather than garble the frame (HDLC
+ * sends whole octets). Returns 1 (error set) if buf cannot be sent. */
+static int frame_unclean(const unsigned char *buf, size_t len)
+{
+    if ( g.data_bits < 8 && g.framing == MM_FRAMING_ASYNC ) {
+        for ( size_t i = 0; i < len; i++ ) {
+            if ( buf[i] >> g.data_bits ) {
+                set_error("Frame is not 7-bit clean");
+                return 1;
+            }
+        }
     }
+    return 0;
+}
 
-    /* Map volume (1-100) -> tone amplitude (0..1). Open Question 4. */
+/* Map volume (1-100) -> tone amplitude (0..1). Open Question 4. The striped
+ * carriers are synthesized by mm_tx_bytes_multi, not the tone generator, so
+ * it takes the volume as tx_amplitude. Caller MUST hold tx_mutex. */
+static void tx_set_volume(int volume)
+{
     if ( volume < 1 )   volume = 1;
     if ( volume > 100 ) volume = 100;
     simpleaudio_tone_init(4096, (float)volume / 100.0f);
+    g.ctx.tx_amplitude = (float)volume / 100.0f;
+}
+
+/* Modulate buf through the link's TX path: mm_tx_bytes, or the striped
+ * carriers. With out set, render into *out / *nout instead (mm_tx_render).
+ * Caller MUST hold tx_mutex. */
+static int tx_modulate(const unsigned char *buf, size_t len, float **out, size_t *nout)
+{
+    minimodem_ctx *ctxs[MM_MAX_CARRIERS];
+    for ( int k = 0; k < g.ncarriers; k++ )
+        ctxs[k] = carrier_ctx(k);
+    if ( out )
+        return mm_tx_render(ctxs, g.ncarriers, buf, len, out, nout);
+    return g.ncarriers > 1 ? mm_tx_bytes_multi(ctxs, g.ncarriers, buf, len)
+                           : mm_tx_bytes(&g.ctx, buf, len);
+}
+
+/* Close a transmission that started at tx_start: clear is_transmitting,
+ * count it (if ok) and arm the idle-carrier hold. Caller MUST hold tx_mutex. */
+static void tx_finish(int ok, size_t nbytes, int held, const struct timespec *tx_start)
+{
+    struct timespec tx_end;
+    clock_gettime(CLOCK_MONOTONIC, &tx_end);
+
+    pthread_mutex_lock(&g.mutex);
+    g.is_transmitting = 0;
+    if ( ok )
+        g.stats.tx_bytes += (unsigned long long)nbytes;
+    if ( ok && held )
+        g.stats.tx_leaders_skipped++;
+    if ( ok && g.tx_hold_ms > MM_TX_HOLD_OFF ) {
+        /* keep the carrier up as idle marks (hold_thread_main) */
+        g.hold_start   = tx_end;
+        g.hold_until   = tx_end;
+        g.hold_until.tv_sec  += g.tx_hold_ms / 1000;
+        g.hold_until.tv_nsec += (long)(g.tx_hold_ms % 1000) * 1000000L;
+        if ( g.hold_until.tv_nsec >= 1000000000L ) {
+            g.hold_until.tv_sec++;
+            g.hold_until.tv_nsec -= 1000000000L;
+        }
+        g.hold_emitted = 0.0;
+        pthread_cond_broadcast(&g.hold_cond);
+    }
+    g.stats.tx_seconds += (double)(tx_end.tv_sec - tx_start->tv_sec)
+                        + (double)(tx_end.tv_nsec - tx_start->tv_nsec) / 1e9;
+    pthread_cond_broadcast(&g.tx_cond);
+    pthread_mutex_unlock(&g.mutex);
+}
+
+/* Modulate buf as one transmission (leader, bytes, trailer) and account for
+ * it in the stats. Shared by _send and _send_many. A transmission that starts
+ * while the idle carrier is held skips its leader. */
+static int transmit(const unsigned char *buf, size_t len, int volume)
+{
+    pthread_mutex_lock(&tx_mutex);
+
+    if ( frame_unclean(buf, len) ) {
+        pthread_mutex_unlock(&tx_mutex);
+        return -2;
+    }
+    tx_set_volume(volume);
 
     pthread_mutex_lock(&g.mutex);
     g.is_transmitting = 1;
+    int held = carrier_held_locked();
     pthread_mutex_unlock(&g.mutex);
 
+    /* carrier 0's ctx carries the framing for mm_tx_bytes_multi too */
+    g.ctx.tx_leader_bits_len  = held ? 0 : g.tx_leader_bits;
+    g.ctx.tx_trailer_bits_len = g.tx_trailer_bits;
+
+    struct timespec tx_start;
+    clock_gettime(CLOCK_MONOTONIC, &tx_start);
+
     /* Modulate the caller's bytes to waveOut. On Windows the WinMM write()
      * coalesces into the ring and returns BEFORE the audio has played out, so
      * we must drain explicitly below. On Linux ALSA/Pulse write() blocks to
      * completion, so no drain is needed. */
-    int rc = mm_tx_bytes(&g.ctx, (const unsigned char *)message, strlen(message));
+    int rc = tx_modulate(buf, len, NULL, NULL);
 
 #ifdef _WIN32
     /* Flush the trailing partial buffer and wait for the full FSK signal to
@@ -329,9 +1395,8 @@ MINIMODEM_SIMPLE_API int minimodem_simple_send(const char *message, int volume)
         mm_winmm_drain(g.ctx.sa_out);
 #endif
 
-    pthread_mutex_lock(&g.mutex);
-    g.is_transmitting = 0;
-    pthread_mutex_unlock(&g.mutex);
+    tx_finish(rc >= 0, len, held, &tx_start);
+    pthread_mutex_unlock(&tx_mutex);
 
     if ( rc < 0 ) {
         set_error("mm_tx_bytes failed");
@@ -340,6 +1405,145 @@ MINIMODEM_SIMPLE_API int minimodem_simple_send(const char *message, int volume)
     return 0;
 }
 
+MINIMODEM_SIMPLE_API int minimodem_simple_send(const char *message, int volume)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !message || message[0] == '\0' ) {
+        set_error("Empty message");
+        return -2;
+    }
+    return transmit((const unsigned char *)message, strlen(message), volume);
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_send_many(const char *const *frames, int count,
+                                                    int volume)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !frames || count < 1 ) {
+        set_error("Empty message");
+        return -2;
+    }
+
+    /* Join the frames into one buffer so mm_tx_bytes emits a single leader
+     * and trailer around all of them; each frame keeps its '\n' framing. */
+    size_t total = 0;
+    for ( int i = 0; i < count; i++ ) {
+        if ( !frames[i] || frames[i][0] == '\0' ) {
+            set_error("Empty message");
+            return -2;
+        }
+        total += strlen(frames[i]) + 1;
+    }
+    unsigned char *burst = malloc(total);
+    if ( !burst ) {
+        set_error("Failed to allocate the burst buffer");
+        return -3;
+    }
+    size_t len = 0;
+    for ( int i = 0; i < count; i++ ) {
+        size_t n = strlen(frames[i]);
+        memcpy(burst + len, frames[i], n);
+        len += n;
+        if ( frames[i][n - 1] != '\n' )
+            burst[len++] = '\n';
+    }
+
+    int rc = transmit(burst, len, volume);
+    free(burst);
+    return rc;
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_render(const char *message, int volume,
+                                                 float *samples, int maxSamples)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !message || message[0] == '\0' ) {
+        set_error("Empty message");
+        return -2;
+    }
+    const unsigned char *buf = (const unsigned char *)message;
+    size_t len = strlen(message);
+
+    /* The tone table and the ctx framing are the live transmitter's. */
+    pthread_mutex_lock(&tx_mutex);
+    if ( frame_unclean(buf, len) ) {
+        pthread_mutex_unlock(&tx_mutex);
+        return -2;
+    }
+    tx_set_volume(volume);
+    g.ctx.tx_leader_bits_len  = g.tx_leader_bits;
+    g.ctx.tx_trailer_bits_len = g.tx_trailer_bits;
+    float *pcm = NULL;
+    size_t n = 0;
+    int rc = tx_modulate(buf, len, &pcm, &n);
+    pthread_mutex_unlock(&tx_mutex);
+
+    if ( rc < 0 || n > INT_MAX ) {
+        free(pcm);
+        set_error("Failed to render the waveform");
+        return -3;
+    }
+    if ( samples && maxSamples > 0 && (size_t)maxSamples >= n )
+        memcpy(samples, pcm, n * sizeof(float));
+    free(pcm);
+    return (int)n;
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_send_pcm(const float *samples, int count, int nbytes,
+                                                   int volume)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !samples || count < 1 ) {
+        set_error("Empty message");
+        return -2;
+    }
+
+    pthread_mutex_lock(&tx_mutex);
+    /* the hold thread idles at the tone table's volume: make it the samples' */
+    if ( volume > 0 )
+        tx_set_volume(volume);
+    pthread_mutex_lock(&g.mutex);
+    g.is_transmitting = 1;
+    int held = carrier_held_locked();
+    pthread_mutex_unlock(&g.mutex);
+
+    /* _render puts tx_leader_bits mark bits first: under a held carrier play
+     * from just past them, as _send would skip its leader */
+    size_t skip = held ? (size_t)g.tx_leader_bits * g.ctx.tx_bit_nsamples : 0;
+    if ( skip >= (size_t)count )
+        skip = 0, held = 0;
+
+    struct timespec tx_start;
+    clock_gettime(CLOCK_MONOTONIC, &tx_start);
+    /* the backends only read the buffer */
+    ssize_t r = simpleaudio_write(g.ctx.sa_out, (void *)(samples + skip),
+                                  (size_t)count - skip);
+#ifdef _WIN32
+    if ( r >= 0 )
+        mm_winmm_drain(g.ctx.sa_out);
+#endif
+    tx_finish(r >= 0, nbytes > 0 ? (size_t)nbytes : 0, held, &tx_start);
+    pthread_mutex_unlock(&tx_mutex);
+
+    if ( r < 0 ) {
+        set_error("Failed to write the samples");
+        return -3;
+    }
+    return 0;
+}
+
 MINIMODEM_SIMPLE_API int minimodem_simple_is_transmitting(void)
 {
     if ( !g.initialized )
@@ -347,6 +1551,32 @@ MINIMODEM_SIMPLE_API int minimodem_simple_is_transmitting(void)
     return g.is_transmitting ? 1 : 0;
 }
 
+MINIMODEM_SIMPLE_API int minimodem_simple_wait_transmit_done(int timeoutMs)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+
+    pthread_mutex_lock(&g.mutex);
+    if ( !waiter_enter_locked() ) {
+        pthread_mutex_unlock(&g.mutex);
+        set_error("Shutting down");
+        return -1;
+    }
+    if ( g.is_transmitting && timeoutMs > 0 ) {
+        struct timespec deadline = deadline_after_ms(timeoutMs);
+        while ( g.is_transmitting && !g.closing ) {
+            if ( pthread_cond_timedwait(&g.tx_cond, &g.mutex, &deadline) == ETIMEDOUT )
+                break;
+        }
+    }
+    int done = g.is_transmitting ? 0 : 1;
+    waiter_leave_locked();
+    pthread_mutex_unlock(&g.mutex);
+    return done;
+}
+
 MINIMODEM_SIMPLE_API int minimodem_simple_process(void)
 {
     if ( !g.initialized ) {
@@ -370,26 +1600,132 @@ MINIMODEM_SIMPLE_API int minimodem_simple_receive(char *buffer, int bufferSize)
         return -1;
     }
 
-    int len = 0;
     pthread_mutex_lock(&g.mutex);
-    if ( g.line_count > 0 ) {
+    int len = queue_pop_line_locked(buffer, bufferSize);
+    pthread_mutex_unlock(&g.mutex);
+
+    return len;   /* 0 if no complete line is queued */
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_wait(char *buffer, int bufferSize,
+                                                       int timeoutMs)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !buffer || bufferSize <= 0 ) {
+        set_error("Invalid receive buffer");
+        return -1;
+    }
+
+    pthread_mutex_lock(&g.mutex);
+    if ( !waiter_enter_locked() ) {
+        pthread_mutex_unlock(&g.mutex);
+        return 0;
+    }
+    if ( timeoutMs > 0 )
+        queue_wait_line_locked(timeoutMs);
+    int len = queue_pop_line_locked(buffer, bufferSize);
+    waiter_leave_locked();
+    pthread_mutex_unlock(&g.mutex);
+
+    return len;   /* 0 on timeout / shutdown */
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_peek_length(int timeoutMs)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+
+    pthread_mutex_lock(&g.mutex);
+    if ( !waiter_enter_locked() ) {
+        pthread_mutex_unlock(&g.mutex);
+        return 0;
+    }
+    if ( timeoutMs > 0 )
+        queue_wait_line_locked(timeoutMs);
+    int len = g.line_count > 0 ? g.lines[g.line_head].len : 0;
+    waiter_leave_locked();
+    pthread_mutex_unlock(&g.mutex);
+
+    return len;   /* 0 if no complete line is queued */
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_many(char *buffer, int bufferSize,
+                                                       int *lengths, int maxLines,
+                                                       int timeoutMs)
+{
+    return minimodem_simple_receive_many_timed(buffer, bufferSize, lengths, NULL, NULL,
+                                               maxLines, timeoutMs);
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_many_bauds(char *buffer, int bufferSize,
+                                                             int *lengths, int *bauds,
+                                                             int maxLines, int timeoutMs)
+{
+    return minimodem_simple_receive_many_timed(buffer, bufferSize, lengths, bauds, NULL,
+                                               maxLines, timeoutMs);
+}
+
+/* bauds and times may each be NULL (_receive_many / _receive_many_bauds). */
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_many_timed(char *buffer, int bufferSize,
+                                                             int *lengths, int *bauds,
+                                                             double *times,
+                                                             int maxLines, int timeoutMs)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !buffer || bufferSize <= 0 || !lengths || maxLines <= 0 ) {
+        set_error("Invalid receive_many buffer");
+        return -1;
+    }
+
+    int nlines = 0;
+    int used = 0;
+    pthread_mutex_lock(&g.mutex);
+    if ( !waiter_enter_locked() ) {
+        pthread_mutex_unlock(&g.mutex);
+        return 0;
+    }
+    if ( timeoutMs > 0 )
+        queue_wait_line_locked(timeoutMs);
+    double t_dequeued = mono_now();
+    while ( g.line_count > 0 && nlines < maxLines ) {
         mm_line *ln = &g.lines[g.line_head];
-        len = ln->len;
-        /* bounds-checked copy: never overrun buffer (Security V5) */
-        if ( len > bufferSize - 1 )
-            len = bufferSize - 1;
-        memcpy(buffer, ln->data, (size_t)len);
-        buffer[len] = '\0';
-
-        /* dequeue */
+        int len = ln->len;
+        if ( len > bufferSize - used ) {
+            /* Leave it queued for the next call, unless it could never fit: a
+             * lone oversized line is truncated exactly like _receive does. */
+            if ( nlines > 0 )
+                break;
+            len = bufferSize;
+        }
+        memcpy(buffer + used, ln->data, (size_t)len);
+        if ( bauds )
+            bauds[nlines] = ln->baud;
+        if ( times ) {
+            double *t = times + (size_t)nlines * MM_RX_TIMES_PER_LINE;
+            t[0] = ln->t_carrier;
+            t[1] = ln->t_decoded;
+            t[2] = t_dequeued;
+        }
+        lengths[nlines++] = len;
+        used += len;
+
         free(ln->data);
         ln->data = NULL;
-        g.line_head = (g.line_head + 1) % MM_QUEUE_MAX_LINES;
+        g.line_head = (g.line_head + 1) % g.queue_cap;
         g.line_count--;
     }
+    waiter_leave_locked();
     pthread_mutex_unlock(&g.mutex);
 
-    return len;   /* 0 if no complete line is queued */
+    return nlines;   /* 0 on timeout / empty queue */
 }
 
 /* ================================================================ */
@@ -407,6 +1743,10 @@ MINIMODEM_SIMPLE_API int minimodem_simple_set_baud(int baud)
     }
     if ( baud == g.baud )
         return 0;
+    if ( bands_fit(baud) < 0 )
+        return -1;    /* refuse up front: tearing the link down and failing would leave it dead */
+
+    hold_drop();                       /* the idle marks belong to the old tones */
 
     /*
      * Rebuild the fsk plan / config for the new baud. Both ends MUST match;
@@ -416,17 +1756,18 @@ MINIMODEM_SIMPLE_API int minimodem_simple_set_baud(int baud)
      */
     g.rx_run = 0;
     pthread_join(g.rx_thread, NULL);
+    decoders_stop();
+    carriers_destroy();
 
     /* Detach the open streams from the ctx so mm_build_config's memset does not
      * lose them; mm_build_config zeroes the whole ctx. */
     simpleaudio *sa_in  = g.ctx.sa_in;
     simpleaudio *sa_out = g.ctx.sa_out;
 
-    /* free the old RX plan + buffer without touching the streams */
-    if ( g.ctx.samplebuf ) { free(g.ctx.samplebuf); g.ctx.samplebuf = NULL; }
-    if ( g.ctx.fskp )      { fsk_plan_destroy(g.ctx.fskp); g.ctx.fskp = NULL; }
+    /* free the old RX plan + buffers without touching the streams */
+    mm_free_rx(&g.ctx);
 
-    int rc = mm_build_config(&g.ctx, baud, 48000);
+    int rc = mm_build_config_carrier(&g.ctx, baud, 48000, rx_band(0));
     if ( rc < 0 ) {
         set_error(g.ctx.error);
         /* config is now invalid; close the streams we stashed and bail. */
@@ -437,10 +1778,18 @@ MINIMODEM_SIMPLE_API int minimodem_simple_set_baud(int baud)
         return rc;
     }
 
-    /* reattach streams + clear any partial line */
+    /* reattach streams + RX event counters, clear any partial line */
     g.ctx.sa_in  = sa_in;
     g.ctx.sa_out = sa_out;
+    g.ctx.tap    = rx_tap;
+    g.ctx.counters = g.rx_counters;    /* RX thread is joined: this copy is current */
     g.baud = baud;
+    int carriers_rc = carriers_build(baud);
+    if ( carriers_rc < 0 )
+        g.ncarriers = 1;               /* allocation failed: keep RX alive on carrier 0 */
+    tx_bands_apply();                  /* bands_fit vetted every band at this baud */
+    apply_rx_options();                /* the setters vetted them; only an allocation can fail */
+    int decoders_rc = decoders_start();  /* the candidates now exclude the new baud */
 
     pthread_mutex_lock(&g.mutex);
     g.accum_len = 0;
@@ -452,6 +1801,358 @@ MINIMODEM_SIMPLE_API int minimodem_simple_set_baud(int baud)
         set_error("Failed to restart RX thread after set_baud");
         return -2;
     }
+    return carriers_rc < 0 || decoders_rc < 0 ? -3 : 0;
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_set_tones(int tones)
+{
+    if ( tones != MM_TONES_BFSK && tones != 4 && tones != MM_MAX_TONES ) {
+        set_error("Invalid tone count");
+        return -1;
+    }
+    if ( !g.initialized ) {
+        g.tones = tones;
+        return 0;
+    }
+    if ( tones == g.tones )
+        return 0;
+    int was = g.tones;
+    g.tones = tones;
+    if ( bands_fit(g.baud) < 0 ) {
+        g.tones = was;                 /* refuse up front, as set_baud does */
+        return -1;
+    }
+
+    hold_drop();                       /* the idle marks belong to the old tones */
+    pthread_mutex_lock(&tx_mutex);     /* never mid-transmission */
+    int rc = reapply_rx_options();     /* mm_set_tones moves RX and TX tones */
+    pthread_mutex_unlock(&tx_mutex);
+    pthread_mutex_lock(&g.mutex);
+    g.accum_len = 0;                   /* a partial line from the old tones */
+    pthread_mutex_unlock(&g.mutex);
+    return rc;
+}
+
+/* ================================================================ */
+/* Line limits                                                      */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_line_limits(int maxLineLen, int maxLines)
+{
+    if ( maxLineLen < 1 || maxLineLen > MM_LINE_MAX_LEN_LIMIT ) {
+        set_error("Line length limit out of range");
+        return -1;
+    }
+    if ( maxLines < 1 || maxLines > MM_QUEUE_MAX_LINES_LIMIT ) {
+        set_error("Queue depth out of range");
+        return -1;
+    }
+    g.line_max_len    = maxLineLen;
+    g.queue_max_lines = maxLines;
+    return 0;
+}
+
+/* ================================================================ */
+/* Character framing                                                */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_char_framing(int dataBits, int stopBits)
+{
+    if ( (dataBits != MM_DATA_BITS_ASCII && dataBits != MM_DATA_BITS_DEFAULT)
+         || stopBits < 1 || stopBits > MM_STOP_BITS_MAX ) {
+        set_error("Character framing out of range");
+        return -1;
+    }
+    if ( !g.initialized ) {
+        g.data_bits = dataBits;
+        g.stop_bits = stopBits;
+        return 0;
+    }
+    if ( dataBits == g.data_bits && stopBits == g.stop_bits )
+        return 0;
+    pthread_mutex_lock(&tx_mutex);     /* never mid-transmission */
+    g.data_bits = dataBits;
+    g.stop_bits = stopBits;
+    int rc = reapply_rx_options();     /* the frame search's expected bits */
+    pthread_mutex_unlock(&tx_mutex);
+    pthread_mutex_lock(&g.mutex);
+    g.accum_len = 0;                   /* a partial line in the old framing */
+    pthread_mutex_unlock(&g.mutex);
+    return rc;
+}
+
+/* ================================================================ */
+/* Link framing                                                     */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_framing_mode(int mode)
+{
+    if ( mode != MM_FRAMING_ASYNC && mode != MM_FRAMING_HDLC ) {
+        set_error("Invalid framing mode");
+        return -1;
+    }
+    if ( !g.initialized ) {
+        g.framing = mode;
+        return 0;
+    }
+    if ( mode == g.framing )
+        return 0;
+    int was = g.framing;
+    g.framing = mode;
+    if ( bands_fit(g.baud) < 0 ) {
+        g.framing = was;               /* refuse up front, as set_tones does */
+        return -1;
+    }
+
+    pthread_mutex_lock(&tx_mutex);     /* never mid-transmission */
+    int rc = reapply_rx_options();     /* frame search <-> bit-clock recovery */
+    pthread_mutex_unlock(&tx_mutex);
+    pthread_mutex_lock(&g.mutex);
+    g.accum_len = 0;                   /* a partial line in the old framing */
+    pthread_mutex_unlock(&g.mutex);
+    return rc;
+}
+
+/* ================================================================ */
+/* TX framing / carrier hold                                        */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_tx_framing(int leaderBits, int trailerBits)
+{
+    if ( leaderBits < 0 || leaderBits > MM_TX_FRAMING_BITS_MAX
+         || trailerBits < 0 || trailerBits > MM_TX_FRAMING_BITS_MAX ) {
+        set_error("Leader/trailer length out of range");
+        return -1;
+    }
+    pthread_mutex_lock(&tx_mutex);     /* never mid-transmission */
+    g.tx_leader_bits  = leaderBits;
+    g.tx_trailer_bits = trailerBits;
+    pthread_mutex_unlock(&tx_mutex);
+    return 0;
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_set_tx_hold(int holdMs)
+{
+    if ( holdMs < MM_TX_HOLD_OFF || holdMs > MM_TX_HOLD_MAX_MS ) {
+        set_error("Carrier hold out of range");
+        return -1;
+    }
+    g.tx_hold_ms = holdMs;
+    if ( holdMs == MM_TX_HOLD_OFF && g.initialized )
+        hold_drop();
+    return 0;
+}
+
+/* ================================================================ */
+/* Duplex                                                           */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_duplex(int mode)
+{
+    if ( mode != MM_DUPLEX_HALF && mode != MM_DUPLEX_LOW && mode != MM_DUPLEX_HIGH ) {
+        set_error("Invalid duplex mode");
+        return -1;
+    }
+    g.duplex = mode;
+    return 0;
+}
+
+/* ================================================================ */
+/* Candidate bauds                                                  */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_rx_bauds(const int *bauds, int count)
+{
+    if ( count < 0 || count > MM_MAX_RX_BAUDS || (count > 0 && !bauds) ) {
+        set_error("Invalid candidate baud list");
+        return -1;
+    }
+    for ( int i = 0; i < count; i++ ) {
+        /* refuse up front a baud whose plan cannot be built */
+        minimodem_ctx probe;
+        if ( bauds[i] <= 0 || mm_build_config(&probe, bauds[i], 48000) < 0 ) {
+            set_error(bauds[i] <= 0 ? "Invalid baud" : probe.error);
+            return -1;
+        }
+        mm_destroy(&probe);
+    }
+
+    if ( g.initialized ) {
+        g.rx_run = 0;
+        pthread_join(g.rx_thread, NULL);
+        decoders_stop();
+    }
+    if ( count > 0 )
+        memcpy(g.rx_bauds, bauds, (size_t)count * sizeof(int));
+    g.n_rx_bauds = count;
+    if ( g.initialized ) {
+        int rc = decoders_start();
+        g.rx_run = 1;
+        if ( pthread_create(&g.rx_thread, NULL, rx_thread_main, NULL) != 0 ) {
+            set_error("Failed to restart RX thread");
+            return -2;
+        }
+        if ( rc < 0 )
+            return -2;
+    }
+    return 0;
+}
+
+/* ================================================================ */
+/* Bit detector                                                     */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_detector(int detector)
+{
+    if ( detector != MM_DETECTOR_DEFAULT && detector != MM_DETECTOR_FFT
+         && detector != MM_DETECTOR_GOERTZEL ) {
+        set_error("Unknown bit detector");
+        return -1;
+    }
+#ifndef USE_FFT
+    if ( detector == MM_DETECTOR_FFT ) {
+        set_error("FFT bit detector not available (built without FFTW)");
+        return -1;
+    }
+#endif
+
+    g.detector = detector;
+    if ( g.initialized )
+        return reapply_rx_options();
+    return 0;
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_set_squelch(int openDbfs)
+{
+    if ( openDbfs != MM_SQUELCH_OFF
+         && (openDbfs < MM_SQUELCH_MIN_DBFS || openDbfs > 0) ) {
+        set_error("Squelch level out of range");
+        return -1;
+    }
+
+    g.squelch_dbfs = openDbfs;
+    if ( g.initialized ) {
+        /* the gate state is read and written only by the RX thread: pause it
+         * so the new levels and the reset measurement land between passes */
+        return reapply_rx_options();
+    }
+    return 0;
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_set_decimation(int maxFactor)
+{
+    if ( maxFactor < MM_DECIMATION_AUTO || maxFactor > MM_DECIMATION_MAX ) {
+        set_error("Decimation factor out of range");
+        return -1;
+    }
+
+    g.decimation = maxFactor;
+    if ( g.initialized ) {
+        /* a rate change rebuilds the RX plan and sample buffer under the RX
+         * thread's feet: pause it (a partly received line is dropped) */
+        return reapply_rx_options();
+    }
+    return 0;
+}
+
+/* ================================================================ */
+/* Statistics                                                       */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_get_stats(minimodem_simple_stats *stats)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !stats ) {
+        set_error("Invalid stats pointer");
+        return -2;
+    }
+
+    pthread_mutex_lock(&g.mutex);
+    *stats = g.stats;
+    stats->queue_depth      = (unsigned long long)g.line_count;
+    stats->carrier_acquired = g.rx_counters.carrier_acquired;
+    stats->carrier_lost     = g.rx_counters.carrier_lost;
+    memcpy(stats->confidence_hist, g.rx_counters.confidence_hist,
+           sizeof(stats->confidence_hist));
+    stats->squelch_open     = g.rx_counters.squelch_open;
+    stats->squelch_opened   = g.rx_counters.squelch_opened;
+    stats->squelch_skipped  = g.rx_counters.squelch_skipped;
+    pthread_mutex_unlock(&g.mutex);
+    return 0;
+}
+
+/* ================================================================ */
+/* RX capture                                                       */
+/* ================================================================ */
+MINIMODEM_SIMPLE_API int minimodem_simple_capture_start(const char *path, int seconds)
+{
+    if ( !g.initialized ) {
+        set_error("Not initialized");
+        return -1;
+    }
+    if ( !path || seconds <= 0 ) {
+        set_error("Invalid capture path or length");
+        return -2;
+    }
+
+    unsigned long long capacity = (unsigned long long)seconds * 48000;
+    size_t map_size = sizeof(minimodem_simple_capture_header)
+                      + (size_t)capacity * sizeof(float);
+    void *map = NULL;
+
+    pthread_mutex_lock(&cap_mutex);
+    capture_close_locked();
+#ifdef _WIN32
+    HANDLE file = CreateFileA(path, GENERIC_READ | GENERIC_WRITE, FILE_SHARE_READ, NULL,
+                              CREATE_ALWAYS, FILE_ATTRIBUTE_NORMAL, NULL);
+    HANDLE mapping = NULL;
+    if ( file != INVALID_HANDLE_VALUE ) {
+        mapping = CreateFileMappingA(file, NULL, PAGE_READWRITE,
+                                     (DWORD)((unsigned long long)map_size >> 32),
+                                     (DWORD)(map_size & 0xffffffffu), NULL);
+        if ( mapping )
+            map = MapViewOfFile(mapping, FILE_MAP_WRITE, 0, 0, map_size);
+    }
+    if ( !map ) {
+        if ( mapping ) CloseHandle(mapping);
+        if ( file != INVALID_HANDLE_VALUE ) CloseHandle(file);
+    } else {
+        cap.file    = file;
+        cap.mapping = mapping;
+    }
+#else
+    int fd = open(path, O_RDWR | O_CREAT | O_TRUNC, 0644);
+    if ( fd >= 0 && ftruncate(fd, (off_t)map_size) == 0 ) {
+        map = mmap(NULL, map_size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+        if ( map == MAP_FAILED )
+            map = NULL;
+    }
+    if ( !map ) {
+        if ( fd >= 0 ) close(fd);
+    } else {
+        cap.fd = fd;
+    }
+#endif
+    if ( !map ) {
+        pthread_mutex_unlock(&cap_mutex);
+        set_error("Failed to create or map the capture file");
+        return -3;
+    }
+
+    cap.hdr      = map;
+    cap.ring     = (float *)(cap.hdr + 1);
+    cap.map_size = map_size;
+    memset(cap.hdr, 0, sizeof(*cap.hdr));
+    memcpy(cap.hdr->magic, MM_CAPTURE_MAGIC, sizeof(MM_CAPTURE_MAGIC));
+    cap.hdr->sample_rate = 48000;
+    cap.hdr->baud        = (unsigned int)g.baud;
+    cap.hdr->carriers    = (unsigned int)g.ncarriers;
+    cap.hdr->tones       = (unsigned int)g.tones;
+    cap.hdr->capacity    = capacity;
+    pthread_mutex_unlock(&cap_mutex);
+    return 0;
+}
+
+MINIMODEM_SIMPLE_API int minimodem_simple_capture_stop(void)
+{
+    pthread_mutex_lock(&cap_mutex);
+    capture_close_locked();
+    pthread_mutex_unlock(&cap_mutex);
     return 0;
 }
 
@@ -470,19 +2171,36 @@ MINIMODEM_SIMPLE_API void minimodem_simple_cleanup(void)
      * returned buffer. */
     g.rx_run = 0;
     pthread_join(g.rx_thread, NULL);
+    decoders_stop();
+
+    /* stop the carrier-hold thread before the playback stream closes */
+    pthread_mutex_lock(&g.mutex);
+    g.hold_run = 0;
+    pthread_cond_broadcast(&g.hold_cond);
+    pthread_mutex_unlock(&g.mutex);
+    pthread_join(g.hold_thread, NULL);
 
+    /* release anyone parked in _receive_wait / _peek_length /
+     * _receive_many_timed / _wait_transmit_done, and wait until the last of
+     * them has left g.lines and g.mutex before both are torn down */
+    pthread_mutex_lock(&g.mutex);
+    g.closing = 1;
+    pthread_cond_broadcast(&g.line_cond);
+    pthread_cond_broadcast(&g.tx_cond);
+    while ( g.waiters > 0 )
+        pthread_cond_wait(&g.line_cond, &g.mutex);
+    pthread_mutex_unlock(&g.mutex);
+
+    minimodem_simple_capture_stop();
+    carriers_destroy();
     mm_destroy(&g.ctx);                /* free samplebuf, fsk plan, close streams */
+    pthread_cond_destroy(&g.hold_cond);
+    pthread_cond_destroy(&g.tx_cond);
+    pthread_cond_destroy(&g.line_cond);
     pthread_mutex_destroy(&g.mutex);
 
-    /* drain any queued lines */
-    for ( int i = 0; i < g.line_count; i++ ) {
-        int idx = (g.line_head + i) % MM_QUEUE_MAX_LINES;
-        free(g.lines[idx].data);
-        g.lines[idx].data = NULL;
-    }
-    g.line_head = 0;
-    g.line_count = 0;
-    g.accum_len = 0;
+    /* drain any queued lines, free the ring */
+    queue_free();
 
     g.initialized = 0;
 }
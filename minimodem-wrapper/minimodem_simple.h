@@ -32,6 +32,174 @@
 extern "C" {
 #endif
 
+/* RX bit detectors for minimodem_simple_set_detector. */
+#define MM_DETECTOR_DEFAULT   0   /* FFT if the build links FFTW, else Goertzel */
+#define MM_DETECTOR_FFT       1   /* full r2c FFT per bit, reads the two tone bins */
+#define MM_DETECTOR_GOERTZEL  2   /* Goertzel filters at just the mark/space bins */
+
+/*
+ * Energy squelch (minimodem_simple_set_squelch): while no carrier is held the
+ * frame search only runs once the mark/space tone level reaches this many
+ * dBFS; the gate closes again 6 dB lower. MM_SQUELCH_OFF searches every pass.
+ */
+#define MM_SQUELCH_OFF            0
+#define MM_SQUELCH_DEFAULT_DBFS (-60)
+
+/*
+ * RX decimation (minimodem_simple_set_decimation): the capture device stays at
+ * 48 kHz; the demodulator runs at 48000 / D with D picked per baud and tone
+ * plan (whole samples per bit, >= 8 of them, tones well below the new
+ * Nyquist). The setting caps D: MM_DECIMATION_AUTO lets the wrapper choose
+ * (and keeps the Goertzel detector's async RX at 48 kHz, where the FIR would
+ * cost more than it saves), 1 turns decimation off.
+ */
+#define MM_DECIMATION_AUTO 0
+#define MM_DECIMATION_OFF  1
+#define MM_DECIMATION_MAX 12
+
+/* Upper bound on parallel tone pairs for minimodem_simple_init_multi. */
+#define MM_MAX_CARRIERS 8
+
+/*
+ * Tones per symbol (minimodem_simple_set_tones). MM_TONES_BFSK is the
+ * mark/space pair, one bit per symbol. 4 or 8 tones (MFSK) carry 2 or 3 bits
+ * per symbol on tones one baud apart, from the lower base tone up: each byte is
+ * a start symbol (lowest tone), ceil(8 / bits) Gray-coded data symbols and a
+ * stop symbol (highest tone, also the leader / idle tone), so a frame is 6
+ * (4 tones) or 5 (8 tones) symbols instead of 10.
+ */
+#define MM_TONES_BFSK 2
+#define MM_MAX_TONES  8
+
+/* Upper bound on candidate bauds for minimodem_simple_set_rx_bauds. */
+#define MM_MAX_RX_BAUDS 4
+
+/*
+ * Duplex modes (minimodem_simple_set_duplex). Full duplex splits the band
+ * plan: with N carriers, one direction uses bands 0..N-1 and the other
+ * N..2N-1, so 2N must fit (minimodem_simple_max_carriers). The two ends pick
+ * opposite sides.
+ */
+#define MM_DUPLEX_HALF 0   /* both directions share bands 0..N-1; RX muted during TX */
+#define MM_DUPLEX_LOW  1   /* transmit on the low bands, receive on the high */
+#define MM_DUPLEX_HIGH 2   /* transmit on the high bands, receive on the low */
+
+/*
+ * Timestamps per line from minimodem_simple_receive_many_timed, in this order:
+ * carrier acquired, last byte decoded, dequeued.
+ */
+#define MM_RX_TIMES_PER_LINE 3
+
+/*
+ * Received-line caps (minimodem_simple_set_line_limits; Security V5): bytes
+ * accumulated without a '\n' beyond the max length reset the line
+ * (lines_truncated), and a full queue drops its oldest line (lines_dropped).
+ */
+#define MM_LINE_MAX_LEN_DEFAULT       8192
+#define MM_LINE_MAX_LEN_LIMIT       262144
+#define MM_QUEUE_MAX_LINES_DEFAULT      64
+#define MM_QUEUE_MAX_LINES_LIMIT      1024
+
+/*
+ * TX framing (minimodem_simple_set_tx_framing): mark bits sent before and
+ * after every transmission. The leader is what the far demodulator acquires
+ * on; the trailer guards the last stop bit.
+ */
+#define MM_TX_LEADER_BITS_DEFAULT      2
+#define MM_TX_TRAILER_BITS_DEFAULT     2
+#define MM_TX_FRAMING_BITS_MAX      1024
+
+/*
+ * Character framing (minimodem_simple_set_char_framing): data bits per
+ * character and stop bits after it. The default is 8-N-1, ten bit times per
+ * byte; MM_DATA_BITS_ASCII sends 7-bit ASCII in nine (7-N-1), and a send
+ * holding a byte with the top bit set is refused rather than truncated. A
+ * second stop bit gives a drifting receiver more time to find the next start
+ * edge. One stop bit is the least the frame search can sync on. MFSK frames
+ * ceil(data bits / bits per symbol) data symbols and repeats its stop symbol.
+ */
+#define MM_DATA_BITS_DEFAULT  8
+#define MM_DATA_BITS_ASCII    7
+#define MM_STOP_BITS_DEFAULT  1
+#define MM_STOP_BITS_MAX      2
+
+/*
+ * Link framing (minimodem_simple_set_framing_mode). MM_FRAMING_ASYNC sends
+ * every character in its own start/stop frame (the character framing above).
+ * MM_FRAMING_HDLC sends each transmission as one synchronous bitstream with
+ * no per-character start/stop bits: MM_HDLC_PREAMBLE_FLAGS 0x7E flags to
+ * lock on, the bytes LSB first with a 0 stuffed after every five 1s, then a
+ * closing flag. Bits are NRZI coded (a 0 changes tone, a 1 keeps it), so the
+ * receiver recovers the bit clock from the tone changes instead of framing
+ * on each start edge: eight bit times per byte, plus a few percent of
+ * stuffing, instead of ten. Binary FSK on a single carrier in half duplex;
+ * the character framing does not apply (bytes go as whole octets).
+ */
+#define MM_FRAMING_ASYNC        0
+#define MM_FRAMING_HDLC         1
+#define MM_HDLC_PREAMBLE_FLAGS  4
+
+/*
+ * Idle-carrier hold (minimodem_simple_set_tx_hold): after a transmission the
+ * mark tone keeps playing for up to this long; a send inside the window
+ * continues on the live carrier and skips its leader. MM_TX_HOLD_OFF drops
+ * the carrier with the trailer.
+ */
+#define MM_TX_HOLD_OFF                 0
+#define MM_TX_HOLD_MAX_MS          10000
+
+/*
+ * FSK confidence histogram: bin i counts decoded frames whose confidence was
+ * below MM_STATS_CONFIDENCE_EDGES[i]; the last bin is everything at or above
+ * the last edge (including a perfect, infinite-confidence frame). Frames below
+ * the 1.5 acquisition threshold never decode, so bin 0 starts there.
+ */
+#define MM_STATS_CONFIDENCE_BINS  8
+#define MM_STATS_CONFIDENCE_EDGES { 2.0f, 3.0f, 5.0f, 10.0f, 20.0f, 50.0f, 100.0f }
+
+/**
+ * Cumulative wrapper counters since init (they survive set_baud). Filled by
+ * minimodem_simple_get_stats; every field is a plain 64-bit integer or double
+ * so the layout is the same for the AHK and ctypes callers.
+ */
+typedef struct minimodem_simple_stats {
+    unsigned long long bytes_demodulated;   /* bytes out of the FSK decoder */
+    unsigned long long bytes_discarded_tx;  /* ...of which dropped while transmitting */
+    unsigned long long lines_queued;        /* complete lines pushed onto the queue */
+    unsigned long long lines_dropped;       /* oldest line dropped on a full queue / OOM */
+    unsigned long long lines_truncated;     /* partial lines reset at the line max length */
+    unsigned long long queue_depth;         /* lines queued right now */
+    unsigned long long queue_high_water;    /* deepest the queue has been */
+    unsigned long long carrier_acquired;    /* carrier lock events */
+    unsigned long long carrier_lost;        /* carrier loss events */
+    unsigned long long confidence_hist[MM_STATS_CONFIDENCE_BINS];
+    unsigned long long tx_bytes;            /* bytes modulated by _send */
+    double             tx_seconds;          /* wall time spent inside _send */
+    unsigned long long squelch_open;        /* carriers whose squelch is open right now */
+    unsigned long long squelch_opened;      /* squelch open events */
+    unsigned long long squelch_skipped;     /* samples the squelch kept from the frame search */
+    unsigned long long tx_leaders_skipped;  /* sends that rode a held carrier (no leader) */
+} minimodem_simple_stats;
+
+/*
+ * RX capture ring file (minimodem_simple_capture_start): this header, then
+ * `capacity` little-endian float32 samples used as a ring. `written` counts
+ * every sample ever teed; the oldest sample sits at written % capacity once
+ * the ring has wrapped (written > capacity), at 0 before. Read it after
+ * _capture_stop, or accept that the newest block may be mid-write.
+ */
+#define MM_CAPTURE_MAGIC "MMCAP01"
+
+typedef struct minimodem_simple_capture_header {
+    char               magic[8];            /* MM_CAPTURE_MAGIC, NUL-terminated */
+    unsigned int       sample_rate;
+    unsigned int       baud;                /* link baud when the capture started */
+    unsigned int       carriers;            /* carrier count (1 unless _init_multi) */
+    unsigned int       tones;               /* tones per symbol (MM_TONES_BFSK unless _set_tones) */
+    unsigned long long capacity;            /* ring size in samples */
+    unsigned long long written;             /* samples teed since _capture_start */
+} minimodem_simple_capture_header;
+
 /**
  * Initialize the minimodem system with specified audio devices.
  *
@@ -43,6 +211,31 @@ extern "C" {
  */
 MINIMODEM_SIMPLE_API int minimodem_simple_init(int playbackDeviceId, int captureDeviceId, int baud);
 
+/**
+ * Initialize in multi-carrier mode: `carriers` independent mark/space pairs in
+ * non-overlapping bands (carrier k = the single-carrier pair shifted up by
+ * k * (shift + 2*baud)). Each message is striped byte-by-byte across the
+ * carriers and reassembled on RX, so throughput scales with the carrier count.
+ * Both ends MUST use the same baud AND carrier count. carriers == 1 is
+ * exactly minimodem_simple_init.
+ * @return 0 on success, negative on error (too many carriers for the baud: -1)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_init_multi(int playbackDeviceId, int captureDeviceId,
+                                                     int baud, int carriers);
+
+/**
+ * How many carriers fit the band plan at a baud (1..MM_MAX_CARRIERS).
+ * @return Carrier limit, 0 for an invalid baud
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_max_carriers(int baud);
+
+/**
+ * The most tones per symbol that fit the band plan at a baud (MM_MAX_TONES,
+ * 4 or MM_TONES_BFSK).
+ * @return Tone limit, 0 for an invalid baud
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_max_tones(int baud);
+
 /**
  * Get the number of available playback devices.
  * @return Number of playback devices
@@ -74,16 +267,80 @@ MINIMODEM_SIMPLE_API const char* minimodem_simple_get_capture_device_name(int de
  *
  * @param message   Null-terminated string to send
  * @param volume    Volume level (1-100); maps to TX tone amplitude
- * @return 0 on success, negative on error
+ * @return 0 on success, negative on error (-2: empty, or not 7-bit clean
+ *         under async MM_DATA_BITS_ASCII)
  */
 MINIMODEM_SIMPLE_API int minimodem_simple_send(const char* message, int volume);
 
+/**
+ * Send several newline-framed frames as one burst: a single leader, the frames
+ * back to back on one continuous carrier, then a single trailer. Saves the
+ * per-frame lead-in/trailer and the gap between separate _send calls. A frame
+ * missing its trailing '\n' gets one, so the receiver still splits the burst
+ * into the same lines.
+ *
+ * @param frames    Array of count null-terminated frames (none empty)
+ * @param count     Number of frames (>= 1)
+ * @param volume    Volume level (1-100); maps to TX tone amplitude
+ * @return 0 on success, negative on error (-2: no / empty frames, or not
+ *         7-bit clean under async MM_DATA_BITS_ASCII)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_send_many(const char* const* frames, int count,
+                                                    int volume);
+
+/**
+ * Render what _send(message, volume) would transmit -- leader, frames,
+ * trailer, at the current baud, tones and framing -- into samples instead of
+ * the sound device, for replay with _send_pcm. Like snprintf, the full length
+ * is returned whether or not it fit: nothing is copied unless samples holds
+ * maxSamples >= that many (samples NULL / maxSamples 0 asks for the size).
+ * The waveform always opens with its leader (the _set_tx_framing leader bits
+ * of mark tone), and is tied to the link settings it was rendered under:
+ * render again after any of them changes.
+ *
+ * @param message     Null-terminated message (should end with '\n')
+ * @param volume      Volume level (1-100)
+ * @param samples     Buffer for the float samples (device rate, mono), or NULL
+ * @param maxSamples  Capacity of samples
+ * @return Sample count (> 0), negative on error (-1: not initialized, -2:
+ *         empty or not 7-bit clean as in _send, -3: render failed)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_render(const char* message, int volume,
+                                                 float* samples, int maxSamples);
+
+/**
+ * Transmit pre-rendered samples (from _render) as one transmission: one
+ * device write, no synthesis. Waits, signals and arms the carrier hold like
+ * _send; while the idle carrier is held the leader at the front of the
+ * samples is not played (counted in tx_leaders_skipped), as _send skips it.
+ * The held carrier after them idles at volume, as it would after _send.
+ *
+ * @param samples  count float samples (device rate, mono)
+ * @param count    Number of samples (>= 1)
+ * @param nbytes   Payload bytes the samples carry, for tx_bytes (may be 0)
+ * @param volume   Volume level (1-100) the samples were rendered at; 0 keeps
+ *                 the last _send / _render volume
+ * @return 0 on success, negative on error (-1: not initialized, -2: empty,
+ *         -3: device write failed)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_send_pcm(const float* samples, int count, int nbytes,
+                                                   int volume);
+
 /**
  * Check if currently transmitting.
  * @return 1 if transmitting, 0 if not
  */
 MINIMODEM_SIMPLE_API int minimodem_simple_is_transmitting(void);
 
+/**
+ * Block until the in-flight transmission (if any) has finished playing, or
+ * timeoutMs elapses. Wakes on a condition variable signalled by _send(), so a
+ * sender on another thread resumes immediately instead of polling
+ * _is_transmitting. timeoutMs <= 0 just reports the current state.
+ * @return 1 if idle (transmission done), 0 on timeout, negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_wait_transmit_done(int timeoutMs);
+
 /**
  * Process housekeeping (called regularly by the frontend loop).
  * With the background RX thread doing the demod pumping, this is a near no-op
@@ -93,20 +350,227 @@ MINIMODEM_SIMPLE_API int minimodem_simple_is_transmitting(void);
 MINIMODEM_SIMPLE_API int minimodem_simple_process(void);
 
 /**
- * Drain one received newline-delimited message into buffer.
+ * Drain one received newline-delimited message into buffer. A line longer
+ * than bufferSize - 1 is truncated (size the buffer with _peek_length).
  * @return Length of received message, 0 if none, negative on error
  */
 MINIMODEM_SIMPLE_API int minimodem_simple_receive(char* buffer, int bufferSize);
 
+/**
+ * Blocking variant of minimodem_simple_receive: sleeps on a condition variable
+ * until a complete line is queued or timeoutMs elapses, then drains one line.
+ * timeoutMs <= 0 behaves exactly like minimodem_simple_receive (no wait).
+ * @return Length of received message, 0 on timeout/shutdown, negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_wait(char* buffer, int bufferSize, int timeoutMs);
+
+/**
+ * Length of the oldest queued line without dequeuing it, so the caller can
+ * size the buffer for the _receive that follows (length + 1 for the NUL).
+ * timeoutMs > 0 first waits for a line, as _receive_wait does.
+ * @return Line length in bytes, 0 if none is queued, negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_peek_length(int timeoutMs);
+
+/**
+ * Drain up to maxLines queued messages in one call. Lines are packed back to
+ * back into buffer (no separators, no NUL) and lengths[i] receives the length
+ * of line i. A line that does not fit in the remaining space stays queued for
+ * the next call; a single line larger than the whole buffer is truncated.
+ * timeoutMs > 0 waits (as _receive_wait) for at least one line first.
+ * @return Number of lines copied (0 if none), negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_many(char* buffer, int bufferSize,
+                                                       int* lengths, int maxLines,
+                                                       int timeoutMs);
+
+/**
+ * minimodem_simple_receive_many that also reports which baud decoded each
+ * line: bauds[i] receives the rate of line i (the link baud, or one of the
+ * _set_rx_bauds candidates).
+ * @return Number of lines copied (0 if none), negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_many_bauds(char* buffer, int bufferSize,
+                                                             int* lengths, int* bauds,
+                                                             int maxLines, int timeoutMs);
+
+/**
+ * minimodem_simple_receive_many_bauds that also reports when each line moved
+ * through the receiver: times[3*i .. 3*i+2] receive line i's carrier
+ * acquisition (the lock it arrived on; lines after the first of a burst share
+ * it), the decode of its last byte, and this dequeue, as CLOCK_MONOTONIC
+ * seconds (Python's time.monotonic()) at device-read granularity. bauds and
+ * times may each be NULL; times must hold MM_RX_TIMES_PER_LINE * maxLines.
+ * @return Number of lines copied (0 if none), negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_receive_many_timed(char* buffer, int bufferSize,
+                                                             int* lengths, int* bauds,
+                                                             double* times,
+                                                             int maxLines, int timeoutMs);
+
 /**
  * Set the FSK baud rate (rebuilds the fsk plan). Replaces set_protocol.
+ * In multi-carrier mode every carrier is rebuilt; a baud at which the carrier
+ * count no longer fits the band plan is refused without touching the link.
  * @param baud  Baud rate (both ends MUST match)
  * @return 0 on success, negative on error
  */
 MINIMODEM_SIMPLE_API int minimodem_simple_set_baud(int baud);
 
+/**
+ * Select binary FSK or MFSK (tones per symbol; see MM_TONES_BFSK). Sticky:
+ * applies now if initialized (the link is rebuilt as by set_baud) and to
+ * every later init / set_baud. MFSK runs on a single carrier in half duplex,
+ * without candidate-baud decoders; a setting that does not fit the link is
+ * refused without touching it. Both ends MUST match.
+ * @param tones  MM_TONES_BFSK, 4 or MM_MAX_TONES
+ * @return 0 on success, negative on error (-1: invalid / does not fit)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_tones(int tones);
+
+/**
+ * Set the received-line caps (sticky; they take effect at the next init,
+ * which sizes the line accumulators and the queue ring from them). Raise
+ * maxLineLen for frames longer than the 8 KiB default.
+ * @param maxLineLen  Bytes per line, 1..MM_LINE_MAX_LEN_LIMIT (default MM_LINE_MAX_LEN_DEFAULT)
+ * @param maxLines    Queued lines, 1..MM_QUEUE_MAX_LINES_LIMIT (default MM_QUEUE_MAX_LINES_DEFAULT)
+ * @return 0 on success, negative on error (-1: out of range)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_line_limits(int maxLineLen, int maxLines);
+
+/**
+ * Set the mark bits sent before (leader) and after (trailer) every
+ * transmission. Sticky and TX-only: it applies from the next send, before or
+ * after init. Shorter leaders cut the airtime of short frames; the far end
+ * needs enough of one to acquire the carrier (tools/leader_sweep.py).
+ * @param leaderBits   0..MM_TX_FRAMING_BITS_MAX (default MM_TX_LEADER_BITS_DEFAULT)
+ * @param trailerBits  0..MM_TX_FRAMING_BITS_MAX (default MM_TX_TRAILER_BITS_DEFAULT)
+ * @return 0 on success, negative on error (-1: out of range)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_tx_framing(int leaderBits, int trailerBits);
+
+/**
+ * Set the character framing: data bits per character and stop bits after it
+ * (sticky; before init or live, where it rebuilds the RX side like
+ * set_tones). Both ends must match. With MM_DATA_BITS_ASCII, _send and
+ * _send_many refuse a frame that is not 7-bit clean.
+ * @param dataBits  MM_DATA_BITS_ASCII or MM_DATA_BITS_DEFAULT
+ * @param stopBits  1..MM_STOP_BITS_MAX (default MM_STOP_BITS_DEFAULT)
+ * @return 0 on success, negative on error (-1: out of range)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_char_framing(int dataBits, int stopBits);
+
+/**
+ * Select async (start/stop) or HDLC synchronous framing (see MM_FRAMING_*).
+ * Sticky: before init, or live, where it rebuilds the RX side like
+ * set_tones. HDLC runs binary FSK on a single carrier in half duplex; a
+ * setting that does not fit the link is refused without touching it. Both
+ * ends MUST match.
+ * @param mode  MM_FRAMING_ASYNC or MM_FRAMING_HDLC
+ * @return 0 on success, negative on error (-1: invalid / does not fit)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_framing_mode(int mode);
+
+/**
+ * Hold the carrier (idle mark tone) for holdMs after each transmission, so a
+ * quick follow-up send skips its leader (counted in tx_leaders_skipped). The
+ * hold does not set is_transmitting: RX keeps decoding and a waiter on
+ * _wait_transmit_done resumes when the frame itself has played. Sticky.
+ * @param holdMs  MM_TX_HOLD_OFF..MM_TX_HOLD_MAX_MS
+ * @return 0 on success, negative on error (-1: out of range)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_tx_hold(int holdMs);
+
+/**
+ * Select half or full duplex (MM_DUPLEX_*). In full duplex this end transmits
+ * on one half of the band plan and receives on the other, and the RX thread
+ * keeps decoding while a transmission plays (a retx request or a new draft
+ * arriving mid-report is no longer lost); frames that are mostly another
+ * band's leakage (the local TX echo) are rejected. Sticky; takes effect at
+ * the next init. init / set_baud then fail if the 2N bands do not fit at the baud.
+ * @param mode  MM_DUPLEX_HALF, MM_DUPLEX_LOW or MM_DUPLEX_HIGH
+ * @return 0 on success, negative on error (-1: invalid mode)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_duplex(int mode);
+
+/**
+ * Decode several candidate bauds at once (sticky, like _set_detector). Each
+ * candidate other than the link baud gets its own demodulator on its own
+ * thread, fed the same capture samples; its lines are queued alongside the
+ * link's, tagged with their baud (_receive_many_bauds), so a sender that
+ * changed rate is still heard. TX stays at the link baud (_set_baud).
+ * Single-carrier links only: in multi-carrier mode the list is kept but idle.
+ * @param bauds  Candidate bauds (the link baud may be included; it is skipped)
+ * @param count  0..MM_MAX_RX_BAUDS (0: link baud only, the default)
+ * @return 0 on success, negative on error (-1: bad count / a baud whose tones
+ *         do not fit the band plan, -2: a decoder could not be started)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_rx_bauds(const int* bauds, int count);
+
+/**
+ * Select the RX bit detector (MM_DETECTOR_*). Sticky: it applies to the link
+ * now (if initialized) and to every later init / set_baud. Goertzel computes
+ * only the mark and space magnitudes and decodes the same bits as the FFT.
+ * @param detector  MM_DETECTOR_DEFAULT, _FFT or _GOERTZEL
+ * @return 0 on success, negative on error (-1: unknown / not built in)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_detector(int detector);
+
+/**
+ * Cap the RX decimation factor (sticky, like _set_detector). The wrapper
+ * picks the largest factor <= maxFactor that suits each carrier's baud and
+ * tones (e.g. 1200 baud Bell 202 -> 4, 12 kHz, 10 samples/bit), low-passes
+ * and downsamples every capture read, and demodulates at the reduced rate.
+ * Under MM_DECIMATION_AUTO the Goertzel detector's async RX stays at D = 1;
+ * an explicit cap >= 2 still decimates it. TX and _capture_start recordings
+ * stay at 48 kHz.
+ * @param maxFactor  MM_DECIMATION_AUTO (default), MM_DECIMATION_OFF, or 2..MM_DECIMATION_MAX
+ * @return 0 on success, negative on error (-1: out of range)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_decimation(int maxFactor);
+
+/**
+ * Set the RX energy squelch (sticky, like _set_detector). With no carrier
+ * held, each new bit-length block's mark/space tone level is measured (two
+ * Goertzel filters) and the frame search is skipped while nothing reaches
+ * `openDbfs`; the gate closes once every sample above `openDbfs - 6` has
+ * left the search window. A tone anywhere in the window opens the gate
+ * before that pass's search, so acquisition is not delayed.
+ * @param openDbfs  Open threshold in dBFS of tone amplitude (-120..-1, e.g.
+ *                  MM_SQUELCH_DEFAULT_DBFS), or MM_SQUELCH_OFF
+ * @return 0 on success, negative on error (-1: out of range)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_set_squelch(int openDbfs);
+
+/**
+ * Copy a consistent snapshot of the wrapper counters into *stats (taken under
+ * the queue mutex, so it never blocks on the audio device).
+ * @param stats  Caller-allocated minimodem_simple_stats
+ * @return 0 on success, negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_get_stats(minimodem_simple_stats* stats);
+
+/**
+ * Tee every raw RX sample (as read from the capture device, before any
+ * demodulation) into a memory-mapped ring file holding the last `seconds` of
+ * audio, for offline replay (python-backend/tools/replay_capture.py). The file
+ * is created or truncated; an active capture is stopped first.
+ * @param path     Capture file path
+ * @param seconds  Ring length in seconds of audio (> 0)
+ * @return 0 on success, negative on error (-3: file could not be created/mapped)
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_capture_start(const char* path, int seconds);
+
+/**
+ * Stop the RX capture, flush the ring file and unmap it. No-op if none is active.
+ * @return 0 on success, negative on error
+ */
+MINIMODEM_SIMPLE_API int minimodem_simple_capture_stop(void);
+
 /**
  * Clean up and release all resources (joins the RX thread, closes streams).
+ * Callers blocked in _receive_wait, _peek_length, _receive_many* or
+ * _wait_transmit_done are woken and drained first; they return 0 / -1.
  */
 MINIMODEM_SIMPLE_API void minimodem_simple_cleanup(void);
 
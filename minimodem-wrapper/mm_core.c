@@ -15,6 +15,30 @@
  *   main() RX loop body       (minimodem.c:1137-1463)-> mm_rx_step (one pass per call; bytes -> out, not stdout)
  *   main() cleanup            (minimodem.c:1465-1480)-> mm_destroy
  *
+ * Added for the wrapper (not in minimodem.c): multi-carrier mode — a band plan
+ * of N tone pairs (mm_build_config_carrier / mm_max_carriers), a striped TX
+ * that sums the N carriers into one signal (mm_tx_bytes_multi), and a sample
+ * FIFO (mm_sample_fifo) so one device read can feed every carrier's RX ctx.
+ * mm_set_tx_carrier moves a ctx's TX tones into another band of the plan
+ * (full duplex: RX and TX on separate bands).
+ * mm_set_tones switches a ctx to MFSK: 4 or 8 tones one baud apart, 2-3 bits
+ * per symbol, with its own TX framing (mm_mfsk_transmit_frame) and frame
+ * search (mm_mfsk_find_frame, per-tone Goertzel) in place of fsk.c's.
+ * mm_set_char_framing sets the data and stop bits minimodem.c took from
+ * --ascii/-8 and --stopbits (7-N-1 for 7-bit ASCII payloads).
+ * mm_set_framing_mode swaps the start/stop frames for an HDLC-style
+ * synchronous bitstream (flags, bit stuffing, NRZI; mm_hdlc_transmit) that
+ * RX clocks from the tone changes (mm_hdlc_rx) instead of fsk_find_frame.
+ * mm_tx_render runs either TX path into a memory sink instead of the device,
+ * so the wrapper can hand out pre-rendered waveforms for replay.
+ * mm_set_detector selects fsk.c's Goertzel two-tone bit detector in place of
+ * the FFT (a build with -DFSK_NO_FFTW has only Goertzel and no FFTW link).
+ * An energy squelch (mm_set_squelch) in front of fsk_find_frame skips the
+ * frame search while no carrier is held and the tones are below threshold.
+ * RX runs decimated (mm_set_decimation, auto-picked per baud): each refill
+ * is low-passed and downsampled so the demodulator sees only a few samples
+ * per bit; TX and the capture tap stay at the device rate.
+ *
  * Stripped: getopt/usage/version, benchmarks, sndfile/--file, signals,
  * stdin read / stdout write, baudot/callerid/uic/RTTY modes, --inverted,
  * --mark/--space overrides, sync bytes, carrier autodetect (-a).
@@ -24,12 +48,18 @@
 #include <stdlib.h>
 #include <string.h>
 #include <math.h>
+#include <float.h>
 #include <assert.h>
 
 #include "minimodem_internal.h"  /* pulls in simpleaudio.h + fsk.h */
+#include "simpleaudio_internal.h"  /* mm_tx_render's memory sink backend */
 #include "databits.h"
 
 /* v1 transport is fixed 8-N-1 ASCII, non-inverted, lsb-first, no sync bytes. */
+#ifndef M_PI
+#define M_PI 3.14159265358979323846
+#endif
+
 #define MM_INVERT_START_STOP   0
 #define MM_MSB_FIRST           0
 
@@ -102,80 +132,256 @@ mm_fsk_transmit_frame(
 }
 
 
-/* ===== mm_build_config (minimodem.c:882-965 + 1037-1131) ===== */
-int
-mm_build_config( minimodem_ctx *ctx, int baud, unsigned int sample_rate )
+/* ===== baud -> mark/space/band_width derivation (minimodem.c:900-934) ===== */
+static void
+mm_base_tones( float data_rate, float *mark_f, float *space_f, float *band_width )
 {
-    memset(ctx, 0, sizeof(*ctx));
-
-    if ( baud <= 0 ) {
-        snprintf(ctx->error, sizeof(ctx->error),
-                "invalid baud rate %d (must be > 0)", baud);
-        return -1;
-    }
-    if ( sample_rate == 0 )
-        sample_rate = 48000;
-
-    ctx->sample_rate = sample_rate;
-    ctx->bfsk_data_rate = (float)baud;
-    ctx->bfsk_n_data_bits = 8;
-    ctx->bfsk_nstartbits = 1;
-    ctx->bfsk_nstopbits = 1.0f;
-    ctx->fsk_confidence_threshold = 1.5f;        /* minimodem.c:519 */
-    ctx->fsk_confidence_search_limit = 2.3f;     /* minimodem.c:528 */
-    ctx->tx_leader_bits_len = 2;
-    ctx->tx_trailer_bits_len = 2;
-    ctx->tx_amplitude = 1.0f;
-
-    /* --- baud -> mark/space/band_width derivation (minimodem.c:900-934) --- */
-    float bfsk_mark_f = 0, bfsk_space_f = 0, band_width = 0;
     int autodetect_shift;
-    if ( ctx->bfsk_data_rate >= 400 ) {
+    if ( data_rate >= 400 ) {
         /* Bell 202: baud=1200 mark=1200 space=2200 */
-        autodetect_shift = - ( ctx->bfsk_data_rate * 5 / 6 );
-        bfsk_mark_f  = ctx->bfsk_data_rate / 2 + 600;
-        bfsk_space_f = bfsk_mark_f - autodetect_shift;
-        band_width = 200;
-    } else if ( ctx->bfsk_data_rate >= 100 ) {
+        autodetect_shift = - ( data_rate * 5 / 6 );
+        *mark_f  = data_rate / 2 + 600;
+        *space_f = *mark_f - autodetect_shift;
+        *band_width = 200;
+    } else if ( data_rate >= 100 ) {
         /* Bell 103: baud=300 mark=1270 space=1070 */
         autodetect_shift = 200;
-        bfsk_mark_f  = 1270;
-        bfsk_space_f = bfsk_mark_f - autodetect_shift;
-        band_width = 50;
+        *mark_f  = 1270;
+        *space_f = *mark_f - autodetect_shift;
+        *band_width = 50;
     } else {
         /* RTTY-ish low baud */
         autodetect_shift = 170;
-        bfsk_mark_f  = 1585;
-        bfsk_space_f = bfsk_mark_f - autodetect_shift;
-        band_width = 10;
+        *mark_f  = 1585;
+        *space_f = *mark_f - autodetect_shift;
+        *band_width = 10;
     }
+}
 
-    /* restrict band_width to <= data rate (minimodem.c:959-961) */
-    if ( band_width > ctx->bfsk_data_rate )
-        band_width = ctx->bfsk_data_rate;
+/* ===== Multi-carrier band plan ===== */
+/*
+ * Carrier k is the base tone pair shifted up by k * spacing, where spacing is
+ * the mark/space shift plus two baud widths, so neighbouring pairs never share
+ * a bit-rate main lobe. The top tone of the last carrier must stay below
+ * MM_CARRIER_MAX_FRACTION of the sample rate (clear of the anti-alias filter).
+ */
+#define MM_CARRIER_MAX_FRACTION 0.45f
 
-    /* sanitize confidence search limit (minimodem.c:963-965) */
-    if ( ctx->fsk_confidence_search_limit < ctx->fsk_confidence_threshold )
-        ctx->fsk_confidence_search_limit = ctx->fsk_confidence_threshold;
+static float
+mm_carrier_spacing( float data_rate, float mark_f, float space_f )
+{
+    return fabsf(space_f - mark_f) + 2.0f * data_rate;
+}
 
-    ctx->bfsk_mark_f = bfsk_mark_f;
-    ctx->bfsk_space_f = bfsk_space_f;
-    ctx->band_width = band_width;
+int
+mm_max_carriers( int baud, unsigned int sample_rate )
+{
+    if ( baud <= 0 )
+        return 0;
+    if ( sample_rate == 0 )
+        sample_rate = 48000;
 
-    /* n databits + start + stop bits (minimodem.c:942-947) */
-    ctx->bfsk_frame_n_bits =
-        ctx->bfsk_n_data_bits + ctx->bfsk_nstartbits + (unsigned int)ctx->bfsk_nstopbits;
-    if ( ctx->bfsk_frame_n_bits > 64 ) {
-        snprintf(ctx->error, sizeof(ctx->error),
-                "total number of bits per frame must be <= 64");
+    float mark_f, space_f, band_width;
+    mm_base_tones((float)baud, &mark_f, &space_f, &band_width);
+    float spacing = mm_carrier_spacing((float)baud, mark_f, space_f);
+    float top = fmaxf(mark_f, space_f) + (float)baud / 2;
+    float limit = (float)sample_rate * MM_CARRIER_MAX_FRACTION;
+
+    int n = 1;                          /* carrier 0 is the single-carrier plan */
+    while ( n < MM_MAX_CARRIERS && top + (float)n * spacing < limit )
+        n++;
+    return n;
+}
+
+/* ===== MFSK tone plan (wrapper addition) ===== */
+/*
+ * Tone i is the lower base tone plus i * baud: one symbol rate apart, so each
+ * tone's one-symbol Goertzel bin has its nulls on the others. The top tone
+ * plus half a baud must stay below MM_CARRIER_MAX_FRACTION of the sample rate,
+ * as for the multi-carrier plan. Data symbols are Gray-coded, so the likely
+ * error (a neighbouring tone) costs one bit.
+ */
+static float
+mm_mfsk_base( float data_rate )
+{
+    float mark_f, space_f, band_width;
+    mm_base_tones(data_rate, &mark_f, &space_f, &band_width);
+    return fminf(mark_f, space_f);
+}
+
+int
+mm_max_tones( int baud, unsigned int sample_rate )
+{
+    if ( baud <= 0 )
+        return 0;
+    if ( sample_rate == 0 )
+        sample_rate = 48000;
+
+    float limit = (float)sample_rate * MM_CARRIER_MAX_FRACTION;
+    for ( int tones = MM_MAX_TONES; tones > MM_TONES_BFSK; tones /= 2 ) {
+        if ( mm_mfsk_base((float)baud) + ((float)tones - 0.5f) * (float)baud < limit )
+            return tones;
+    }
+    return MM_TONES_BFSK;
+}
+
+static unsigned int
+mm_gray_decode( unsigned int gray )
+{
+    unsigned int v = gray;
+    while ( gray >>= 1 )
+        v ^= gray;
+    return v;
+}
+
+/* ===== RX decimation (wrapper addition) ===== */
+/*
+ * The device always runs at ctx->sample_rate (TX and captures too), but the
+ * demodulator only needs a few samples per bit: mm_build_rx picks the
+ * largest factor D (<= the cap) for which the RX rate sample_rate / D keeps
+ *   - a whole number of samples per bit, at least MM_RX_MIN_SAMPLES_PER_BIT,
+ *   - the top tone plus half a baud within MM_RX_TONE_MAX_FRACTION of it,
+ * and each refill is low-passed by a Blackman windowed-sinc FIR (cutoff at
+ * the RX Nyquist, MM_RX_DECIMATION_TAPS_PER_FACTOR * D + 1 taps; flat to
+ * ~0.33, stopband from ~0.67 of the RX rate) and kept 1 in D. Anything that
+ * folds back lands above the tones. nsamples_per_bit, the FFT size and the
+ * Goertzel length all shrink by D. For async frames MM_DECIMATION_AUTO only
+ * decimates for the FFT detector: the FIR costs more than it saves Goertzel's
+ * two bins (loopback at 1200 baud: 3.52 us/byte at D=1, 4.51 at D=4), so
+ * Goertzel stays at D=1 unless a cap >= 2 is set explicitly. HDLC's sliding
+ * DFT runs per RX sample whatever the detector, so it always decimates.
+ */
+#define MM_RX_MIN_SAMPLES_PER_BIT          8
+#define MM_RX_TONE_MAX_FRACTION         0.3f
+#define MM_RX_DECIMATION_TAPS_PER_FACTOR  16
+
+/* MM_DETECTOR_* -> the FSK_DETECTOR_* it runs in this build */
+static int
+mm_fsk_detector( int detector )
+{
+    if ( detector == MM_DETECTOR_GOERTZEL )
+        return FSK_DETECTOR_GOERTZEL;
+    if ( detector == MM_DETECTOR_FFT )
+        return FSK_DETECTOR_FFT;
+#ifdef USE_FFT
+    return FSK_DETECTOR_FFT;
+#else
+    return FSK_DETECTOR_GOERTZEL;
+#endif
+}
+
+static unsigned int
+mm_pick_decimation( const minimodem_ctx *ctx, int max_factor )
+{
+    static const unsigned int factors[] = { 12, 10, 8, 6, 4, 3, 2 };
+    float top = fmaxf(ctx->bfsk_mark_f, ctx->bfsk_space_f) + ctx->bfsk_data_rate / 2;
+    unsigned int baud = (unsigned int)ctx->bfsk_data_rate;
+
+    if ( max_factor == MM_DECIMATION_AUTO && ctx->framing != MM_FRAMING_HDLC
+         && mm_fsk_detector(ctx->detector) == FSK_DETECTOR_GOERTZEL )
+        return 1;
+    if ( max_factor == MM_DECIMATION_AUTO || max_factor > MM_DECIMATION_MAX )
+        max_factor = MM_DECIMATION_MAX;
+    if ( (float)baud != ctx->bfsk_data_rate )
+        return 1;
+    for ( size_t i = 0; i < sizeof(factors)/sizeof(factors[0]); i++ ) {
+        unsigned int d = factors[i];
+        unsigned int rate = ctx->sample_rate / d;
+        if ( (int)d > max_factor || ctx->sample_rate % d || rate % baud )
+            continue;
+        if ( rate / baud < MM_RX_MIN_SAMPLES_PER_BIT
+             || top > (float)rate * MM_RX_TONE_MAX_FRACTION )
+            continue;
+        return d;
+    }
+    return 1;
+}
+
+void
+mm_free_rx( minimodem_ctx *ctx )
+{
+    if ( ctx->fskp )     { fsk_plan_destroy(ctx->fskp); ctx->fskp = NULL; }
+    if ( ctx->samplebuf ){ free(ctx->samplebuf);        ctx->samplebuf = NULL; }
+    free(ctx->hdlc_ring);
+    ctx->hdlc_ring = NULL;
+    free(ctx->dec_taps);
+    free(ctx->dec_work);
+    ctx->dec_taps = ctx->dec_work = NULL;
+    ctx->dec_ntaps = 0;
+}
+
+/* Blackman windowed sinc, cutoff 0.5/D cycles per device sample, DC gain 1. */
+static int
+mm_build_decimator( minimodem_ctx *ctx )
+{
+    unsigned int d = ctx->rx_decimation;
+    unsigned int n = MM_RX_DECIMATION_TAPS_PER_FACTOR * d + 1;
+    ctx->dec_taps = malloc(n * sizeof(float));
+    ctx->dec_work = calloc(n - 1 + ctx->samplebuf_size / 2 * d, sizeof(float));
+    if ( !ctx->dec_taps || !ctx->dec_work )
         return -1;
+    ctx->dec_ntaps = n;
+
+    double sum = 0.0;
+    for ( unsigned int i = 0; i < n; i++ ) {
+        double x = ((double)i - (double)(n - 1) / 2) / (double)d;   /* 2*fc*(i - M/2) */
+        double sinc = x == 0.0 ? 1.0 : sin(M_PI * x) / (M_PI * x);
+        double w = 0.42 - 0.5 * cos(2 * M_PI * i / (n - 1))
+                        + 0.08 * cos(4 * M_PI * i / (n - 1));
+        ctx->dec_taps[i] = (float)(sinc * w);
+        sum += sinc * w;
     }
+    for ( unsigned int i = 0; i < n; i++ )
+        ctx->dec_taps[i] = (float)(ctx->dec_taps[i] / sum);
+    return 0;
+}
 
-    /* --- TX derived state (minimodem.c:131-136) --- */
-    ctx->tx_bit_nsamples = (unsigned int)(sample_rate / ctx->bfsk_data_rate + 0.5f);
-    ctx->tx_bfsk_mark_f = ctx->bfsk_mark_f;
+/* Filter the n device samples sitting after the FIR history in dec_work and
+ * write every D-th output to out. Returns the number of RX samples written.
+ * The taps are symmetric, so each pair of samples mirrored about the centre
+ * shares one multiply; the half-length (8 * D) always splits into four
+ * independent partial sums, which keeps the FP adds pipelined. */
+static size_t
+mm_decimate( minimodem_ctx *ctx, float *out, size_t n )
+{
+    const unsigned int d = ctx->rx_decimation;
+    const unsigned int ntaps = ctx->dec_ntaps;
+    const unsigned int half = ntaps / 2;
+    const float *taps = ctx->dec_taps;
+    size_t nout = n / d;
+
+    for ( size_t k = 0; k < nout; k++ ) {
+        const float *w = ctx->dec_work + k * d;
+        const float *m = w + ntaps - 1;
+        float a0 = taps[half] * w[half], a1 = 0.0f, a2 = 0.0f, a3 = 0.0f;
+        for ( unsigned int j = 0; j < half; j += 4 ) {
+            a0 += taps[j]     * (w[j]     + m[-(int)j]);
+            a1 += taps[j + 1] * (w[j + 1] + m[-(int)j - 1]);
+            a2 += taps[j + 2] * (w[j + 2] + m[-(int)j - 2]);
+            a3 += taps[j + 3] * (w[j + 3] + m[-(int)j - 3]);
+        }
+        out[k] = (a0 + a1) + (a2 + a3);
+    }
+    memmove(ctx->dec_work, ctx->dec_work + nout * d, (ntaps - 1) * sizeof(float));
+    return nout;
+}
+
+/*
+ * (Re)build everything that depends on the RX rate: fsk plan, sample buffer,
+ * bit/frame sizes, decimation FIR, and reset the loop-carried RX state. The
+ * counters, squelch levels, streams and FIFO source are kept; the new plan
+ * starts on ctx->detector.
+ */
+static int
+mm_build_rx( minimodem_ctx *ctx, int max_factor )
+{
+    mm_free_rx(ctx);
+
+    ctx->rx_decimation_cap = max_factor;
+    ctx->rx_decimation = mm_pick_decimation(ctx, max_factor);
+    ctx->rx_sample_rate = ctx->sample_rate / ctx->rx_decimation;
+    unsigned int sample_rate = ctx->rx_sample_rate;
 
-    /* --- RX prep (minimodem.c:1037-1131) --- */
     ctx->nsamples_per_bit = sample_rate / ctx->bfsk_data_rate;
 
     ctx->fskp = fsk_plan_new(sample_rate, ctx->bfsk_mark_f, ctx->bfsk_space_f,
@@ -184,11 +390,13 @@ mm_build_config( minimodem_ctx *ctx, int baud, unsigned int sample_rate )
         /* high baud may push a tone outside the band plan (fsk.c:58) -
          * surface as an error, do not crash (Pitfall 6 / ASSUMPTION A2). */
         snprintf(ctx->error, sizeof(ctx->error),
-                "fsk_plan_new() failed for baud=%d (mark=%.0fHz space=%.0fHz bw=%.0f) "
+                "fsk_plan_new() failed for baud=%.0f (mark=%.0fHz space=%.0fHz bw=%.0f) "
                 "- tone likely out of band; lower baud or override tones",
-                baud, ctx->bfsk_mark_f, ctx->bfsk_space_f, ctx->band_width);
+                ctx->bfsk_data_rate, ctx->bfsk_mark_f, ctx->bfsk_space_f, ctx->band_width);
         return -1;
     }
+    /* validated by mm_set_detector when it was chosen */
+    fsk_plan_set_detector(ctx->fskp, mm_fsk_detector(ctx->detector));
 
     /* sample buffer sizing (minimodem.c:1056-1071) */
     unsigned int nbits = 0;
@@ -207,8 +415,7 @@ mm_build_config( minimodem_ctx *ctx, int baud, unsigned int sample_rate )
     ctx->samplebuf = malloc(samplebuf_size * sizeof(float));
     if ( !ctx->samplebuf ) {
         snprintf(ctx->error, sizeof(ctx->error), "samplebuf malloc failed");
-        fsk_plan_destroy(ctx->fskp);
-        ctx->fskp = NULL;
+        mm_free_rx(ctx);
         return -1;
     }
 
@@ -223,11 +430,20 @@ mm_build_config( minimodem_ctx *ctx, int baud, unsigned int sample_rate )
     ctx->frame_nsamples =
         (unsigned int)(ctx->nsamples_per_bit * (float)ctx->bfsk_frame_n_bits + 0.5f);
 
-    /* expect bits string (minimodem.c:1115-1131) */
-    ctx->expect_n_bits = mm_build_expect_bits_string(
-            ctx->expect_data_string,
-            ctx->bfsk_nstartbits, ctx->bfsk_n_data_bits, ctx->bfsk_nstopbits,
-            MM_INVERT_START_STOP, 0, 0);
+    /* expect bits string (minimodem.c:1115-1131); MFSK: prev stop + frame
+     * symbols, checked by mm_mfsk_frame_analyze itself */
+    if ( ctx->mfsk_tones ) {
+        for ( unsigned int i = 0; i < ctx->mfsk_tones; i++ )
+            ctx->mfsk_coeff[i] = 2.0f * cosf(2.0f * (float)M_PI * ctx->mfsk_f[i]
+                                             / (float)sample_rate);
+        ctx->expect_data_string[0] = 0;
+        ctx->expect_n_bits = 1 + 1 + ctx->mfsk_data_symbols + 1;
+    } else {
+        ctx->expect_n_bits = mm_build_expect_bits_string(
+                ctx->expect_data_string,
+                ctx->bfsk_nstartbits, ctx->bfsk_n_data_bits, ctx->bfsk_nstopbits,
+                MM_INVERT_START_STOP, 0, 0);
+    }
     ctx->expect_nsamples =
         (unsigned int)(ctx->nsamples_per_bit * ctx->expect_n_bits);
 
@@ -243,11 +459,314 @@ mm_build_config( minimodem_ctx *ctx, int baud, unsigned int sample_rate )
     ctx->track_amplitude = 0.0f;
     ctx->peak_confidence = 0.0f;
     ctx->carrier_band    = -1;   /* was function-static at minimodem.c:1180 */
+    ctx->squelch_open    = ctx->squelch_open_level <= 0.0f;
+    ctx->squelch_measured= 0;
+    ctx->squelch_loud_end= 0;
+
+    /* HDLC: the sliding DFT's products ring and oscillators, unlocked */
+    if ( ctx->framing == MM_FRAMING_HDLC ) {
+        ctx->hdlc_window = (unsigned int)(ctx->nsamples_per_bit + 0.5f);
+        ctx->hdlc_ring = calloc((size_t)ctx->hdlc_window * 4, sizeof(float));
+        if ( !ctx->hdlc_ring ) {
+            snprintf(ctx->error, sizeof(ctx->error), "HDLC DFT ring malloc failed");
+            mm_free_rx(ctx);
+            return -1;
+        }
+        const float f[2] = { ctx->bfsk_mark_f, ctx->bfsk_space_f };
+        for ( int k = 0; k < 2; k++ ) {
+            float w = 2.0f * (float)M_PI * f[k] / (float)sample_rate;
+            ctx->hdlc_osc[2*k]   = 1.0f;
+            ctx->hdlc_osc[2*k+1] = 0.0f;
+            ctx->hdlc_rot[2*k]   = cosf(w);
+            ctx->hdlc_rot[2*k+1] = -sinf(w);
+        }
+        memset(ctx->hdlc_sum, 0, sizeof(ctx->hdlc_sum));
+        ctx->hdlc_ring_pos = 0;
+        ctx->hdlc_n = ctx->hdlc_edge = ctx->hdlc_pend = 0;
+        ctx->hdlc_pending = 0;
+        ctx->hdlc_level = 1;
+        ctx->hdlc_clocked = 0;
+        ctx->hdlc_pat = ctx->hdlc_byte = ctx->hdlc_nbits = ctx->hdlc_nbytes = 0;
+    }
+
+    if ( ctx->rx_decimation > 1 && mm_build_decimator(ctx) < 0 ) {
+        snprintf(ctx->error, sizeof(ctx->error), "decimation FIR malloc failed");
+        mm_free_rx(ctx);
+        return -1;
+    }
+    return 0;
+}
+
+int
+mm_set_decimation( minimodem_ctx *ctx, int max_factor )
+{
+    if ( max_factor < 0 ) {
+        snprintf(ctx->error, sizeof(ctx->error), "invalid decimation %d", max_factor);
+        return -1;
+    }
+    if ( mm_pick_decimation(ctx, max_factor) == ctx->rx_decimation && ctx->fskp ) {
+        ctx->rx_decimation_cap = max_factor;
+        return 0;                       /* same RX rate: keep the running state */
+    }
+    return mm_build_rx(ctx, max_factor);
+}
+
+
+/* ===== mm_build_config (minimodem.c:882-965 + 1037-1131) ===== */
+int
+mm_set_tx_carrier( minimodem_ctx *ctx, int carrier )
+{
+    int baud = (int)ctx->bfsk_data_rate;
+    if ( carrier < 0 || carrier >= mm_max_carriers(baud, ctx->sample_rate) ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "TX carrier %d does not fit the band plan at baud=%d (max %d)",
+                carrier, baud, mm_max_carriers(baud, ctx->sample_rate));
+        return -1;
+    }
+    float mark_f = 0, space_f = 0, band_width = 0;
+    mm_base_tones(ctx->bfsk_data_rate, &mark_f, &space_f, &band_width);
+    float shift = (float)carrier *
+        mm_carrier_spacing(ctx->bfsk_data_rate, mark_f, space_f);
+    ctx->tx_bfsk_mark_f  = mark_f + shift;
+    ctx->tx_bfsk_space_f = space_f + shift;
+    return 0;
+}
+
+/* Frame length in bits (MFSK: symbols) from the tones and character framing
+ * (minimodem.c:942-947). */
+static void
+mm_frame_layout( minimodem_ctx *ctx )
+{
+    unsigned int ndata = ctx->bfsk_n_data_bits;
+    if ( ctx->mfsk_tones ) {
+        ctx->mfsk_data_symbols = (ndata + ctx->mfsk_bits - 1) / ctx->mfsk_bits;
+        ndata = ctx->mfsk_data_symbols;
+    }
+    ctx->bfsk_frame_n_bits =
+        ndata + ctx->bfsk_nstartbits + (unsigned int)ctx->bfsk_nstopbits;
+}
+
+int
+mm_set_tones( minimodem_ctx *ctx, int tones )
+{
+    int baud = (int)ctx->bfsk_data_rate;
+    if ( tones != MM_TONES_BFSK && tones != 4 && tones != MM_MAX_TONES ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "invalid tone count %d (2, 4 or %d)", tones, MM_MAX_TONES);
+        return -1;
+    }
+    if ( tones > mm_max_tones(baud, ctx->sample_rate) ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "%d tones do not fit the band plan at baud=%d (max %d)",
+                tones, baud, mm_max_tones(baud, ctx->sample_rate));
+        return -1;
+    }
+    unsigned int mfsk = tones == MM_TONES_BFSK ? 0 : (unsigned int)tones;
+    if ( mfsk && ctx->framing != MM_FRAMING_ASYNC ) {
+        snprintf(ctx->error, sizeof(ctx->error), "MFSK needs async framing");
+        return -1;
+    }
+    if ( mfsk == ctx->mfsk_tones && ctx->fskp )
+        return 0;                       /* same tones: keep the running state */
+
+    if ( mfsk ) {
+        float base = mm_mfsk_base(ctx->bfsk_data_rate);
+        for ( unsigned int i = 0; i < mfsk; i++ )
+            ctx->mfsk_f[i] = base + (float)i * ctx->bfsk_data_rate;
+        ctx->mfsk_bits = mfsk == 4 ? 2 : 3;
+        ctx->bfsk_mark_f  = ctx->mfsk_f[mfsk - 1];
+        ctx->bfsk_space_f = ctx->mfsk_f[0];
+    } else {
+        float band_width;
+        mm_base_tones(ctx->bfsk_data_rate, &ctx->bfsk_mark_f, &ctx->bfsk_space_f, &band_width);
+    }
+    ctx->mfsk_tones = mfsk;
+    mm_frame_layout(ctx);
+    ctx->tx_bfsk_mark_f  = ctx->bfsk_mark_f;
+    ctx->tx_bfsk_space_f = ctx->bfsk_space_f;
+    return mm_build_rx(ctx, MM_DECIMATION_AUTO);
+}
+
+int
+mm_set_char_framing( minimodem_ctx *ctx, int data_bits, int stop_bits )
+{
+    if ( (data_bits != MM_DATA_BITS_ASCII && data_bits != MM_DATA_BITS_DEFAULT)
+         || stop_bits < 1 || stop_bits > MM_STOP_BITS_MAX ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "invalid character framing: %d data / %d stop bits", data_bits, stop_bits);
+        return -1;
+    }
+    if ( (unsigned int)data_bits == ctx->bfsk_n_data_bits
+         && (float)stop_bits == ctx->bfsk_nstopbits && ctx->fskp )
+        return 0;                       /* same framing: keep the running state */
+    ctx->bfsk_n_data_bits = (unsigned int)data_bits;
+    ctx->bfsk_nstopbits = (float)stop_bits;
+    mm_frame_layout(ctx);
+    return mm_build_rx(ctx, MM_DECIMATION_AUTO);
+}
+
+int
+mm_set_framing_mode( minimodem_ctx *ctx, int mode )
+{
+    if ( mode != MM_FRAMING_ASYNC && mode != MM_FRAMING_HDLC ) {
+        snprintf(ctx->error, sizeof(ctx->error), "invalid framing mode %d", mode);
+        return -1;
+    }
+    if ( mode == MM_FRAMING_HDLC && ctx->mfsk_tones ) {
+        snprintf(ctx->error, sizeof(ctx->error), "HDLC framing needs binary FSK");
+        return -1;
+    }
+    if ( mode == ctx->framing && ctx->fskp )
+        return 0;                       /* same framing: keep the running state */
+    ctx->framing = mode;
+    return mm_build_rx(ctx, MM_DECIMATION_AUTO);
+}
+
+int
+mm_build_config( minimodem_ctx *ctx, int baud, unsigned int sample_rate )
+{
+    return mm_build_config_carrier(ctx, baud, sample_rate, 0);
+}
+
+int
+mm_build_config_carrier( minimodem_ctx *ctx, int baud, unsigned int sample_rate,
+        int carrier )
+{
+    memset(ctx, 0, sizeof(*ctx));
+
+    if ( baud <= 0 ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "invalid baud rate %d (must be > 0)", baud);
+        return -1;
+    }
+    if ( sample_rate == 0 )
+        sample_rate = 48000;
+
+    ctx->sample_rate = sample_rate;
+    ctx->bfsk_data_rate = (float)baud;
+    ctx->bfsk_n_data_bits = 8;
+    ctx->bfsk_nstartbits = 1;
+    ctx->bfsk_nstopbits = 1.0f;
+    ctx->fsk_confidence_threshold = 1.5f;        /* minimodem.c:519 */
+    ctx->fsk_confidence_search_limit = 2.3f;     /* minimodem.c:528 */
+    ctx->tx_leader_bits_len = 2;
+    ctx->tx_trailer_bits_len = 2;
+    ctx->tx_amplitude = 1.0f;
+
+    /* --- baud -> mark/space/band_width derivation (minimodem.c:900-934) --- */
+    float bfsk_mark_f = 0, bfsk_space_f = 0, band_width = 0;
+    mm_base_tones(ctx->bfsk_data_rate, &bfsk_mark_f, &bfsk_space_f, &band_width);
 
+    /* --- multi-carrier: shift the pair into carrier's band --- */
+    if ( carrier < 0 || carrier >= mm_max_carriers(baud, sample_rate) ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "carrier %d does not fit the band plan at baud=%d (max %d)",
+                carrier, baud, mm_max_carriers(baud, sample_rate));
+        return -1;
+    }
+    float shift = (float)carrier *
+        mm_carrier_spacing(ctx->bfsk_data_rate, bfsk_mark_f, bfsk_space_f);
+    bfsk_mark_f  += shift;
+    bfsk_space_f += shift;
+
+    /* restrict band_width to <= data rate (minimodem.c:959-961) */
+    if ( band_width > ctx->bfsk_data_rate )
+        band_width = ctx->bfsk_data_rate;
+
+    /* sanitize confidence search limit (minimodem.c:963-965) */
+    if ( ctx->fsk_confidence_search_limit < ctx->fsk_confidence_threshold )
+        ctx->fsk_confidence_search_limit = ctx->fsk_confidence_threshold;
+
+    ctx->bfsk_mark_f = bfsk_mark_f;
+    ctx->bfsk_space_f = bfsk_space_f;
+    ctx->band_width = band_width;
+
+    /* n databits + start + stop bits (minimodem.c:942-947) */
+    mm_frame_layout(ctx);
+    if ( ctx->bfsk_frame_n_bits > 64 ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "total number of bits per frame must be <= 64");
+        return -1;
+    }
+
+    /* --- TX derived state (minimodem.c:131-136) --- */
+    ctx->tx_bit_nsamples = (unsigned int)(sample_rate / ctx->bfsk_data_rate + 0.5f);
+    ctx->tx_bfsk_mark_f = ctx->bfsk_mark_f;
+    ctx->tx_bfsk_space_f = ctx->bfsk_space_f;
+
+    /* --- RX prep (minimodem.c:1037-1131), at the auto-picked RX rate --- */
+    if ( mm_build_rx(ctx, MM_DECIMATION_AUTO) < 0 )
+        return -1;
+
+    mm_set_squelch(ctx, MM_SQUELCH_DEFAULT_DBFS);
     return 0;
 }
 
 
+/* ===== MFSK frame (wrapper addition) ===== */
+/* Start (tone 0), the character LSB-first in mfsk_bits-wide Gray-coded
+ * symbols, then the stop symbol(s) (top tone), one symbol each. */
+static void
+mm_mfsk_transmit_frame( const minimodem_ctx *ctx, unsigned int byte )
+{
+    unsigned int mask = (1u << ctx->mfsk_bits) - 1;
+    simpleaudio_tone(ctx->sa_out, ctx->mfsk_f[0], ctx->tx_bit_nsamples);
+    for ( unsigned int k = 0; k < ctx->mfsk_data_symbols; k++ ) {
+        unsigned int v = ( byte >> (k * ctx->mfsk_bits) ) & mask;
+        simpleaudio_tone(ctx->sa_out, ctx->mfsk_f[v ^ (v >> 1)], ctx->tx_bit_nsamples);
+    }
+    simpleaudio_tone(ctx->sa_out, ctx->mfsk_f[ctx->mfsk_tones - 1],
+            ctx->tx_bit_nsamples * (unsigned int)ctx->bfsk_nstopbits);
+}
+
+
+/* ===== HDLC framing (wrapper addition) ===== */
+#define MM_HDLC_FLAG     0x7E
+#define MM_HDLC_MAX_RUN  7          /* bit times between tone changes: flag's six 1s + its 0 */
+
+/* One NRZI bit time: a 0 changes tone, a 1 keeps it. */
+static void
+mm_hdlc_tx_bit( const minimodem_ctx *ctx, unsigned int bit, float *tone )
+{
+    if ( !bit )
+        *tone = *tone == ctx->tx_bfsk_mark_f ? ctx->tx_bfsk_space_f : ctx->tx_bfsk_mark_f;
+    simpleaudio_tone(ctx->sa_out, *tone, ctx->tx_bit_nsamples);
+}
+
+static void
+mm_hdlc_tx_flag( const minimodem_ctx *ctx, float *tone )
+{
+    for ( int k = 0; k < 8; k++ )
+        mm_hdlc_tx_bit(ctx, (MM_HDLC_FLAG >> k) & 1, tone);
+}
+
+/* Preamble flags, the bytes LSB first with a 0 stuffed after every five 1s,
+ * and the closing flag, starting on the mark tone. Returns the tone it ends
+ * on (the trailer holds it: a change there would be one more bit). */
+static float
+mm_hdlc_transmit( const minimodem_ctx *ctx, const unsigned char *buf, size_t len )
+{
+    float tone = ctx->tx_bfsk_mark_f;
+    for ( int f = 0; f < MM_HDLC_PREAMBLE_FLAGS; f++ )
+        mm_hdlc_tx_flag(ctx, &tone);
+    unsigned int ones = 0;
+    for ( size_t i = 0; i < len; i++ ) {
+        for ( int k = 0; k < 8; k++ ) {
+            unsigned int bit = (buf[i] >> k) & 1;
+            mm_hdlc_tx_bit(ctx, bit, &tone);
+            if ( !bit ) {
+                ones = 0;
+            } else if ( ++ones == 5 ) {
+                mm_hdlc_tx_bit(ctx, 0, &tone);
+                ones = 0;
+            }
+        }
+    }
+    mm_hdlc_tx_flag(ctx, &tone);
+    return tone;
+}
+
+
 /* ===== mm_tx_bytes (minimodem.c:114-250 minus stdin/select/itimer/signals) ===== */
 int
 mm_tx_bytes( minimodem_ctx *ctx, const unsigned char *buf, size_t len )
@@ -260,27 +779,508 @@ mm_tx_bytes( minimodem_ctx *ctx, const unsigned char *buf, size_t len )
     /* leader tone (mark) — minimodem.c:210-212 */
     int j;
     for ( j=0; j<ctx->tx_leader_bits_len; j++ )
-        simpleaudio_tone(ctx->sa_out, ctx->bfsk_mark_f, ctx->tx_bit_nsamples);
-
-    /* data bytes: 8-N-1 frames via mm_fsk_transmit_frame — minimodem.c:224-228 */
-    for ( size_t i=0; i<len; i++ ) {
+        simpleaudio_tone(ctx->sa_out, ctx->tx_bfsk_mark_f, ctx->tx_bit_nsamples);
+
+    /* data bytes: 8-N-1 frames via mm_fsk_transmit_frame — minimodem.c:224-228
+     * (MFSK: mm_mfsk_transmit_frame; HDLC: one bitstream, mm_hdlc_transmit) */
+    float idle_f = ctx->tx_bfsk_mark_f;
+    if ( ctx->framing == MM_FRAMING_HDLC )
+        idle_f = mm_hdlc_transmit(ctx, buf, len);
+    for ( size_t i=0; i<len && ctx->framing == MM_FRAMING_ASYNC; i++ ) {
+        if ( ctx->mfsk_tones ) {
+            mm_mfsk_transmit_frame(ctx, buf[i] & ((1u << ctx->bfsk_n_data_bits) - 1));
+            continue;
+        }
         unsigned int bits[2];
         unsigned int nwords = databits_encode_ascii8(bits, (char)buf[i]);
         for ( unsigned int w=0; w<nwords; w++ )
             mm_fsk_transmit_frame(ctx->sa_out, bits[w], ctx->bfsk_n_data_bits,
-                    ctx->tx_bit_nsamples, ctx->bfsk_mark_f, ctx->bfsk_space_f,
+                    ctx->tx_bit_nsamples, ctx->tx_bfsk_mark_f, ctx->tx_bfsk_space_f,
                     ctx->bfsk_nstartbits, ctx->bfsk_nstopbits,
                     MM_INVERT_START_STOP, MM_MSB_FIRST);
     }
 
     /* trailer tone (mark) — replaces the SIGALRM flush (minimodem.c:64-66) */
     for ( j=0; j<ctx->tx_trailer_bits_len; j++ )
-        simpleaudio_tone(ctx->sa_out, ctx->bfsk_mark_f, ctx->tx_bit_nsamples);
+        simpleaudio_tone(ctx->sa_out, idle_f, ctx->tx_bit_nsamples);
+
+    return 0;
+}
+
+/* Bit b of carrier k's stream: leader marks, then 8-N-1 frames of bytes
+ * k, k+n, k+2n, ... (NUL past the end pads the last stripe), then trailer. */
+static unsigned int
+mm_stripe_bit( const minimodem_ctx *ctx, const unsigned char *buf, size_t len,
+        int ncarriers, int k, size_t b, size_t nframes )
+{
+    size_t leader = (size_t)ctx->tx_leader_bits_len;
+    if ( b < leader || b >= leader + nframes * ctx->bfsk_frame_n_bits )
+        return 1;                                   /* leader / trailer: mark */
+    size_t frame = (b - leader) / ctx->bfsk_frame_n_bits;
+    size_t pos   = (b - leader) % ctx->bfsk_frame_n_bits;
+    if ( pos == 0 )
+        return 0;                                   /* start bit: space */
+    if ( pos > ctx->bfsk_n_data_bits )
+        return 1;                                   /* stop bit: mark */
+    size_t idx = frame * (size_t)ncarriers + (size_t)k;
+    unsigned int byte = idx < len ? buf[idx] : 0;
+    return ( byte >> (pos - 1) ) & 1;               /* LSB first */
+}
+
+/* ===== mm_tx_bytes_multi (multi-carrier; no minimodem.c equivalent) ===== */
+int
+mm_tx_bytes_multi( minimodem_ctx *const *ctxs, int ncarriers,
+        const unsigned char *buf, size_t len )
+{
+    const minimodem_ctx *ctx = ctxs[0];
+    if ( !ctx->sa_out || ncarriers < 1 )
+        return -1;
+
+    /* Every carrier sends the same number of frames in lockstep. */
+    size_t nframes = (len + (size_t)ncarriers - 1) / (size_t)ncarriers;
+    size_t nbits   = (size_t)ctx->tx_leader_bits_len
+                   + nframes * ctx->bfsk_frame_n_bits
+                   + (size_t)ctx->tx_trailer_bits_len;
+    size_t bit_ns  = ctx->tx_bit_nsamples;
+
+    float *samples = calloc(nbits * bit_ns, sizeof(float));
+    if ( !samples )
+        return -1;
+
+    /* Sum the carriers at 1/n amplitude each so the peak stays <= tx_amplitude. */
+    float mag = ctx->tx_amplitude / (float)ncarriers;
+    for ( int k = 0; k < ncarriers; k++ ) {
+        const minimodem_ctx *c = ctxs[k];
+        double phase = 0.0;                         /* turns; continuous per carrier */
+        for ( size_t b = 0; b < nbits; b++ ) {
+            float f = mm_stripe_bit(ctx, buf, len, ncarriers, k, b, nframes)
+                    ? c->tx_bfsk_mark_f : c->tx_bfsk_space_f;
+            double step = (double)f / (double)ctx->sample_rate;
+            float *dst = samples + b * bit_ns;
+            for ( size_t i = 0; i < bit_ns; i++ ) {
+                dst[i] += mag * sinf((float)(2.0 * M_PI * phase));
+                phase += step;
+            }
+            phase -= floor(phase);
+        }
+    }
+
+    ssize_t r = simpleaudio_write(ctx->sa_out, samples, nbits * bit_ns);
+    free(samples);
+    return r < 0 ? -1 : 0;
+}
+
+
+/* ===== mm_tx_render (TX into memory; no minimodem.c equivalent) ===== */
+typedef struct {
+    float  *buf;
+    size_t  len;
+    size_t  cap;
+} mm_pcm_sink;
+
+static ssize_t
+mm_pcm_sink_write( simpleaudio *sa, void *buf, size_t nframes )
+{
+    mm_pcm_sink *sink = sa->backend_handle;
+    if ( sink->len + nframes > sink->cap ) {
+        size_t cap = sink->cap ? sink->cap : 4096;
+        while ( cap < sink->len + nframes )
+            cap *= 2;
+        float *grown = realloc(sink->buf, cap * sizeof(float));
+        if ( !grown )
+            return -1;
+        sink->buf = grown;
+        sink->cap = cap;
+    }
+    memcpy(sink->buf + sink->len, buf, nframes * sizeof(float));
+    sink->len += nframes;
+    return (ssize_t)nframes;
+}
+
+static const struct simpleaudio_backend mm_pcm_sink_backend = {
+    NULL, NULL, mm_pcm_sink_write, NULL,
+};
+
+int
+mm_tx_render( minimodem_ctx *const *ctxs, int ncarriers,
+        const unsigned char *buf, size_t len, float **out, size_t *nout )
+{
+    minimodem_ctx *ctx = ctxs[0];
+    mm_pcm_sink sink = { NULL, 0, 0 };
+    simpleaudio sa = {
+        .backend = &mm_pcm_sink_backend,
+        .format = SA_SAMPLE_FORMAT_FLOAT,
+        .rate = (unsigned int)ctx->sample_rate,
+        .channels = 1,
+        .backend_handle = &sink,
+        .samplesize = sizeof(float),
+        .backend_framesize = sizeof(float),
+    };
+
+    simpleaudio *sa_out = ctx->sa_out;
+    ctx->sa_out = &sa;
+    int rc = ncarriers > 1 ? mm_tx_bytes_multi(ctxs, ncarriers, buf, len)
+                           : mm_tx_bytes(ctx, buf, len);
+    ctx->sa_out = sa_out;
+
+    if ( rc < 0 || sink.len == 0 ) {
+        free(sink.buf);
+        return -1;
+    }
+    *out  = sink.buf;
+    *nout = sink.len;
+    return 0;
+}
+
+
+/* ===== mm_sample_fifo (multi-carrier RX fan-out) ===== */
+int
+mm_fifo_init( mm_sample_fifo *fifo, size_t capacity )
+{
+    fifo->buf = malloc(capacity * sizeof(float));
+    fifo->cap = fifo->buf ? capacity : 0;
+    fifo->head = 0;
+    fifo->len = 0;
+    return fifo->buf ? 0 : -1;
+}
+
+void
+mm_fifo_free( mm_sample_fifo *fifo )
+{
+    free(fifo->buf);
+    memset(fifo, 0, sizeof(*fifo));
+}
+
+void
+mm_fifo_push( mm_sample_fifo *fifo, const float *samples, size_t n )
+{
+    if ( fifo->cap == 0 )
+        return;
+    if ( n > fifo->cap ) {                          /* keep only the newest cap */
+        samples += n - fifo->cap;
+        n = fifo->cap;
+    }
+    if ( fifo->len + n > fifo->cap ) {              /* overrun: drop the oldest */
+        size_t drop = fifo->len + n - fifo->cap;
+        fifo->head = (fifo->head + drop) % fifo->cap;
+        fifo->len -= drop;
+    }
+    for ( size_t i = 0; i < n; i++ )
+        fifo->buf[(fifo->head + fifo->len + i) % fifo->cap] = samples[i];
+    fifo->len += n;
+}
+
+size_t
+mm_fifo_pop( mm_sample_fifo *fifo, float *out, size_t n )
+{
+    if ( n > fifo->len )
+        n = fifo->len;
+    for ( size_t i = 0; i < n; i++ )
+        out[i] = fifo->buf[(fifo->head + i) % fifo->cap];
+    if ( fifo->cap )
+        fifo->head = (fifo->head + n) % fifo->cap;
+    fifo->len -= n;
+    return n;
+}
+
 
+/* Bin one decoded frame's confidence (MM_STATS_CONFIDENCE_EDGES). */
+static void
+mm_count_confidence( mm_rx_counters *counters, float confidence )
+{
+    static const float edges[MM_STATS_CONFIDENCE_BINS - 1] = MM_STATS_CONFIDENCE_EDGES;
+    int bin = 0;
+    while ( bin < MM_STATS_CONFIDENCE_BINS - 1 && !(confidence < edges[bin]) )
+        bin++;
+    counters->confidence_hist[bin]++;
+}
+
+/* ===== Energy squelch (wrapper addition) ===== */
+/*
+ * Measure every whole bit-length block of samplebuf not yet measured (the
+ * louder of the mark/space Goertzel amplitudes), open the gate on a block at
+ * the open level, and close it once no block at the close level is left in
+ * the buffer. Returns non-zero if this pass should run the frame search.
+ * Everything up to samples_nvalid is measured first, so a tone anywhere in
+ * the search window opens the gate before the search that would find it.
+ */
+static int
+mm_squelch_pass( minimodem_ctx *ctx )
+{
+    if ( ctx->squelch_open_level <= 0.0f )
+        return 1;
+
+    size_t block = (size_t)ctx->nsamples_per_bit;
+    if ( block == 0 )
+        block = 1;
+    while ( ctx->squelch_measured + block <= ctx->samples_nvalid ) {
+        float mag_mark, mag_space;
+        fsk_tone_mags(ctx->fskp, ctx->samplebuf + ctx->squelch_measured,
+                      (unsigned int)block, &mag_mark, &mag_space);
+        float level = mag_mark > mag_space ? mag_mark : mag_space;
+        ctx->squelch_measured += block;
+        if ( level >= ctx->squelch_close_level )
+            ctx->squelch_loud_end = ctx->squelch_measured;
+        if ( !ctx->squelch_open && level >= ctx->squelch_open_level ) {
+            ctx->squelch_open = 1;
+            ctx->counters.squelch_opened++;
+        }
+    }
+    if ( ctx->squelch_open && !ctx->carrier && ctx->squelch_loud_end == 0 )
+        ctx->squelch_open = 0;
+    return ctx->squelch_open || ctx->carrier;
+}
+
+int
+mm_set_squelch( minimodem_ctx *ctx, int open_dbfs )
+{
+    if ( open_dbfs != MM_SQUELCH_OFF
+         && (open_dbfs < MM_SQUELCH_MIN_DBFS || open_dbfs > 0) ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "squelch %d dBFS out of range (%d..-1, or 0 for off)",
+                open_dbfs, MM_SQUELCH_MIN_DBFS);
+        return -1;
+    }
+    if ( open_dbfs == MM_SQUELCH_OFF ) {
+        ctx->squelch_open_level = 0.0f;
+        ctx->squelch_close_level = 0.0f;
+    } else {
+        ctx->squelch_open_level = powf(10.0f, (float)open_dbfs / 20.0f);
+        ctx->squelch_close_level = powf(10.0f,
+                (float)(open_dbfs - MM_SQUELCH_HYSTERESIS_DB) / 20.0f);
+    }
+    /* start closed with nothing measured: the next pass measures the buffer
+     * (a disabled gate reads as permanently open) */
+    ctx->squelch_open = open_dbfs == MM_SQUELCH_OFF;
+    ctx->squelch_measured = 0;
+    ctx->squelch_loud_end = 0;
     return 0;
 }
 
 
+/* ===== MFSK frame search (wrapper addition; fsk_find_frame's counterpart) ===== */
+/*
+ * Analyze the prev-stop, start, data and stop symbols of the frame at
+ * samples, each by one Goertzel filter per tone. The stops must land on the
+ * top tone and the start on tone 0. Confidence is the summed winning-tone
+ * magnitude over the summed runner-up (fsk.c's frame SNR), amplitude the mean
+ * winning magnitude. Returns 0 for no frame.
+ */
+static float
+mm_mfsk_frame_analyze( const minimodem_ctx *ctx, const float *samples,
+        unsigned int *byte_outp, float *ampl_outp )
+{
+    unsigned int nsym = (unsigned int)ctx->nsamples_per_bit;
+    unsigned int top = ctx->mfsk_tones - 1;
+    float scalar = 2.0f / (float)nsym;
+    float total_sig = 0.0f, total_noise = 0.0f;
+    unsigned int byte = 0;
+
+    for ( unsigned int s = 0; s < ctx->expect_n_bits; s++ ) {
+        const float *x = samples + (unsigned int)(ctx->nsamples_per_bit * (float)s + 0.5f);
+        float sig = 0.0f, noise = 0.0f;
+        unsigned int tone = 0;
+        for ( unsigned int t = 0; t <= top; t++ ) {
+            const float c = ctx->mfsk_coeff[t];
+            float s1 = 0.0f, s2 = 0.0f;
+            for ( unsigned int i = 0; i < nsym; i++ ) {
+                float s0 = x[i] + c * s1 - s2;
+                s2 = s1;
+                s1 = s0;
+            }
+            float p = s1*s1 + s2*s2 - c*s1*s2;
+            float mag = sqrtf(p > 0.0f ? p : 0.0f) * scalar;
+            if ( mag > sig ) {
+                noise = sig;
+                sig = mag;
+                tone = t;
+            } else if ( mag > noise ) {
+                noise = mag;
+            }
+        }
+        if ( s == 0 || s == ctx->expect_n_bits - 1 ) {
+            if ( tone != top )
+                return 0.0f;                            /* prev stop / stop */
+        } else if ( s == 1 ) {
+            if ( tone != 0 )
+                return 0.0f;                            /* start */
+        } else {
+            byte |= mm_gray_decode(tone) << ((s - 2) * ctx->mfsk_bits);
+        }
+        total_sig += sig;
+        if ( noise > FLT_EPSILON )
+            total_noise += noise;
+    }
+    *byte_outp = byte & ((1u << ctx->bfsk_n_data_bits) - 1);
+    *ampl_outp = total_sig / (float)ctx->expect_n_bits;
+    return total_sig / total_noise;                     /* no noise: INFINITY */
+}
+
+/* Scan offsets alternating around try_first_sample, as fsk_find_frame. */
+static float
+mm_mfsk_find_frame( const minimodem_ctx *ctx, const float *samples,
+        unsigned int try_first_sample,
+        unsigned int try_max_nsamples,
+        unsigned int try_step_nsamples,
+        float try_confidence_search_limit,
+        unsigned long long *bits_outp,
+        float *ampl_outp,
+        unsigned int *frame_start_outp )
+{
+    unsigned int best_t = 0, best_byte = 0;
+    float best_c = 0.0f, best_a = 0.0f;
+    for ( int j = 0; ; j++ ) {
+        int up = ( j % 2 ) ? 1 : -1;
+        int t = (int)try_first_sample + up * ((j + 1) / 2) * (int)try_step_nsamples;
+        if ( t >= (int)try_max_nsamples )
+            break;
+        if ( t < 0 )
+            continue;
+        unsigned int byte = 0;
+        float ampl = 0.0f;
+        float c = mm_mfsk_frame_analyze(ctx, samples + t, &byte, &ampl);
+        if ( best_c < c ) {
+            best_t = (unsigned int)t;
+            best_c = c;
+            best_a = ampl;
+            best_byte = byte;
+            if ( best_c >= try_confidence_search_limit )
+                break;
+        }
+    }
+    *bits_outp = best_byte;
+    *ampl_outp = best_a;
+    *frame_start_outp = best_t;
+    return best_c;
+}
+
+
+/* ===== HDLC receive (wrapper addition; fsk_find_frame's counterpart) ===== */
+/* End of a frame (its closing flag) or of the bitstream (a run too long
+ * for a frame): back to hunting a flag. */
+static void
+mm_hdlc_unlock( minimodem_ctx *ctx )
+{
+    if ( ctx->carrier ) {
+        ctx->counters.carrier_lost++;
+        ctx->carrier = 0;
+    }
+    ctx->hdlc_pat = ctx->hdlc_byte = ctx->hdlc_nbits = ctx->hdlc_nbytes = 0;
+}
+
+/* Deframe one received bit: a flag locks (or, after data, closes the frame),
+ * a 0 after five 1s is stuffing, and every eighth data bit is a byte. Until
+ * the next flag locks again, the bits between transmissions are ignored. */
+static void
+mm_hdlc_rx_bit( minimodem_ctx *ctx, unsigned int bit, char *out, size_t out_size,
+        size_t *out_n )
+{
+    ctx->hdlc_pat = (ctx->hdlc_pat >> 1) | (bit << 7);
+    if ( ctx->hdlc_pat == MM_HDLC_FLAG ) {
+        if ( ctx->hdlc_nbytes ) {
+            mm_hdlc_unlock(ctx);
+            return;
+        }
+        if ( !ctx->carrier ) {
+            ctx->counters.carrier_acquired++;
+            ctx->carrier = 1;
+        }
+        ctx->hdlc_byte = ctx->hdlc_nbits = 0;      /* drop the flag's own bits */
+        return;
+    }
+    if ( !ctx->carrier || (ctx->hdlc_pat & 0xFC) == 0x7C )
+        return;
+    ctx->hdlc_byte |= bit << ctx->hdlc_nbits;
+    if ( ++ctx->hdlc_nbits == 8 ) {
+        if ( *out_n < out_size )
+            out[(*out_n)++] = (char)ctx->hdlc_byte;
+        ctx->nframes_decoded++;
+        ctx->hdlc_nbytes++;
+        ctx->hdlc_byte = ctx->hdlc_nbits = 0;
+    }
+}
+
+/*
+ * Run n RX samples through the bit-clock recovery. Per sample: slide the
+ * one-bit DFT at both tones and take the louder (holding the last tone below
+ * the squelch close level); a tone change counts once the new tone has held
+ * half a bit, and the run since the previous change is n bit times, i.e.
+ * n-1 ones and the 0 the change itself codes. Every change re-times the bit
+ * clock, and stuffing guarantees one at least every MM_HDLC_MAX_RUN bits; a
+ * longer run means the transmission has ended. Returns the bytes appended.
+ */
+static size_t
+mm_hdlc_rx( minimodem_ctx *ctx, const float *samples, size_t n, char *out,
+        size_t out_size )
+{
+    size_t out_n = 0;
+    const float spb = ctx->nsamples_per_bit;
+    const double gate = (double)ctx->squelch_close_level * ctx->hdlc_window / 2;
+    float *o = ctx->hdlc_osc;
+    const float *r = ctx->hdlc_rot;
+    double *sum = ctx->hdlc_sum;
+
+    for ( size_t i = 0; i < n; i++ ) {
+        float x = samples[i];
+        float *p = ctx->hdlc_ring + 4 * ctx->hdlc_ring_pos;
+        for ( int k = 0; k < 4; k++ ) {
+            float v = x * o[k];
+            sum[k] += v - p[k];
+            p[k] = v;
+        }
+        for ( int k = 0; k < 4; k += 2 ) {
+            float re = o[k] * r[k] - o[k+1] * r[k+1];
+            o[k+1]   = o[k] * r[k+1] + o[k+1] * r[k];
+            o[k]     = re;
+        }
+        if ( ++ctx->hdlc_ring_pos == ctx->hdlc_window ) {
+            ctx->hdlc_ring_pos = 0;
+            for ( int k = 0; k < 4; k += 2 ) {     /* hold the oscillators at unit gain */
+                float g = 1.0f / sqrtf(o[k] * o[k] + o[k+1] * o[k+1]);
+                o[k] *= g;
+                o[k+1] *= g;
+            }
+        }
+        ctx->hdlc_n++;
+
+        double p_mark  = sum[0] * sum[0] + sum[1] * sum[1];
+        double p_space = sum[2] * sum[2] + sum[3] * sum[3];
+        int level = ctx->hdlc_level;
+        if ( (p_mark > p_space ? p_mark : p_space) > gate * gate )
+            level = p_mark > p_space;
+
+        if ( level == ctx->hdlc_level ) {
+            ctx->hdlc_pending = 0;
+        } else if ( !ctx->hdlc_pending ) {
+            ctx->hdlc_pending = 1;
+            ctx->hdlc_pend = ctx->hdlc_n;
+        } else if ( (float)(ctx->hdlc_n - ctx->hdlc_pend) >= spb / 2 ) {
+            ctx->hdlc_level = level;
+            ctx->hdlc_pending = 0;
+            if ( ctx->hdlc_clocked ) {
+                unsigned int nbits =
+                    (unsigned int)((float)(ctx->hdlc_pend - ctx->hdlc_edge) / spb + 0.5f);
+                if ( nbits > MM_HDLC_MAX_RUN ) {
+                    mm_hdlc_unlock(ctx);       /* a new bitstream starts here */
+                } else {
+                    for ( unsigned int j = 1; j < nbits; j++ )
+                        mm_hdlc_rx_bit(ctx, 1, out, out_size, &out_n);
+                    mm_hdlc_rx_bit(ctx, 0, out, out_size, &out_n);
+                }
+            }
+            ctx->hdlc_edge = ctx->hdlc_pend;
+            ctx->hdlc_clocked = 1;
+        }
+        if ( ctx->hdlc_clocked && !ctx->hdlc_pending
+             && (float)(ctx->hdlc_n - ctx->hdlc_edge) > (MM_HDLC_MAX_RUN + 1) * spb ) {
+            mm_hdlc_unlock(ctx);
+            ctx->hdlc_clocked = 0;
+        }
+    }
+    return out_n;
+}
+
+
 /* ===== mm_rx_step (minimodem.c:1137-1463 — ONE pass per call) ===== */
 /*
  * Performs exactly one read-and-scan pass: shift samplebuf by `advance`,
@@ -295,7 +1295,7 @@ mm_tx_bytes( minimodem_ctx *ctx, const unsigned char *buf, size_t len )
 int
 mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
 {
-    if ( !ctx->sa_in || !ctx->fskp || !ctx->samplebuf )
+    if ( (!ctx->sa_in && !ctx->src) || !ctx->fskp || !ctx->samplebuf )
         return -1;
 
     size_t out_n = 0;
@@ -305,6 +1305,7 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
     if ( ctx->advance == ctx->samplebuf_size ) {
         ctx->samples_nvalid = 0;
         ctx->advance = 0;
+        ctx->squelch_measured = ctx->squelch_loud_end = 0;
     }
     if ( ctx->advance ) {
         if ( ctx->advance > ctx->samples_nvalid ) {
@@ -314,6 +1315,10 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
         memmove(ctx->samplebuf, ctx->samplebuf + ctx->advance,
                 (ctx->samplebuf_size - ctx->advance) * sizeof(float));
         ctx->samples_nvalid -= ctx->advance;
+        ctx->squelch_measured -= ctx->squelch_measured < ctx->advance
+                                 ? ctx->squelch_measured : ctx->advance;
+        ctx->squelch_loud_end -= ctx->squelch_loud_end < ctx->advance
+                                 ? ctx->squelch_loud_end : ctx->advance;
         ctx->advance = 0;
     }
 
@@ -323,11 +1328,29 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
         size_t  read_nsamples = ctx->samplebuf_size/2;
         assert( read_nsamples > 0 );
         assert( ctx->samples_nvalid + read_nsamples <= ctx->samplebuf_size );
-        ssize_t r = simpleaudio_read(ctx->sa_in, samples_readptr, read_nsamples);
+        /* decimating: read D device samples per RX sample in behind the FIR
+         * history, then filter them down into samplebuf */
+        size_t  dev_nsamples = read_nsamples * ctx->rx_decimation;
+        float  *dev_readptr = ctx->rx_decimation > 1
+                              ? ctx->dec_work + ctx->dec_ntaps - 1 : samples_readptr;
+        ssize_t r;
+        if ( ctx->src ) {
+            /* multi-carrier: wait (return) until the fan-out FIFO holds a
+             * full half-buffer, exactly as the blocking read would */
+            if ( ctx->src->len < dev_nsamples )
+                return 0;
+            r = (ssize_t)mm_fifo_pop(ctx->src, dev_readptr, dev_nsamples);
+        } else {
+            r = simpleaudio_read(ctx->sa_in, dev_readptr, dev_nsamples);
+            if ( r > 0 && ctx->tap )
+                ctx->tap(dev_readptr, (size_t)r);
+        }
         if ( r < 0 ) {
             snprintf(ctx->error, sizeof(ctx->error), "simpleaudio_read: error");
             return -1;
         }
+        if ( ctx->rx_decimation > 1 )
+            r = (ssize_t)mm_decimate(ctx, samples_readptr, (size_t)r);
         ctx->samples_nvalid += r;
     }
 
@@ -336,6 +1359,20 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
 
     /* (carrier-autodetect block skipped — fixed tones) */
 
+    /* HDLC: no frame search -- every sample goes through the bit-clock
+     * recovery once, so the whole buffer is consumed each pass. Squelched
+     * spans still count as time for the run lengths. */
+    if ( ctx->framing == MM_FRAMING_HDLC ) {
+        size_t n = ctx->samples_nvalid;
+        ctx->advance = (unsigned int)n;
+        if ( !mm_squelch_pass(ctx) ) {
+            ctx->counters.squelch_skipped += n * ctx->rx_decimation;   /* device samples */
+            ctx->hdlc_n += n;
+            return 0;
+        }
+        return (int)mm_hdlc_rx(ctx, ctx->samplebuf, n, out, out_size);
+    }
+
     if ( ctx->samples_nvalid < ctx->expect_nsamples )
         return 0;
 
@@ -352,6 +1389,20 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
     if ( try_step_nsamples == 0 )
         try_step_nsamples = 1;
 
+    /* Energy squelch: no carrier and no tone in the buffer -> skip the
+     * search. Everything before the last measured block was quiet, and a
+     * frame's window opens on a mark (prev stop / leader), so jump straight
+     * there instead of one bit at a time. */
+    if ( !mm_squelch_pass(ctx) ) {
+        size_t block = (size_t)ctx->nsamples_per_bit;
+        size_t skip = ctx->squelch_measured > block ? ctx->squelch_measured - block : 0;
+        if ( skip < try_max_nsamples )
+            skip = try_max_nsamples;
+        ctx->counters.squelch_skipped += skip * ctx->rx_decimation;   /* device samples */
+        ctx->advance = (unsigned int)skip;
+        return 0;
+    }
+
     float confidence, amplitude;
     unsigned long long bits = 0;
     unsigned int frame_start_sample = 0;
@@ -361,15 +1412,25 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
     try_confidence_search_limit = ctx->fsk_confidence_search_limit;
     try_first_sample = ctx->carrier ? ctx->nsamples_overscan : 0;
 
-    confidence = fsk_find_frame(ctx->fskp, ctx->samplebuf, ctx->expect_nsamples,
-            try_first_sample,
-            try_max_nsamples,
-            try_step_nsamples,
-            try_confidence_search_limit,
-            ctx->expect_data_string,
-            &bits,
-            &amplitude,
-            &frame_start_sample);
+    if ( ctx->mfsk_tones )
+        confidence = mm_mfsk_find_frame(ctx, ctx->samplebuf,
+                try_first_sample,
+                try_max_nsamples,
+                try_step_nsamples,
+                try_confidence_search_limit,
+                &bits,
+                &amplitude,
+                &frame_start_sample);
+    else
+        confidence = fsk_find_frame(ctx->fskp, ctx->samplebuf, ctx->expect_nsamples,
+                try_first_sample,
+                try_max_nsamples,
+                try_step_nsamples,
+                try_confidence_search_limit,
+                ctx->expect_data_string,
+                &bits,
+                &amplitude,
+                &frame_start_sample);
 
     int do_refine_frame = 0;
 
@@ -383,6 +1444,18 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
         confidence = 0;
     }
 
+    /* full duplex: no-confidence if the tones are mostly another band's
+     * leakage (a tone of amplitude A has mean square A^2/2) */
+    if ( ctx->band_share > 0.0f && confidence > 0 ) {
+        const float *f = ctx->samplebuf + frame_start_sample;
+        float energy = 0.0f;
+        for ( unsigned int i=0; i<ctx->frame_nsamples; i++ )
+            energy += f[i] * f[i];
+        if ( amplitude * amplitude * ctx->frame_nsamples
+                < ctx->band_share * 2.0f * energy )
+            confidence = 0;
+    }
+
 #define MM_FSK_MAX_NOCONFIDENCE_BITS 20
 
     if ( confidence <= ctx->fsk_confidence_threshold ) {
@@ -390,6 +1463,7 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
         if ( ++ctx->noconfidence > MM_FSK_MAX_NOCONFIDENCE_BITS ) {
             ctx->carrier_band = -1;
             if ( ctx->carrier ) {
+                ctx->counters.carrier_lost++;
                 ctx->carrier = 0;
                 ctx->carrier_nsamples = 0;
                 ctx->confidence_total = 0;
@@ -412,6 +1486,7 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
         ctx->carrier_nsamples -= ctx->nsamples_overscan;
     } else {
         /* just acquired carrier */
+        ctx->counters.carrier_acquired++;
         ctx->carrier = 1;
         databits_decode_ascii8(0, 0, 0, 0);  /* reset frame processor */
         do_refine_frame = 1;
@@ -427,15 +1502,25 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
             float confidence2, amplitude2;
             unsigned long long bits2;
             unsigned int frame_start_sample2;
-            confidence2 = fsk_find_frame(ctx->fskp, ctx->samplebuf, ctx->expect_nsamples,
-                    try_first_sample,
-                    try_max_nsamples,
-                    try_step_nsamples,
-                    try_confidence_search_limit,
-                    ctx->expect_data_string,
-                    &bits2,
-                    &amplitude2,
-                    &frame_start_sample2);
+            if ( ctx->mfsk_tones )
+                confidence2 = mm_mfsk_find_frame(ctx, ctx->samplebuf,
+                        try_first_sample,
+                        try_max_nsamples,
+                        try_step_nsamples,
+                        try_confidence_search_limit,
+                        &bits2,
+                        &amplitude2,
+                        &frame_start_sample2);
+            else
+                confidence2 = fsk_find_frame(ctx->fskp, ctx->samplebuf, ctx->expect_nsamples,
+                        try_first_sample,
+                        try_max_nsamples,
+                        try_step_nsamples,
+                        try_confidence_search_limit,
+                        ctx->expect_data_string,
+                        &bits2,
+                        &amplitude2,
+                        &frame_start_sample2);
             if ( confidence2 > confidence ) {
                 bits = bits2;
                 amplitude = amplitude2;
@@ -452,10 +1537,18 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
     ctx->amplitude_total += amplitude;
     ctx->nframes_decoded++;
     ctx->noconfidence = 0;
+    mm_count_confidence(&ctx->counters, confidence);
 
     /* advance past frame (minimodem.c:1407) */
     ctx->advance = frame_start_sample + ctx->frame_nsamples - ctx->nsamples_overscan;
 
+    /* MFSK: the frame search already decoded the byte */
+    if ( ctx->mfsk_tones ) {
+        if ( out_n < out_size )
+            out[out_n++] = (char)bits;
+        return (int)out_n;
+    }
+
     /* chop off the prev_stop bit (minimodem.c:1414-1416) */
     if ( ctx->bfsk_nstopbits != 0.0f )
         bits = bits >> 1;
@@ -482,20 +1575,34 @@ mm_rx_step( minimodem_ctx *ctx, char *out, size_t out_size )
 }
 
 
+/* ===== mm_set_detector (wrapper addition) ===== */
+int
+mm_set_detector( minimodem_ctx *ctx, int detector )
+{
+    if ( detector != MM_DETECTOR_DEFAULT && detector != MM_DETECTOR_FFT
+         && detector != MM_DETECTOR_GOERTZEL ) {
+        snprintf(ctx->error, sizeof(ctx->error), "unknown detector %d", detector);
+        return -1;
+    }
+    if ( !ctx->fskp || fsk_plan_set_detector(ctx->fskp, mm_fsk_detector(detector)) < 0 ) {
+        snprintf(ctx->error, sizeof(ctx->error),
+                "detector %d is not available in this build", detector);
+        return -1;
+    }
+    ctx->detector = detector;
+    /* auto decimation depends on the detector: rebuild if the RX rate moves */
+    if ( mm_pick_decimation(ctx, ctx->rx_decimation_cap) != ctx->rx_decimation )
+        return mm_build_rx(ctx, ctx->rx_decimation_cap);
+    return 0;
+}
+
 /* ===== mm_destroy (minimodem.c:1465-1480) ===== */
 void
 mm_destroy( minimodem_ctx *ctx )
 {
     if ( !ctx )
         return;
-    if ( ctx->samplebuf ) {
-        free(ctx->samplebuf);
-        ctx->samplebuf = NULL;
-    }
-    if ( ctx->fskp ) {
-        fsk_plan_destroy(ctx->fskp);
-        ctx->fskp = NULL;
-    }
+    mm_free_rx(ctx);                   /* samplebuf, fsk plan, decimation FIR */
     if ( ctx->sa_in ) {
         simpleaudio_close(ctx->sa_in);
         ctx->sa_in = NULL;
@@ -245,6 +245,18 @@ sa_winmm_write( simpleaudio *sa, void *buf, size_t nframes )
     return (ssize_t)nframes;
 }
 
+/* Queue the trailing partial buffer without waiting for it to play, so a
+ * short write (the carrier hold's idle marks) starts now instead of when the
+ * staging buffer fills. Exported like mm_winmm_drain. Returns 0 / -1. */
+int
+mm_winmm_flush( simpleaudio *sa )
+{
+    winmm_state *w = (winmm_state *)sa->backend_handle;
+    if ( !w || w->is_record )
+        return -1;
+    return mm_winmm_queue_current(w);
+}
+
 /* Flush the trailing partial buffer and block until ALL queued audio has
  * finished playing. Called by minimodem_simple_send() after mm_tx_bytes so the
  * transmission is fully emitted before is_transmitting clears. Exported (not
@@ -16,10 +16,40 @@
  * TX and RX share the SAME FIFO -> a perfect noiseless loopback. This isolates
  * the FSK refactor (Pitfall 1: loop-carried RX state must persist in ctx).
  *
- * The exe sweeps baud {1200, 4800, 9600}. It exits 0 ONLY when 1200-baud
- * loopback is byte-exact (the default/contract). 4800/9600 are reported but, if
- * the band plan rejects the tones or carrier never acquires (ASSUMPTION A2 /
- * Pitfall 6), they are recorded as "tone/carrier issue" and DO NOT fail the gate.
+ * The exe sweeps baud {1200, 4800, 9600} once per built bit detector (FFT when
+ * FFTW is linked, Goertzel always). It exits 0 ONLY when 1200-baud loopback is
+ * byte-exact with every detector (the default/contract) AND every detector
+ * decoded the same bytes at every baud. 4800/9600 are reported but, if the band
+ * plan rejects the tones or carrier never acquires (ASSUMPTION A2 / Pitfall 6),
+ * they are recorded as "tone/carrier issue" and DO NOT fail the gate.
+ *
+ * Each run also reports the RX CPU time (clock()) per decoded byte, so the
+ * detectors can be compared on the same payload.
+ *
+ * Squelch section (mm_set_squelch, default -60 dBFS): RX CPU per second of
+ * pure silence with the squelch on vs. off, and a quiet (-40 dBFS) payload
+ * after a second of silence, which must still decode byte-exact with the
+ * squelch on (acquisition is not delayed or missed) -- also a GATE.
+ *
+ * Decimation section (mm_set_decimation, auto by default): RX CPU per decoded
+ * byte vs. baud {300 .. 9600} with decimation off and auto, plus the factor
+ * picked, once per built detector. The 1200-baud payload must decode
+ * byte-exact both ways, and wherever auto picks D > 1 it must not cost more
+ * CPU than D = 1 -- both GATES.
+ *
+ * HDLC section (mm_set_framing_mode): the same payload in async 8-N-1 frames
+ * and as the HDLC synchronous bitstream, per baud {300 .. 9600} and built
+ * detector (it picks the async bit detector; HDLC always runs its own sliding
+ * DFT): airtime (samples written) and RX CPU per decoded byte of each, and
+ * the share of airtime saved. The 1200-baud HDLC payload must decode
+ * byte-exact -- a GATE. HDLC's RX CPU claim is against async on the FFT
+ * detector, which it must beat at every baud -- also a GATE. Against
+ * Goertzel async (two bins per bit, no FFT) the sliding DFT is no cheaper
+ * from 1200 baud up; those rows are reported as NOTEs, not passes.
+ *
+ * CPU figures in the decimation and HDLC sections are the best of CPU_RUNS
+ * runs: one 0.5 kB decode is a few ms of clock(), too noisy to rank two
+ * configurations on from a single sample.
  *
  * GPLv3 -- part of the minimodem_simple wrapper test harness.
  */
@@ -135,20 +165,44 @@ static simpleaudio *lb_open_stream(sa_direction_t dir, unsigned int rate)
     return sa;
 }
 
+/* Knobs for the squelch runs (defaults reproduce the plain sweep). */
+static int    g_squelch_dbfs = MM_SQUELCH_DEFAULT_DBFS;
+static float  g_tx_amplitude = 1.0f;
+static size_t g_lead_silence = 0;    /* frames of silence queued before TX */
+static int    g_decimation   = MM_DECIMATION_AUTO;
+static int    g_framing      = MM_FRAMING_ASYNC;
+static size_t g_tx_nsamples  = 0;    /* frames the last run_one transmitted */
+
 /* ============================================================= */
-/* One byte-exact round trip at a given baud.                    */
+/* One byte-exact round trip at a given baud and bit detector.   */
+/* The decoded bytes land in got (room for payload_len + 32) and */
+/* *got_n; *rx_cpu is the CPU seconds spent in mm_rx_step.       */
 /* Returns 0 byte-exact, 1 decode mismatch, -1 setup failure.    */
 /* ============================================================= */
-static int run_one(int baud, const unsigned char *payload, size_t payload_len,
-                   const char **why)
+static int run_one(int baud, int detector, const unsigned char *payload,
+                   size_t payload_len, unsigned char *got, size_t *got_n,
+                   double *rx_cpu, const char **why)
 {
     *why = "";
+    *got_n = 0;
+    *rx_cpu = 0.0;
     minimodem_ctx ctx;
     int rc = mm_build_config(&ctx, baud, 48000);
+    static char err[256];              /* ctx.error outlives ctx */
     if ( rc < 0 ) {
-        *why = ctx.error;
+        snprintf(err, sizeof(err), "%s", ctx.error);
+        *why = err;
         return -1;                     /* e.g. tone out of band at high baud */
     }
+    if ( mm_set_framing_mode(&ctx, g_framing) < 0
+         || mm_set_decimation(&ctx, g_decimation) < 0
+         || mm_set_detector(&ctx, detector) < 0
+         || mm_set_squelch(&ctx, g_squelch_dbfs) < 0 ) {
+        snprintf(err, sizeof(err), "%s", ctx.error);
+        *why = err;
+        mm_destroy(&ctx);
+        return -1;
+    }
 
     fifo_reset();
     ctx.sa_out = lb_open_stream(SA_STREAM_PLAYBACK, ctx.sample_rate);
@@ -163,6 +217,12 @@ static int run_one(int baud, const unsigned char *payload, size_t payload_len,
     }
 
     simpleaudio_tone_init(4096, 1.0f);
+    ctx.tx_amplitude = g_tx_amplitude;
+    if ( g_lead_silence ) {
+        fifo_ensure(g_lead_silence);
+        memset(g_fifo + g_widx, 0, g_lead_silence * sizeof(float));
+        g_widx += g_lead_silence;
+    }
 
     /* TX: append the whole modulated waveform to the shared FIFO. */
     if ( mm_tx_bytes(&ctx, payload, payload_len) < 0 ) {
@@ -170,28 +230,28 @@ static int run_one(int baud, const unsigned char *payload, size_t payload_len,
         mm_destroy(&ctx);
         return -1;
     }
+    g_tx_nsamples = g_widx - g_lead_silence;
 
     /* RX: pump mm_rx_step until we've decoded payload_len bytes or the FIFO is
      * drained (several consecutive all-silence reads => no more frames). */
-    unsigned char *got = malloc(payload_len + 64);
-    if ( !got ) { mm_destroy(&ctx); *why = "OOM"; return -1; }
-    size_t got_n = 0;
     char tmp[256];
     int guard = 0;
     const int max_guard = 1000000;     /* hard safety bound */
+    clock_t t0 = clock();
 
-    while ( got_n < payload_len && guard++ < max_guard ) {
+    while ( *got_n < payload_len && guard++ < max_guard ) {
         int n = mm_rx_step(&ctx, tmp, sizeof(tmp));
         if ( n < 0 ) { *why = "mm_rx_step read error"; break; }
-        for ( int i = 0; i < n && got_n < payload_len + 32; i++ )
-            got[got_n++] = (unsigned char)tmp[i];
+        for ( int i = 0; i < n && *got_n < payload_len + 32; i++ )
+            got[(*got_n)++] = (unsigned char)tmp[i];
         /* FIFO drained and demod produced nothing more -> stop. */
         if ( g_silence_reads > 8 )
             break;
     }
+    *rx_cpu = (double)(clock() - t0) / CLOCKS_PER_SEC;
 
     int result;
-    if ( got_n == payload_len && memcmp(got, payload, payload_len) == 0 ) {
+    if ( *got_n == payload_len && memcmp(got, payload, payload_len) == 0 ) {
         result = 0;                    /* byte-exact */
     } else {
         result = 1;                    /* mismatch / short */
@@ -199,16 +259,69 @@ static int run_one(int baud, const unsigned char *payload, size_t payload_len,
             static char buf[128];
             snprintf(buf, sizeof(buf),
                      "decoded %zu of %zu bytes (carrier/decode issue)",
-                     got_n, payload_len);
+                     *got_n, payload_len);
             *why = buf;
         }
     }
 
-    free(got);
     mm_destroy(&ctx);
     return result;
 }
 
+/* ============================================================= */
+/* run_one CPU_RUNS times; *rx_cpu is the lowest RX CPU seen.    */
+/* Stops at (and returns) the first non-byte-exact run.          */
+/* ============================================================= */
+#define CPU_RUNS 5
+
+static int run_best(int baud, int detector, const unsigned char *payload,
+                    size_t payload_len, unsigned char *got, size_t *got_n,
+                    double *rx_cpu, const char **why)
+{
+    int r = 0;
+    *rx_cpu = 0.0;
+    for ( int i = 0; i < CPU_RUNS; i++ ) {
+        double cpu;
+        r = run_one(baud, detector, payload, payload_len, got, got_n, &cpu, why);
+        if ( r != 0 )
+            break;
+        if ( i == 0 || cpu < *rx_cpu )
+            *rx_cpu = cpu;
+    }
+    return r;
+}
+
+/* ============================================================= */
+/* RX CPU seconds to scan `seconds` of silence (-1 on failure).  */
+/* ============================================================= */
+static double idle_cpu(int baud, int squelch_dbfs, double seconds)
+{
+    minimodem_ctx ctx;
+    if ( mm_build_config(&ctx, baud, 48000) < 0
+         || mm_set_squelch(&ctx, squelch_dbfs) < 0 )
+        return -1.0;
+    fifo_reset();
+    ctx.sa_in = lb_open_stream(SA_STREAM_RECORD, ctx.sample_rate);
+    if ( !ctx.sa_in ) {
+        mm_destroy(&ctx);
+        return -1.0;
+    }
+
+    /* the empty FIFO reads as silence, one half buffer of RX samples (D
+     * device frames each) per read */
+    size_t reads = (size_t)(seconds * ctx.sample_rate)
+                   / (ctx.samplebuf_size / 2 * ctx.rx_decimation);
+    char tmp[256];
+    clock_t t0 = clock();
+    while ( g_silence_reads < reads ) {
+        if ( mm_rx_step(&ctx, tmp, sizeof(tmp)) < 0 )
+            break;
+    }
+    double cpu = (double)(clock() - t0) / CLOCKS_PER_SEC;
+    mm_destroy(&ctx);
+    return cpu;
+}
+
 /* ============================================================= */
 int main(void)
 {
@@ -227,34 +340,180 @@ int main(void)
         payload[plen + i] = (unsigned char)(0x20 + (rand() % 0x5F));  /* printable ASCII */
 
     const int bauds[] = { 1200, 4800, 9600 };
-    int gate_ok = 0;
+    const struct { int id; const char *name; } detectors[] = {
+#ifdef USE_FFT
+        { MM_DETECTOR_FFT,      "fft"      },
+#endif
+        { MM_DETECTOR_GOERTZEL, "goertzel" },
+    };
+    const size_t ndet = sizeof(detectors)/sizeof(detectors[0]);
+    unsigned char *got[2] = { malloc(total + 32), malloc(total + 32) };
+    size_t got_n[2];
+    if ( !got[0] || !got[1] ) { fprintf(stderr, "OOM\n"); return 2; }
+    int gate_ok = 1;
+    int agree_ok = 1;
+    int cpu_ok = 1;
 
     printf("=== minimodem_loopback: in-process byte-exact TX->RX ===\n");
     printf("payload: %zu bytes (%zu fixed + %zu random printable)\n\n",
            total, plen, rand_len);
 
     for ( size_t b = 0; b < sizeof(bauds)/sizeof(bauds[0]); b++ ) {
+        for ( size_t d = 0; d < ndet; d++ ) {
+            const char *why = "";
+            double cpu;
+            int r = run_one(bauds[b], detectors[d].id, payload, total,
+                            got[d], &got_n[d], &cpu, &why);
+            if ( r == 0 ) {
+                printf("[ OK   ] baud %5d %-8s : byte-exact (%zu bytes), RX %.2f us CPU/byte\n",
+                       bauds[b], detectors[d].name, total, 1e6 * cpu / (double)total);
+            } else if ( bauds[b] == 1200 ) {
+                printf("[ FAIL ] baud %5d %-8s : %s  <-- GATE\n",
+                       bauds[b], detectors[d].name, why);
+                gate_ok = 0;
+            } else {
+                printf("[ NOTE ] baud %5d %-8s : %s (tone override may be needed; not a gate failure)\n",
+                       bauds[b], detectors[d].name, why);
+            }
+        }
+        /* Goertzel reads the same two bins the FFT does: same bytes, always. */
+        if ( ndet == 2 && (got_n[0] != got_n[1]
+                           || memcmp(got[0], got[1], got_n[0]) != 0) ) {
+            printf("[ FAIL ] baud %5d : fft and goertzel decoded different bytes  <-- GATE\n",
+                   bauds[b]);
+            agree_ok = 0;
+        }
+    }
+
+    /* Squelch: idle cost with the gate on vs. off, then a quiet payload
+     * after leading silence must still round-trip with the gate on. */
+    printf("\n--- squelch (open %d dBFS) ---\n", MM_SQUELCH_DEFAULT_DBFS);
+    for ( size_t b = 0; b < sizeof(bauds)/sizeof(bauds[0]); b++ ) {
+        double on  = idle_cpu(bauds[b], MM_SQUELCH_DEFAULT_DBFS, 10.0);
+        double off = idle_cpu(bauds[b], MM_SQUELCH_OFF, 10.0);
+        printf("[ INFO ] baud %5d idle     : RX %.3f ms CPU/s of silence squelched, "
+               "%.3f ms unsquelched\n", bauds[b], 100.0 * on, 100.0 * off);
+
         const char *why = "";
-        int r = run_one(bauds[b], payload, total, &why);
+        double cpu;
+        g_tx_amplitude = 0.01f;                        /* -40 dBFS */
+        g_lead_silence = 48000;                        /* 1 s */
+        int r = run_one(bauds[b], MM_DETECTOR_DEFAULT, payload, total,
+                        got[0], &got_n[0], &cpu, &why);
+        g_tx_amplitude = 1.0f;
+        g_lead_silence = 0;
         if ( r == 0 ) {
-            printf("[ OK   ] baud %5d : byte-exact (%zu bytes)\n", bauds[b], total);
-            if ( bauds[b] == 1200 )
-                gate_ok = 1;
+            printf("[ OK   ] baud %5d squelch  : -40 dBFS after 1 s silence byte-exact\n",
+                   bauds[b]);
         } else if ( bauds[b] == 1200 ) {
-            printf("[ FAIL ] baud %5d : %s  <-- GATE\n", bauds[b], why);
+            printf("[ FAIL ] baud %5d squelch  : %s  <-- GATE\n", bauds[b], why);
+            gate_ok = 0;
         } else {
-            printf("[ NOTE ] baud %5d : %s (tone override may be needed; not a gate failure)\n",
-                   bauds[b], why);
+            printf("[ NOTE ] baud %5d squelch  : %s (not a gate failure)\n", bauds[b], why);
+        }
+    }
+
+    /* Decimation: decode cost vs. baud at the full 48 kHz and at the rate
+     * mm_pick_decimation chooses, per detector. Auto keeps Goertzel at D=1
+     * (nothing to compare); where it does decimate it must pay off. */
+    printf("\n--- decimation (off vs. auto) ---\n");
+    const int dec_bauds[] = { 300, 1200, 2400, 4800, 9600 };
+    for ( size_t d = 0; d < ndet; d++ ) {
+        for ( size_t b = 0; b < sizeof(dec_bauds)/sizeof(dec_bauds[0]); b++ ) {
+            double cpu[2] = { 0.0, 0.0 };
+            int    r[2];
+            const char *why[2] = { "", "" };
+            const int modes[2] = { MM_DECIMATION_OFF, MM_DECIMATION_AUTO };
+            for ( int m = 0; m < 2; m++ ) {
+                g_decimation = modes[m];
+                r[m] = run_best(dec_bauds[b], detectors[d].id, payload, total,
+                                got[m], &got_n[m], &cpu[m], &why[m]);
+            }
+            g_decimation = MM_DECIMATION_AUTO;
+
+            minimodem_ctx probe;
+            unsigned int factor = 1;
+            if ( mm_build_config(&probe, dec_bauds[b], 48000) == 0 ) {
+                if ( mm_set_detector(&probe, detectors[d].id) == 0 )
+                    factor = probe.rx_decimation;
+                mm_destroy(&probe);
+            }
+            if ( r[0] == 0 && r[1] == 0 ) {
+                int slower = factor > 1 && cpu[1] > cpu[0];
+                printf("[ %-4s ] baud %5d %-8s D=%-2u : RX %.2f us CPU/byte at 48 kHz, "
+                       "%.2f us at %u Hz (%.1fx)%s\n", slower ? "FAIL" : "OK",
+                       dec_bauds[b], detectors[d].name, factor,
+                       1e6 * cpu[0] / (double)total, 1e6 * cpu[1] / (double)total,
+                       48000 / factor, cpu[1] > 0.0 ? cpu[0] / cpu[1] : 0.0,
+                       slower ? "  auto is slower than off <-- GATE" : "");
+                if ( slower )
+                    cpu_ok = 0;
+            } else if ( dec_bauds[b] == 1200 ) {
+                printf("[ FAIL ] baud %5d %-8s D=%-2u : %s  <-- GATE\n", dec_bauds[b],
+                       detectors[d].name, factor, r[1] ? why[1] : why[0]);
+                gate_ok = 0;
+            } else {
+                printf("[ NOTE ] baud %5d %-8s D=%-2u : %s (not a gate failure)\n",
+                       dec_bauds[b], detectors[d].name, factor, r[1] ? why[1] : why[0]);
+            }
+        }
+    }
+
+    /* HDLC: airtime and decode cost of the synchronous bitstream against
+     * async 8-N-1 on the same payload (auto decimation), per detector. */
+    printf("\n--- HDLC framing (async vs. hdlc) ---\n");
+    for ( size_t d = 0; d < ndet; d++ ) {
+        for ( size_t b = 0; b < sizeof(dec_bauds)/sizeof(dec_bauds[0]); b++ ) {
+            double cpu[2] = { 0.0, 0.0 };
+            size_t air[2] = { 0, 0 };
+            int    r[2];
+            const char *why[2] = { "", "" };
+            const int modes[2] = { MM_FRAMING_ASYNC, MM_FRAMING_HDLC };
+            for ( int m = 0; m < 2; m++ ) {
+                g_framing = modes[m];
+                r[m] = run_best(dec_bauds[b], detectors[d].id, payload, total,
+                                got[m], &got_n[m], &cpu[m], &why[m]);
+                air[m] = g_tx_nsamples;
+            }
+            g_framing = MM_FRAMING_ASYNC;
+
+            if ( r[0] == 0 && r[1] == 0 ) {
+                int slower = cpu[1] > cpu[0];
+                int gated = detectors[d].id == MM_DETECTOR_FFT;
+                printf("[ %-4s ] baud %5d hdlc %-8s : airtime %.3f s vs %.3f s async "
+                       "(%.1f%% saved), RX %.2f us CPU/byte vs %.2f us%s\n",
+                       !slower ? "OK" : gated ? "FAIL" : "NOTE",
+                       dec_bauds[b], detectors[d].name,
+                       air[1] / 48000.0, air[0] / 48000.0,
+                       100.0 * (1.0 - (double)air[1] / (double)air[0]),
+                       1e6 * cpu[1] / (double)total, 1e6 * cpu[0] / (double)total,
+                       !slower ? "" : gated ? "  hdlc is slower than async <-- GATE"
+                                            : "  hdlc is slower than async (not a gate failure)");
+                if ( slower && gated )
+                    cpu_ok = 0;
+            } else if ( dec_bauds[b] == 1200 ) {
+                printf("[ FAIL ] baud %5d hdlc %-8s : %s  <-- GATE\n",
+                       dec_bauds[b], detectors[d].name, r[1] ? why[1] : why[0]);
+                gate_ok = 0;
+            } else {
+                printf("[ NOTE ] baud %5d hdlc %-8s : %s (not a gate failure)\n",
+                       dec_bauds[b], detectors[d].name, r[1] ? why[1] : why[0]);
+            }
         }
     }
 
+    free(got[0]);
+    free(got[1]);
     free(payload);
 
     printf("\n");
-    if ( gate_ok ) {
-        printf("GATE PASS: 1200-baud loopback is byte-exact.\n");
+    if ( gate_ok && agree_ok && cpu_ok ) {
+        printf("GATE PASS: 1200-baud loopback is byte-exact with every detector.\n");
         return 0;
     }
-    printf("GATE FAIL: 1200-baud loopback did NOT round-trip byte-exact.\n");
+    printf("GATE FAIL: %s.\n",
+           !gate_ok  ? "1200-baud loopback did NOT round-trip byte-exact"
+           : !agree_ok ? "the bit detectors disagree"
+           : "auto decimation or HDLC framing costs more RX CPU than it should save");
     return 1;
 }
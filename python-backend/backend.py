@@ -8,6 +8,8 @@ through the report-formatting pipeline, and transmits responses back over the
 same FSK audio link.
 
 Phase 7: transport uses the minimodem ctypes binding (lib/minimodem.py -> libminimodem_simple.so); the old ggwave/PyAudio stack was replaced in Phase 7.
+``--transport`` swaps the link (lib/transport.py): the FSK modem (default), the
+NumPy software modem, newline-framed stdio, or a UNIX-domain socket.
 Messages are single
 newline-framed JSON frames (ci=0, cc=1) carrying a CRC32 of ``ct``; a CRC
 mismatch triggers a full-message retransmit and never surfaces a partial report.
@@ -24,6 +26,8 @@ import os
 import sys
 import json
 import argparse
+import asyncio
+import itertools
 import time
 
 from lib import (
@@ -32,21 +36,37 @@ from lib import (
     log_session_start,
     log_session_end,
     chunk_message,
-    extract_json_frame,
+    parse_json_frame,
     handle_received_chunk,
     check_chunk_timeouts,
     send_chunks,
     handle_retransmission_request,
+    handle_hello_request,
+    check_hello_timeout,
+    frame_crc_ok,
+    follow_sender_baud,
+    link_controller,
+    transmitter,
+    AsyncModemTransport,
     list_devices,
     minimodem,
+    softmodem,
+    Transport,
+    ModemTransport,
+    StdioTransport,
+    UnixSocketTransport,
+    TRANSPORT_CHOICES,
+    DEFAULT_SOCKET_PATH,
     TestPipeline,
     LLMPipeline,
 )
+from lib.config import STATS_LOG_INTERVAL
 
-# Sleep between empty receive() polls. minimodem.receive() is non-blocking
-# (returns None when no line is queued); without a small sleep the loop would
-# busy-spin and peg the Pi CPU. ~10 ms mirrors the AHK 10 ms ProcessAudio cadence.
-POLL_SLEEP = 0.01
+# Housekeeping cadence (seconds). The main loop blocks inside the transport
+# (transport.receive(timeout=...)) until a line is queued or this deadline passes,
+# so an idle line costs no CPU and a frame reaches its handler as soon as the RX
+# thread queues it. Reassembly timeouts are 30 s, so 0.5 s is ample resolution.
+HOUSEKEEPING_INTERVAL = 0.5
 
 
 def parse_args():
@@ -60,6 +80,8 @@ Examples:
   python backend.py -i 5 -o 3
   python backend.py -i 5 -o 3 -v 80 --baud 2400
   python backend.py -l
+  python backend.py --transport unix --socket /run/llm-over-sound.sock
+  python backend.py --transport stdio < frames.jsonl
 
 NOTE: the protocol-id flag was removed in Phase 7. Use --baud (both ends MUST match).
         """,
@@ -83,7 +105,144 @@ NOTE: the protocol-id flag was removed in Phase 7. Use --baud (both ends MUST ma
     parser.add_argument(
         "--baud",
         type=int, default=1200,
-        help="minimodem baud rate; MUST match the frontend (default: 1200)",
+        help="minimodem baud rate to start at; MUST match the frontend, which may "
+             "then negotiate a higher rate with fn:\"hello\" (default: 1200)",
+    )
+    parser.add_argument(
+        "--carriers",
+        type=int, default=1,
+        help="Parallel FSK tone pairs (modem/softmodem); bytes are striped across "
+             "them. MUST match the frontend, like --baud (default: 1)",
+    )
+    parser.add_argument(
+        "--detector",
+        choices=("default", "fft", "goertzel"), default="default",
+        help="RX bit detector: the FFT per bit, or Goertzel filters at just the "
+             "mark/space tones (same bits, less CPU). Local only; the frontend "
+             "need not match (default: FFT if the wrapper links FFTW)",
+    )
+    parser.add_argument(
+        "--squelch",
+        type=int, default=-60, metavar="DBFS",
+        help="RX energy squelch: skip the frame search while the tone level is "
+             "below this many dBFS and no carrier is held; 0 turns it off "
+             "(default: -60)",
+    )
+    parser.add_argument(
+        "--decimation",
+        type=int, default=0, metavar="D",
+        help="Cap on the RX decimation factor: the demodulator downsamples to "
+             "48000/D Hz (D picked per baud); 0 = auto, 1 = off, 2..12 caps it. "
+             "Local only (default: 0)",
+    )
+    parser.add_argument(
+        "--rx-bauds",
+        type=int, nargs="+", default=[], metavar="BAUD",
+        help=f"Also decode these bauds (up to {minimodem.MAX_RX_BAUDS}, single carrier) "
+             "and answer at the rate a CRC-valid request arrives at, so the "
+             "frontend may change speed without a restart; list --baud too to "
+             "be able to come back to it (default: --baud only)",
+    )
+    parser.add_argument(
+        "--line-max",
+        type=int, default=minimodem.LINE_MAX_LEN_DEFAULT, metavar="BYTES",
+        help="Longest received line kept; longer ones are dropped as noise. "
+             f"Raise it for frames over 8 KiB (up to {minimodem.LINE_MAX_LEN_LIMIT}; "
+             f"default: {minimodem.LINE_MAX_LEN_DEFAULT})",
+    )
+    parser.add_argument(
+        "--queue-lines",
+        type=int, default=minimodem.QUEUE_MAX_LINES_DEFAULT, metavar="N",
+        help="Received lines queued before the oldest is dropped "
+             f"(up to {minimodem.QUEUE_MAX_LINES_LIMIT}; default: {minimodem.QUEUE_MAX_LINES_DEFAULT})",
+    )
+    parser.add_argument(
+        "--tx-leader",
+        type=int, default=minimodem.TX_LEADER_BITS_DEFAULT, metavar="BITS",
+        help="Mark bits sent before every transmission (modem/softmodem). Shorter "
+             "cuts the airtime of short replies; the frontend must still acquire "
+             "on it (tools/leader_sweep.py: ~8 bits with line noise ahead of the "
+             f"frame; default: {minimodem.TX_LEADER_BITS_DEFAULT})",
+    )
+    parser.add_argument(
+        "--tx-trailer",
+        type=int, default=minimodem.TX_TRAILER_BITS_DEFAULT, metavar="BITS",
+        help=f"Mark bits sent after every transmission (default: {minimodem.TX_TRAILER_BITS_DEFAULT})",
+    )
+    parser.add_argument(
+        "--data-bits",
+        type=int, choices=(minimodem.DATA_BITS_ASCII, minimodem.DATA_BITS_DEFAULT),
+        default=minimodem.DATA_BITS_DEFAULT,
+        help="Data bits per character (modem/softmodem). 7 sends the 7-bit ASCII "
+             "JSON frames in nine bit times a byte instead of ten (~10%% less "
+             "airtime) and refuses frames that are not 7-bit clean. MUST match "
+             "the frontend (DATA_BITS in AHK/include/config.ahk) "
+             f"(default: {minimodem.DATA_BITS_DEFAULT})",
+    )
+    parser.add_argument(
+        "--stop-bits",
+        type=int, choices=range(1, minimodem.STOP_BITS_MAX + 1),
+        default=minimodem.STOP_BITS_DEFAULT,
+        help="Stop bits per character; 2 gives a drifting receiver more slack. "
+             f"MUST match the frontend (default: {minimodem.STOP_BITS_DEFAULT})",
+    )
+    parser.add_argument(
+        "--tx-hold",
+        type=float, default=0.0, metavar="SECONDS",
+        help="Keep the carrier up as idle marks this long after each transmission, "
+             "so a send inside the window skips its leader; 0 drops it with the "
+             "trailer (up to 10; default: 0)",
+    )
+    parser.add_argument(
+        "--duplex",
+        choices=tuple(minimodem.DUPLEX_MODES), default="half",
+        help="half: both directions share the tones and RX is muted while we "
+             "transmit. low/high: full duplex, transmitting on that half of the "
+             "band plan and receiving on the other, so requests arriving during "
+             "a long reply are still heard; the frontend sets the opposite side "
+             "(DUPLEX_MODE in AHK/include/config.ahk). Needs twice --carriers "
+             "bands, i.e. 2400 baud or below (default: half)",
+    )
+    parser.add_argument(
+        "--tones",
+        type=int, choices=minimodem.TONE_COUNTS, default=minimodem.TONES_BFSK,
+        help="Tones per symbol: 2 is plain BFSK; 4 or 8 is MFSK, carrying 2 or 3 "
+             "bits per symbol for about 1.67x / 2x the bytes per second at the "
+             "same baud. Single carrier and half duplex only; 8 tones need 2400 "
+             "baud or below. MUST match the frontend (TONES in "
+             "AHK/include/config.ahk), like --baud (default: 2)",
+    )
+    parser.add_argument(
+        "--framing",
+        choices=tuple(minimodem.FRAMING_MODES), default="async",
+        help="async: start/stop bits around every character. hdlc: each "
+             "transmission is one synchronous bitstream between 0x7E flags, bit "
+             "stuffed, ~19%% less airtime per byte at any baud; whole octets, so "
+             "--data-bits does not apply. Single BFSK carrier and half duplex "
+             "only. MUST match the frontend (FRAMING in AHK/include/config.ahk) "
+             "(default: async)",
+    )
+    parser.add_argument(
+        "--no-adaptive-baud",
+        action="store_true",
+        help="Keep the baud fixed instead of stepping down after repeated CRC "
+             "failures (and back up after a clean streak)",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORT_CHOICES, default="modem",
+        help="Link to serve on: modem (FSK via the wrapper, default), softmodem "
+             "(NumPy FSK, in-memory loopback), stdio, or unix (socket)",
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"UNIX socket path for --transport unix (default: {DEFAULT_SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--async-loop",
+        action="store_true",
+        help="Run the asyncio main loop (RX, retx timers and pipeline as separate tasks)",
     )
     parser.add_argument(
         "-l", "--list",
@@ -94,15 +253,328 @@ NOTE: the protocol-id flag was removed in Phase 7. Use --baud (both ends MUST ma
     return parser.parse_args()
 
 
-def main():
-    """Main loop — listen for minimodem input, process, and transmit response."""
+def accept_line(msg, volume: int, baud: int = 0) -> dict | None:
+    """Run ONE received newline-framed line through frame recovery, JSON parse,
+    retx / echo filtering and the CRC check.
+
+    ``msg`` is a ``str`` or the received buffer itself (``bytes`` / the
+    ``memoryview`` slices ``receive_many`` returns); a buffer is recovered and
+    parsed in place, without decoding the whole line first. ``baud`` is the
+    rate that decoded the line (``Transport.rx_bauds``; 0 if not reported).
+
+    Retransmission requests are served here. Returns the CRC-verified message
+    dict ready for the pipeline, or None if the line needs no further work.
+    """
+    logger.info(f"[RECV_RAW] Bytes: {len(msg)} | Raw: {truncate_for_log(msg)}")
+
+    # Recover and parse the JSON object in one pass, skipping any FSK
+    # carrier-acquisition garbage wrapping the line (leading/trailing junk
+    # bytes, or a spurious carrier lock on noise between frames).
+    chunk_dict = parse_json_frame(msg)
+    if chunk_dict is None:
+        # No brace begins a JSON object -> pure noise between transmissions.
+        logger.debug(f"[RECV_SKIP] No frame in line (noise) | Raw: {truncate_for_log(msg)}")
+        return None
+
+    # A line from a candidate-baud decoder (--rx-bauds): either the frontend
+    # changed speed, or a wrong-rate decoder turned our link's audio into
+    # noise. Only a CRC-valid request settles it; then answer at its rate.
+    if baud and baud != transmitter.transport.baud:
+        if (chunk_dict.get("fn") in ("retx", "hello") or "st" in chunk_dict
+                or not frame_crc_ok(chunk_dict)):
+            logger.debug(f"[RECV_SKIP] Off-rate line ({baud} baud) is not a CRC-valid request")
+            return None
+        follow_sender_baud(baud)
+
+    # Handle retransmission request from frontend.
+    if chunk_dict.get("fn") == "retx":
+        handle_retransmission_request(chunk_dict, volume)
+        return None
+
+    # Baud negotiation frames (propose / probe / commit / done) are answered by
+    # the hello responder and never reach the pipeline or the CRC-retx path.
+    if chunk_dict.get("fn") == "hello":
+        handle_hello_request(chunk_dict, volume)
+        return None
+
+    # Ignore our OWN responses echoed back (self-loop / cross-talk between
+    # the two interfaces). A request carries "fn" and no "st"; a response
+    # always carries "st". Without this guard the backend reprocesses its
+    # own output in a runaway feedback loop (each pass re-wraps the previous
+    # response: "Processed function  with content: Processed function ...").
+    if "st" in chunk_dict:
+        logger.debug(
+            f"[RECV_SKIP] Ignoring echoed response id={chunk_dict.get('id')} "
+            f"(st={chunk_dict.get('st')})"
+        )
+        return None
+
+    # Handle frame (CRC-verified single frame; None if mismatch/incomplete).
+    return handle_received_chunk(chunk_dict)
+
+
+def run_pipeline(complete_msg: dict, pipeline) -> list[str]:
+    """Process a verified message through the pipeline (UNCHANGED) and return
+    the reply frame(s)."""
+    msg_id = complete_msg.get("id", "[no-id]")
+    response_dict = pipeline.process(complete_msg)
+
+    status = response_dict.get("st", "?")
+    if status == "S":
+        logger.info(f"[PROCESS_OK] ID: {msg_id} | Processed successfully")
+    else:
+        logger.warning(f"[PROCESS_FAIL] ID: {msg_id} | Error: {response_dict.get('ct', '')}")
+
+    # Build single CRC frame.
+    return chunk_message(response_dict)
+
+
+def log_latency(msg_id: str, times: tuple | None, t_start: float, t_ready: float,
+                t_sent: float) -> None:
+    """Log one [LATENCY] breakdown of a reply, all ``time.monotonic()``:
+    air (carrier lock -> the line's last byte decoded), queue (-> dequeued),
+    pipeline (-> reply frames ready) and TX (-> reply sent).
+
+    ``times`` is the line's ``Transport.rx_times`` entry; without one (the
+    byte-stream transports) air and queue are not known and the pipeline is
+    timed from ``t_start``, when the line was picked up.
+    """
+    if times:
+        t_carrier, t_decoded, t_start = times
+        air = f"{t_decoded - t_carrier:.3f}s"
+        queue = f"{t_start - t_decoded:.3f}s"
+    else:
+        air = queue = "-"
+    logger.info(
+        f"[LATENCY] ID: {msg_id} | Air: {air} | Queue: {queue} | "
+        f"Pipeline: {t_ready - t_start:.3f}s | TX: {t_sent - t_ready:.3f}s"
+    )
 
-    args = parse_args()
 
-    input_device_index = args.input_device
-    output_device_index = args.output_device
-    volume = args.volume
-    baud = args.baud
+def handle_line(msg, pipeline, volume: int, baud: int = 0,
+                times: tuple | None = None) -> None:
+    """Handle ONE received line end to end: ``accept_line``, the pipeline, and
+    the reply, then log its [LATENCY] breakdown (``times``: the line's
+    ``Transport.rx_times`` entry, if reported).
+
+    Per-line failures are logged and swallowed so one bad frame never stops the
+    loop.
+    """
+    try:
+        t_start = time.monotonic()
+        complete_msg = accept_line(msg, volume, baud)
+        if complete_msg is None:
+            return
+        msg_id = complete_msg.get("id", "[no-id]")
+        chunks = run_pipeline(complete_msg, pipeline)
+        t_ready = time.monotonic()
+        send_chunks(chunks, volume, msg_id)
+        log_latency(msg_id, times, t_start, t_ready, time.monotonic())
+
+    except Exception as inner_e:
+        logger.error(f"[RECV_FAIL] Error processing message: {str(inner_e)}")
+
+
+def pending_retx_frames() -> list[str]:
+    """Reassembly timeouts -> retx request frames to send."""
+    return [json.dumps(retx, separators=(",", ":")) + "\n" for retx in check_chunk_timeouts()]
+
+
+def log_link_stats(transport: Transport) -> None:
+    """Log one [LINK_STATS] summary of the transport's counters and, for the
+    modems, the binding's counter block (queue, carrier, confidence, TX time)."""
+    stats = transport.stats()
+    parts = [
+        f"baud={transport.baud}",
+        f"tx={stats['frames_sent']} frames/{stats['bytes_sent']} B",
+        f"rx={stats['lines_received']} lines/{stats['bytes_received']} B",
+        f"send_errors={stats['send_errors']}",
+    ]
+    modem = stats.get("modem")
+    if modem:
+        parts += [
+            f"demod={modem['bytes_demodulated']} B (discarded_tx={modem['bytes_discarded_tx']})",
+            f"queue={modem['queue_depth']}/hw {modem['queue_high_water']}",
+            f"lines queued={modem['lines_queued']} dropped={modem['lines_dropped']} "
+            f"truncated={modem['lines_truncated']}",
+            f"carrier +{modem['carrier_acquired']}/-{modem['carrier_lost']}",
+            f"confidence={modem['confidence_hist']}",
+            f"squelch={'open' if modem['squelch_open'] else 'closed'} "
+            f"opened={modem['squelch_opened']} skipped={modem['squelch_skipped']} samples",
+            f"airtime={modem['tx_seconds']:.1f} s/{modem['tx_bytes']} B",
+            f"waveform cache hits={stats['waveform_hits']} misses={stats['waveform_misses']}",
+        ]
+    else:
+        parts.append(f"dropped={stats['lines_dropped']}")
+    logger.info("[LINK_STATS] " + " | ".join(parts))
+
+
+def send_error_response(error: Exception, volume: int) -> None:
+    """Try to send an error response back to the frontend."""
+    error_dict = {"id": "", "st": "E", "ct": str(error)}
+    try:
+        error_chunks = chunk_message(error_dict)
+        send_chunks(error_chunks, volume, cached=True)
+    except Exception as send_e:
+        logger.error(f"[SEND_FAIL] Failed to send error response: {str(send_e)}")
+
+
+# ---------------------------------------------------------------------------
+# Main loops
+# ---------------------------------------------------------------------------
+
+def serve(pipeline, volume: int, transport: Transport) -> None:
+    """Synchronous main loop: block for lines, handle each inline (pipeline and
+    TX included), and run housekeeping every HOUSEKEEPING_INTERVAL (with a
+    [LINK_STATS] summary every STATS_LOG_INTERVAL).
+
+    Nothing is drained while a line is being handled; lines queue in the
+    transport meanwhile. Returns once the transport's input has ended.
+    """
+    next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+    next_stats = time.monotonic() + STATS_LOG_INTERVAL
+
+    while True:
+        try:
+            # Sleep in the transport until a newline-framed JSON line is queued
+            # or the housekeeping deadline passes, then drain every queued line
+            # in one call (for the modem: raw memoryviews into the binding's
+            # reusable buffer).
+            wait = max(0.0, next_housekeeping - time.monotonic())
+            lines = transport.receive(timeout=wait)
+            if not lines and transport.closed:
+                logger.info("[TRANSPORT] Input ended")
+                return
+
+            if time.monotonic() >= next_housekeeping:
+                next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+                check_hello_timeout(volume)
+                if STATS_LOG_INTERVAL > 0 and time.monotonic() >= next_stats:
+                    next_stats = time.monotonic() + STATS_LOG_INTERVAL
+                    log_link_stats(transport)
+                for retx_json in pending_retx_frames():
+                    try:
+                        if transmitter.send(retx_json, volume, cached=True):
+                            logger.info(f"[RETX_SEND] Requesting retransmission: {retx_json.strip()}")
+                        else:
+                            logger.error(f"[RETX_FAIL] Send failed: {transport.get_error()}")
+                    except Exception as retx_e:
+                        logger.error(f"[RETX_FAIL] Failed to send retx request: {retx_e}")
+
+            # Lines go to accept_line as received (views into the binding's
+            # buffer, valid until the next receive); each is handled before then.
+            for raw, baud, times in itertools.zip_longest(lines, transport.rx_bauds,
+                                                          transport.rx_times):
+                handle_line(raw, pipeline, volume, baud or 0, times)
+
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            logger.error(f"[ERROR] Exception: {str(e)}")
+            send_error_response(e, volume)
+
+
+async def serve_async(pipeline, volume: int, transport: AsyncModemTransport | None = None) -> None:
+    """asyncio main loop: RX draining, retransmit timers and pipeline work run
+    as separate tasks, so lines keep being accepted (and retx requests served)
+    while the pipeline or a reply transmission is busy.
+
+    - rx: ``transport.recv()`` -> ``accept_line`` on a worker thread (it may
+      transmit a retx) -> verified messages onto the work queue.
+    - pipeline: a single worker, so replies keep arrival order;
+      ``pipeline.process`` and the reply TX run on worker threads.
+    - housekeeping: every HOUSEKEEPING_INTERVAL, run the hello responder's
+      timers and send pending retx requests; log [LINK_STATS] every
+      STATS_LOG_INTERVAL.
+
+    ``transport`` defaults to one over the shared transmitter's transport.
+    Returns once the transport's input has ended and queued work is answered
+    (or when cancelled).
+    """
+    transport = transport or AsyncModemTransport()
+    work: asyncio.Queue = asyncio.Queue()
+
+    async def rx_task():
+        while True:
+            msg = await transport.recv()
+            if msg is None:
+                logger.info("[TRANSPORT] Input ended")
+                await work.join()
+                return
+            times, t_start = transport.last_times, time.monotonic()
+            try:
+                complete_msg = await asyncio.to_thread(accept_line, msg, volume,
+                                                       transport.last_baud)
+            except Exception as e:
+                logger.error(f"[RECV_FAIL] Error processing message: {str(e)}")
+                continue
+            if complete_msg is not None:
+                work.put_nowait((complete_msg, times, t_start))
+
+    async def pipeline_task():
+        while True:
+            complete_msg, times, t_start = await work.get()
+            try:
+                msg_id = complete_msg.get("id", "[no-id]")
+                chunks = await asyncio.to_thread(run_pipeline, complete_msg, pipeline)
+                t_ready = time.monotonic()
+                await asyncio.to_thread(send_chunks, chunks, volume, msg_id)
+                log_latency(msg_id, times, t_start, t_ready, time.monotonic())
+            except Exception as e:
+                logger.error(f"[ERROR] Exception: {str(e)}")
+                await asyncio.to_thread(send_error_response, e, volume)
+            finally:
+                work.task_done()
+
+    async def housekeeping_task():
+        next_stats = time.monotonic() + STATS_LOG_INTERVAL
+        while True:
+            await asyncio.sleep(HOUSEKEEPING_INTERVAL)
+            try:
+                await asyncio.to_thread(check_hello_timeout, volume)
+                if STATS_LOG_INTERVAL > 0 and time.monotonic() >= next_stats:
+                    next_stats = time.monotonic() + STATS_LOG_INTERVAL
+                    log_link_stats(transport.transport)
+                for retx_json in pending_retx_frames():
+                    if await transport.send(retx_json, volume, cached=True):
+                        logger.info(f"[RETX_SEND] Requesting retransmission: {retx_json.strip()}")
+                    else:
+                        logger.error(f"[RETX_FAIL] Send failed: {transport.transport.get_error()}")
+            except Exception as retx_e:
+                logger.error(f"[RETX_FAIL] Failed to send retx request: {retx_e}")
+
+    async with transport:
+        tasks = [
+            asyncio.create_task(rx_task(), name="rx"),
+            asyncio.create_task(pipeline_task(), name="pipeline"),
+            asyncio.create_task(housekeeping_task(), name="housekeeping"),
+        ]
+        try:
+            await tasks[0]  # rx: returns at end of input
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def open_transport(args) -> Transport | None:
+    """Open the link selected by ``--transport``.
+
+    For the modems this initializes the binding on the chosen devices/baud
+    (exiting on failure) and handles ``--list``, returning None after printing.
+    """
+    if args.transport in ("stdio", "unix"):
+        if args.transport == "stdio":
+            logger.info("Transport: stdio (newline-framed lines on stdin/stdout)")
+            transport = StdioTransport()
+        else:
+            logger.info(f"Transport: UNIX socket {args.socket}")
+            transport = UnixSocketTransport.listen(args.socket)
+        transport.line_max = args.line_max
+        transport.queue_max = args.queue_lines
+        return transport
+
+    modem = softmodem if args.transport == "softmodem" else minimodem
 
     # A7: surface the breaking protocol-id flag removal at startup.
     logger.info(
@@ -112,20 +584,105 @@ def main():
     )
 
     # minimodem device indices: -1 means "system default".
-    playback_id = output_device_index if output_device_index is not None else -1
-    capture_id = input_device_index if input_device_index is not None else -1
+    playback_id = args.output_device if args.output_device is not None else -1
+    capture_id = args.input_device if args.input_device is not None else -1
 
-    # Initialize the minimodem transport (loads libminimodem_simple.so).
-    init_result = minimodem.init(playback_id, capture_id, baud)
+    # Initialize the modem (the ctypes path loads libminimodem_simple.so).
+    if modem.set_detector(args.detector) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} detector {args.detector}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_squelch(args.squelch) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} squelch {args.squelch}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_decimation(args.decimation) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} decimation {args.decimation}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_line_limits(args.line_max, args.queue_lines) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} line limits {args.line_max} B x "
+                     f"{args.queue_lines}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_tx_framing(args.tx_leader, args.tx_trailer) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} tx framing {args.tx_leader}/"
+                     f"{args.tx_trailer} bits: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_tx_hold(args.tx_hold) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} tx hold {args.tx_hold}s: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_rx_bauds(args.rx_bauds) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} rx bauds {args.rx_bauds}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_duplex(args.duplex) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} duplex {args.duplex}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_char_framing(args.data_bits, args.stop_bits) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} char framing {args.data_bits}/"
+                     f"{args.stop_bits}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_tones(args.tones) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} tones {args.tones}: {modem.get_error()}")
+        sys.exit(1)
+    if modem.set_framing_mode(args.framing) < 0:
+        logger.error(f"[INIT_FAIL] {args.transport} framing {args.framing}: {modem.get_error()}")
+        sys.exit(1)
+    init_result = modem.init(playback_id, capture_id, args.baud, args.carriers)
     if init_result < 0:
-        logger.error(f"[INIT_FAIL] minimodem init failed: {minimodem.get_error()}")
+        logger.error(f"[INIT_FAIL] {args.transport} init failed: {modem.get_error()}")
         sys.exit(1)
 
     # List devices if requested (after init so the backend has enumerated them).
     if args.list:
-        list_devices()
-        minimodem.cleanup()
-        return
+        list_devices(modem)
+        modem.cleanup()
+        return None
+
+    # Log resolved device info.
+    in_name = modem.get_capture_device_name(capture_id) if capture_id >= 0 else "default"
+    out_name = modem.get_playback_device_name(playback_id) if playback_id >= 0 else "default"
+    logger.info(f"Transport: {args.transport}")
+    logger.info(f"Input  device: {args.input_device if args.input_device is not None else 'default'} ({in_name})")
+    logger.info(f"Output device: {args.output_device if args.output_device is not None else 'default'} ({out_name})")
+    logger.info(f"Baud: {args.baud}")
+    if args.carriers > 1:
+        logger.info(f"Carriers: {args.carriers}")
+    if args.tones != minimodem.TONES_BFSK:
+        logger.info(f"MFSK: {args.tones} tones per symbol")
+    if args.detector != "default":
+        logger.info(f"Detector: {args.detector}")
+    if args.decimation != 0:
+        logger.info(f"Decimation cap: {args.decimation}")
+    if args.rx_bauds:
+        logger.info(f"RX candidate bauds: {args.rx_bauds}")
+    if (args.line_max, args.queue_lines) != (minimodem.LINE_MAX_LEN_DEFAULT,
+                                             minimodem.QUEUE_MAX_LINES_DEFAULT):
+        logger.info(f"Line limits: {args.line_max} B, {args.queue_lines} lines queued")
+    if (args.tx_leader, args.tx_trailer) != (minimodem.TX_LEADER_BITS_DEFAULT,
+                                             minimodem.TX_TRAILER_BITS_DEFAULT):
+        logger.info(f"TX framing: {args.tx_leader} leader / {args.tx_trailer} trailer bits")
+    if (args.data_bits, args.stop_bits) != (minimodem.DATA_BITS_DEFAULT,
+                                            minimodem.STOP_BITS_DEFAULT):
+        logger.info(f"Char framing: {args.data_bits}-N-{args.stop_bits}")
+    if args.framing != "async":
+        logger.info(f"Link framing: {args.framing}")
+    if args.tx_hold > 0:
+        logger.info(f"TX carrier hold: {args.tx_hold}s")
+    if args.duplex != "half":
+        logger.info(f"Full duplex: transmitting on the {args.duplex} bands")
+    transport = ModemTransport(modem, args.baud)
+    transport.tone_bits = args.tx_leader + args.tx_trailer
+    # HDLC sends whole octets: no 7-bit refusal whatever --data-bits says.
+    transport.data_bits = args.data_bits if args.framing == "async" else minimodem.DATA_BITS_DEFAULT
+    return transport
+
+
+def main():
+    """Main loop — listen on the selected transport, process, and transmit response."""
+
+    args = parse_args()
+    volume = args.volume
+
+    transport = open_transport(args)
+    if transport is None:
+        return  # --list handled
 
     log_session_start()
 
@@ -138,111 +695,24 @@ def main():
         pipeline = TestPipeline()
         logger.info(f"Pipeline: TestPipeline (mode={pipeline_mode})")
 
-    # Log resolved device info.
-    in_name = minimodem.get_capture_device_name(capture_id) if capture_id >= 0 else "default"
-    out_name = minimodem.get_playback_device_name(playback_id) if playback_id >= 0 else "default"
-    logger.info(f"Input  device: {input_device_index if input_device_index is not None else 'default'} ({in_name})")
-    logger.info(f"Output device: {output_device_index if output_device_index is not None else 'default'} ({out_name})")
-    logger.info(f"Baud: {baud} | Volume: {volume}")
-
-    while True:
-        try:
-            # Housekeeping poll (near no-op; the wrapper RX thread does the demod).
-            minimodem.process()
-
-            # Drain ONE received newline-framed JSON line, if any.
-            msg = minimodem.receive()
-
-            if msg is None:
-                # No message queued — sleep to avoid busy-spin, then check timeouts.
-                time.sleep(POLL_SLEEP)
-                for retx in check_chunk_timeouts():
-                    retx_json = json.dumps(retx, separators=(",", ":")) + "\n"
-                    try:
-                        if minimodem.send(retx_json, volume) >= 0:
-                            while minimodem.is_transmitting():
-                                time.sleep(0.05)
-                            logger.info(f"[RETX_SEND] Requesting retransmission: {retx_json.strip()}")
-                        else:
-                            logger.error(f"[RETX_FAIL] Send failed: {minimodem.get_error()}")
-                    except Exception as retx_e:
-                        logger.error(f"[RETX_FAIL] Failed to send retx request: {retx_e}")
-                continue
-
-            logger.info(f"[RECV_RAW] Bytes: {len(msg)} | Raw: {truncate_for_log(msg)}")
-
-            try:
-                # Recover the JSON object from any FSK carrier-acquisition garbage
-                # wrapping the line (leading/trailing junk bytes, or a spurious
-                # carrier lock on noise between frames).
-                frame = extract_json_frame(msg)
-                if frame is None:
-                    # No brace pair -> pure noise between transmissions. Skip quietly.
-                    logger.debug(f"[RECV_SKIP] No frame in line (noise) | Raw: {truncate_for_log(msg)}")
-                    continue
-
-                # Parse JSON.
-                try:
-                    chunk_dict = json.loads(frame)
-                except json.JSONDecodeError as je:
-                    logger.warning(f"[RECV_FAIL] Invalid JSON after extraction: {je} | Raw: {truncate_for_log(msg)}")
-                    continue
-
-                # Handle retransmission request from frontend.
-                if chunk_dict.get("fn") == "retx":
-                    handle_retransmission_request(chunk_dict, volume)
-                    continue
-
-                # Ignore our OWN responses echoed back (self-loop / cross-talk between
-                # the two interfaces). A request carries "fn" and no "st"; a response
-                # always carries "st". Without this guard the backend reprocesses its
-                # own output in a runaway feedback loop (each pass re-wraps the previous
-                # response: "Processed function  with content: Processed function ...").
-                if "st" in chunk_dict:
-                    logger.debug(
-                        f"[RECV_SKIP] Ignoring echoed response id={chunk_dict.get('id')} "
-                        f"(st={chunk_dict.get('st')})"
-                    )
-                    continue
-
-                # Handle frame (CRC-verified single frame; None if mismatch/incomplete).
-                complete_msg = handle_received_chunk(chunk_dict)
-                if complete_msg is None:
-                    continue
-
-                # Process through the pipeline (UNCHANGED).
-                msg_id = complete_msg.get("id", "[no-id]")
-                response_dict = pipeline.process(complete_msg)
-
-                status = response_dict.get("st", "?")
-                if status == "S":
-                    logger.info(f"[PROCESS_OK] ID: {msg_id} | Processed successfully")
-                else:
-                    logger.warning(f"[PROCESS_FAIL] ID: {msg_id} | Error: {response_dict.get('ct', '')}")
-
-                # Build single CRC frame and send.
-                chunks = chunk_message(response_dict)
-                send_chunks(chunks, volume, msg_id)
-
-            except Exception as inner_e:
-                logger.error(f"[RECV_FAIL] Error processing message: {str(inner_e)}")
-
-        except KeyboardInterrupt:
-            logger.info("Keyboard interrupt received")
-            log_session_end("KeyboardInterrupt")
-            minimodem.cleanup()
-            break
-        except Exception as e:
-            logger.error(f"[ERROR] Exception: {str(e)}")
-
-            # Try to send error response back to frontend.
-            error_dict = {"id": "", "st": "E", "ct": str(e)}
-            try:
-                error_chunks = chunk_message(error_dict)
-                send_chunks(error_chunks, volume)
-            except Exception as send_e:
-                logger.error(f"[SEND_FAIL] Failed to send error response: {str(send_e)}")
+    logger.info(f"Volume: {volume} | Main loop: {'asyncio' if args.async_loop else 'synchronous'}")
+
+    # Every send site (send_chunks, retx) goes through the shared transmitter.
+    transmitter.transport = transport
+    link_controller.enabled = not args.no_adaptive_baud
+
+    try:
+        if args.async_loop:
+            asyncio.run(serve_async(pipeline, volume))
+        else:
+            serve(pipeline, volume, transport)
+    except KeyboardInterrupt:
+        logger.info("Keyboard interrupt received")
+        log_session_end("KeyboardInterrupt")
+        transport.close()
+        return
 
+    transport.close()
     log_session_end("Normal exit")
     sys.exit(0)
 
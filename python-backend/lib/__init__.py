@@ -4,15 +4,37 @@ lib — shared modules for the minimodem radiology backend.
 
 from .config import logger, truncate_for_log, log_session_start, log_session_end
 from .compression import lznt1_compress, lznt1_decompress, crc32_str
-from . import minimodem
+from . import minimodem, softmodem
+from .capture import Capture, CaptureRing, read_capture
+from .transport import (
+    Transport,
+    ModemTransport,
+    StdioTransport,
+    UnixSocketTransport,
+    MemoryTransport,
+    memory_pair,
+    TRANSPORT_CHOICES,
+    DEFAULT_SOCKET_PATH,
+)
 from .chunking import (
+    Transmitter,
+    transmitter,
     chunk_message,
     extract_json_frame,
+    parse_json_frame,
     handle_received_chunk,
     check_chunk_timeouts,
     send_chunks,
     handle_retransmission_request,
+    negotiate_baud,
+    LinkController,
+    link_controller,
+    handle_hello_request,
+    check_hello_timeout,
+    frame_crc_ok,
+    follow_sender_baud,
 )
+from .async_transport import AsyncModemTransport
 from .audio import list_devices
 from .pipeline import ReportPipeline, TestPipeline, LLMPipeline
 from .templates.schema import (
@@ -45,13 +67,39 @@ __all__ = [
     "crc32_str",
     # transport binding
     "minimodem",
+    "softmodem",
+    # RX sample captures
+    "Capture",
+    "CaptureRing",
+    "read_capture",
+    # transports
+    "Transport",
+    "ModemTransport",
+    "StdioTransport",
+    "UnixSocketTransport",
+    "MemoryTransport",
+    "memory_pair",
+    "TRANSPORT_CHOICES",
+    "DEFAULT_SOCKET_PATH",
     # chunking
+    "Transmitter",
+    "transmitter",
     "chunk_message",
     "extract_json_frame",
+    "parse_json_frame",
     "handle_received_chunk",
     "check_chunk_timeouts",
     "send_chunks",
     "handle_retransmission_request",
+    "negotiate_baud",
+    "LinkController",
+    "link_controller",
+    "handle_hello_request",
+    "check_hello_timeout",
+    "frame_crc_ok",
+    "follow_sender_baud",
+    # async transport
+    "AsyncModemTransport",
     # audio
     "list_devices",
     # pipeline
@@ -0,0 +1,138 @@
+"""
+asyncio adapter over a line transport.
+
+``AsyncModemTransport`` lets the backend run RX draining, retransmit timers and
+pipeline work as separate asyncio tasks instead of one synchronous loop that
+stops receiving while the pipeline or a transmission is running.
+
+- RX: a daemon reader thread parks in ``Transport.receive`` (for the modem,
+  ``minimodem.receive_many`` with the GIL released) and hands each line to the
+  event loop with ``loop.call_soon_threadsafe``, so ``await recv()`` wakes as
+  soon as a line is queued. When the transport reports ``closed`` (input at
+  EOF) ``recv()`` returns None. ``last_baud`` is the rate that decoded the
+  line ``recv()`` last returned (``Transport.rx_bauds``; 0 if not reported)
+  and ``last_times`` its ``Transport.rx_times`` stamps (None if not reported).
+- TX: ``send`` runs the ``Transmitter`` on a single-worker executor, so frames
+  stay serialised and the event loop never blocks on airtime.
+- ``wait_tx`` parks ``Transport.wait_tx`` on the default executor.
+
+By default it wraps the shared ``chunking.transmitter`` and its transport, so
+async sends and ``send_chunks`` share one TX lock.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import logger
+from .chunking import Transmitter
+from . import chunking
+
+# Seconds the reader thread parks in receive per pass. Bounds how long
+# close() waits for the thread to notice the stop flag.
+READER_POLL_TIMEOUT = 0.5
+
+
+class AsyncModemTransport:
+    """Async ``recv`` / ``send`` / ``wait_tx`` over a blocking ``Transport``."""
+
+    def __init__(self, transport=None, transmitter=None,
+                 poll_timeout: float = READER_POLL_TIMEOUT):
+        if transmitter is None:
+            if transport is None or transport is chunking.transmitter.transport:
+                transmitter = chunking.transmitter
+            else:
+                transmitter = Transmitter(transport)
+        self.transmitter = transmitter
+        self.transport = transport if transport is not None else transmitter.transport
+        self.poll_timeout = poll_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lines: asyncio.Queue | None = None
+        self.last_baud = 0
+        self.last_times: tuple[float, float, float] | None = None
+        self._reader: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._tx_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="modem-tx")
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        """Bind to the running loop and start the reader thread."""
+        if self._reader is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._lines = asyncio.Queue()
+        self._stop.clear()
+        self._reader = threading.Thread(target=self._read_loop, name="modem-rx", daemon=True)
+        self._reader.start()
+
+    def close(self) -> None:
+        """Stop the reader thread and the TX executor (idempotent)."""
+        self._stop.set()
+        if self._reader is not None:
+            self._reader.join(timeout=self.poll_timeout * 2)
+            self._reader = None
+        self._tx_executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncModemTransport":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    # -- reader thread -----------------------------------------------------
+
+    def _post(self, line: str | None, baud: int = 0, times: tuple | None = None) -> bool:
+        try:
+            self._loop.call_soon_threadsafe(self._lines.put_nowait, (line, baud, times))
+            return True
+        except RuntimeError:
+            return False  # event loop closed underneath us
+
+    def _read_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                lines = self.transport.receive(timeout=self.poll_timeout)
+            except Exception as e:
+                logger.error(f"[RECV_FAIL] Reader thread: {e}")
+                self._stop.wait(self.poll_timeout)
+                continue
+            if not lines and self.transport.closed:
+                self._post(None)  # end of input
+                return
+            # Modem lines are views into the binding's reusable buffer: decode
+            # (copy) them here, before the next receive overwrites it.
+            bauds, times = self.transport.rx_bauds, self.transport.rx_times
+            for i, raw in enumerate(lines):
+                if not self._post(str(raw, "utf-8", "replace"),
+                                  bauds[i] if i < len(bauds) else 0,
+                                  times[i] if i < len(times) else None):
+                    return
+
+    # -- async API ---------------------------------------------------------
+
+    async def recv(self) -> str | None:
+        """Return the next received newline-framed line (decoded), or None once
+        the transport's input has ended."""
+        if self._lines is None:
+            self.start()
+        line, self.last_baud, self.last_times = await self._lines.get()
+        return line
+
+    async def send(self, frame: str, volume: int, spaced: bool = False,
+                   cached: bool = False) -> bool:
+        """Transmit ONE frame and resolve once it has played out.
+
+        Runs ``Transmitter.send`` on the single TX worker, so concurrent sends
+        queue in order. Returns False if the transport rejected the frame.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._tx_executor, self.transmitter.send, frame, volume, spaced, cached
+        )
+
+    async def wait_tx(self, timeout: float | None = None) -> bool:
+        """Resolve True once no transmission is in flight (False on timeout)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.transport.wait_tx, timeout)
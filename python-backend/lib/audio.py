@@ -10,21 +10,22 @@ stays familiar.
 from . import minimodem
 
 
-def list_devices():
+def list_devices(modem=minimodem):
     """List available audio devices (via the minimodem wrapper) to stdout.
 
     Requires the wrapper to be initialized (``minimodem.init(...)``) so the
-    underlying audio backend has enumerated its devices.
+    underlying audio backend has enumerated its devices. ``modem`` may be any
+    binding with the same surface (e.g. ``lib.softmodem``).
     """
     print("\nAvailable Audio Devices:")
     print("=" * 80)
 
     try:
-        playback_count = minimodem.get_playback_device_count()
+        playback_count = modem.get_playback_device_count()
     except Exception:
         playback_count = 0
     try:
-        capture_count = minimodem.get_capture_device_count()
+        capture_count = modem.get_capture_device_count()
     except Exception:
         capture_count = 0
 
@@ -33,7 +34,7 @@ def list_devices():
         print("  (none)")
     for i in range(playback_count):
         try:
-            name = minimodem.get_playback_device_name(i)
+            name = modem.get_playback_device_name(i)
         except Exception:
             name = "<error>"
         print(f"  Device {i}: {name}  |  Out")
@@ -44,7 +45,7 @@ def list_devices():
         print("  (none)")
     for i in range(capture_count):
         try:
-            name = minimodem.get_capture_device_name(i)
+            name = modem.get_capture_device_name(i)
         except Exception:
             name = "<error>"
         print(f"  Device {i}: {name}  |  In")
@@ -0,0 +1,150 @@
+"""
+RX sample captures: the wrapper's memory-mapped ring file, plus WAV and raw
+float32 recordings, as one float32 sample array for offline replay.
+
+Ring file layout (``minimodem_simple_capture_header`` in minimodem_simple.h):
+a 40-byte little-endian header -- magic ``MMCAP01\\0``, sample_rate, baud,
+carriers, tones (u32 each), capacity, written (u64 each) -- followed by
+``capacity`` float32 samples used as a ring. ``written`` counts every sample
+ever teed; once it exceeds ``capacity`` the oldest sample sits at
+``written % capacity``. Files from before ``set_tones`` have tones 0 (binary
+FSK).
+
+``CaptureRing`` writes that format (the software modem's tee, so a softmodem
+capture replays exactly like a wrapper one); ``read_capture`` reads a ring
+file, a WAV file (PCM 8/16/24/32-bit or IEEE float, first channel) or, for
+anything else, headerless float32 samples.
+"""
+
+import mmap
+import struct
+import threading
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # optional: only sample captures need it
+    np = None
+
+CAPTURE_MAGIC = b"MMCAP01\0"
+HEADER = struct.Struct("<8sIIIIQQ")       # minimodem_simple_capture_header
+_WRITTEN_OFFSET = HEADER.size - 8
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+@dataclass
+class Capture:
+    """Samples recovered from a capture, oldest first."""
+    samples: "np.ndarray"
+    sample_rate: int
+    baud: int | None = None       # ring files record the link baud
+    carriers: int = 1
+    tones: int = 2                # tones per symbol (MFSK if > 2)
+
+
+class CaptureRing:
+    """Writer for the ring file format: ``write`` appends samples (keeping the
+    newest ``seconds`` of audio), ``close`` flushes and unmaps."""
+
+    def __init__(self, path: str, seconds: float, sample_rate: int, baud: int,
+                 carriers: int = 1, tones: int = 2):
+        self.capacity = max(1, int(seconds * sample_rate))
+        self._lock = threading.Lock()
+        self._file = open(path, "w+b")
+        self._file.truncate(HEADER.size + self.capacity * 4)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._map[:HEADER.size] = HEADER.pack(CAPTURE_MAGIC, sample_rate, baud, carriers, tones,
+                                              self.capacity, 0)
+        self._ring = np.frombuffer(self._map, dtype="<f4", count=self.capacity,
+                                   offset=HEADER.size)
+        self.written = 0
+
+    def write(self, samples: "np.ndarray") -> None:
+        with self._lock:
+            if self._map is None:
+                return
+            samples = np.asarray(samples, dtype=np.float32)
+            if len(samples) > self.capacity:
+                self.written += len(samples) - self.capacity
+                samples = samples[-self.capacity:]
+            pos = self.written % self.capacity
+            first = min(len(samples), self.capacity - pos)
+            self._ring[pos:pos + first] = samples[:first]
+            self._ring[:len(samples) - first] = samples[first:]
+            self.written += len(samples)
+            struct.pack_into("<Q", self._map, _WRITTEN_OFFSET, self.written)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is None:
+                return
+            del self._ring                 # release the buffer export before closing
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+
+def read_capture(path: str, sample_rate: int = 48000) -> Capture:
+    """Load a capture as float32 samples. ``sample_rate`` applies to headerless
+    raw files only; ring and WAV files carry their own."""
+    if np is None:
+        raise RuntimeError("NumPy is required to read sample captures")
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] == CAPTURE_MAGIC:
+        return _read_ring(data)
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return _read_wav(data, path)
+    usable = len(data) - len(data) % 4
+    return Capture(np.frombuffer(data[:usable], dtype="<f4").astype(np.float32), sample_rate)
+
+
+def _read_ring(data: bytes) -> Capture:
+    _, rate, baud, carriers, tones, capacity, written = HEADER.unpack_from(data)
+    ring = np.frombuffer(data, dtype="<f4", count=capacity, offset=HEADER.size)
+    if written <= capacity:
+        samples = ring[:written].copy()
+    else:
+        head = written % capacity
+        samples = np.concatenate((ring[head:], ring[:head]))
+    return Capture(samples, rate, baud or None, carriers or 1, tones or 2)
+
+
+def _read_wav(data: bytes, path: str) -> Capture:
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, pos)
+        body = data[pos + 8:pos + 8 + size]
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack_from("<HHIIHH", body)
+            if fmt[0] == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                fmt = (struct.unpack_from("<H", body, 24)[0],) + fmt[1:]
+        elif chunk_id == b"data" and fmt is not None:
+            return Capture(_wav_samples(body, fmt, path), fmt[2])
+        pos += 8 + size + (size & 1)
+    raise ValueError(f"{path}: WAV file has no fmt/data chunks")
+
+
+def _wav_samples(body: bytes, fmt: tuple, path: str) -> "np.ndarray":
+    tag, channels, _, _, _, bits = fmt
+    width = bits // 8
+    body = body[:len(body) - len(body) % (width * channels)]
+    if tag == _WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        samples = np.frombuffer(body, dtype=f"<f{width}").astype(np.float32)
+    elif tag == _WAVE_FORMAT_PCM and bits == 8:
+        samples = (np.frombuffer(body, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif tag == _WAVE_FORMAT_PCM and bits in (16, 32):
+        samples = np.frombuffer(body, dtype=f"<i{width}").astype(np.float32) / 2 ** (bits - 1)
+    elif tag == _WAVE_FORMAT_PCM and bits == 24:
+        raw = np.frombuffer(body, dtype=np.uint8).reshape(-1, 3)
+        ints = (raw[:, 0].astype(np.int32) | raw[:, 1].astype(np.int32) << 8
+                | raw[:, 2].astype(np.int8).astype(np.int32) << 16)
+        samples = ints.astype(np.float32) / 2 ** 23
+    else:
+        raise ValueError(f"{path}: unsupported WAV encoding (format {tag}, {bits} bits)")
+    return samples[::channels] if channels > 1 else samples
+
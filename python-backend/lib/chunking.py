@@ -12,29 +12,57 @@ The multi-chunk split (``chunk_message``) and reassembly (``reassemble_chunks``)
 code paths are RETAINED but DORMANT — kept ready for v2 chunking of large
 payloads. The v1 path does not exercise them.
 
-Transport: ``minimodem.send`` (FSK over the wrapper) replaces the old
-ggwave.encode + PyAudio stream writes; the ggwave Python binding is no longer
-imported here.
+Transport: frames go out through a ``lib.transport.Transport`` -- by default
+``ModemTransport`` over the minimodem binding (FSK over the wrapper), which
+replaced the old ggwave.encode + PyAudio stream writes. Every outbound frame
+goes through the module ``transmitter`` (a ``Transmitter``), which waits for TX
+completion with ``Transport.wait_tx`` (the wrapper's condition variable) rather
+than polling ``is_transmitting``. ``backend.py --transport`` swaps the link by
+rebinding ``transmitter.transport``.
 
 Wire shape of a v1 frame (serialized, separators=(",",":")):
     {"id":...,"fn":...,"ct":...,"st":...,"ci":0,"cc":1,"crc":<crc32_str(ct)>}
+
+Baud negotiation (``fn:"hello"``): ``negotiate_baud`` (initiator) and
+``handle_hello_request`` (responder) step the link up from a safe rate by
+exchanging CRC-protected probe frames; at runtime ``link_controller`` steps it
+down after repeated CRC failures and back up after a clean streak. When the
+modem also decodes candidate bauds (``set_rx_bauds``), ``follow_sender_baud``
+retunes this end to the rate a CRC-valid request arrived at. See the section
+near the end.
 """
 
 import base64
 import json
+import re
+import threading
 import time
+from collections import deque
 
 from .config import (
+    BAUD_CANDIDATES,
+    BAUD_MIN_PASS_RATE,
+    BAUD_PROBE_COUNT,
     CHUNK_DATA_SIZE,
     CHUNK_REASSEMBLY_TIMEOUT,
     COMPRESSION_THRESHOLD,
     MODEM_PAYLOAD_LIMIT,
     INTER_CHUNK_DELAY,
+    TX_DONE_TIMEOUT,
+    HELLO_DONE_ATTEMPTS,
+    HELLO_PROBE_SLACK,
+    HELLO_SETTLE,
+    HELLO_TIMEOUT,
+    LINK_ADAPT_ENABLED,
+    LINK_CLEAN_STREAK,
+    LINK_FAIL_THRESHOLD,
+    LINK_STEP_ATTEMPTS,
+    LINK_WINDOW,
     logger,
     truncate_for_log,
 )
 from .compression import lznt1_compress, lznt1_decompress, crc32_str
-from . import minimodem
+from .transport import ModemTransport
 
 # ---------------------------------------------------------------------------
 # Limits
@@ -50,14 +78,127 @@ MAX_ACCEPT_CT_LEN = 65536
 # ---------------------------------------------------------------------------
 
 # Incoming chunks: {msg_id: {"chunks": {ci: ct_data}, "cc": int, "meta": dict, "timestamp": float}}
-# (dormant — only used by the retained multi-chunk path)
+# (dormant — only used by the retained multi-chunk path). Guarded by
+# _receive_lock: serve_async feeds frames in from a worker thread while the
+# event loop sweeps timeouts.
 chunk_receive_buffer: dict = {}
+_receive_lock = threading.Lock()
 
 # Last sent frame(s) for retransmission: {msg_id: [json_line, ...]}
 # v1 stores exactly one newline-terminated frame per id.
 last_sent_chunks: dict = {}
 
 
+# ---------------------------------------------------------------------------
+# Transmitter: the single path every outbound frame takes
+# ---------------------------------------------------------------------------
+
+class Transmitter:
+    """Serialise frames onto a transport (default: the minimodem link).
+
+    ``send`` waits out any in-flight transmission, hands the frame to the
+    transport, then blocks in ``wait_tx`` (for the modem, a condition variable
+    in the wrapper) so the caller resumes as soon as the signal has played out
+    — no 50 ms ``is_transmitting`` polling. ``INTER_CHUNK_DELAY`` is only applied
+    between frames of one burst (``spaced=True``), measured from the end of the
+    previous transmission, never after the last frame. ``send_many`` sends a
+    burst of frames in one transmission (one carrier lead-in), so no gap is
+    paid between them at all. On a link sending 7-bit characters
+    (the transport's ``data_bits``) a frame that is not 7-bit clean is refused
+    up front rather than sent with its top bits stripped. ``cached`` marks
+    frames that go out byte for byte again (retx requests, resends, error
+    replies): a transport with ``send_cached`` replays their rendered waveform.
+    """
+
+    def __init__(self, transport=None, inter_frame_delay: float = INTER_CHUNK_DELAY,
+                 done_timeout: float = TX_DONE_TIMEOUT):
+        self.transport = transport if transport is not None else ModemTransport()
+        self.inter_frame_delay = inter_frame_delay
+        self.done_timeout = done_timeout
+        self._lock = threading.Lock()
+        self._last_tx_end = 0.0
+
+    def send(self, frame: str, volume: int, spaced: bool = False,
+             cached: bool = False) -> bool:
+        """Transmit ONE newline-terminated frame and wait for it to finish.
+
+        ``spaced`` marks a follow-on frame of the same burst: the gap since the
+        previous transmission is topped up to ``inter_frame_delay`` first.
+        Returns False if the transport rejected the frame (see
+        ``transport.get_error()``).
+        """
+        if not self._seven_bit_clean([frame]):
+            return False
+        with self._lock:
+            self.transport.wait_tx(self.done_timeout)
+            if spaced:
+                remaining = self._last_tx_end + self.inter_frame_delay - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+
+            if self._transport_send([frame], volume, cached) < 0:
+                return False
+            if not self.transport.wait_tx(self.done_timeout):
+                logger.warning(
+                    f"[SEND_WAIT] Transmission still in flight after {self.done_timeout}s"
+                )
+            self._last_tx_end = time.monotonic()
+            return True
+
+    def send_many(self, frames: list[str], volume: int, cached: bool = False) -> bool:
+        """Transmit newline-terminated ``frames`` as one burst and wait for it
+        to finish: on the modem one leader, the frames back to back on a
+        continuous carrier, one trailer. A single frame goes through ``send``.
+        Returns False if the transport rejected the burst.
+        """
+        if len(frames) == 1:
+            return self.send(frames[0], volume, cached=cached)
+        if not self._seven_bit_clean(frames):
+            return False
+        with self._lock:
+            self.transport.wait_tx(self.done_timeout)
+            if self._transport_send(frames, volume, cached) < 0:
+                return False
+            if not self.transport.wait_tx(self.done_timeout):
+                logger.warning(
+                    f"[SEND_WAIT] Transmission still in flight after {self.done_timeout}s"
+                )
+            self._last_tx_end = time.monotonic()
+            return True
+
+    def _transport_send(self, frames: list[str], volume: int, cached: bool) -> int:
+        send_cached = getattr(self.transport, "send_cached", None) if cached else None
+        if send_cached is not None:
+            return send_cached(frames, volume)
+        if len(frames) == 1:
+            return self.transport.send(frames[0], volume)
+        return self.transport.send_many(frames, volume)
+
+    def _seven_bit_clean(self, frames: list[str]) -> bool:
+        """False (logged) if the link sends 7-bit characters and a frame is
+        not pure ASCII; always True on an 8-bit link."""
+        if getattr(self.transport, "data_bits", 8) >= 8 or all(f.isascii() for f in frames):
+            return True
+        logger.error("[SEND_REFUSED] Frame is not 7-bit clean; the link sends 7 data bits")
+        return False
+
+    def burst_savings(self, count: int) -> float:
+        """Seconds a ``count``-frame burst saves over ``count`` spaced sends:
+        the extra leader/trailer tones (the modem transport's ``tone_bits``) at
+        the link baud plus the inter-frame gaps (byte-stream transports send
+        no tones, so only the gaps count)."""
+        if count < 2:
+            return 0.0
+        baud = getattr(self.transport, "baud", 0)
+        bits = getattr(self.transport, "tone_bits", 0)
+        tones = bits / baud if baud > 0 else 0.0
+        return (count - 1) * (tones + self.inter_frame_delay)
+
+
+# Shared instance used by every send site (backend + this module).
+transmitter = Transmitter()
+
+
 # ---------------------------------------------------------------------------
 # Outbound (v1 ACTIVE): build a single CRC-protected frame
 # ---------------------------------------------------------------------------
@@ -151,6 +292,28 @@ def chunk_message(msg_dict: dict) -> list[str]:
 # Inbound: receiving frames; CRC-verified single-frame (v1) + dormant reassembly
 # ---------------------------------------------------------------------------
 
+# One shared decoder; ``raw_decode`` is reentrant.
+_JSON_DECODER = json.JSONDecoder()
+# First "{" of a received line, found in the raw buffer (re accepts any
+# bytes-like object, so a memoryview is searched in place).
+_OPEN_BRACE = re.compile(rb"{")
+
+
+def _scan_json_frame(text: str) -> tuple[dict, int, int] | None:
+    """(object, start, end) of the first ``{`` in ``text`` that begins a JSON
+    object, or None. See ``extract_json_frame`` for why every brace is tried."""
+    i = text.find("{")
+    while i != -1:
+        try:
+            obj, end = _JSON_DECODER.raw_decode(text, i)
+            if isinstance(obj, dict):
+                return obj, i, end
+        except json.JSONDecodeError:
+            pass
+        i = text.find("{", i + 1)
+    return None
+
+
 def extract_json_frame(raw: str) -> str | None:
     """Recover a single JSON object from a received line wrapped in FSK garbage.
 
@@ -170,27 +333,49 @@ def extract_json_frame(raw: str) -> str | None:
 
     Returns the ``{...}`` substring, or None if no ``{`` begins a valid JSON
     object (pure noise — the caller should skip it silently, not log a parse error).
+    Receive paths that want the parsed object use ``parse_json_frame``, which
+    does the same scan without parsing the frame a second time.
     """
     if not raw:
         return None
-    decoder = json.JSONDecoder()
-    i = raw.find("{")
-    while i != -1:
-        try:
-            obj, end = decoder.raw_decode(raw, i)
-            if isinstance(obj, dict):
-                return raw[i:end]
-        except json.JSONDecodeError:
-            pass
-        i = raw.find("{", i + 1)
-    return None
+    found = _scan_json_frame(raw)
+    return raw[found[1]:found[2]] if found else None
+
+
+def parse_json_frame(raw) -> dict | None:
+    """``extract_json_frame`` + ``json.loads`` in one pass: the dict that the
+    recovery scan already parsed, or None for noise.
+
+    ``raw`` may be a ``str`` or the received buffer itself (``bytes`` or the
+    ``memoryview`` slices ``receive_many`` returns). A buffer is searched for
+    its first ``{`` in place and only the rest of the line is decoded, once;
+    leading carrier-acquisition garbage is never copied or decoded.
+    """
+    if not raw:
+        return None
+    if not isinstance(raw, str):
+        brace = _OPEN_BRACE.search(raw)
+        if brace is None:
+            return None
+        raw = str(raw[brace.start():], "utf-8", "replace")
+    found = _scan_json_frame(raw)
+    return found[0] if found else None
+
+
+def _crc_matches(received_crc, expected_crc: int) -> bool:
+    """crc travels as a JSON number; compare numerically (False if absent/bad)."""
+    try:
+        return received_crc is not None and int(received_crc) == expected_crc
+    except (TypeError, ValueError):
+        return False
 
 
 def handle_received_chunk(chunk_dict: dict) -> dict | None:
     """Process a received frame.
 
     v1 ACTIVE PATH (cc == 1): verify ``crc32_str(ct) == crc``. On match, return
-    the message dict (ci/cc/crc stripped). On mismatch: log [RECV_FAIL], request
+    the message dict (ci/cc/crc stripped, in place: the parsed frame object is
+    reused, not copied). On mismatch: log [RECV_FAIL], request
     a FULL-message retransmit, and return None — never surface a partial/corrupt
     report (CLAUDE.md medico-legal rule).
 
@@ -219,50 +404,52 @@ def handle_received_chunk(chunk_dict: dict) -> dict | None:
         received_crc = chunk_dict.get("crc")
         expected_crc = crc32_str(ct)
 
-        # crc travels as a JSON number; compare numerically.
-        try:
-            crc_ok = received_crc is not None and int(received_crc) == expected_crc
-        except (TypeError, ValueError):
-            crc_ok = False
-
-        if not crc_ok:
+        if not _crc_matches(received_crc, expected_crc):
             logger.error(
                 f"[RECV_FAIL] ID: {msg_id} | CRC mismatch (got {received_crc} "
                 f"expected {expected_crc}) - requesting full retransmit"
             )
+            link_controller.record_failure(msg_id)
             _request_full_retransmit(msg_id)
             return None
 
+        link_controller.record_success(msg_id)
+        hello_responder.heard_frame()
+
         # Integrity verified — surface the message (drop framing/integrity fields).
-        return {k: v for k, v in chunk_dict.items() if k not in ("ci", "cc", "crc")}
+        for key in ("ci", "cc", "crc"):
+            chunk_dict.pop(key, None)
+        return chunk_dict
 
     # ---- DORMANT (v2): single message with no chunking (cc == 0) ----
     if cc == 0:
         return {k: v for k, v in chunk_dict.items() if k not in ("ci", "cc")}
 
     # ---- DORMANT (v2): multi-chunk reassembly ----
-    if msg_id not in chunk_receive_buffer:
-        chunk_receive_buffer[msg_id] = {
-            "chunks": {},
-            "cc": cc,
-            "meta": {},
-            "timestamp": time.time(),
-        }
-
-    buf = chunk_receive_buffer[msg_id]
-    buf["chunks"][ci] = chunk_dict.get("ct", "")
-
-    if ci == 0:
-        for key, val in chunk_dict.items():
-            if key not in ("id", "ci", "cc", "ct"):
-                buf["meta"][key] = val
+    with _receive_lock:
+        if msg_id not in chunk_receive_buffer:
+            chunk_receive_buffer[msg_id] = {
+                "chunks": {},
+                "cc": cc,
+                "meta": {},
+                "timestamp": time.time(),
+            }
+
+        buf = chunk_receive_buffer[msg_id]
+        buf["chunks"][ci] = chunk_dict.get("ct", "")
+
+        if ci == 0:
+            for key, val in chunk_dict.items():
+                if key not in ("id", "ci", "cc", "ct"):
+                    buf["meta"][key] = val
+        have = len(buf["chunks"])
 
     logger.info(
         f"[CHUNK_RECV] ID: {msg_id} | Chunk {ci + 1}/{cc} | "
-        f"Have {len(buf['chunks'])}/{cc}"
+        f"Have {have}/{cc}"
     )
 
-    if len(buf["chunks"]) == cc:
+    if have == cc:
         return reassemble_chunks(msg_id)
 
     return None
@@ -275,18 +462,20 @@ def reassemble_chunks(msg_id: str) -> dict | None:
     """
     global chunk_receive_buffer
 
-    if msg_id not in chunk_receive_buffer:
-        return None
-
-    buf = chunk_receive_buffer[msg_id]
-    cc = buf["cc"]
+    with _receive_lock:
+        buf = chunk_receive_buffer.get(msg_id)
+        if buf is None:
+            return None
+        cc = buf["cc"]
+        chunks = dict(buf["chunks"])
+        meta = dict(buf["meta"])
 
     encoded_parts: list[str] = []
     for ci in range(cc):
-        if ci not in buf["chunks"]:
+        if ci not in chunks:
             logger.error(f"[REASSEMBLE] ID: {msg_id} | Missing chunk {ci}")
             return None
-        encoded_parts.append(buf["chunks"][ci])
+        encoded_parts.append(chunks[ci])
 
     encoded = "".join(encoded_parts)
 
@@ -296,15 +485,17 @@ def reassemble_chunks(msg_id: str) -> dict | None:
         content = decompressed.decode("utf-8")
     except Exception as e:
         logger.error(f"[REASSEMBLE] ID: {msg_id} | Decompression failed: {e}")
-        del chunk_receive_buffer[msg_id]
+        with _receive_lock:
+            chunk_receive_buffer.pop(msg_id, None)
         return None
 
     result = {"id": msg_id, "ct": content}
-    result.update(buf["meta"])
+    result.update(meta)
 
     logger.info(f"[REASSEMBLE] ID: {msg_id} | Reassembled {cc} chunks -> {len(content)} chars")
 
-    del chunk_receive_buffer[msg_id]
+    with _receive_lock:
+        chunk_receive_buffer.pop(msg_id, None)
     return result
 
 
@@ -313,7 +504,7 @@ def reassemble_chunks(msg_id: str) -> dict | None:
 # ---------------------------------------------------------------------------
 
 def _request_full_retransmit(msg_id: str) -> None:
-    """Send a full-message retransmit request over minimodem.
+    """Send a full-message retransmit request over the transport.
 
     Mirrors the AHK retx shape ``{id, fn:"retx", ci:[0]}`` (ci=[0] => whole
     single-frame message). Sent immediately rather than buffered so the peer can
@@ -322,12 +513,9 @@ def _request_full_retransmit(msg_id: str) -> None:
     retx = {"id": msg_id, "fn": "retx", "ci": [0]}
     retx_json = json.dumps(retx, separators=(",", ":")) + "\n"
     try:
-        result = minimodem.send(retx_json, 50)
-        if result < 0:
-            logger.error(f"[RETX_FAIL] ID: {msg_id} | Send failed: {minimodem.get_error()}")
+        if not transmitter.send(retx_json, 50, cached=True):
+            logger.error(f"[RETX_FAIL] ID: {msg_id} | Send failed: {transmitter.transport.get_error()}")
             return
-        while minimodem.is_transmitting():
-            time.sleep(0.05)
         logger.info(f"[RETX_SEND] ID: {msg_id} | Requesting full-message retransmit (ci=[0])")
     except Exception as e:
         logger.error(f"[RETX_FAIL] ID: {msg_id} | {e}")
@@ -346,26 +534,29 @@ def check_chunk_timeouts() -> list[dict]:
     retx_requests: list[dict] = []
     expired: list[str] = []
 
-    for msg_id, buf in chunk_receive_buffer.items():
-        elapsed = now - buf["timestamp"]
-        if elapsed > CHUNK_REASSEMBLY_TIMEOUT:
-            missing = [ci for ci in range(buf["cc"]) if ci not in buf["chunks"]]
-            if missing:
-                retx_requests.append({
-                    "id": msg_id,
-                    "fn": "retx",
-                    "ci": missing,
-                })
-                buf["timestamp"] = now
-                logger.warning(
-                    f"[TIMEOUT] ID: {msg_id} | Missing chunks: {missing} | "
-                    "Requesting retransmission"
-                )
-            else:
-                expired.append(msg_id)
-
-    for msg_id in expired:
-        del chunk_receive_buffer[msg_id]
+    with _receive_lock:
+        for msg_id, buf in chunk_receive_buffer.items():
+            elapsed = now - buf["timestamp"]
+            if elapsed > CHUNK_REASSEMBLY_TIMEOUT:
+                missing = [ci for ci in range(buf["cc"]) if ci not in buf["chunks"]]
+                if missing:
+                    retx_requests.append({
+                        "id": msg_id,
+                        "fn": "retx",
+                        "ci": missing,
+                    })
+                    buf["timestamp"] = now
+                else:
+                    expired.append(msg_id)
+
+        for msg_id in expired:
+            del chunk_receive_buffer[msg_id]
+
+    for retx in retx_requests:
+        logger.warning(
+            f"[TIMEOUT] ID: {retx['id']} | Missing chunks: {retx['ci']} | "
+            "Requesting retransmission"
+        )
 
     return retx_requests
 
@@ -374,8 +565,8 @@ def check_chunk_timeouts() -> list[dict]:
 # Sending (v1: single frame over minimodem)
 # ---------------------------------------------------------------------------
 
-def send_chunks(chunks: list[str], volume: int, msg_id: str = ""):
-    """Transmit frame(s) sequentially via minimodem.
+def send_chunks(chunks: list[str], volume: int, msg_id: str = "", cached: bool = False):
+    """Transmit frame(s) sequentially via the transport.
 
     v1: ``chunks`` is a single-element list holding ONE newline-terminated
     CRC-protected frame (from ``chunk_message``). Stored in ``last_sent_chunks``
@@ -384,7 +575,7 @@ def send_chunks(chunks: list[str], volume: int, msg_id: str = ""):
 
     NOTE: the legacy ``stream_output``/``protocol_id`` params are GONE — transport
     now goes through the minimodem binding. All call sites pass (chunks, volume,
-    msg_id).
+    msg_id); ``cached`` (error replies) goes through the waveform cache.
     """
     global last_sent_chunks
 
@@ -392,31 +583,36 @@ def send_chunks(chunks: list[str], volume: int, msg_id: str = ""):
         last_sent_chunks[msg_id] = chunks
 
     total = len(chunks)
+    # Every frame goes out in one burst (dormant for the single-frame path):
+    # one carrier lead-in instead of one per frame plus INTER_CHUNK_DELAY gaps.
+    # The Transmitter waits for TX completion itself.
+    if not transmitter.send_many(chunks, volume, cached=cached):
+        logger.error(
+            f"[SEND_FAIL] ID: {msg_id} | {total} frame(s) | "
+            f"Error: {transmitter.transport.get_error()}"
+        )
+        return
     for i, chunk_json in enumerate(chunks):
-        result = minimodem.send(chunk_json, volume)
-        if result < 0:
-            logger.error(
-                f"[SEND_FAIL] ID: {msg_id} | Frame {i + 1}/{total} | "
-                f"Error: {minimodem.get_error()}"
-            )
-            return
         logger.info(
             f"[SEND] ID: {msg_id} | Frame {i + 1}/{total} | "
             f"Content: {truncate_for_log(chunk_json)}"
         )
+    _log_burst(msg_id, total)
 
-        # Wait for transmission to complete before the next frame (mirrors AHK).
-        while minimodem.is_transmitting():
-            time.sleep(0.05)
+    logger.info(f"[SEND_OK] ID: {msg_id} | All {total} frame(s) transmitted")
 
-        if i < total - 1:
-            time.sleep(INTER_CHUNK_DELAY)  # dormant for the single-frame path
 
-    logger.info(f"[SEND_OK] ID: {msg_id} | All {total} frame(s) transmitted")
+def _log_burst(msg_id: str, count: int) -> None:
+    """Log the airtime a multi-frame burst saved over spaced single sends."""
+    if count > 1:
+        logger.info(
+            f"[SEND_BURST] ID: {msg_id} | {count} frames in one burst | "
+            f"Airtime saved: {transmitter.burst_savings(count):.3f}s"
+        )
 
 
 def handle_retransmission_request(retx_dict: dict, volume: int):
-    """Resend the stored frame(s) for a retransmission request via minimodem.
+    """Resend the stored frame(s) for a retransmission request via the transport.
 
     v1: ``last_sent_chunks[msg_id]`` holds exactly one frame (index 0), so a
     ``retx`` with ci=[0] resends the whole message. The loop also covers the
@@ -428,21 +624,622 @@ def handle_retransmission_request(retx_dict: dict, volume: int):
     msg_id = retx_dict.get("id", "")
     requested = retx_dict.get("ci", [])
 
+    # The peer could not decode our frame: count it against the link.
+    link_controller.record_failure(msg_id)
+
     if msg_id not in last_sent_chunks:
         logger.warning(f"[RETX] ID: {msg_id} | No frames in send buffer")
         return
 
     stored_chunks = last_sent_chunks[msg_id]
 
+    resend = []
     for ci in requested:
         if isinstance(ci, int) and 0 <= ci < len(stored_chunks):
             logger.info(f"[RETX] ID: {msg_id} | Resending frame {ci}")
-            result = minimodem.send(stored_chunks[ci], volume)
-            if result < 0:
-                logger.error(f"[RETX_FAIL] ID: {msg_id} | Send failed: {minimodem.get_error()}")
-                continue
-            while minimodem.is_transmitting():
-                time.sleep(0.05)
-            time.sleep(INTER_CHUNK_DELAY)
+            resend.append(stored_chunks[ci])
         else:
             logger.warning(f"[RETX] ID: {msg_id} | Frame {ci} out of range (have {len(stored_chunks)})")
+    if not resend:
+        return
+    # The requested frames go out as one burst, like send_chunks; a resend is
+    # byte for byte, so its waveform is worth keeping.
+    if not transmitter.send_many(resend, volume, cached=True):
+        logger.error(f"[RETX_FAIL] ID: {msg_id} | Send failed: {transmitter.transport.get_error()}")
+        return
+    _log_burst(msg_id, len(resend))
+
+
+# ---------------------------------------------------------------------------
+# Baud negotiation (fn:"hello")
+# ---------------------------------------------------------------------------
+#
+# Every control frame travels at the last rate both ends agree on (the "base");
+# only the probe bursts go out at the candidate rate. One step, initiator (I)
+# and responder (R), all frames built by build_single_frame (crc over ct; a
+# control frame's ct spells out its own fields, e.g. "ph=ack,bd=4800"):
+#
+#   I -> R  {"fn":"hello","ph":"propose","bd":4800,"pn":5}   at base
+#   R -> I  {"fn":"hello","ph":"ack","bd":4800}              at base; both -> 4800
+#   I -> R  {"fn":"hello","ph":"probe","bd":4800,"sq":0..4,"ct":PROBE}  at 4800
+#           both -> base (R after the last probe or when the burst window ends)
+#   R -> I  {"fn":"hello","ph":"report","bd":4800,"ok":k,"pn":5}  at base
+#
+# I steps up until a rate's pass rate (k/pn) falls below BAUD_MIN_PASS_RATE or
+# R stops answering, then settles on the best passing rate:
+#
+#   I -> R  {"ph":"commit","bd":best}  at base;  R -> I {"ph":"ack"}; both -> best
+#   I -> R  {"ph":"done","bd":best}    at best;  R -> I {"ph":"ready"}
+#   I -> R  {"ph":"confirm","bd":best} at best
+#
+# If "done" never reaches R it reverts to base. I sends "done" up to
+# HELLO_DONE_ATTEMPTS times, and R answers each with "ready", so one lost
+# "ready" costs a retry, not the rate. After its "ready" R holds best for one
+# HELLO_TIMEOUT and reverts to base unless a CRC-valid frame other than a
+# repeated "done" (the "confirm", or any traffic) arrives there; if no "ready"
+# reaches I it falls back too -- so a link that cannot sustain the rate falls
+# back on both ends.
+
+HELLO_ID = "hello"
+
+# Probe content: mixed-case letters, digits and JSON-escaped punctuation, so a
+# rate that mangles any bit pattern fails the CRC.
+PROBE_PAYLOAD = 'The quick brown fox jumps over the lazy dog 0123456789 {"[]"}\\/~!@#$%^&*'
+
+
+_HELLO_FIELDS = ("ph", "bd", "pn", "sq", "ok")
+
+
+def _hello_digest(msg: dict) -> str:
+    """Control-frame ``ct``: the hello fields spelled out, so the frame CRC
+    (which covers ``ct`` only) also protects them."""
+    return ",".join(f"{k}={msg[k]}" for k in _HELLO_FIELDS if k in msg)
+
+
+def _hello_frame(ph: str, bd: int, **fields) -> str:
+    """Build one CRC-protected hello frame for phase ``ph`` at rate ``bd``.
+    Probes carry ``PROBE_PAYLOAD``; every other phase carries its digest."""
+    msg = {"id": HELLO_ID, "fn": "hello", "ph": ph, "bd": bd}
+    msg.update(fields)
+    msg.setdefault("ct", _hello_digest(msg))
+    return build_single_frame(msg)
+
+
+def _hello_crc_ok(hello_dict: dict) -> bool:
+    ct = hello_dict.get("ct", "")
+    if not _crc_matches(hello_dict.get("crc"), crc32_str(ct)):
+        return False
+    expected = PROBE_PAYLOAD if hello_dict.get("ph") == "probe" else _hello_digest(hello_dict)
+    return ct == expected
+
+
+def _parse_hello(raw) -> dict | None:
+    """A received line (str or raw buffer) -> CRC-verified hello dict, or None."""
+    msg = parse_json_frame(raw)
+    if msg is None:
+        return None
+    if msg.get("fn") != "hello" or not _hello_crc_ok(msg):
+        return None
+    return msg
+
+
+def _set_baud(transport, baud: int) -> None:
+    if transport.set_baud(baud) < 0:
+        raise RuntimeError(f"set_baud({baud}) failed: {transport.get_error()}")
+
+
+def _await_hello(transport, ph: str, bd: int, timeout: float) -> dict | None:
+    """Block until a CRC-valid hello frame with phase ``ph`` for rate ``bd``
+    arrives, or ``timeout`` seconds pass. Anything else is discarded."""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        for raw in transport.receive(timeout=remaining):
+            msg = _parse_hello(raw)
+            if msg is not None and msg.get("ph") == ph and msg.get("bd") == bd:
+                return msg
+        if transport.closed:
+            return None
+
+
+def _hello_exchange(tx: Transmitter, volume: int, frame: str, reply_ph: str, bd: int,
+                    timeout: float) -> dict | None:
+    """Send one hello frame and wait for its reply."""
+    if not tx.send(frame, volume):
+        logger.error(f"[HELLO_FAIL] Send failed: {tx.transport.get_error()}")
+        return None
+    return _await_hello(tx.transport, reply_ph, bd, timeout)
+
+
+def negotiate_baud(volume: int, candidates: tuple[int, ...] = BAUD_CANDIDATES,
+                   probes: int = BAUD_PROBE_COUNT,
+                   min_pass_rate: float = BAUD_MIN_PASS_RATE,
+                   timeout: float = HELLO_TIMEOUT, tx: Transmitter | None = None) -> int:
+    """Initiator side of the ``fn:"hello"`` handshake (over ``tx``, default the
+    shared ``transmitter``).
+
+    Starts the link at ``candidates[0]`` (the safe rate), probes each higher
+    candidate in order with ``probes`` CRC-protected frames, and stops at the
+    first rate whose CRC pass rate is below ``min_pass_rate`` or that the peer
+    does not answer. Commits the highest passing rate on both ends and returns
+    it (``candidates[0]`` if nothing better held). The commit's ``done`` goes
+    out up to ``HELLO_DONE_ATTEMPTS`` times, so a lost ``ready`` is answered
+    again rather than splitting the link; a ``confirm`` at the new rate then
+    closes the responder's window. Reads the transport directly, so call it
+    before a main loop starts consuming lines.
+    """
+    tx = tx or transmitter
+    transport = tx.transport
+    base = candidates[0]
+    best = base
+    _set_baud(transport, base)
+    t0 = time.monotonic()
+    results: list[str] = []
+
+    for bd in candidates[1:]:
+        step_start = time.monotonic()
+        ack = _hello_exchange(tx, volume, _hello_frame("propose", bd, pn=probes),
+                              "ack", bd, timeout)
+        if ack is None:
+            logger.warning(f"[BAUD_PROBE] {bd} baud | No answer to propose at {base} - stopping")
+            break
+
+        _set_baud(transport, bd)
+        time.sleep(HELLO_SETTLE)             # the responder retunes after its ack
+        for sq in range(probes):
+            tx.send(_hello_frame("probe", bd, sq=sq, ct=PROBE_PAYLOAD), volume)
+        _set_baud(transport, base)
+
+        # A lossy burst leaves the responder waiting out its probe window
+        # (up to HELLO_PROBE_SLACK past the burst) before it reports.
+        report = _await_hello(transport, "report", bd, timeout + HELLO_PROBE_SLACK)
+        ok = report.get("ok", 0) if report is not None else 0
+        rate = ok / probes if probes else 0.0
+        results.append(f"{bd}:{ok}/{probes}")
+        logger.info(
+            f"[BAUD_PROBE] {bd} baud | {ok}/{probes} probes CRC-valid ({rate:.0%}) | "
+            f"{'report' if report is not None else 'no report'} | "
+            f"{time.monotonic() - step_start:.2f}s"
+        )
+        if rate < min_pass_rate:
+            break
+        best = bd
+
+    if best != base:
+        ack = _hello_exchange(tx, volume, _hello_frame("commit", best), "ack", best, timeout)
+        if ack is None:
+            logger.warning(f"[BAUD_NEGOTIATE] No ack to commit {best} - staying at {base}")
+            best = base
+        else:
+            _set_baud(transport, best)
+            time.sleep(HELLO_SETTLE)
+            # The responder holds the new rate for one timeout after each
+            # ready; split ours across the done sends so a re-sent done still
+            # finds it there when only the ready was lost.
+            for attempt in range(HELLO_DONE_ATTEMPTS):
+                ready = _hello_exchange(tx, volume, _hello_frame("done", best),
+                                        "ready", best, timeout / HELLO_DONE_ATTEMPTS)
+                if ready is not None:
+                    break
+                logger.warning(
+                    f"[BAUD_NEGOTIATE] No ready at {best} "
+                    f"(done {attempt + 1}/{HELLO_DONE_ATTEMPTS})"
+                )
+            if ready is None:
+                logger.warning(f"[BAUD_NEGOTIATE] No ready at {best} - falling back to {base}")
+                _set_baud(transport, base)
+                best = base
+            else:
+                tx.send(_hello_frame("confirm", best), volume)
+
+    logger.info(
+        f"[BAUD_NEGOTIATED] {best} baud (safe rate {base}) | probes "
+        f"{', '.join(results) or 'none'} | {time.monotonic() - t0:.2f}s"
+    )
+    return best
+
+
+class HelloResponder:
+    """Responder side of the ``fn:"hello"`` handshake.
+
+    Driven by the main loop: ``handle`` gets each received hello frame and
+    ``check_timeout`` runs on the housekeeping tick, reverting to the base rate
+    when a probe burst or a commit's "done" does not arrive in time. After its
+    ``ready`` the responder stays in a confirm window: a repeated ``done``
+    (the initiator missed the ready) is answered again, any other CRC-valid
+    frame at the new rate (``heard_frame``) ends the window, and a window
+    that runs out reverts to the base rate. Replies go out through ``tx``
+    (default: the shared ``transmitter``, looked up per call so
+    ``--transport`` rebinding applies).
+    """
+
+    def __init__(self, tx: Transmitter | None = None, timeout: float = HELLO_TIMEOUT,
+                 probe_slack: float = HELLO_PROBE_SLACK):
+        self._tx = tx
+        self.timeout = timeout
+        self.probe_slack = probe_slack
+        self._lock = threading.Lock()
+        self._state = "idle"    # idle | probing | committed | confirming
+        self._base = 0
+        self._bd = 0
+        self._pn = 0
+        self._seen: set[int] = set()
+        self._deadline = 0.0
+
+    def _probe_window(self, bd: int, pn: int) -> float:
+        """Seconds a burst of ``pn`` probes takes at ``bd`` (10 bits/byte), plus slack."""
+        frame_bytes = len(_hello_frame("probe", bd, sq=0, ct=PROBE_PAYLOAD).encode("utf-8"))
+        return pn * frame_bytes * 10 / bd + self.probe_slack
+
+    def handle(self, hello_dict: dict, volume: int) -> None:
+        """Act on one received hello frame. Frames failing CRC (or whose
+        fields disagree with their digest) are ignored; a probe that fails
+        simply does not count."""
+        if not _hello_crc_ok(hello_dict):
+            logger.debug(f"[HELLO] Dropping hello frame with bad CRC (ph={hello_dict.get('ph')})")
+            return
+        ph = hello_dict.get("ph")
+        bd = hello_dict.get("bd")
+        if not isinstance(bd, int) or bd <= 0:
+            return
+        tx = self._tx or transmitter
+        transport = tx.transport
+
+        with self._lock:
+            if self._state == "confirming" and ph in ("propose", "probe", "commit", "confirm"):
+                self._confirm()                  # the initiator is at the new rate
+            if ph == "propose":
+                pn = hello_dict.get("pn", BAUD_PROBE_COUNT)
+                self._base = transport.baud
+                if not tx.send(_hello_frame("ack", bd), volume):
+                    logger.error(f"[HELLO_FAIL] Ack send failed: {transport.get_error()}")
+                    return
+                _set_baud(transport, bd)
+                self._state, self._bd, self._pn = "probing", bd, pn
+                self._seen = set()
+                self._deadline = time.monotonic() + self._probe_window(bd, pn)
+                logger.info(f"[HELLO] Probing {bd} baud ({pn} probes, base {self._base})")
+
+            elif ph == "probe" and self._state == "probing" and bd == self._bd:
+                sq = hello_dict.get("sq")
+                if isinstance(sq, int):
+                    self._seen.add(sq)
+                if sq == self._pn - 1:
+                    self._finish_probe(volume)
+
+            elif ph == "commit":
+                self._base = transport.baud
+                if not tx.send(_hello_frame("ack", bd), volume):
+                    logger.error(f"[HELLO_FAIL] Ack send failed: {transport.get_error()}")
+                    return
+                _set_baud(transport, bd)
+                self._state, self._bd = "committed", bd
+                self._deadline = time.monotonic() + self.timeout
+
+            elif ph == "done" and bd == self._bd and (
+                    self._state in ("committed", "confirming")
+                    or self._state == "idle" and bd == transport.baud
+                    and time.monotonic() < self._deadline):
+                # A repeated done means the initiator missed our ready: answer
+                # it again, also when other traffic already closed the window
+                # (but not after it would have run out), and keep an open
+                # window open rather than confirming.
+                if self._state != "idle":
+                    self._state = "confirming"
+                    self._deadline = time.monotonic() + self.timeout
+                tx.send(_hello_frame("ready", bd), volume)
+            # ack / report / ready are initiator-bound (or our own echo), and a
+            # confirm only closes the window above: nothing more to do.
+
+    def heard_frame(self) -> None:
+        """A CRC-valid frame arrived at the current rate: the initiator is
+        there, so close a confirm window."""
+        with self._lock:
+            if self._state == "confirming":
+                self._confirm()
+
+    def _confirm(self) -> None:
+        self._state = "idle"
+        logger.info(f"[BAUD_NEGOTIATED] {self._bd} baud (was {self._base})")
+
+    def _finish_probe(self, volume: int) -> None:
+        tx = self._tx or transmitter
+        ok = len(self._seen)
+        _set_baud(tx.transport, self._base)
+        self._state = "idle"
+        logger.info(f"[BAUD_PROBE] {self._bd} baud | {ok}/{self._pn} probes CRC-valid")
+        tx.send(_hello_frame("report", self._bd, ok=ok, pn=self._pn), volume)
+
+    def check_timeout(self, volume: int) -> None:
+        """Close a probe burst whose window passed, or revert an unconfirmed commit."""
+        with self._lock:
+            if self._state == "idle" or time.monotonic() < self._deadline:
+                return
+            if self._state == "probing":
+                self._finish_probe(volume)
+            else:
+                missing = "done" if self._state == "committed" else "frame after ready"
+                logger.warning(
+                    f"[BAUD_NEGOTIATE] No {missing} at {self._bd} - reverting to {self._base}"
+                )
+                _set_baud((self._tx or transmitter).transport, self._base)
+                self._state = "idle"
+
+
+class LinkController:
+    """Runtime baud adaptation driven by CRC health.
+
+    Every CRC-verified frame is a success; a CRC mismatch or a retransmit
+    request from the peer (it could not decode our frame) is a failure.
+    ``fail_threshold`` consecutive failures schedule a step one rate down
+    ``candidates``; ``clean_streak`` consecutive successes below the highest
+    rate the link has run at schedule a step one rate up. A step is a
+    commit / ack / done / ready / confirm exchange with the peer's
+    ``HelloResponder``, run from ``tick`` (housekeeping) with replies fed in
+    by ``handle_reply``; both send and sleep with the controller's lock
+    released, so the receive path's outcome recording never waits on them.
+    As in ``negotiate_baud``, ``done`` goes out up to ``HELLO_DONE_ATTEMPTS``
+    times before the step is abandoned, so a lost ``ready`` does not leave the
+    peer's responder alone on the new rate. An up-step that does not confirm,
+    or that has to step back down before ``clean_streak`` clean frames at the
+    new rate, doubles the streak needed before the next try.
+    """
+
+    def __init__(self, tx: Transmitter | None = None,
+                 candidates: tuple[int, ...] = BAUD_CANDIDATES,
+                 fail_threshold: int = LINK_FAIL_THRESHOLD,
+                 clean_streak: int = LINK_CLEAN_STREAK,
+                 window: int = LINK_WINDOW,
+                 attempts: int = LINK_STEP_ATTEMPTS,
+                 timeout: float = HELLO_TIMEOUT,
+                 enabled: bool = LINK_ADAPT_ENABLED):
+        self._tx = tx
+        self.candidates = tuple(sorted(candidates))
+        self.fail_threshold = fail_threshold
+        self.clean_streak = clean_streak
+        self.attempts = attempts
+        self.timeout = timeout
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque(maxlen=window)
+        self._fail_run = 0
+        self._ok_run = 0
+        self._streak_needed = clean_streak
+        self._probation = False           # stepped up, not yet proven clean
+        self._ceiling = 0
+        self._retx_counts: dict = {}      # msg_id -> failures before delivery
+        self._target = 0                  # scheduled / in-flight step
+        self._base = 0
+        self._state = "idle"              # idle | stepping | confirming
+        self._tries = 0
+        self._dones = 0
+        self._deadline = 0.0
+        self.steps = {"down": 0, "up": 0, "failed": 0}
+
+    @property
+    def transport(self):
+        return (self._tx or transmitter).transport
+
+    # -- outcome tracking --------------------------------------------------
+
+    def record_success(self, msg_id: str = "") -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            self._fail_run = 0
+            self._ok_run += 1
+            retries = self._retx_counts.pop(msg_id, 0)
+            if retries:
+                logger.info(f"[LINK] ID: {msg_id} | Delivered after {retries} failure(s)")
+            baud = self.transport.baud
+            self._ceiling = max(self._ceiling, baud)
+            if self._probation and self._ok_run >= self.clean_streak:
+                self._probation = False
+                self._streak_needed = self.clean_streak
+            if (self.enabled and self._state == "idle" and not self._target
+                    and self._ok_run >= self._streak_needed and baud < self._ceiling):
+                self._target = self._next_rate(baud, up=True)
+
+    def record_failure(self, msg_id: str = "") -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            self._ok_run = 0
+            self._fail_run += 1
+            if msg_id:
+                self._retx_counts[msg_id] = self._retx_counts.get(msg_id, 0) + 1
+            baud = self.transport.baud
+            self._ceiling = max(self._ceiling, baud)
+            if (self.enabled and self._state == "idle" and not self._target
+                    and self._fail_run >= self.fail_threshold):
+                self._target = self._next_rate(baud, up=False)
+                if self._probation:                   # the last up-step did not hold
+                    self._probation = False
+                    self._streak_needed *= 2
+
+    def _next_rate(self, baud: int, up: bool) -> int:
+        """The neighbouring candidate rate, or 0 if there is none."""
+        if up:
+            higher = [c for c in self.candidates if baud < c <= self._ceiling]
+            return higher[0] if higher else 0
+        lower = [c for c in self.candidates if c < baud]
+        return lower[-1] if lower else 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            failed = sum(1 for ok in self._outcomes if not ok)
+            return {
+                "baud": self.transport.baud,
+                "window": len(self._outcomes),
+                "window_failures": failed,
+                "consecutive_failures": self._fail_run,
+                "clean_streak": self._ok_run,
+                "pending_retx": dict(self._retx_counts),
+                **self.steps,
+            }
+
+    # -- step exchange -----------------------------------------------------
+
+    def tick(self, volume: int) -> None:
+        """Start a scheduled step, or retry / abandon one that timed out."""
+        step = None
+        with self._lock:
+            now = time.monotonic()
+            if self._state == "idle":
+                if self._target:
+                    self._base = self.transport.baud
+                    self._tries = 0
+                    step = self._commit_step()
+            elif now >= self._deadline:
+                if self._state == "stepping" and self._tries < self.attempts:
+                    step = self._commit_step()
+                elif self._state == "confirming" and self._dones < HELLO_DONE_ATTEMPTS:
+                    logger.warning(
+                        f"[LINK_STEP] No ready at {self._target} baud "
+                        f"(done {self._dones}/{HELLO_DONE_ATTEMPTS}) - sending done again"
+                    )
+                    step = self._done_step()
+                else:
+                    self._abandon()
+        if step is not None:
+            self._transmit(volume, *step)
+
+    def _commit_step(self) -> tuple:
+        self._tries += 1
+        self._state = "stepping"
+        self._deadline = float("inf")         # timed from the end of the send
+        direction = "up" if self._target > self._base else "down"
+        failed = sum(1 for ok in self._outcomes if not ok)
+        logger.warning(
+            f"[LINK_STEP] {direction} {self._base} -> {self._target} baud "
+            f"(attempt {self._tries}/{self.attempts}) | {self._fail_run} consecutive "
+            f"failures, {failed}/{len(self._outcomes)} in window"
+        )
+        # Twice the hello timeout: a responder that acked (ack lost) reverts
+        # after one timeout, so a retry then lands on the base rate again.
+        return _hello_frame("commit", self._target), "stepping", 2 * self.timeout
+
+    def _done_step(self) -> tuple:
+        self._dones += 1
+        self._deadline = float("inf")
+        # The peer's responder holds the new rate for one timeout after each
+        # ready (and after its ack): every done still finds it there.
+        return (_hello_frame("done", self._target), "confirming",
+                self.timeout / HELLO_DONE_ATTEMPTS)
+
+    def _transmit(self, volume: int, frame: str, state: str, wait: float,
+                  settle: float = 0.0) -> None:
+        """Send a step frame with the lock released (the send waits out the
+        frame's airtime, and ``record_success`` / ``record_failure`` must not
+        wait with it), then time the reply from the end of the send."""
+        try:
+            if settle:
+                time.sleep(settle)
+            (self._tx or transmitter).send(frame, volume)
+        finally:
+            with self._lock:
+                if self._state == state and self._deadline == float("inf"):
+                    self._deadline = time.monotonic() + wait
+
+    def _abandon(self) -> None:
+        if self._state == "confirming":
+            _set_baud(self.transport, self._base)
+        logger.warning(
+            f"[LINK_STEP] {self._base} -> {self._target} baud not confirmed - "
+            f"staying at {self._base}"
+        )
+        if self._target > self._base:
+            self._streak_needed *= 2                      # back off further up-steps
+        self.steps["failed"] += 1
+        self._reset_step()
+
+    def _reset_step(self) -> None:
+        self._state = "idle"
+        self._target = 0
+        self._fail_run = 0
+        self._ok_run = 0
+
+    def follow(self, baud: int) -> None:
+        """The peer moved to ``baud`` on its own: drop any step in progress
+        and start the failure / clean-streak accounting afresh there."""
+        with self._lock:
+            if self._target:
+                logger.info(f"[LINK_STEP] Step to {self._target} baud dropped - peer is at {baud}")
+            self._outcomes.clear()
+            self._reset_step()
+
+    def handle_reply(self, hello_dict: dict, volume: int) -> None:
+        """Feed an ``ack`` / ``ready`` hello frame from the peer."""
+        if not _hello_crc_ok(hello_dict):
+            return
+        ph = hello_dict.get("ph")
+        step = confirm = None
+        with self._lock:
+            if hello_dict.get("bd") != self._target:
+                return
+            if ph == "ack" and self._state == "stepping":
+                _set_baud(self.transport, self._target)
+                self._state = "confirming"
+                self._dones = 0
+                step = self._done_step() + (HELLO_SETTLE,)   # the peer retunes after its ack
+            elif ph == "ready" and self._state == "confirming":
+                up = self._target > self._base
+                self.steps["up" if up else "down"] += 1
+                self._probation = up
+                logger.info(
+                    f"[BAUD_NEGOTIATED] Link stepped {'up' if up else 'down'} "
+                    f"{self._base} -> {self._target} baud"
+                )
+                self._outcomes.clear()
+                confirm = _hello_frame("confirm", self._target)
+                self._reset_step()
+        if step is not None:
+            self._transmit(volume, *step)
+        elif confirm is not None:
+            (self._tx or transmitter).send(confirm, volume)
+
+
+# Shared responder / link controller used by the backend main loops.
+hello_responder = HelloResponder()
+link_controller = LinkController()
+
+
+def handle_hello_request(hello_dict: dict, volume: int) -> None:
+    """Serve one received ``fn:"hello"`` frame: replies to a step this end
+    started go to the link controller, everything else to the responder."""
+    if hello_dict.get("ph") in ("ack", "ready"):
+        link_controller.handle_reply(hello_dict, volume)
+    else:
+        hello_responder.handle(hello_dict, volume)
+
+
+def check_hello_timeout(volume: int) -> None:
+    """Housekeeping hook for the hello responder's and link controller's timers."""
+    hello_responder.check_timeout(volume)
+    link_controller.tick(volume)
+
+
+# ---------------------------------------------------------------------------
+# Sender-rate detection (candidate-baud RX)
+# ---------------------------------------------------------------------------
+#
+# With ``set_rx_bauds`` the modem runs a demodulator per candidate rate over
+# the same audio, so every transmission also comes out of the wrong-rate
+# decoders as noise. Only a frame whose CRC checks is trusted to say which
+# rate the sender is at; the backend then answers at that rate.
+
+def frame_crc_ok(chunk_dict: dict) -> bool:
+    """True if a single frame's ``crc`` matches its ``ct``. Unlike
+    ``handle_received_chunk`` a mismatch requests nothing."""
+    ct = chunk_dict.get("ct")
+    return isinstance(ct, str) and _crc_matches(chunk_dict.get("crc"), crc32_str(ct))
+
+
+def follow_sender_baud(baud: int, tx: Transmitter | None = None) -> None:
+    """Retune this end to ``baud``, the rate the peer was heard sending at,
+    so replies (and the link controller) continue there."""
+    transport = (tx or transmitter).transport
+    old = transport.baud
+    _set_baud(transport, baud)
+    logger.warning(f"[BAUD_DETECTED] Peer is sending at {baud} baud - link retuned {old} -> {baud}")
+    link_controller.follow(baud)
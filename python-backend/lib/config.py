@@ -18,6 +18,28 @@ MODEM_PAYLOAD_LIMIT = 140     # Max bytes per minimodem transmission (dormant ch
 CHUNK_DATA_SIZE = 70           # Max base64 content chars per chunk
 INTER_CHUNK_DELAY = 0.5        # Seconds between chunk transmissions
 CHUNK_REASSEMBLY_TIMEOUT = 30  # Seconds before requesting retransmission
+TX_DONE_TIMEOUT = 60           # Max seconds to wait for one transmission to play out
+TX_LEADER_BITS = 2             # Default mark bits before each transmission (set_tx_framing)
+TX_TRAILER_BITS = 2            # Default mark bits after each transmission
+
+# ==================== Baud Negotiation (fn:"hello") ====================
+BAUD_CANDIDATES = (1200, 2400, 4800, 9600)  # Safe rate first, then the step-up ladder
+BAUD_PROBE_COUNT = 5           # CRC-protected probe frames sent at each candidate rate
+BAUD_MIN_PASS_RATE = 0.8       # Fraction of probes that must pass CRC to accept a rate
+HELLO_TIMEOUT = 5.0            # Seconds to wait for each hello reply (ack/report/ready)
+HELLO_PROBE_SLACK = 2.0        # Extra seconds the responder waits for a probe burst
+HELLO_SETTLE = 0.05            # Seconds the peer gets to retune after its ack before we send at the new rate
+HELLO_DONE_ATTEMPTS = 2        # "done" sends before a commit without a "ready" falls back
+
+# ==================== Adaptive Link Control ====================
+LINK_ADAPT_ENABLED = True      # Step the baud down/up at runtime on CRC health
+LINK_FAIL_THRESHOLD = 3        # Consecutive CRC failures / retx requests before stepping down
+LINK_CLEAN_STREAK = 20         # Consecutive clean frames before trying one rate up
+LINK_WINDOW = 20               # Rolling window (frames) for the logged failure rate
+LINK_STEP_ATTEMPTS = 3         # Commit attempts per step before giving up
+
+# ==================== Link Statistics ====================
+STATS_LOG_INTERVAL = 60.0      # Seconds between [LINK_STATS] summaries in the log (0 disables)
 
 
 def setup_logging() -> logging.Logger:
@@ -56,14 +78,27 @@ def setup_logging() -> logging.Logger:
 logger = setup_logging()
 
 
-def truncate_for_log(text: str) -> str:
-    """Truncate long text for logging."""
-    text = text.replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n")
+def truncate_for_log(text) -> str:
+    """Truncate long text for logging.
+
+    ``text`` may also be a received buffer (bytes / memoryview); only the part
+    that will be logged is decoded.
+    """
+    if not isinstance(text, str):
+        total = len(text)
+        text = str(text[:LOG_MAX_CONTENT_LENGTH], "utf-8", "replace")
+        if total > LOG_MAX_CONTENT_LENGTH:
+            return _escape_newlines(text) + f"... [truncated, {total} total bytes]"
+    text = _escape_newlines(text)
     if len(text) > LOG_MAX_CONTENT_LENGTH:
         return text[:LOG_MAX_CONTENT_LENGTH] + f"... [truncated, {len(text)} total chars]"
     return text
 
 
+def _escape_newlines(text: str) -> str:
+    return text.replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n")
+
+
 def log_session_start():
     """Log session start with separator."""
     separator = "=" * 80
@@ -5,7 +5,32 @@ ctypes binding to the minimodem FSK wrapper shared library
 This is the minimodem FSK transport binding (replaced the old ggwave Python binding). The wrapper
 mirrors ``ggwave_simple.h`` / ``minimodem_simple.h`` exactly so this binding is
 symmetric with the AHK frontend's ``DllCall`` model: same 12-function API, with
-``protocolId`` replaced by ``baud`` (and ``set_protocol`` -> ``set_baud``).
+``protocolId`` replaced by ``baud`` (and ``set_protocol`` -> ``set_baud``), plus
+``receive_wait`` so a host that can block sleeps until a line is queued,
+``peek_length`` so a receive buffer can be sized to the queued line,
+``receive_many`` to drain a burst of queued lines in one FFI round trip, and
+``wait_transmit_done`` so a sender wakes the moment the FSK signal has played
+out instead of polling ``is_transmitting``, and ``get_stats`` for the wrapper's
+counter block (``MinimodemStats``). ``init(..., carriers=N)`` selects the
+wrapper's multi-carrier mode (``minimodem_simple_init_multi``): N tone pairs in
+separate bands with each message striped across them; ``max_carriers`` reports
+how many fit at a baud. ``set_rx_bauds`` has the wrapper decode extra candidate
+bauds in parallel (one demodulator thread each); ``received_bauds`` reports
+which rate decoded each line of the last ``receive_many`` batch, so the backend
+can answer a sender that changed speed. ``set_duplex`` splits the band plan
+between the two directions so the wrapper keeps receiving while it sends
+(the far end picks the opposite side). ``set_tones`` switches the link to
+MFSK (4 or 8 tones, 2-3 bits per symbol; ``max_tones`` reports what fits at a
+baud). ``set_char_framing`` selects 7-bit characters (7-N-1, nine bit times
+per byte instead of ten) for ASCII-only frames, and the stop bits.
+``set_framing_mode`` swaps the per-character start/stop frames for an
+HDLC-style synchronous bitstream (flags, bit stuffing, NRZI): eight bit times
+per byte and a cheaper receiver. ``render`` returns the samples a send would
+play (a ctypes float array) and ``send_pcm`` plays such samples back in one
+device write, so a frame that is sent again need not be re-synthesised.
+``capture_start`` / ``capture_stop`` tee the raw RX
+samples into a memory-mapped ring file (format in ``lib.capture``) for offline
+replay with ``tools/replay_capture.py``.
 
 Security (07-RESEARCH.md Threat Model — ctypes signature mismatch): EXPLICIT
 ``restype``/``argtypes`` are set on every bound function. A wrong/implicit
@@ -14,9 +39,14 @@ is always called with a sized ``ctypes.create_string_buffer`` and only the
 returned length is decoded (bounds respected).
 
 Framing: the wrapper's background RX thread accumulates the FSK byte stream and
-queues complete newline-delimited messages. ``receive`` drains ONE such line at
-a time (the trailing newline is consumed by the wrapper); this binding returns
-the decoded JSON line string.
+queues complete newline-delimited messages (at most ``set_line_limits`` bytes
+each, that many lines deep). ``receive`` drains ONE such line at a time (the
+trailing newline is consumed by the wrapper): it peeks the line's length, grows
+one reusable buffer to fit, and returns the decoded JSON line string, so a
+frame longer than ``RECEIVE_BUFFER_SIZE`` arrives whole. ``receive_many`` drains every queued line into a
+single preallocated buffer + length table and returns ``memoryview`` slices of
+it — no per-line allocation, but the views are only valid until the next
+``receive_many`` call.
 """
 
 import ctypes
@@ -42,6 +72,110 @@ _LIB_DIR = os.path.dirname(os.path.abspath(__file__))
 _lib = None  # populated by load()
 
 
+# ---------------------------------------------------------------------------
+# RX bit detectors (MM_DETECTOR_* in minimodem_simple.h)
+# ---------------------------------------------------------------------------
+
+DETECTOR_DEFAULT = 0     # FFT if the wrapper links FFTW, else Goertzel
+DETECTOR_FFT = 1
+DETECTOR_GOERTZEL = 2
+DETECTORS = {"default": DETECTOR_DEFAULT, "fft": DETECTOR_FFT, "goertzel": DETECTOR_GOERTZEL}
+
+# RX energy squelch (MM_SQUELCH_*): open level in dBFS of tone amplitude.
+SQUELCH_OFF = 0
+SQUELCH_DEFAULT_DBFS = -60
+
+# RX decimation cap (MM_DECIMATION_*): the demodulator runs at 48000 / D.
+DECIMATION_AUTO = 0      # the wrapper picks D per baud
+DECIMATION_OFF = 1
+DECIMATION_MAX = 12
+
+# Candidate bauds decoded alongside the link baud (MM_MAX_RX_BAUDS).
+MAX_RX_BAUDS = 4
+
+# Duplex modes (MM_DUPLEX_*): full duplex transmits on one half of the band
+# plan and receives on the other; the two ends pick opposite sides.
+DUPLEX_HALF = 0
+DUPLEX_LOW = 1           # transmit on the low bands, receive on the high
+DUPLEX_HIGH = 2          # transmit on the high bands, receive on the low
+DUPLEX_MODES = {"half": DUPLEX_HALF, "low": DUPLEX_LOW, "high": DUPLEX_HIGH}
+
+# Tones per symbol (MM_TONES_BFSK / MM_MAX_TONES): binary FSK, or MFSK with
+# 4 or 8 tones one baud apart (2 or 3 bits per symbol).
+TONES_BFSK = 2
+MAX_TONES = 8
+TONE_COUNTS = (TONES_BFSK, 4, MAX_TONES)
+
+# Character framing (MM_DATA_BITS_* / MM_STOP_BITS_*): 8-N-1 by default,
+# 7-N-1 for 7-bit ASCII frames.
+DATA_BITS_DEFAULT = 8
+DATA_BITS_ASCII = 7
+STOP_BITS_DEFAULT = 1
+STOP_BITS_MAX = 2
+
+# Link framing (MM_FRAMING_*): async start/stop frames, or the HDLC
+# synchronous bitstream behind MM_HDLC_PREAMBLE_FLAGS flags.
+FRAMING_ASYNC = 0
+FRAMING_HDLC = 1
+FRAMING_MODES = {"async": FRAMING_ASYNC, "hdlc": FRAMING_HDLC}
+HDLC_PREAMBLE_FLAGS = 4
+
+# MM_RX_TIMES_PER_LINE: carrier acquired, last byte decoded, dequeued.
+RX_TIMES_PER_LINE = 3
+
+# Received-line caps (MM_LINE_MAX_LEN_* / MM_QUEUE_MAX_LINES_*).
+LINE_MAX_LEN_DEFAULT = 8192
+LINE_MAX_LEN_LIMIT = 262144
+QUEUE_MAX_LINES_DEFAULT = 64
+QUEUE_MAX_LINES_LIMIT = 1024
+
+# TX framing (MM_TX_*): mark bits around every transmission, idle-carrier hold.
+TX_LEADER_BITS_DEFAULT = 2
+TX_TRAILER_BITS_DEFAULT = 2
+TX_FRAMING_BITS_MAX = 1024
+TX_HOLD_OFF = 0
+TX_HOLD_MAX_MS = 10000
+
+
+# ---------------------------------------------------------------------------
+# Statistics block (mirrors struct minimodem_simple_stats)
+# ---------------------------------------------------------------------------
+
+# MM_STATS_CONFIDENCE_BINS / MM_STATS_CONFIDENCE_EDGES: bin i counts decoded
+# frames with confidence below CONFIDENCE_EDGES[i]; the last bin is the rest.
+CONFIDENCE_BINS = 8
+CONFIDENCE_EDGES = (2.0, 3.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+
+class MinimodemStats(ctypes.Structure):
+    """ctypes layout of ``minimodem_simple_stats`` (field order is the ABI)."""
+
+    _fields_ = [
+        ("bytes_demodulated", ctypes.c_ulonglong),
+        ("bytes_discarded_tx", ctypes.c_ulonglong),
+        ("lines_queued", ctypes.c_ulonglong),
+        ("lines_dropped", ctypes.c_ulonglong),
+        ("lines_truncated", ctypes.c_ulonglong),
+        ("queue_depth", ctypes.c_ulonglong),
+        ("queue_high_water", ctypes.c_ulonglong),
+        ("carrier_acquired", ctypes.c_ulonglong),
+        ("carrier_lost", ctypes.c_ulonglong),
+        ("confidence_hist", ctypes.c_ulonglong * CONFIDENCE_BINS),
+        ("tx_bytes", ctypes.c_ulonglong),
+        ("tx_seconds", ctypes.c_double),
+        ("squelch_open", ctypes.c_ulonglong),
+        ("squelch_opened", ctypes.c_ulonglong),
+        ("squelch_skipped", ctypes.c_ulonglong),
+        ("tx_leaders_skipped", ctypes.c_ulonglong),
+    ]
+
+    def to_dict(self) -> dict:
+        """Plain-dict copy (the histogram becomes a list)."""
+        out = {name: getattr(self, name) for name, _ in self._fields_}
+        out["confidence_hist"] = list(self.confidence_hist)
+        return out
+
+
 def _resolve_lib_path() -> str:
     """Resolve an absolute path to the wrapper .so, with sensible fallbacks."""
     search_dirs = [
@@ -64,12 +198,24 @@ def _bind_signatures(lib: ctypes.CDLL) -> None:
     """Set EXPLICIT restype/argtypes on every exported function.
 
     Security: an implicit/incorrect signature can corrupt memory across the FFI
-    boundary, so all 12 exports are pinned here.
+    boundary, so every export is pinned here.
     """
     # int minimodem_simple_init(int playback, int capture, int baud)
     lib.minimodem_simple_init.restype = ctypes.c_int
     lib.minimodem_simple_init.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
 
+    # int minimodem_simple_init_multi(int playback, int capture, int baud, int carriers)
+    lib.minimodem_simple_init_multi.restype = ctypes.c_int
+    lib.minimodem_simple_init_multi.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+
+    # int minimodem_simple_max_carriers(int baud)
+    lib.minimodem_simple_max_carriers.restype = ctypes.c_int
+    lib.minimodem_simple_max_carriers.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_max_tones(int baud)
+    lib.minimodem_simple_max_tones.restype = ctypes.c_int
+    lib.minimodem_simple_max_tones.argtypes = [ctypes.c_int]
+
     # int minimodem_simple_get_playback_device_count(void)
     lib.minimodem_simple_get_playback_device_count.restype = ctypes.c_int
     lib.minimodem_simple_get_playback_device_count.argtypes = []
@@ -90,10 +236,29 @@ def _bind_signatures(lib: ctypes.CDLL) -> None:
     lib.minimodem_simple_send.restype = ctypes.c_int
     lib.minimodem_simple_send.argtypes = [ctypes.c_char_p, ctypes.c_int]
 
+    # int minimodem_simple_send_many(const char* const* frames, int count, int volume)
+    lib.minimodem_simple_send_many.restype = ctypes.c_int
+    lib.minimodem_simple_send_many.argtypes = [ctypes.POINTER(ctypes.c_char_p), ctypes.c_int,
+                                               ctypes.c_int]
+
+    # int minimodem_simple_render(const char* message, int volume, float* samples, int maxSamples)
+    lib.minimodem_simple_render.restype = ctypes.c_int
+    lib.minimodem_simple_render.argtypes = [ctypes.c_char_p, ctypes.c_int,
+                                            ctypes.POINTER(ctypes.c_float), ctypes.c_int]
+
+    # int minimodem_simple_send_pcm(const float* samples, int count, int nbytes, int volume)
+    lib.minimodem_simple_send_pcm.restype = ctypes.c_int
+    lib.minimodem_simple_send_pcm.argtypes = [ctypes.POINTER(ctypes.c_float), ctypes.c_int,
+                                              ctypes.c_int, ctypes.c_int]
+
     # int minimodem_simple_is_transmitting(void)
     lib.minimodem_simple_is_transmitting.restype = ctypes.c_int
     lib.minimodem_simple_is_transmitting.argtypes = []
 
+    # int minimodem_simple_wait_transmit_done(int timeoutMs)
+    lib.minimodem_simple_wait_transmit_done.restype = ctypes.c_int
+    lib.minimodem_simple_wait_transmit_done.argtypes = [ctypes.c_int]
+
     # int minimodem_simple_process(void)
     lib.minimodem_simple_process.restype = ctypes.c_int
     lib.minimodem_simple_process.argtypes = []
@@ -102,10 +267,100 @@ def _bind_signatures(lib: ctypes.CDLL) -> None:
     lib.minimodem_simple_receive.restype = ctypes.c_int
     lib.minimodem_simple_receive.argtypes = [ctypes.c_char_p, ctypes.c_int]
 
+    # int minimodem_simple_receive_wait(char* buffer, int bufferSize, int timeoutMs)
+    lib.minimodem_simple_receive_wait.restype = ctypes.c_int
+    lib.minimodem_simple_receive_wait.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_int]
+
+    # int minimodem_simple_peek_length(int timeoutMs)
+    lib.minimodem_simple_peek_length.restype = ctypes.c_int
+    lib.minimodem_simple_peek_length.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_receive_many(char* buffer, int bufferSize,
+    #                                   int* lengths, int maxLines, int timeoutMs)
+    lib.minimodem_simple_receive_many.restype = ctypes.c_int
+    lib.minimodem_simple_receive_many.argtypes = [
+        ctypes.c_char_p, ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int), ctypes.c_int, ctypes.c_int,
+    ]
+
+    # int minimodem_simple_receive_many_bauds(char* buffer, int bufferSize, int* lengths,
+    #                                         int* bauds, int maxLines, int timeoutMs)
+    lib.minimodem_simple_receive_many_bauds.restype = ctypes.c_int
+    lib.minimodem_simple_receive_many_bauds.argtypes = [
+        ctypes.c_char_p, ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.c_int, ctypes.c_int,
+    ]
+
+    # int minimodem_simple_receive_many_timed(char* buffer, int bufferSize, int* lengths,
+    #                                         int* bauds, double* times, int maxLines,
+    #                                         int timeoutMs)
+    lib.minimodem_simple_receive_many_timed.restype = ctypes.c_int
+    lib.minimodem_simple_receive_many_timed.argtypes = [
+        ctypes.c_char_p, ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_double), ctypes.c_int, ctypes.c_int,
+    ]
+
     # int minimodem_simple_set_baud(int baud)
     lib.minimodem_simple_set_baud.restype = ctypes.c_int
     lib.minimodem_simple_set_baud.argtypes = [ctypes.c_int]
 
+    # int minimodem_simple_set_tones(int tones)
+    lib.minimodem_simple_set_tones.restype = ctypes.c_int
+    lib.minimodem_simple_set_tones.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_set_line_limits(int maxLineLen, int maxLines)
+    lib.minimodem_simple_set_line_limits.restype = ctypes.c_int
+    lib.minimodem_simple_set_line_limits.argtypes = [ctypes.c_int, ctypes.c_int]
+
+    # int minimodem_simple_set_char_framing(int dataBits, int stopBits)
+    lib.minimodem_simple_set_char_framing.restype = ctypes.c_int
+    lib.minimodem_simple_set_char_framing.argtypes = [ctypes.c_int, ctypes.c_int]
+
+    # int minimodem_simple_set_framing_mode(int mode)
+    lib.minimodem_simple_set_framing_mode.restype = ctypes.c_int
+    lib.minimodem_simple_set_framing_mode.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_set_tx_framing(int leaderBits, int trailerBits)
+    lib.minimodem_simple_set_tx_framing.restype = ctypes.c_int
+    lib.minimodem_simple_set_tx_framing.argtypes = [ctypes.c_int, ctypes.c_int]
+
+    # int minimodem_simple_set_tx_hold(int holdMs)
+    lib.minimodem_simple_set_tx_hold.restype = ctypes.c_int
+    lib.minimodem_simple_set_tx_hold.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_set_duplex(int mode)
+    lib.minimodem_simple_set_duplex.restype = ctypes.c_int
+    lib.minimodem_simple_set_duplex.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_set_rx_bauds(const int* bauds, int count)
+    lib.minimodem_simple_set_rx_bauds.restype = ctypes.c_int
+    lib.minimodem_simple_set_rx_bauds.argtypes = [ctypes.POINTER(ctypes.c_int), ctypes.c_int]
+
+    # int minimodem_simple_set_detector(int detector)
+    lib.minimodem_simple_set_detector.restype = ctypes.c_int
+    lib.minimodem_simple_set_detector.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_set_squelch(int openDbfs)
+    lib.minimodem_simple_set_squelch.restype = ctypes.c_int
+    lib.minimodem_simple_set_squelch.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_set_decimation(int maxFactor)
+    lib.minimodem_simple_set_decimation.restype = ctypes.c_int
+    lib.minimodem_simple_set_decimation.argtypes = [ctypes.c_int]
+
+    # int minimodem_simple_get_stats(minimodem_simple_stats* stats)
+    lib.minimodem_simple_get_stats.restype = ctypes.c_int
+    lib.minimodem_simple_get_stats.argtypes = [ctypes.POINTER(MinimodemStats)]
+
+    # int minimodem_simple_capture_start(const char* path, int seconds)
+    lib.minimodem_simple_capture_start.restype = ctypes.c_int
+    lib.minimodem_simple_capture_start.argtypes = [ctypes.c_char_p, ctypes.c_int]
+
+    # int minimodem_simple_capture_stop(void)
+    lib.minimodem_simple_capture_stop.restype = ctypes.c_int
+    lib.minimodem_simple_capture_stop.argtypes = []
+
     # void minimodem_simple_cleanup(void)
     lib.minimodem_simple_cleanup.restype = None
     lib.minimodem_simple_cleanup.argtypes = []
@@ -141,20 +396,59 @@ def _require() -> ctypes.CDLL:
 # Thin Python helpers over the bound functions
 # ---------------------------------------------------------------------------
 
-# Default receive buffer size; mirrors the AHK frontend's 512-byte drain buffer.
+# Initial receive buffer size; mirrors the AHK frontend's 512-byte drain buffer.
+# ``receive`` grows its reusable buffer past it to fit each queued line.
 RECEIVE_BUFFER_SIZE = 512
 
+# receive_many: one reusable buffer + length table, allocated on first use.
+# 64 lines matches the wrapper's default queue depth, so one call can empty it;
+# the buffer holds at least two lines at the configured line cap.
+RECEIVE_MANY_BUFFER_SIZE = 16384
+RECEIVE_MANY_MAX_LINES = 64
+
+# render: one reusable sample buffer the wrapper renders into, grown to the
+# longest waveform; each render's samples are copied out of it at their size.
+RENDER_BUFFER_SAMPLES = 1 << 18
+
+_recv_buf = None    # ctypes char array, grown to the longest line received
+_render_buf = None  # ctypes float array (>= RENDER_BUFFER_SAMPLES)
+_line_max = LINE_MAX_LEN_DEFAULT   # as passed to set_line_limits
 
-def init(playback_device_id: int = -1, capture_device_id: int = -1, baud: int = 1200) -> int:
+_many_buf = None    # ctypes char array (>= RECEIVE_MANY_BUFFER_SIZE)
+_many_view = None   # memoryview over _many_buf, sliced per line
+_many_lens = None   # ctypes int array (RECEIVE_MANY_MAX_LINES)
+_many_bauds = None  # ctypes int array: baud that decoded each line
+_many_times = None  # ctypes double array: RX_TIMES_PER_LINE stamps per line
+_many_count = 0     # lines in the last receive_many batch
+
+
+def init(playback_device_id: int = -1, capture_device_id: int = -1, baud: int = 1200,
+         carriers: int = 1) -> int:
     """Initialize minimodem with the given device indices and baud.
 
-    -1 selects the system default device. Returns 0 on success, negative on error.
+    -1 selects the system default device. ``carriers > 1`` runs that many
+    parallel tone pairs (both ends MUST agree, as for baud; see
+    ``max_carriers``). Returns 0 on success, negative on error.
     """
-    return _require().minimodem_simple_init(
-        int(playback_device_id), int(capture_device_id), int(baud)
+    if carriers == 1:
+        return _require().minimodem_simple_init(
+            int(playback_device_id), int(capture_device_id), int(baud)
+        )
+    return _require().minimodem_simple_init_multi(
+        int(playback_device_id), int(capture_device_id), int(baud), int(carriers)
     )
 
 
+def max_carriers(baud: int) -> int:
+    """How many carriers fit the wrapper's band plan at ``baud`` (0 if invalid)."""
+    return _require().minimodem_simple_max_carriers(int(baud))
+
+
+def max_tones(baud: int) -> int:
+    """The most tones per symbol that fit the band plan at ``baud`` (0 if invalid)."""
+    return _require().minimodem_simple_max_tones(int(baud))
+
+
 def get_playback_device_count() -> int:
     return _require().minimodem_simple_get_playback_device_count()
 
@@ -178,37 +472,307 @@ def send(message: str, volume: int = 50) -> int:
     return _require().minimodem_simple_send(message.encode("utf-8"), int(volume))
 
 
+def send_many(frames, volume: int = 50) -> int:
+    """Send newline-framed ``frames`` as one burst: one leader, the frames back
+    to back on a continuous carrier, one trailer. Returns 0 on success."""
+    encoded = [frame.encode("utf-8") for frame in frames]
+    array = (ctypes.c_char_p * max(1, len(encoded)))(*encoded)
+    return _require().minimodem_simple_send_many(array, len(encoded), int(volume))
+
+
+def render(message: str, volume: int = 50):
+    """The samples ``send(message, volume)`` would play at the current link
+    settings (leader included), as a ctypes float array for ``send_pcm``;
+    None on error (see ``get_error``)."""
+    global _render_buf
+    lib = _require()
+    data = message.encode("utf-8")
+    if _render_buf is None:
+        _render_buf = (ctypes.c_float * RENDER_BUFFER_SAMPLES)()
+    n = lib.minimodem_simple_render(data, int(volume), _render_buf, len(_render_buf))
+    if n > len(_render_buf):                            # did not fit: grow and render again
+        _render_buf = (ctypes.c_float * n)()
+        n = lib.minimodem_simple_render(data, int(volume), _render_buf, len(_render_buf))
+    if n <= 0:
+        return None
+    samples = (ctypes.c_float * n)()
+    ctypes.memmove(samples, _render_buf, n * ctypes.sizeof(ctypes.c_float))
+    return samples
+
+
+def send_pcm(samples, nbytes: int = 0, volume: int = 0) -> int:
+    """Play pre-rendered samples (``render``'s array, a float32 buffer or a
+    sequence of floats) as one transmission; ``nbytes`` payload bytes count
+    towards tx_bytes. While the idle carrier is held the leader at the front
+    of the samples is skipped, as ``send`` skips it. ``volume`` is the one the
+    samples were rendered at, for the held carrier after them (0 keeps the
+    last send / render volume). Returns 0 on success."""
+    if isinstance(samples, (list, tuple)):
+        samples = (ctypes.c_float * len(samples))(*samples)
+    elif not isinstance(samples, ctypes.Array):
+        samples = (ctypes.c_float * len(samples)).from_buffer_copy(samples)
+    return _require().minimodem_simple_send_pcm(samples, len(samples), int(nbytes),
+                                                int(volume))
+
+
 def is_transmitting() -> bool:
     """True while a transmission is still in flight."""
     return bool(_require().minimodem_simple_is_transmitting())
 
 
+def wait_transmit_done(timeout: float | None = None) -> bool:
+    """Block until the in-flight transmission (if any) has finished.
+
+    Parks in the wrapper on a condition variable that ``send`` signals, with the
+    GIL released. ``timeout`` is in seconds; None returns the current state
+    without waiting. Returns True once idle, False on timeout or error.
+    """
+    timeout_ms = 0 if timeout is None else max(0, int(timeout * 1000))
+    return _require().minimodem_simple_wait_transmit_done(timeout_ms) == 1
+
+
 def process() -> int:
     """Housekeeping poll (near no-op; the wrapper RX thread does the demod)."""
     return _require().minimodem_simple_process()
 
 
-def receive(buffer_size: int = RECEIVE_BUFFER_SIZE) -> str | None:
+def peek_length(timeout: float | None = None) -> int:
+    """Length of the oldest queued line without dequeuing it (0 if none is
+    queued, negative on error). A ``timeout`` in seconds waits for a line as
+    ``receive(timeout=...)`` does."""
+    timeout_ms = 0 if timeout is None else max(0, int(timeout * 1000))
+    return _require().minimodem_simple_peek_length(timeout_ms)
+
+
+def receive(buffer_size: int | None = None, timeout: float | None = None) -> str | None:
     """Drain ONE received newline-delimited message.
 
-    Passes a sized ``create_string_buffer`` and decodes only the returned length
-    (bounds respected). Returns the decoded JSON line string, or None if no
-    message is queued (length 0) / on error (negative length).
+    With ``timeout=None`` this is a non-blocking poll. With a timeout (seconds)
+    the call parks in the wrapper until a line is queued or the timeout
+    elapses; ctypes releases the GIL for the duration, so other Python threads
+    keep running.
+
+    By default the line's length is peeked first (``peek_length``, which does
+    the waiting) and one module buffer is grown to fit it, so no line is ever
+    cut short. An explicit ``buffer_size`` uses a fresh buffer of that size and
+    the wrapper's truncation instead (``minimodem_simple_receive_wait``).
+    Decodes only the returned length (bounds respected). Returns the decoded
+    JSON line string, or None if no message is queued (length 0) / on timeout /
+    on error (negative length).
     """
-    buf = ctypes.create_string_buffer(buffer_size)
-    n = _require().minimodem_simple_receive(buf, buffer_size)
+    global _recv_buf
+    lib = _require()
+    timeout_ms = 0 if timeout is None else max(0, int(timeout * 1000))
+    if buffer_size is None:
+        needed = lib.minimodem_simple_peek_length(timeout_ms) + 1
+        if needed <= 0:
+            return None
+        if _recv_buf is None or len(_recv_buf) < needed:
+            _recv_buf = ctypes.create_string_buffer(max(needed, RECEIVE_BUFFER_SIZE))
+        buf = _recv_buf
+        n = lib.minimodem_simple_receive(buf, len(buf))
+    else:
+        buf = ctypes.create_string_buffer(buffer_size)
+        n = lib.minimodem_simple_receive_wait(buf, buffer_size, timeout_ms)
     if n <= 0:
         return None
     # Respect the returned length; never read past it.
-    n = min(n, buffer_size)
+    n = min(n, len(buf))
     return buf.raw[:n].decode("utf-8", "replace")
 
 
+def receive_many(max_lines: int = RECEIVE_MANY_MAX_LINES,
+                 timeout: float | None = None) -> list[memoryview]:
+    """Drain up to ``max_lines`` queued messages in one FFI call.
+
+    Returns a list of raw (undecoded) ``memoryview`` slices of one reusable
+    module buffer, oldest first; empty if nothing is queued (or the timeout
+    elapsed). A ``timeout`` in seconds waits for at least one line, as
+    ``receive(timeout=...)`` does.
+
+    The views alias the shared buffer: consume (or copy) them before the next
+    ``receive_many`` call. ``received_bauds`` gives the baud of each line and
+    ``received_times`` its timestamps.
+    """
+    global _many_buf, _many_view, _many_lens, _many_bauds, _many_times, _many_count
+    size = max(RECEIVE_MANY_BUFFER_SIZE, 2 * _line_max)
+    if _many_buf is None or len(_many_buf) < size:
+        _many_buf = ctypes.create_string_buffer(size)
+        _many_view = memoryview(_many_buf).cast("B")
+        _many_lens = (ctypes.c_int * RECEIVE_MANY_MAX_LINES)()
+        _many_bauds = (ctypes.c_int * RECEIVE_MANY_MAX_LINES)()
+        _many_times = (ctypes.c_double * (RX_TIMES_PER_LINE * RECEIVE_MANY_MAX_LINES))()
+
+    max_lines = max(1, min(int(max_lines), RECEIVE_MANY_MAX_LINES))
+    timeout_ms = 0 if timeout is None else max(0, int(timeout * 1000))
+    n = _require().minimodem_simple_receive_many_timed(
+        _many_buf, len(_many_buf), _many_lens, _many_bauds, _many_times, max_lines, timeout_ms
+    )
+    _many_count = max(0, n)
+    lines: list[memoryview] = []
+    offset = 0
+    for i in range(max(0, n)):
+        length = _many_lens[i]
+        lines.append(_many_view[offset:offset + length])
+        offset += length
+    return lines
+
+
+def received_bauds() -> list[int]:
+    """The baud that decoded each line of the last ``receive_many`` batch (the
+    link baud, or a ``set_rx_bauds`` candidate), in the same order."""
+    return list(_many_bauds[:_many_count]) if _many_bauds is not None else []
+
+
+def received_times() -> list[tuple[float, float, float]]:
+    """``(carrier_acquired, decoded, dequeued)`` for each line of the last
+    ``receive_many`` batch, in ``time.monotonic()`` seconds: the carrier lock
+    the line arrived on (shared by the lines of one burst), the decode of its
+    last byte, and the ``receive_many`` call that drained it."""
+    if _many_times is None:
+        return []
+    flat = _many_times[:RX_TIMES_PER_LINE * _many_count]
+    return [tuple(flat[i:i + RX_TIMES_PER_LINE]) for i in range(0, len(flat), RX_TIMES_PER_LINE)]
+
+
 def set_baud(baud: int) -> int:
     """Set the FSK baud rate (rebuilds the fsk plan). Replaces set_protocol."""
     return _require().minimodem_simple_set_baud(int(baud))
 
 
+def set_tones(tones: int) -> int:
+    """Modulate with ``tones`` tones per symbol: ``TONES_BFSK`` (binary FSK)
+    or 4 / 8 (MFSK, 2 / 3 bits per symbol: 1.67x / 2x the bytes per second
+    at the same baud). Sticky like ``set_baud``: applied now if initialized
+    and kept across ``init`` / ``set_baud``. MFSK needs a single carrier in
+    half duplex and ``tones <= max_tones(baud)``; both ends MUST match.
+    Returns 0, or -1 if invalid or it does not fit."""
+    return _require().minimodem_simple_set_tones(int(tones))
+
+
+def set_char_framing(data_bits: int = DATA_BITS_DEFAULT,
+                     stop_bits: int = STOP_BITS_DEFAULT) -> int:
+    """Set the data bits per character (``DATA_BITS_ASCII`` or the default 8)
+    and the stop bits after it (1..``STOP_BITS_MAX``). 7-N-1 takes nine bit
+    times per byte instead of ten; ``send`` / ``send_many`` then refuse a frame
+    that is not 7-bit clean (-2). Sticky like ``set_tones``; both ends MUST
+    match. Returns 0, or -1 if out of range."""
+    return _require().minimodem_simple_set_char_framing(int(data_bits), int(stop_bits))
+
+
+def set_framing_mode(mode: int | str) -> int:
+    """Select ``"async"`` start/stop frames or the ``"hdlc"`` synchronous
+    bitstream (or a ``FRAMING_*`` value). HDLC sends each transmission as
+    preamble flags, the bytes bit-stuffed with no start/stop bits, and a
+    closing flag: about 19% less airtime on JSON frames, and the receiver
+    clocks bits off the tone changes instead of searching for every frame.
+    It needs binary FSK on a single carrier in half duplex and sends whole
+    octets (the character framing does not apply). Sticky like
+    ``set_tones``; both ends MUST match. Returns 0, or -1 if unknown or it
+    does not fit."""
+    if isinstance(mode, str):
+        if mode not in FRAMING_MODES:
+            return -1
+        mode = FRAMING_MODES[mode]
+    return _require().minimodem_simple_set_framing_mode(int(mode))
+
+
+def set_line_limits(max_line_len: int = LINE_MAX_LEN_DEFAULT,
+                    max_lines: int = QUEUE_MAX_LINES_DEFAULT) -> int:
+    """Cap received lines at ``max_line_len`` bytes and the queue at
+    ``max_lines`` (sticky; takes effect at the next ``init``). Raise the line
+    cap for frames over 8 KiB. Returns 0, or -1 if out of range."""
+    global _line_max
+    result = _require().minimodem_simple_set_line_limits(int(max_line_len), int(max_lines))
+    if result == 0:
+        _line_max = int(max_line_len)
+    return result
+
+
+def set_tx_framing(leader_bits: int = TX_LEADER_BITS_DEFAULT,
+                   trailer_bits: int = TX_TRAILER_BITS_DEFAULT) -> int:
+    """Set the mark bits sent before / after every transmission (sticky, from
+    the next send). The far end needs enough leader to acquire the carrier
+    (``tools/leader_sweep.py``). Returns 0, or -1 if out of range."""
+    return _require().minimodem_simple_set_tx_framing(int(leader_bits), int(trailer_bits))
+
+
+def set_tx_hold(hold: float) -> int:
+    """Keep the carrier up as idle marks for ``hold`` seconds after each
+    transmission, so a send inside that window skips its leader (``0`` turns
+    the hold off). Sticky. Returns 0, or -1 if out of range."""
+    return _require().minimodem_simple_set_tx_hold(int(round(hold * 1000)))
+
+
+def set_duplex(mode: int | str) -> int:
+    """Select ``"half"`` duplex or full duplex on the ``"low"`` / ``"high"``
+    half of the band plan (or a ``DUPLEX_*`` value). Full duplex keeps RX
+    decoding during TX and needs twice the carriers to fit
+    (``max_carriers``); the far end must pick the opposite side. Sticky;
+    applied at the next ``init``. Returns 0, or -1 for an unknown mode."""
+    if isinstance(mode, str):
+        if mode not in DUPLEX_MODES:
+            return -1
+        mode = DUPLEX_MODES[mode]
+    return _require().minimodem_simple_set_duplex(int(mode))
+
+
+def set_rx_bauds(bauds) -> int:
+    """Also decode each of ``bauds`` (up to ``MAX_RX_BAUDS``; the link baud
+    is skipped) on its own wrapper thread. Sticky like ``set_detector``; an
+    empty list returns to link-baud-only RX. Single-carrier links only.
+    Returns 0, -1 for a bad list / baud, -2 if a decoder failed to start."""
+    bauds = [int(b) for b in bauds]
+    return _require().minimodem_simple_set_rx_bauds((ctypes.c_int * len(bauds))(*bauds),
+                                                    len(bauds))
+
+
+def set_detector(detector: int | str) -> int:
+    """Select the RX bit detector: ``"default"``, ``"fft"`` or ``"goertzel"``
+    (or a ``DETECTOR_*`` value). Sticky across init/set_baud; applies now if
+    initialized. Returns 0, or -1 for an unknown / not-built-in detector."""
+    if isinstance(detector, str):
+        if detector not in DETECTORS:
+            return -1
+        detector = DETECTORS[detector]
+    return _require().minimodem_simple_set_detector(int(detector))
+
+
+def set_squelch(open_dbfs: int) -> int:
+    """Set the RX energy squelch: skip the frame search while the tone level
+    is below ``open_dbfs`` (-120..-1) and no carrier is held; ``SQUELCH_OFF``
+    disables it. Sticky like ``set_detector``. Returns 0, or -1 if out of range."""
+    return _require().minimodem_simple_set_squelch(int(open_dbfs))
+
+
+def set_decimation(max_factor: int) -> int:
+    """Cap the RX decimation factor: ``DECIMATION_AUTO`` lets the wrapper pick
+    one per baud (none for the Goertzel detector's async RX),
+    ``DECIMATION_OFF`` demodulates at 48 kHz, 2..12 caps it. Sticky like
+    ``set_detector``. Returns 0, or -1 if out of range."""
+    return _require().minimodem_simple_set_decimation(int(max_factor))
+
+
+def get_stats() -> dict | None:
+    """Snapshot of the wrapper's cumulative counters (see ``MinimodemStats``),
+    or None if the wrapper is not initialized."""
+    stats = MinimodemStats()
+    if _require().minimodem_simple_get_stats(ctypes.byref(stats)) < 0:
+        return None
+    return stats.to_dict()
+
+
+def capture_start(path: str, seconds: int = 60) -> int:
+    """Tee raw RX samples into a ring file holding the last ``seconds`` of
+    audio (see ``lib.capture``). Returns 0 on success, negative on error."""
+    return _require().minimodem_simple_capture_start(os.fsencode(path), int(seconds))
+
+
+def capture_stop() -> int:
+    """Stop the RX capture and flush the ring file."""
+    return _require().minimodem_simple_capture_stop()
+
+
 def cleanup() -> None:
     """Release all resources (joins the RX thread, closes streams)."""
     _require().minimodem_simple_cleanup()
@@ -0,0 +1,1588 @@
+"""
+Software FSK modem with the same surface as ``lib.minimodem``.
+
+A pure-Python/NumPy stand-in for ``libminimodem_simple.so`` so the framing,
+chunking and backend code can run (and be benchmarked) end to end on a
+headless box with no wrapper build and no sound device. Every function of the
+ctypes binding is mirrored with the same arguments, return codes and
+``get_error`` reporting, so ``from lib import softmodem as minimodem`` (or
+``Transmitter(modem=softmodem)``) is a drop-in swap.
+
+Signal path (matches mm_core.c's modulation exactly):
+- TX: leader marks, then per-byte 8-N-1 frames (LSB first), then trailer
+  marks, Bell-202-style tones derived from baud as in ``mm_build_config``
+  (baud >= 400: mark = baud/2 + 600, space = mark + baud*5/6). Modulation is
+  one vectorised continuous-phase pass over the whole message.
+- RX: per-sample mark/space energies from a one-bit sliding single-bin DFT
+  (the Goertzel bin at each tone, computed for every offset at once with a
+  cumulative sum), then UART framing: find the mark->space start edge, sample
+  each bit on its aligned window, check the stop bit.
+- Squelch (``set_squelch``, as ``minimodem_simple_set_squelch``): with no
+  carrier held, a block whose tone amplitude (estimated from its per-bit RMS;
+  the pipes carry no out-of-band noise for the wrapper's Goertzel measurement
+  to reject) stays below the open level is not searched at all.
+- Decimation (``set_decimation``, as ``minimodem_simple_set_decimation``):
+  the demodulator low-passes (the wrapper's Blackman windowed-sinc FIR) and
+  keeps 1 in D samples, D picked per baud and tone plan by ``rx_decimation``,
+  so every per-bit sum runs on a D times shorter window.
+- Multi-carrier (``init(..., carriers=N)``, as ``minimodem_simple_init_multi``):
+  carrier k is the tone pair shifted up by k * (shift + 2*baud); bytes are
+  striped round-robin (byte i on carrier i % N, NUL-padded to a whole stripe),
+  the carriers are summed at 1/N amplitude, and RX runs one ``Demodulator``
+  per band and re-interleaves their output (``MultiCarrierDemodulator``).
+- Candidate bauds (``set_rx_bauds``, as ``minimodem_simple_set_rx_bauds``):
+  single-carrier links also run one ``Demodulator`` per extra baud over the
+  same RX blocks, each with its own line accumulator, and every queued line
+  remembers the baud that decoded it (``received_bauds``). The wrapper gives
+  each candidate its own thread; here they run in turn on the RX thread.
+- Line timestamps (``received_times``, as ``_receive_many_timed``): each
+  queued line carries the monotonic time of the carrier lock it arrived on
+  and of the RX block that decoded its newline, plus its dequeue time.
+- TX framing (``set_tx_framing`` / ``set_tx_hold``, as the wrapper's): the
+  leader/trailer mark bits are settable, and with a hold a thread keeps
+  writing idle marks after each send, paced just ahead of the wall clock; a
+  send while that carrier is up skips its leader (``tx_leaders_skipped``).
+- Pre-rendered TX (``render`` / ``send_pcm``, as the wrapper's): ``render``
+  returns the samples a send would write (leader included), ``send_pcm``
+  writes such samples back as one transmission without modulating again,
+  from just past the leader while the idle carrier is held.
+- MFSK (``set_tones``, as ``minimodem_simple_set_tones``): 4 or 8 tones one
+  baud apart from the lower base tone (``mfsk_tones``); a byte is a start
+  symbol (tone 0), ceil(8 / bits) Gray-coded data symbols, LSB first, and a
+  stop symbol (the top tone, also the leader / idle tone). RX takes the
+  loudest of the per-tone sliding DFTs as each window's symbol and frames on
+  the top -> tone 0 edge, as it does on mark -> space.
+- Character framing (``set_char_framing``, as the wrapper's): 7 data bits
+  (7-N-1) for ASCII-only frames and 1 or 2 stop bits; a 7-bit send that is
+  not 7-bit clean is refused. RX frames on the first stop bit and looks for
+  the next start edge past it, so it needs only the data bits.
+- Full duplex (``set_duplex``, as ``minimodem_simple_set_duplex``): the band
+  plan is split, the demodulators run on one half (``duplex_bands``) and
+  ``modulate`` writes on the other, so two modems on opposite sides talk over
+  each other without either hearing its own signal.
+- HDLC framing (``set_framing_mode``, as the wrapper's): each transmission is
+  one synchronous bitstream -- ``HDLC_PREAMBLE_FLAGS`` 0x7E flags, the bytes
+  LSB first with a 0 stuffed after five 1s, a closing flag -- NRZI coded (a 0
+  changes tone). ``HdlcDemodulator`` takes each window's louder tone, clocks
+  bits off the run lengths between tone changes and deframes on the flags.
+
+"Devices" are in-memory sample pipes (``DEVICE_COUNT`` of them). The playback
+id picks the pipe ``send`` writes to and the capture id the pipe the RX thread
+reads; -1 is pipe 0, so ``init(-1, -1, baud)`` is a loopback, and two
+``SoftModem`` instances on crossed pipes (1->2, 2->1) form a link.
+
+``capture_start`` tees every RX block into the same memory-mapped ring file
+format as ``minimodem_simple_capture_start`` (``lib.capture``), so captures
+from either modem replay through ``tools/replay_capture.py``.
+
+Unlike the wrapper this modem does not discard RX while transmitting (there is
+no acoustic self-echo to suppress, and the loopback relies on hearing itself).
+
+NumPy is required; without it ``init`` fails with an error, like a missing
+audio backend would.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+
+from .capture import CaptureRing
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the software modem needs it
+    np = None
+
+# ---------------------------------------------------------------------------
+# Constants (mirroring the wrapper's tunables)
+# ---------------------------------------------------------------------------
+
+SAMPLE_RATE = 48000
+LEADER_BITS = 2           # MM_TX_LEADER_BITS_DEFAULT (set_tx_framing)
+TRAILER_BITS = 2          # MM_TX_TRAILER_BITS_DEFAULT
+TX_FRAMING_BITS_MAX = 1024        # MM_TX_FRAMING_BITS_MAX
+TX_HOLD_MAX = 10.0        # MM_TX_HOLD_MAX_MS, in seconds (set_tx_hold)
+TX_HOLD_BLOCK = 0.02      # idle marks written per carrier-hold pass
+TX_HOLD_AHEAD = 0.04      # hold audio kept queued ahead of the wall clock
+LINE_MAX_LEN = 8192       # MM_LINE_MAX_LEN_DEFAULT (set_line_limits)
+QUEUE_MAX_LINES = 64      # MM_QUEUE_MAX_LINES_DEFAULT
+LINE_MAX_LEN_LIMIT = 262144       # MM_LINE_MAX_LEN_LIMIT
+QUEUE_MAX_LINES_LIMIT = 1024      # MM_QUEUE_MAX_LINES_LIMIT
+MAX_RX_BAUDS = 4          # MM_MAX_RX_BAUDS
+DEVICE_COUNT = 4          # number of in-memory sample pipes
+
+# Minimum tone amplitude treated as carrier (volume 1 -> 0.01).
+CARRIER_MIN_AMPLITUDE = 0.002
+
+# Seconds the RX thread parks on its pipe per pass.
+RX_POLL_TIMEOUT = 0.1
+
+# Carrier is declared lost after this many bit times without a decoded frame
+# (mm_core.c's MM_FSK_MAX_NOCONFIDENCE_BITS).
+CARRIER_LOSS_BITS = 20
+
+# RX bit detector names (MM_DETECTOR_*; see lib.minimodem). The software
+# demodulator's sliding single-bin DFT already evaluates only the mark and
+# space bins, so every choice decodes through the same path here.
+DETECTORS = {"default": 0, "fft": 1, "goertzel": 2}
+
+# Energy squelch (MM_SQUELCH_*): open level in dBFS of tone amplitude, closing
+# SQUELCH_HYSTERESIS_DB lower; SQUELCH_OFF searches every block.
+SQUELCH_OFF = 0
+SQUELCH_DEFAULT_DBFS = -60
+SQUELCH_MIN_DBFS = -120
+SQUELCH_HYSTERESIS_DB = 6
+
+# RX decimation (MM_DECIMATION_*; see mm_core.c's mm_pick_decimation): the
+# largest factor keeping whole samples per bit, at least RX_MIN_SAMPLES_PER_BIT
+# of them, and the top tone plus half a baud below RX_TONE_MAX_FRACTION of the
+# RX rate. The anti-alias FIR has DECIMATION_TAPS_PER_FACTOR * D + 1 taps.
+DECIMATION_AUTO = 0
+DECIMATION_OFF = 1
+DECIMATION_MAX = 12
+DECIMATION_FACTORS = (12, 10, 8, 6, 4, 3, 2)
+DECIMATION_TAPS_PER_FACTOR = 16
+RX_MIN_SAMPLES_PER_BIT = 8
+RX_TONE_MAX_FRACTION = 0.3
+
+# Confidence histogram bins (MM_STATS_CONFIDENCE_EDGES; see lib.minimodem).
+CONFIDENCE_EDGES = (2.0, 3.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+# Duplex modes (MM_DUPLEX_*; see lib.minimodem): full duplex transmits on one
+# half of the band plan and receives on the other; the two ends pick opposite
+# sides.
+DUPLEX_HALF = 0
+DUPLEX_LOW = 1
+DUPLEX_HIGH = 2
+DUPLEX_MODES = {"half": DUPLEX_HALF, "low": DUPLEX_LOW, "high": DUPLEX_HIGH}
+
+# Full-duplex band selectivity (MM_DUPLEX_BAND_SHARE): a bit window only
+# counts as carrier if its dominant tone holds at least this share of the
+# window's energy. A neighbouring band's tones leak a few percent into the
+# mark/space bins -- enough to decode the local TX echo as bytes otherwise.
+DUPLEX_BAND_SHARE = 0.1
+
+# Tones per symbol (MM_TONES_BFSK / MM_MAX_TONES; see lib.minimodem): MFSK
+# carries MFSK_BITS[tones] bits per symbol.
+TONES_BFSK = 2
+MAX_TONES = 8
+TONE_COUNTS = (TONES_BFSK, 4, MAX_TONES)
+MFSK_BITS = {4: 2, 8: 3}
+
+# Character framing (MM_DATA_BITS_* / MM_STOP_BITS_*; see lib.minimodem).
+DATA_BITS_DEFAULT = 8
+DATA_BITS_ASCII = 7
+STOP_BITS_DEFAULT = 1
+STOP_BITS_MAX = 2
+
+# Link framing (MM_FRAMING_* / MM_HDLC_PREAMBLE_FLAGS; see lib.minimodem).
+# HDLC_MAX_RUN: the most bit times between tone changes inside a frame (a
+# flag's six 1s and its 0).
+FRAMING_ASYNC = 0
+FRAMING_HDLC = 1
+FRAMING_MODES = {"async": FRAMING_ASYNC, "hdlc": FRAMING_HDLC}
+HDLC_PREAMBLE_FLAGS = 4
+HDLC_FLAG = 0x7E
+HDLC_MAX_RUN = 7
+
+# Multi-carrier band plan (MM_MAX_CARRIERS / MM_CARRIER_MAX_FRACTION).
+MAX_CARRIERS = 8
+CARRIER_MAX_FRACTION = 0.45
+
+
+def _base_tones(baud: int) -> tuple[float, float]:
+    if baud >= 400:
+        mark = baud / 2 + 600
+        return mark, mark + int(baud * 5 / 6)
+    if baud >= 100:
+        return 1270.0, 1070.0
+    return 1585.0, 1415.0
+
+
+def carrier_spacing(baud: int) -> float:
+    """Shift between neighbouring carriers: the tone shift plus two baud widths."""
+    mark, space = _base_tones(baud)
+    return abs(space - mark) + 2 * baud
+
+
+def max_carriers(baud: int, sample_rate: int = SAMPLE_RATE) -> int:
+    """How many carriers fit the band plan at ``baud`` (mm_max_carriers)."""
+    if baud <= 0:
+        return 0
+    top = max(_base_tones(baud)) + baud / 2
+    n = 1
+    while n < MAX_CARRIERS and top + n * carrier_spacing(baud) < sample_rate * CARRIER_MAX_FRACTION:
+        n += 1
+    return n
+
+
+def fsk_tones(baud: int, carrier: int = 0) -> tuple[float, float]:
+    """(mark_hz, space_hz) for a baud, exactly as mm_build_config derives them
+    (shifted into band ``carrier`` in multi-carrier mode)."""
+    mark, space = _base_tones(baud)
+    shift = carrier * carrier_spacing(baud) if carrier else 0
+    return mark + shift, space + shift
+
+
+def mfsk_tones(baud: int, tones: int) -> tuple[float, ...]:
+    """MFSK tone frequencies, ascending: the lower base tone plus i * baud
+    (mm_set_tones). Tone 0 is the start symbol, the top tone stop / idle."""
+    base = min(_base_tones(baud))
+    return tuple(base + i * baud for i in range(tones))
+
+
+def max_tones(baud: int, sample_rate: int = SAMPLE_RATE) -> int:
+    """The most tones per symbol that fit the band plan at ``baud`` (mm_max_tones)."""
+    if baud <= 0:
+        return 0
+    for tones in (MAX_TONES, 4):
+        if min(_base_tones(baud)) + (tones - 0.5) * baud < sample_rate * CARRIER_MAX_FRACTION:
+            return tones
+    return TONES_BFSK
+
+
+def frame_symbols(tones: int = TONES_BFSK, data_bits: int = DATA_BITS_DEFAULT,
+                  stop_bits: int = STOP_BITS_DEFAULT) -> int:
+    """Symbols per byte on the air: start + data + stop (10 for 8-N-1 binary
+    FSK, 9 for 7-N-1)."""
+    data = data_bits if tones == TONES_BFSK else -(-data_bits // MFSK_BITS[tones])
+    return 1 + data + stop_bits
+
+
+def duplex_bands(duplex: int, carriers: int = 1) -> tuple[int, int]:
+    """(first RX band, first TX band) of a link with ``carriers`` carriers:
+    half duplex shares bands 0..N-1, full duplex puts one direction on
+    0..N-1 and the other on N..2N-1 (rx_band / tx_band in the wrapper)."""
+    return (carriers if duplex == DUPLEX_LOW else 0,
+            carriers if duplex == DUPLEX_HIGH else 0)
+
+
+def bit_nsamples(baud: int, sample_rate: int = SAMPLE_RATE) -> int:
+    """Samples per bit (rounded, like tx_bit_nsamples)."""
+    return int(sample_rate / baud + 0.5)
+
+
+def rx_decimation(baud: int, sample_rate: int = SAMPLE_RATE, carrier: int = 0,
+                  max_factor: int = DECIMATION_AUTO, tones: int = TONES_BFSK) -> int:
+    """RX decimation factor for a baud and band or MFSK tone set
+    (mm_pick_decimation), capped at ``max_factor`` (``DECIMATION_AUTO``:
+    ``DECIMATION_MAX``); 1 if none fits."""
+    if max_factor == DECIMATION_AUTO or max_factor > DECIMATION_MAX:
+        max_factor = DECIMATION_MAX
+    freqs = fsk_tones(baud, carrier) if tones == TONES_BFSK else mfsk_tones(baud, tones)
+    top = max(freqs) + baud / 2
+    for d in DECIMATION_FACTORS:
+        rate = sample_rate // d
+        if d > max_factor or sample_rate % d or rate % baud:
+            continue
+        if rate // baud >= RX_MIN_SAMPLES_PER_BIT and top <= rate * RX_TONE_MAX_FRACTION:
+            return d
+    return 1
+
+
+def decimation_taps(factor: int) -> "np.ndarray":
+    """Anti-alias FIR for ``factor``: Blackman windowed sinc, cutoff at the RX
+    Nyquist, unity DC gain (mm_build_decimator)."""
+    n = DECIMATION_TAPS_PER_FACTOR * factor + 1
+    taps = np.sinc((np.arange(n) - (n - 1) / 2) / factor) * np.blackman(n)
+    return taps / taps.sum()
+
+
+# ---------------------------------------------------------------------------
+# Modulation
+# ---------------------------------------------------------------------------
+
+def _uart_bits(octets: "np.ndarray", leader_bits: int = LEADER_BITS,
+               trailer_bits: int = TRAILER_BITS, data_bits: int = DATA_BITS_DEFAULT,
+               stop_bits: int = STOP_BITS_DEFAULT) -> "np.ndarray":
+    """Leader marks + per-byte 8-N-1 (or 7-N-1, -N-2) frames (LSB first) +
+    trailer marks."""
+    frames = np.empty((len(octets), 1 + data_bits + stop_bits), dtype=np.uint8)
+    frames[:, 0] = 0                                   # start bit (space)
+    frames[:, 1:1 + data_bits] = np.unpackbits(octets[:, None], axis=1,
+                                               bitorder="little")[:, :data_bits]
+    frames[:, 1 + data_bits:] = 1                      # stop bit(s) (mark)
+    return np.concatenate((
+        np.ones(leader_bits, dtype=np.uint8),
+        frames.ravel(),
+        np.ones(trailer_bits, dtype=np.uint8),
+    ))
+
+
+def _mfsk_symbols(octets: "np.ndarray", tones: int, leader_bits: int,
+                  trailer_bits: int, data_bits: int = DATA_BITS_DEFAULT,
+                  stop_bits: int = STOP_BITS_DEFAULT) -> "np.ndarray":
+    """Tone indices: leader (top tone), per byte start (tone 0) + Gray-coded
+    data symbols (LSB first) + stop(s) (top tone), trailer."""
+    bits = MFSK_BITS[tones]
+    ndata = frame_symbols(tones, data_bits, 0) - 1
+    frames = np.empty((len(octets), 1 + ndata + stop_bits), dtype=np.uint8)
+    frames[:, 0] = 0
+    values = (octets[:, None] >> (bits * np.arange(ndata, dtype=np.uint8))) & (tones - 1)
+    frames[:, 1:1 + ndata] = values ^ (values >> 1)
+    frames[:, 1 + ndata:] = tones - 1
+    return np.concatenate((
+        np.full(leader_bits, tones - 1, dtype=np.uint8),
+        frames.ravel(),
+        np.full(trailer_bits, tones - 1, dtype=np.uint8),
+    ))
+
+
+def _hdlc_bits(octets: "np.ndarray", leader_bits: int, trailer_bits: int) -> "np.ndarray":
+    """Leader, preamble flags, the bytes LSB first with a 0 stuffed after
+    every five 1s, the closing flag, trailer -- before NRZI coding (leader and
+    trailer are 1s: the tone held)."""
+    stuffed, ones = [], 0
+    for bit in np.unpackbits(octets, bitorder="little").tolist():
+        stuffed.append(bit)
+        ones = ones + 1 if bit else 0
+        if ones == 5:
+            stuffed.append(0)
+            ones = 0
+    flag = np.unpackbits(np.array([HDLC_FLAG], dtype=np.uint8), bitorder="little")
+    return np.concatenate((
+        np.ones(leader_bits, dtype=np.uint8),
+        np.tile(flag, HDLC_PREAMBLE_FLAGS),
+        np.array(stuffed, dtype=np.uint8),
+        flag,
+        np.ones(trailer_bits, dtype=np.uint8),
+    ))
+
+
+def modulate(data: bytes, baud: int, amplitude: float = 0.5,
+             sample_rate: int = SAMPLE_RATE, carriers: int = 1,
+             leader_bits: int = LEADER_BITS, trailer_bits: int = TRAILER_BITS,
+             band: int = 0, tones: int = TONES_BFSK, data_bits: int = DATA_BITS_DEFAULT,
+             stop_bits: int = STOP_BITS_DEFAULT,
+             framing: int = FRAMING_ASYNC) -> "np.ndarray":
+    """FSK-modulate ``data`` into float32 samples (leader + 8-N-1 + trailer).
+
+    With ``carriers > 1`` the bytes are striped round-robin over that many
+    bands (NUL-padded to a whole stripe) and the carriers summed, each at
+    ``amplitude / carriers``, all framing in lockstep. Empty ``data`` gives
+    just the leader and trailer marks (the idle carrier). Carrier k rides
+    band ``band + k`` (full duplex: the TX half of the plan). ``tones`` > 2
+    sends MFSK symbols instead (single carrier, band 0). With ``data_bits`` 7
+    each byte's top bit is dropped, as the wrapper's TX does. ``framing``
+    ``FRAMING_HDLC`` sends the HDLC bitstream instead (BFSK, single carrier,
+    band 0; whole octets whatever ``data_bits``), starting on the mark tone.
+    """
+    nbit = bit_nsamples(baud, sample_rate)
+    if framing == FRAMING_HDLC:
+        if carriers > 1 or band or tones != TONES_BFSK:
+            raise ValueError("HDLC framing needs a single BFSK carrier in half duplex")
+        mark, space = fsk_tones(baud)
+        bits = _hdlc_bits(np.frombuffer(data, dtype=np.uint8), leader_bits, trailer_bits)
+        on_mark = np.cumsum(bits == 0) % 2 == 0            # NRZI: a 0 changes tone
+        step = np.where(on_mark, mark, space) * (2.0 * np.pi / sample_rate)
+        return (amplitude * np.sin(np.cumsum(np.repeat(step, nbit)))).astype(np.float32)
+    octets = np.frombuffer(data, dtype=np.uint8) & ((1 << data_bits) - 1)
+    if tones != TONES_BFSK:
+        if carriers > 1 or band:
+            raise ValueError("MFSK needs a single carrier in half duplex")
+        freqs = np.array(mfsk_tones(baud, tones))
+        symbols = _mfsk_symbols(octets, tones, leader_bits, trailer_bits,
+                                data_bits, stop_bits)
+        step = freqs[symbols] * (2.0 * np.pi / sample_rate)
+        return (amplitude * np.sin(np.cumsum(np.repeat(step, nbit)))).astype(np.float32)
+    if carriers > 1:
+        octets = np.concatenate((octets, np.zeros(-len(octets) % carriers, dtype=np.uint8)))
+    stripes = octets.reshape(-1, carriers)             # row = frame slot, column = carrier
+
+    out = None
+    for k in range(carriers):
+        mark, space = fsk_tones(baud, band + k)
+        bits = _uart_bits(stripes[:, k], leader_bits, trailer_bits, data_bits, stop_bits)
+        step = np.where(bits == 1, mark, space) * (2.0 * np.pi / sample_rate)
+        tone = np.sin(np.cumsum(np.repeat(step, nbit)))
+        out = tone if out is None else out + tone
+    return (amplitude / carriers * out).astype(np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Demodulation
+# ---------------------------------------------------------------------------
+
+class Demodulator:
+    """Streaming FSK demodulator: feed samples, get decoded bytes back.
+
+    Keeps at most one partial frame of samples between calls. With
+    ``decimation`` (a cap, as ``set_decimation``) input is filtered and
+    downsampled to ``rx_rate`` first; ``nbit`` and every window below are in
+    RX samples, while ``silence`` and the squelch counters take device
+    samples. Carrier acquisitions/losses and a per-frame confidence histogram (the weakest
+    bit's dominant/other tone amplitude ratio) are counted into ``counters``,
+    which the modem shares across baud changes. A non-zero ``band_share``
+    (full duplex) rejects bit windows whose tone energy is mostly out of band.
+    ``tones`` > 2 demodulates MFSK: every window's symbol is its loudest tone,
+    "mark" the top tone and "space" tone 0. ``data_bits`` 7 decodes 7-N-1
+    frames (any stop-bit count: the next start edge is searched for past the
+    first stop bit).
+    """
+
+    def __init__(self, baud: int, sample_rate: int = SAMPLE_RATE,
+                 counters: dict | None = None, carrier: int = 0,
+                 squelch_dbfs: int = SQUELCH_DEFAULT_DBFS,
+                 decimation: int = DECIMATION_AUTO, band_share: float = 0.0,
+                 tones: int = TONES_BFSK, data_bits: int = DATA_BITS_DEFAULT):
+        self.baud = baud
+        self.sample_rate = sample_rate
+        self.tones = tones
+        self.decimation = rx_decimation(baud, sample_rate, carrier, decimation, tones)
+        self.rx_rate = sample_rate // self.decimation
+        self.nbit = bit_nsamples(baud, self.rx_rate)
+        if self.decimation > 1:
+            self._taps = decimation_taps(self.decimation)
+            self._dec_work = np.zeros(len(self._taps) - 1)   # FIR history + phase remainder
+        mark, space = fsk_tones(baud, carrier)
+        self._w_mark = 2.0 * np.pi * mark / self.rx_rate
+        self._w_space = 2.0 * np.pi * space / self.rx_rate
+        if tones != TONES_BFSK:
+            self._w_tones = [2.0 * np.pi * f / self.rx_rate for f in mfsk_tones(baud, tones)]
+            self._bits = MFSK_BITS[tones]
+            gray = np.arange(tones) ^ (np.arange(tones) >> 1)
+            self._gray_decode = np.argsort(gray)       # tone index -> symbol value
+        self.data_bits = data_bits
+        self._nsym = frame_symbols(tones, data_bits)
+        self._power_min = (CARRIER_MIN_AMPLITUDE * self.nbit / 2) ** 2
+        self._band_share = band_share * self.nbit / 2     # tone power per unit window energy
+        self._buf = np.zeros(0, dtype=np.float64)
+        self._pos = 0  # first window index not yet searched for a start edge
+        self.counters = counters if counters is not None else new_rx_counters()
+        self.carrier = False
+        self._idle = 0  # samples since the last decoded frame
+        if squelch_dbfs == SQUELCH_OFF:
+            self._squelch_open_level = self._squelch_close_level = 0.0
+        else:
+            self._squelch_open_level = 10.0 ** (squelch_dbfs / 20)
+            self._squelch_close_level = 10.0 ** ((squelch_dbfs - SQUELCH_HYSTERESIS_DB) / 20)
+        self.squelch_open = not self._squelch_open_level   # a disabled gate is open
+
+    def _count_frame(self, dominant, other) -> None:
+        """Carrier acquisition + confidence bin for one decoded frame, from its
+        symbols' winning and runner-up tone powers."""
+        if not self.carrier:
+            self.carrier = True
+            self.counters["carrier_acquired"] += 1
+        confidence = float(np.min(dominant / np.maximum(other, 1e-30))) ** 0.5
+        self.counters["confidence_hist"][bisect.bisect_right(CONFIDENCE_EDGES, confidence)] += 1
+
+    def silence(self, nsamples: int) -> None:
+        """Account ``nsamples`` device samples with no signal (an empty pipe read)."""
+        self._idle += nsamples
+        if self.carrier and self._idle > CARRIER_LOSS_BITS * self.nbit * self.decimation:
+            self.carrier = False
+            self.counters["carrier_lost"] += 1
+
+    def _tone_level(self, samples: "np.ndarray") -> float:
+        """Loudest per-bit tone amplitude in ``samples`` (sqrt(2) x block RMS)."""
+        starts = np.arange(0, len(samples), self.nbit)
+        sq = np.add.reduceat(np.square(samples, dtype=np.float64), starts)
+        return float(np.sqrt(2.0 * np.max(sq / np.diff(np.append(starts, len(samples))))))
+
+    def _decimate(self, samples: "np.ndarray") -> "np.ndarray":
+        """Low-pass and keep every D-th sample, carrying the FIR history (and
+        any samples short of the next output) over to the next call."""
+        d, ntaps = self.decimation, len(self._taps)
+        work = np.concatenate((self._dec_work, samples))
+        if len(work) < ntaps:
+            self._dec_work = work
+            return np.zeros(0)
+        windows = np.lib.stride_tricks.sliding_window_view(work, ntaps)[::d]
+        self._dec_work = work[len(windows) * d:]
+        return windows @ self._taps
+
+    def _window_energy(self, x: "np.ndarray", w: float) -> "np.ndarray":
+        """|DFT bin at w|^2 over every nbit-long window of x (index = window start)."""
+        z = x * np.exp(-1j * w * np.arange(len(x)))
+        c = np.concatenate(([0j], np.cumsum(z)))
+        s = c[self.nbit:] - c[:-self.nbit]
+        return s.real * s.real + s.imag * s.imag
+
+    def _gate(self, samples: "np.ndarray", ndevice: int) -> bool | None:
+        """Energy squelch for one (RX-rate) block of ``ndevice`` device
+        samples: None if the gate stays closed (the block is counted as
+        skipped and silent), else whether it is below the close level."""
+        if not (self._squelch_open_level and not self.carrier and len(samples)):
+            return False
+        level = self._tone_level(samples)
+        if not self.squelch_open and level < self._squelch_open_level:
+            self.counters["squelch_skipped"] += ndevice
+            self.silence(ndevice)
+            return None
+        if not self.squelch_open:
+            self.squelch_open = True
+            self.counters["squelch_opened"] += 1
+        return level < self._squelch_close_level
+
+    def feed(self, samples: "np.ndarray") -> bytes:
+        """Append samples and return every byte whose frame is now complete."""
+        nbit = self.nbit
+        ndevice = len(samples)
+        if self.decimation > 1:
+            samples = self._decimate(samples)
+        quiet = self._gate(samples, ndevice)
+        if quiet is None:
+            # Squelched: keep a short tail so a start edge on the boundary
+            # survives, and skip the search.
+            self._buf = np.concatenate((self._buf, samples))[-2 * nbit:]
+            self._pos = 0
+            return b""
+
+        x = np.concatenate((self._buf, samples))
+        if len(x) < 11 * nbit:
+            self._buf = x
+            return b""
+
+        if self.tones == TONES_BFSK:
+            p_mark = self._window_energy(x, self._w_mark)
+            p_space = self._window_energy(x, self._w_space)
+            power, dominant = p_mark + p_space, np.maximum(p_mark, p_space)
+        else:
+            energy = np.stack([self._window_energy(x, w) for w in self._w_tones])
+            symbol = energy.argmax(axis=0)
+            power, dominant = energy.sum(axis=0), energy.max(axis=0)
+        carrier = power > self._power_min
+        if self._band_share:
+            c = np.concatenate(([0.0], np.cumsum(np.square(x, dtype=np.float64))))
+            carrier &= dominant >= self._band_share * (c[nbit:] - c[:-nbit])
+        if self.tones == TONES_BFSK:
+            is_mark = (p_mark > p_space) & carrier
+            is_space = (p_space >= p_mark) & carrier
+        else:
+            is_mark = (symbol == self.tones - 1) & carrier
+            is_space = (symbol == 0) & carrier
+
+        # Mark->space transitions. The first space-dominated window starts
+        # about half a bit before the start bit itself. Between the top tone
+        # and tone 0 an MFSK sweep can pass other tones: there a space run
+        # starting within half a bit of the last mark window counts.
+        nwin = len(carrier)
+        half = nbit // 2
+        if self.tones == TONES_BFSK:
+            edges = np.flatnonzero(is_space[1:] & is_mark[:-1]) + 1
+        else:
+            last_mark = np.maximum.accumulate(np.where(is_mark, np.arange(nwin), -nbit))
+            edges = np.flatnonzero(is_space[1:] & ~is_space[:-1]
+                                   & (np.arange(1, nwin) - last_mark[:-1] <= half)) + 1
+        nsym = self._nsym
+        offsets = nbit * np.arange(nsym)
+
+        out = bytearray()
+        pos = self._pos
+        last_end = None
+        pending = None
+        for edge in edges:
+            if edge < pos:
+                continue
+            start = edge + half                            # first sample of the start bit
+            last = start + (nsym - 1) * nbit               # window aligned on the stop bit
+            if last >= nwin:
+                pending = edge
+                break
+            idx = start + offsets
+            if not is_space[idx[0]] or not is_mark[idx[-1]] or not carrier[idx].all():
+                pos = edge + 1                             # framing error: resync
+                continue
+            byte = 0
+            if self.tones == TONES_BFSK:
+                for k in range(self.data_bits):
+                    if is_mark[idx[1 + k]]:
+                        byte |= 1 << k
+                mark = is_mark[idx]
+                self._count_frame(np.where(mark, p_mark[idx], p_space[idx]),
+                                  np.where(mark, p_space[idx], p_mark[idx]))
+            else:
+                for k, tone in enumerate(symbol[idx[1:-1]]):
+                    byte |= int(self._gray_decode[tone]) << (k * self._bits)
+                ranked = np.sort(energy[:, idx], axis=0)
+                self._count_frame(ranked[-1], ranked[-2])
+            out.append(byte & ((1 << self.data_bits) - 1))
+            pos = last_end = last                          # next start edge follows the stop bit
+
+        # Keep only what a later call still needs: the pending frame, or a
+        # short tail so an edge straddling the boundary is not lost.
+        if pending is not None:
+            keep = max(0, pending - nbit)
+        else:
+            keep = max(0, len(x) - 2 * nbit)
+        self._buf = x[keep:]
+        self._pos = max(0, pos - keep)
+        if quiet and pending is None and last_end is None:
+            self.squelch_open = False                      # nothing left to search
+        if last_end is None:
+            self.silence(ndevice)
+        else:
+            self._idle = 0
+            self.silence((nwin - last_end) * self.decimation)
+        return bytes(out)
+
+
+class HdlcDemodulator(Demodulator):
+    """Streaming demodulator for the HDLC bitstream (``modulate`` with
+    ``framing=FRAMING_HDLC``), the mirror of mm_hdlc_rx.
+
+    Each window's tone is the louder of mark / space (below the carrier floor
+    the held tone stands). A tone change counts once it has held half a bit,
+    and the run since the previous one is n bit times: n-1 ones, then the 0
+    the change codes -- so the bit clock re-times on every change. A flag
+    locks (``carrier``); the closing flag, a run longer than ``HDLC_MAX_RUN``
+    bits or a held tone past it goes back to hunting for one.
+    """
+
+    def __init__(self, baud: int, sample_rate: int = SAMPLE_RATE,
+                 counters: dict | None = None, carrier: int = 0,
+                 squelch_dbfs: int = SQUELCH_DEFAULT_DBFS,
+                 decimation: int = DECIMATION_AUTO):
+        super().__init__(baud, sample_rate, counters, carrier, squelch_dbfs, decimation)
+        self._n = 0             # window index of _buf[0] since the start
+        self._level = 1         # tone held: 1 mark, 0 space
+        self._edge = 0          # window index of the last tone change
+        self._clocked = False   # _edge is a real tone change
+        self._pat = self._byte = self._nbits = self._nbytes = 0
+
+    def _unlock(self) -> None:
+        """Frame or bitstream over: hunt for the next flag."""
+        if self.carrier:
+            self.carrier = False
+            self.counters["carrier_lost"] += 1
+        self._pat = self._byte = self._nbits = self._nbytes = 0
+
+    def _bit(self, bit: int, out: bytearray) -> None:
+        """Deframe one bit: a flag locks (after data bytes: closes the frame),
+        a 0 after five 1s is stuffing, every eighth data bit ends a byte."""
+        self._pat = (self._pat >> 1) | (bit << 7)
+        if self._pat == HDLC_FLAG:
+            if self._nbytes:
+                self._unlock()
+                return
+            if not self.carrier:
+                self.carrier = True
+                self.counters["carrier_acquired"] += 1
+            self._byte = self._nbits = 0
+            return
+        if not self.carrier or self._pat & 0xFC == 0x7C:
+            return
+        self._byte |= bit << self._nbits
+        self._nbits += 1
+        if self._nbits == 8:
+            out.append(self._byte)
+            self._nbytes += 1
+            self._byte = self._nbits = 0
+
+    def silence(self, nsamples: int) -> None:
+        """No signal (an empty pipe read or a squelched block): the bitstream is over."""
+        self._unlock()
+        self._clocked = False
+
+    def feed(self, samples: "np.ndarray") -> bytes:
+        """Append samples and return every byte deframed so far."""
+        nbit = self.nbit
+        ndevice = len(samples)
+        if self.decimation > 1:
+            samples = self._decimate(samples)
+        quiet = self._gate(samples, ndevice)
+        x = np.concatenate((self._buf, samples))
+        nwin = len(x) - nbit + 1
+        if quiet is None or nwin <= 0:
+            keep = max(0, nwin)                            # squelched, or no window yet
+            self._buf, self._n = x[keep:], self._n + keep
+            return b""
+
+        p_mark = self._window_energy(x, self._w_mark)
+        p_space = self._window_energy(x, self._w_space)
+        tone = np.where(np.maximum(p_mark, p_space) > self._power_min,
+                        (p_mark > p_space).astype(np.int8), -1)   # -1: hold the tone
+
+        # Runs of one tone; only a change to the other tone that holds half
+        # a bit clocks bits out. A short run at the end waits for more samples.
+        out = bytearray()
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(tone)) + 1, [nwin])).tolist()
+        keep = nwin
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            level = int(tone[start])
+            if level < 0 or level == self._level:
+                continue
+            if end - start < nbit / 2:
+                if end == nwin:
+                    keep = start
+                    break
+                continue
+            edge = self._n + start
+            if self._clocked:
+                nbits = int((edge - self._edge) / nbit + 0.5)
+                if nbits > HDLC_MAX_RUN:
+                    self._unlock()                         # a new bitstream starts here
+                else:
+                    for _ in range(nbits - 1):
+                        self._bit(1, out)
+                    self._bit(0, out)
+            self._level, self._edge, self._clocked = level, edge, True
+
+        if (self._clocked and keep == nwin
+                and self._n + nwin - self._edge > (HDLC_MAX_RUN + 1) * nbit):
+            self._unlock()                                 # tone held: the bitstream ended
+            self._clocked = False
+        if quiet and not self.carrier:
+            self.squelch_open = False
+        self._buf, self._n = x[keep:], self._n + keep
+        return bytes(out)
+
+
+class MultiCarrierDemodulator:
+    """One ``Demodulator`` per carrier band, their byte streams re-interleaved
+    round-robin (the inverse of ``modulate``'s striping); NUL padding is
+    dropped. If every carrier is idle while the next stripe is still missing,
+    the stranded bytes are dropped and reassembly realigns on carrier 0, as
+    the wrapper does.
+    """
+
+    def __init__(self, baud: int, carriers: int, sample_rate: int = SAMPLE_RATE,
+                 counters: dict | None = None, squelch_dbfs: int = SQUELCH_DEFAULT_DBFS,
+                 decimation: int = DECIMATION_AUTO, band: int = 0, band_share: float = 0.0,
+                 data_bits: int = DATA_BITS_DEFAULT):
+        self.counters = counters if counters is not None else new_rx_counters()
+        self.demods = [Demodulator(baud, sample_rate, self.counters, carrier=band + k,
+                                   squelch_dbfs=squelch_dbfs, decimation=decimation,
+                                   band_share=band_share, data_bits=data_bits)
+                       for k in range(carriers)]
+        self._stripes = [deque() for _ in range(carriers)]
+        self._next = 0
+
+    @property
+    def carrier(self) -> bool:
+        return any(d.carrier for d in self.demods)
+
+    @property
+    def squelch_open(self) -> int:
+        return sum(d.squelch_open or d.carrier for d in self.demods)
+
+    def feed(self, samples: "np.ndarray") -> bytes:
+        for demod, stripe in zip(self.demods, self._stripes):
+            stripe.extend(demod.feed(samples))
+        return self._reassemble()
+
+    def silence(self, nsamples: int) -> None:
+        for demod in self.demods:
+            demod.silence(nsamples)
+        self._reassemble()
+
+    def _reassemble(self) -> bytes:
+        out = bytearray()
+        stripes = self._stripes
+        while stripes[self._next]:
+            c = stripes[self._next].popleft()
+            self._next = (self._next + 1) % len(stripes)
+            if c:
+                out.append(c)
+        if not self.carrier and not stripes[self._next]:
+            for stripe in stripes:                         # a stripe was lost: realign
+                stripe.clear()
+            self._next = 0
+        return bytes(out)
+
+
+def new_rx_counters() -> dict:
+    """RX event counters a ``Demodulator`` fills (ctx.counters in mm_core.c)."""
+    return {
+        "carrier_acquired": 0,
+        "carrier_lost": 0,
+        "confidence_hist": [0] * (len(CONFIDENCE_EDGES) + 1),
+        "squelch_opened": 0,
+        "squelch_skipped": 0,
+    }
+
+
+def _new_stats() -> dict:
+    """Counters kept by ``SoftModem`` (struct minimodem_simple_stats)."""
+    return {
+        "bytes_demodulated": 0,
+        "bytes_discarded_tx": 0,
+        "lines_queued": 0,
+        "lines_dropped": 0,
+        "lines_truncated": 0,
+        "queue_high_water": 0,
+        "tx_bytes": 0,
+        "tx_seconds": 0.0,
+        "tx_leaders_skipped": 0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# In-memory sample pipes ("audio devices")
+# ---------------------------------------------------------------------------
+
+class SamplePipe:
+    """Thread-safe FIFO of sample blocks standing in for an audio device."""
+
+    def __init__(self):
+        self._blocks: deque = deque()
+        self._cond = threading.Condition()
+
+    def write(self, samples: "np.ndarray") -> None:
+        with self._cond:
+            self._blocks.append(samples)
+            self._cond.notify_all()
+
+    def read(self, timeout: float | None = None) -> "np.ndarray | None":
+        """Return every queued sample (one array), or None on timeout."""
+        with self._cond:
+            if not self._blocks and timeout:
+                self._cond.wait_for(lambda: self._blocks, timeout)
+            if not self._blocks:
+                return None
+            blocks = list(self._blocks)
+            self._blocks.clear()
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+    def clear(self) -> None:
+        with self._cond:
+            self._blocks.clear()
+
+
+_pipes: dict[int, SamplePipe] = {}
+_pipes_lock = threading.Lock()
+
+
+def pipe(device_id: int) -> SamplePipe:
+    """The sample pipe behind a device index (-1 -> pipe 0)."""
+    index = 0 if device_id < 0 else device_id
+    with _pipes_lock:
+        if index not in _pipes:
+            _pipes[index] = SamplePipe()
+        return _pipes[index]
+
+
+# ---------------------------------------------------------------------------
+# The modem
+# ---------------------------------------------------------------------------
+
+class SoftModem:
+    """One software modem endpoint; methods mirror ``lib.minimodem``.
+
+    ``realtime=True`` makes ``send`` take the signal's airtime (so
+    ``is_transmitting`` / ``wait_transmit_done`` behave as on the wrapper);
+    by default it returns as soon as the samples are in the pipe.
+    """
+
+    def __init__(self, realtime: bool = False):
+        self.realtime = realtime
+        self._initialized = False
+        self._baud = 0
+        self._carriers = 1
+        self._detector = DETECTORS["default"]
+        self._squelch_dbfs = SQUELCH_DEFAULT_DBFS
+        self._decimation = DECIMATION_AUTO
+        self._rx_bauds: list[int] = []
+        self._line_max = LINE_MAX_LEN      # set_line_limits (applied at init)
+        self._queue_max = QUEUE_MAX_LINES
+        self._line_cap = LINE_MAX_LEN
+        self._queue_cap = QUEUE_MAX_LINES
+        self._leader_bits = LEADER_BITS    # set_tx_framing (sticky)
+        self._trailer_bits = TRAILER_BITS
+        self._hold = 0.0                   # set_tx_hold, seconds (sticky)
+        self._duplex = DUPLEX_HALF         # set_duplex (applied at init)
+        self._link_duplex = DUPLEX_HALF
+        self._tones = TONES_BFSK           # set_tones (sticky)
+        self._data_bits = DATA_BITS_DEFAULT  # set_char_framing (sticky)
+        self._stop_bits = STOP_BITS_DEFAULT
+        self._framing = FRAMING_ASYNC      # set_framing_mode (sticky)
+        self._capture: CaptureRing | None = None
+        self._error = ""
+        self._lock = threading.Lock()
+        self._line_cond = threading.Condition(self._lock)
+        self._tx_cond = threading.Condition(self._lock)
+        self._tx_busy = False
+        self._tx_mutex = threading.Lock()  # one writer on the TX pipe (send / hold)
+        self._tx_amplitude = 0.5
+        self._hold_cond = threading.Condition(self._lock)
+        self._hold_run = False
+        self._hold_thread: threading.Thread | None = None
+        self._hold_start = 0.0             # end of the last transmission (monotonic)
+        self._hold_until = 0.0             # ...plus the hold; 0: carrier down
+        self._hold_emitted = 0.0           # seconds of idle marks written since
+        self._tx_out: SamplePipe | None = None
+        self._rx_in: SamplePipe | None = None
+        self._demod: Demodulator | MultiCarrierDemodulator | None = None
+        self._decoders: list = []          # [baud, Demodulator, accum, t_carrier] per candidate
+        self._accum = bytearray()
+        self._t_carrier = 0.0              # monotonic time of the link's last carrier lock
+        self._lines: deque = deque()       # (line bytes, baud, t_carrier, t_decoded)
+        self._many_bauds: list[int] = []
+        self._many_times: list[tuple[float, float, float]] = []
+        self._rx_run = False
+        self._rx_thread: threading.Thread | None = None
+        self._stats = _new_stats()
+        self._rx_counters = new_rx_counters()
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def load(self, lib_path: str | None = None) -> None:
+        """No-op (nothing to load); kept for binding symmetry."""
+        return None
+
+    def init(self, playback_device_id: int = -1, capture_device_id: int = -1,
+             baud: int = 1200, carriers: int = 1) -> int:
+        if np is None:
+            self._error = "NumPy is required for the software modem"
+            return -1
+        if self._initialized:
+            self.cleanup()
+        if baud <= 0:
+            self._error = "Invalid baud"
+            return -1
+        if carriers < 1 or not self._bands_fit(baud, carriers, self._duplex):
+            return -1
+        if playback_device_id >= DEVICE_COUNT or capture_device_id >= DEVICE_COUNT:
+            self._error = "Invalid device index"
+            return -2
+
+        self._baud = int(baud)
+        self._carriers = int(carriers)
+        self._link_duplex = self._duplex
+        self._stats = _new_stats()
+        self._rx_counters = new_rx_counters()
+        self._line_cap = self._line_max
+        self._queue_cap = self._queue_max
+        self._build_rx()
+        self._tx_out = pipe(playback_device_id)
+        self._rx_in = pipe(capture_device_id)
+        self._accum.clear()
+        self._t_carrier = 0.0
+        self._lines.clear()
+        self._many_bauds = []
+        self._many_times = []
+        self._error = ""
+
+        self._rx_run = True
+        self._rx_thread = threading.Thread(target=self._rx_main, name="softmodem-rx", daemon=True)
+        self._rx_thread.start()
+        self._hold_until = 0.0
+        self._hold_run = True
+        self._hold_thread = threading.Thread(target=self._hold_main, name="softmodem-hold",
+                                             daemon=True)
+        self._hold_thread.start()
+        self._initialized = True
+        return 0
+
+    def cleanup(self) -> None:
+        if not self._initialized:
+            return
+        self._rx_run = False
+        self._rx_thread.join()
+        with self._lock:
+            self._hold_run = False
+            self._hold_cond.notify_all()
+        self._hold_thread.join()
+        self.capture_stop()
+        with self._lock:
+            self._line_cond.notify_all()
+            self._lines.clear()
+            self._accum.clear()
+        self._initialized = False
+
+    # -- devices -----------------------------------------------------------
+
+    def get_playback_device_count(self) -> int:
+        return DEVICE_COUNT
+
+    def get_capture_device_count(self) -> int:
+        return DEVICE_COUNT
+
+    def get_playback_device_name(self, device_id: int) -> str:
+        return f"softmodem pipe {device_id}" if 0 <= device_id < DEVICE_COUNT else ""
+
+    def get_capture_device_name(self, device_id: int) -> str:
+        return f"softmodem pipe {device_id}" if 0 <= device_id < DEVICE_COUNT else ""
+
+    # -- TX ----------------------------------------------------------------
+
+    def send(self, message: str, volume: int = 50) -> int:
+        if not self._initialized:
+            self._error = "Not initialized"
+            return -1
+        if not message:
+            self._error = "Empty message"
+            return -2
+        return self._transmit(message.encode("utf-8"), volume)
+
+    def send_many(self, frames, volume: int = 50) -> int:
+        if not self._initialized:
+            self._error = "Not initialized"
+            return -1
+        if not frames or not all(frames):
+            self._error = "Empty message"
+            return -2
+        # One buffer, so the burst gets a single leader and trailer.
+        burst = b"".join(
+            data if data.endswith(b"\n") else data + b"\n"
+            for data in (frame.encode("utf-8") for frame in frames)
+        )
+        return self._transmit(burst, volume)
+
+    def render(self, message: str, volume: int = 50) -> "np.ndarray | None":
+        """The float32 samples ``send`` would write for ``message`` (always with
+        its leader), for ``send_pcm``; None on error (see ``get_error``). Like
+        ``send`` it sets the amplitude the held carrier idles at."""
+        if not self._initialized:
+            self._error = "Not initialized"
+            return None
+        if not message:
+            self._error = "Empty message"
+            return None
+        data = message.encode("utf-8")
+        volume = min(100, max(1, int(volume)))
+        with self._tx_mutex:
+            if self._frame_unclean(data):
+                return None
+            with self._lock:
+                baud = self._baud
+                self._tx_amplitude = volume / 100.0
+            return self._modulate(data, baud, volume / 100.0, self._leader_bits)
+
+    def send_pcm(self, samples: "np.ndarray", nbytes: int = 0, volume: int = 0) -> int:
+        """Write pre-rendered samples (``render``) as one transmission;
+        ``nbytes`` payload bytes count towards ``tx_bytes``. While the idle
+        carrier is held the leader they open with is skipped, as in ``send``.
+        The held carrier after them idles at ``volume``, the one they were
+        rendered at (0 keeps the last ``send`` / ``render`` amplitude)."""
+        if not self._initialized:
+            self._error = "Not initialized"
+            return -1
+        if samples is None or not len(samples):
+            self._error = "Empty message"
+            return -2
+        samples = np.asarray(samples, dtype=np.float32)
+        with self._tx_mutex:
+            with self._lock:
+                skip = self._leader_bits * bit_nsamples(self._baud)
+                held = self._carrier_held() and skip < len(samples)
+                if volume > 0:
+                    self._tx_amplitude = min(100, int(volume)) / 100.0
+            self._play(samples[skip:] if held else samples, max(0, int(nbytes)), held)
+        return 0
+
+    def _transmit(self, data: bytes, volume: int) -> int:
+        """One transmission; skips the leader while the idle carrier is held."""
+        volume = min(100, max(1, int(volume)))
+        with self._tx_mutex:
+            if self._frame_unclean(data):
+                return -2
+            with self._lock:
+                baud = self._baud
+                held = self._carrier_held()
+                self._tx_amplitude = volume / 100.0
+            samples = self._modulate(data, baud, self._tx_amplitude,
+                                     0 if held else self._leader_bits)
+            self._play(samples, len(data), held)
+        return 0
+
+    def _frame_unclean(self, data: bytes) -> bool:
+        """True (error set) if the link cannot send ``data``."""
+        if self._data_bits < 8 and self._framing == FRAMING_ASYNC and not data.isascii():
+            self._error = "Frame is not 7-bit clean"     # 7-N-1 would drop the top bit
+            return True
+        return False
+
+    def _modulate(self, data: bytes, baud: int, amplitude: float,
+                  leader_bits: int) -> "np.ndarray":
+        return modulate(data, baud, amplitude, carriers=self._carriers,
+                        leader_bits=leader_bits, trailer_bits=self._trailer_bits,
+                        band=self._tx_band(), tones=self._tones, data_bits=self._data_bits,
+                        stop_bits=self._stop_bits, framing=self._framing)
+
+    def _play(self, samples: "np.ndarray", nbytes: int, held: bool) -> None:
+        """Write one transmission to the TX pipe and account for it; arms the
+        carrier hold. Caller holds ``_tx_mutex``."""
+        with self._lock:
+            self._tx_busy = True
+        start = time.monotonic()
+        try:
+            self._tx_out.write(samples)
+            if self.realtime:
+                time.sleep(len(samples) / SAMPLE_RATE)
+        finally:
+            with self._lock:
+                self._tx_busy = False
+                end = time.monotonic()
+                self._stats["tx_seconds"] += end - start
+                if self._hold > 0:
+                    self._hold_start, self._hold_until = end, end + self._hold
+                    self._hold_emitted = 0.0
+                    self._hold_cond.notify_all()
+                self._tx_cond.notify_all()
+        with self._lock:
+            self._stats["tx_bytes"] += nbytes
+            self._stats["tx_leaders_skipped"] += held
+
+    def _carrier_held(self) -> bool:
+        """True while the idle carrier is up. Caller holds ``_lock``."""
+        return time.monotonic() < self._hold_until
+
+    def _hold_main(self) -> None:
+        """Carrier hold: after each transmission keep writing idle marks in
+        ``TX_HOLD_BLOCK`` passes, ``TX_HOLD_AHEAD`` ahead of the wall clock,
+        until the hold runs out or a send takes over."""
+        with self._lock:
+            while self._hold_run:
+                if not self._carrier_held():
+                    self._hold_cond.wait()             # until a send arms the hold
+                    continue
+                ahead = self._hold_emitted - (time.monotonic() - self._hold_start)
+                if ahead > TX_HOLD_AHEAD:
+                    self._hold_cond.wait(ahead - TX_HOLD_AHEAD)
+                    continue
+                self._lock.release()
+                try:
+                    with self._tx_mutex:
+                        with self._lock:
+                            held = self._hold_run and self._carrier_held()
+                            origin, baud = self._hold_start, self._baud
+                        nbits = max(1, int(baud * TX_HOLD_BLOCK))
+                        if held:
+                            self._tx_out.write(modulate(b"", baud, self._tx_amplitude,
+                                                        carriers=self._carriers,
+                                                        leader_bits=nbits, trailer_bits=0,
+                                                        band=self._tx_band(),
+                                                        tones=self._tones))
+                finally:
+                    self._lock.acquire()
+                if held and origin == self._hold_start:
+                    self._hold_emitted += nbits / baud
+
+    def is_transmitting(self) -> bool:
+        return self._tx_busy
+
+    def wait_transmit_done(self, timeout: float | None = None) -> bool:
+        with self._lock:
+            if self._tx_busy and timeout:
+                self._tx_cond.wait_for(lambda: not self._tx_busy, timeout)
+            return not self._tx_busy
+
+    # -- RX ----------------------------------------------------------------
+
+    def _rx_main(self) -> None:
+        while self._rx_run:
+            samples = self._rx_in.read(timeout=RX_POLL_TIMEOUT)
+            with self._lock:
+                demod = self._demod
+                decoders = self._decoders
+                capture = self._capture
+                baud = self._baud
+            if samples is not None and capture is not None:
+                capture.write(samples)
+            if samples is None:
+                demod.silence(int(RX_POLL_TIMEOUT * SAMPLE_RATE))
+                for _, dec, _, _ in decoders:
+                    dec.silence(int(RX_POLL_TIMEOUT * SAMPLE_RATE))
+                continue
+            acquired = demod.counters["carrier_acquired"]
+            data = demod.feed(samples)
+            if demod.counters["carrier_acquired"] != acquired:
+                self._t_carrier = time.monotonic()
+            if data:
+                self._feed_decoded(data, self._accum, baud, self._t_carrier)
+            for decoder in decoders:
+                dec_baud, dec, accum, _ = decoder
+                acquired = dec.counters["carrier_acquired"]
+                data = dec.feed(samples)
+                if dec.counters["carrier_acquired"] != acquired:
+                    decoder[3] = time.monotonic()
+                if data:
+                    self._feed_decoded(data, accum, dec_baud, decoder[3], link=False)
+
+    def _feed_decoded(self, data: bytes, accum: bytearray, baud: int, t_carrier: float,
+                      link: bool = True) -> None:
+        """Split decoded bytes on newline into the capped line queue, tagging
+        each line with ``baud`` and its carrier lock / decode times; ``accum``
+        is the link's or a candidate's."""
+        now = time.monotonic()
+        t_carrier = t_carrier or now
+        with self._lock:
+            stats = self._stats
+            if link:
+                stats["bytes_demodulated"] += len(data)
+            for c in data:
+                if c == 0x0A:
+                    if len(self._lines) == self._queue_cap:
+                        self._lines.popleft()              # drop oldest (DoS guard)
+                        stats["lines_dropped"] += 1
+                    self._lines.append((bytes(accum), baud, t_carrier, now))
+                    accum.clear()
+                    stats["lines_queued"] += 1
+                    stats["queue_high_water"] = max(stats["queue_high_water"], len(self._lines))
+                    self._line_cond.notify_all()
+                elif len(accum) < self._line_cap:
+                    accum.append(c)
+                else:
+                    accum.clear()                          # overlong line: reset
+                    stats["lines_truncated"] += 1
+
+    def _wait_line_locked(self, timeout: float | None) -> None:
+        if not self._lines and timeout:
+            self._line_cond.wait_for(lambda: self._lines or not self._rx_run, timeout)
+
+    def process(self) -> int:
+        if not self._initialized:
+            self._error = "Not initialized"
+            return -1
+        return 0
+
+    def peek_length(self, timeout: float | None = None) -> int:
+        if not self._initialized:
+            self._error = "Not initialized"
+            return -1
+        with self._lock:
+            self._wait_line_locked(timeout)
+            return len(self._lines[0][0]) if self._lines else 0
+
+    def receive(self, buffer_size: int | None = None,
+                timeout: float | None = None) -> str | None:
+        if not self._initialized:
+            return None
+        with self._lock:
+            self._wait_line_locked(timeout)
+            if not self._lines:
+                return None
+            line = self._lines.popleft()[0]
+        if buffer_size is not None:
+            line = line[:max(0, buffer_size - 1)]     # the wrapper's NUL-terminated copy
+        return line.decode("utf-8", "replace") or None
+
+    def receive_many(self, max_lines: int = QUEUE_MAX_LINES,
+                     timeout: float | None = None) -> list[memoryview]:
+        if not self._initialized:
+            return []
+        max_lines = max(1, min(int(max_lines), QUEUE_MAX_LINES))
+        with self._lock:
+            self._wait_line_locked(timeout)
+            n = min(max_lines, len(self._lines))
+            batch = [self._lines.popleft() for _ in range(n)]
+        dequeued = time.monotonic()
+        self._many_bauds = [baud for _, baud, _, _ in batch]
+        self._many_times = [(t_carrier, t_decoded, dequeued)
+                            for _, _, t_carrier, t_decoded in batch]
+        return [memoryview(line) for line, _, _, _ in batch]
+
+    def received_bauds(self) -> list[int]:
+        """The baud that decoded each line of the last ``receive_many`` batch."""
+        return list(self._many_bauds)
+
+    def received_times(self) -> list[tuple[float, float, float]]:
+        """``(carrier_acquired, decoded, dequeued)`` monotonic times for each
+        line of the last ``receive_many`` batch."""
+        return list(self._many_times)
+
+    # -- config / errors ---------------------------------------------------
+
+    def set_baud(self, baud: int) -> int:
+        if not self._initialized:
+            self._error = "Not initialized"
+            return -1
+        if baud <= 0:
+            self._error = "Invalid baud"
+            return -1
+        if not self._bands_fit(baud, self._carriers, self._link_duplex):
+            return -1
+        with self._lock:
+            self._baud = int(baud)
+            self._build_rx()
+        return 0
+
+    def _bands_fit(self, baud: int, carriers: int, duplex: int) -> bool:
+        """Whether the link's bands (twice over in full duplex) fit at ``baud``,
+        and the MFSK tones or HDLC framing with them (bands_fit)."""
+        if self._framing == FRAMING_HDLC and (self._tones != TONES_BFSK or carriers > 1
+                                              or duplex != DUPLEX_HALF):
+            self._error = "HDLC framing needs a single BFSK carrier in half duplex"
+            return False
+        if self._tones != TONES_BFSK:
+            if carriers > 1 or duplex != DUPLEX_HALF:
+                self._error = "MFSK needs a single carrier in half duplex"
+                return False
+            if self._tones > max_tones(baud):
+                self._error = "Tones do not fit the band plan at this baud"
+                return False
+        needed = carriers if duplex == DUPLEX_HALF else 2 * carriers
+        if needed <= max_carriers(baud):
+            return True
+        self._error = ("Carrier count does not fit the band plan at this baud"
+                       if duplex == DUPLEX_HALF
+                       else "Duplex bands do not fit the band plan at this baud")
+        return False
+
+    def _tx_band(self) -> int:
+        return duplex_bands(self._link_duplex, self._carriers)[1]
+
+    def set_duplex(self, mode: int | str) -> int:
+        """Select half or full duplex (sticky; applied at the next init)."""
+        if isinstance(mode, str):
+            mode = DUPLEX_MODES.get(mode, -1)
+        if mode not in DUPLEX_MODES.values():
+            self._error = "Invalid duplex mode"
+            return -1
+        self._duplex = int(mode)
+        return 0
+
+    def set_tones(self, tones: int) -> int:
+        """Select BFSK (2) or MFSK with 4 or 8 tones (sticky; rebuilds the RX
+        side if up, refusing a tone count the link cannot carry)."""
+        if tones not in TONE_COUNTS:
+            self._error = "Invalid tone count"
+            return -1
+        if not self._initialized:
+            self._tones = int(tones)
+            return 0
+        if tones == self._tones:
+            return 0
+        was, self._tones = self._tones, int(tones)
+        if not self._bands_fit(self._baud, self._carriers, self._link_duplex):
+            self._tones = was
+            return -1
+        with self._tx_mutex:
+            with self._lock:
+                self._hold_until = 0.0                 # the idle marks belong to the old tones
+                self._build_rx()
+                self._accum.clear()
+        return 0
+
+    def set_char_framing(self, data_bits: int = DATA_BITS_DEFAULT,
+                         stop_bits: int = STOP_BITS_DEFAULT) -> int:
+        """Set the data and stop bits per character (sticky; rebuilds the RX
+        side if up). 7 data bits refuse sends that are not 7-bit clean."""
+        if (data_bits not in (DATA_BITS_ASCII, DATA_BITS_DEFAULT)
+                or not 1 <= stop_bits <= STOP_BITS_MAX):
+            self._error = "Character framing out of range"
+            return -1
+        if (data_bits, stop_bits) == (self._data_bits, self._stop_bits):
+            return 0
+        with self._tx_mutex:
+            with self._lock:
+                self._data_bits, self._stop_bits = int(data_bits), int(stop_bits)
+                if self._initialized:
+                    self._build_rx()
+                    self._accum.clear()
+        return 0
+
+    def set_framing_mode(self, mode: int | str) -> int:
+        """Select async (start/stop) or HDLC framing (sticky; rebuilds the RX
+        side if up, refusing HDLC on a link it cannot run on)."""
+        if isinstance(mode, str):
+            mode = FRAMING_MODES.get(mode, -1)
+        if mode not in FRAMING_MODES.values():
+            self._error = "Invalid framing mode"
+            return -1
+        if not self._initialized:
+            self._framing = int(mode)
+            return 0
+        if mode == self._framing:
+            return 0
+        was, self._framing = self._framing, int(mode)
+        if not self._bands_fit(self._baud, self._carriers, self._link_duplex):
+            self._framing = was
+            return -1
+        with self._tx_mutex:
+            with self._lock:
+                self._build_rx()
+                self._accum.clear()
+        return 0
+
+    def set_line_limits(self, max_line_len: int = LINE_MAX_LEN,
+                        max_lines: int = QUEUE_MAX_LINES) -> int:
+        """Set the received-line caps (sticky; applied at the next init)."""
+        if not 1 <= max_line_len <= LINE_MAX_LEN_LIMIT:
+            self._error = "Line length limit out of range"
+            return -1
+        if not 1 <= max_lines <= QUEUE_MAX_LINES_LIMIT:
+            self._error = "Queue depth out of range"
+            return -1
+        self._line_max = int(max_line_len)
+        self._queue_max = int(max_lines)
+        return 0
+
+    def set_tx_framing(self, leader_bits: int = LEADER_BITS,
+                       trailer_bits: int = TRAILER_BITS) -> int:
+        """Set the leader / trailer mark bits (sticky; from the next send)."""
+        if not (0 <= leader_bits <= TX_FRAMING_BITS_MAX
+                and 0 <= trailer_bits <= TX_FRAMING_BITS_MAX):
+            self._error = "Leader/trailer length out of range"
+            return -1
+        with self._tx_mutex:
+            self._leader_bits = int(leader_bits)
+            self._trailer_bits = int(trailer_bits)
+        return 0
+
+    def set_tx_hold(self, hold: float) -> int:
+        """Hold the idle carrier ``hold`` seconds after each send (0: off)."""
+        if not 0 <= hold <= TX_HOLD_MAX:
+            self._error = "Carrier hold out of range"
+            return -1
+        with self._lock:
+            self._hold = round(hold, 3)                # the wrapper takes whole ms
+            if not self._hold:
+                self._hold_until = 0.0
+        return 0
+
+    def set_rx_bauds(self, bauds) -> int:
+        """Also decode each candidate baud (sticky; rebuilds the RX side if up)."""
+        bauds = [int(b) for b in bauds]
+        if len(bauds) > MAX_RX_BAUDS:
+            self._error = "Invalid candidate baud list"
+            return -1
+        if any(b <= 0 for b in bauds):
+            self._error = "Invalid baud"
+            return -1
+        self._rx_bauds = bauds
+        if self._initialized:
+            with self._lock:
+                self._build_rx()
+        return 0
+
+    def set_detector(self, detector: int | str) -> int:
+        """Record the bit detector choice (validated like the wrapper's)."""
+        if isinstance(detector, str):
+            detector = DETECTORS.get(detector, -1)
+        if detector not in DETECTORS.values():
+            self._error = "Unknown bit detector"
+            return -1
+        self._detector = int(detector)
+        return 0
+
+    def set_squelch(self, open_dbfs: int) -> int:
+        """Set the RX energy squelch (sticky; rebuilds the demodulator if up)."""
+        if open_dbfs != SQUELCH_OFF and not SQUELCH_MIN_DBFS <= open_dbfs < 0:
+            self._error = "Squelch level out of range"
+            return -1
+        self._squelch_dbfs = int(open_dbfs)
+        if self._initialized:
+            with self._lock:
+                self._build_rx()
+        return 0
+
+    def set_decimation(self, max_factor: int) -> int:
+        """Cap the RX decimation factor (sticky; rebuilds the demodulator if up)."""
+        if not DECIMATION_AUTO <= max_factor <= DECIMATION_MAX:
+            self._error = "Decimation factor out of range"
+            return -1
+        self._decimation = int(max_factor)
+        if self._initialized:
+            with self._lock:
+                self._build_rx()
+        return 0
+
+    def _build_rx(self) -> None:
+        """(Re)build the link demodulator and the candidate-baud decoders
+        (single-carrier BFSK only, skipping the link baud, as decoders_start);
+        under HDLC framing both are ``HdlcDemodulator``."""
+        band = duplex_bands(self._link_duplex, self._carriers)[0]
+        if self._framing == FRAMING_HDLC:
+            options = {"squelch_dbfs": self._squelch_dbfs, "decimation": self._decimation}
+            self._demod = HdlcDemodulator(self._baud, counters=self._rx_counters, **options)
+            self._decoders = [[b, HdlcDemodulator(b, counters=new_rx_counters(), **options),
+                               bytearray(), 0.0]
+                              for b in dict.fromkeys(self._rx_bauds) if b != self._baud]
+            return
+        options = {"counters": self._rx_counters, "squelch_dbfs": self._squelch_dbfs,
+                   "decimation": self._decimation, "data_bits": self._data_bits,
+                   "band_share": DUPLEX_BAND_SHARE if self._link_duplex != DUPLEX_HALF else 0.0}
+        if self._carriers > 1:
+            self._demod = MultiCarrierDemodulator(self._baud, self._carriers, band=band,
+                                                  **options)
+            self._decoders = []
+            return
+        self._demod = Demodulator(self._baud, carrier=band, tones=self._tones, **options)
+        if self._tones != TONES_BFSK:
+            self._decoders = []
+            return
+        del options["counters"]                        # candidates keep the link's stats clean
+        self._decoders = [[b, Demodulator(b, counters=new_rx_counters(), carrier=band,
+                                          **options), bytearray(), 0.0]
+                          for b in dict.fromkeys(self._rx_bauds) if b != self._baud]
+
+    def get_stats(self) -> dict | None:
+        """Counter snapshot with the same keys as ``lib.minimodem.get_stats``."""
+        if not self._initialized:
+            return None
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._lines)
+            stats["carrier_acquired"] = self._rx_counters["carrier_acquired"]
+            stats["carrier_lost"] = self._rx_counters["carrier_lost"]
+            stats["confidence_hist"] = list(self._rx_counters["confidence_hist"])
+            stats["squelch_open"] = int(self._demod.squelch_open or self._demod.carrier)
+            stats["squelch_opened"] = self._rx_counters["squelch_opened"]
+            stats["squelch_skipped"] = self._rx_counters["squelch_skipped"]
+        return stats
+
+    def capture_start(self, path: str, seconds: int = 60) -> int:
+        """Tee raw RX samples into a ring file (``lib.capture`` format)."""
+        if not self._initialized:
+            self._error = "Not initialized"
+            return -1
+        if not path or seconds <= 0:
+            self._error = "Invalid capture path or length"
+            return -2
+        self.capture_stop()
+        try:
+            ring = CaptureRing(path, seconds, SAMPLE_RATE, self._baud, self._carriers,
+                               self._tones)
+        except OSError:
+            self._error = "Failed to create or map the capture file"
+            return -3
+        with self._lock:
+            self._capture = ring
+        return 0
+
+    def capture_stop(self) -> int:
+        with self._lock:
+            ring, self._capture = self._capture, None
+        if ring is not None:
+            ring.close()
+        return 0
+
+    def get_error(self) -> str:
+        return self._error
+
+
+# ---------------------------------------------------------------------------
+# Module-level API (mirrors lib.minimodem's functions over one default modem)
+# ---------------------------------------------------------------------------
+
+_default = SoftModem()
+
+load = _default.load
+init = _default.init
+get_playback_device_count = _default.get_playback_device_count
+get_capture_device_count = _default.get_capture_device_count
+get_playback_device_name = _default.get_playback_device_name
+get_capture_device_name = _default.get_capture_device_name
+send = _default.send
+send_many = _default.send_many
+render = _default.render
+send_pcm = _default.send_pcm
+is_transmitting = _default.is_transmitting
+wait_transmit_done = _default.wait_transmit_done
+process = _default.process
+peek_length = _default.peek_length
+receive = _default.receive
+receive_many = _default.receive_many
+received_bauds = _default.received_bauds
+received_times = _default.received_times
+set_baud = _default.set_baud
+set_tones = _default.set_tones
+set_char_framing = _default.set_char_framing
+set_framing_mode = _default.set_framing_mode
+set_line_limits = _default.set_line_limits
+set_tx_framing = _default.set_tx_framing
+set_tx_hold = _default.set_tx_hold
+set_duplex = _default.set_duplex
+set_rx_bauds = _default.set_rx_bauds
+set_detector = _default.set_detector
+set_squelch = _default.set_squelch
+set_decimation = _default.set_decimation
+get_stats = _default.get_stats
+capture_start = _default.capture_start
+capture_stop = _default.capture_stop
+cleanup = _default.cleanup
+get_error = _default.get_error
@@ -0,0 +1,524 @@
+"""
+Pluggable line transports for the backend.
+
+Framing (``chunking``) and the main loops only need to move newline-framed
+frames, so they talk to a ``Transport`` rather than to the minimodem binding:
+
+- ``ModemTransport``   -- any binding with the ``lib.minimodem`` surface: the
+                          ctypes wrapper (FSK over audio) or ``lib.softmodem``.
+- ``StdioTransport``   -- newline-framed lines on stdin/stdout (the framing of
+                          the AHK STDIO echo backend, generalised).
+- ``UnixSocketTransport`` -- newline-framed lines over a UNIX-domain stream
+                          socket, so the backend can run on a compute box with
+                          the audio link bridged in over the socket.
+- ``memory_pair()``    -- two connected in-process endpoints, for measuring
+                          pipeline throughput without airtime.
+
+Every transport returns received lines newline-stripped (bytes-like, oldest
+first), applies the wrapper's Security V5 caps (``LINE_MAX_LEN`` per line,
+``QUEUE_MAX_LINES`` queued, drop-oldest; the modems take theirs from
+``set_line_limits``, the byte-stream transports from ``line_max`` /
+``queue_max``), and keeps counters for ``stats()``.
+``send`` (one frame) and ``send_many`` (a burst: on the modem, one carrier
+lead-in for all of its frames) follow the binding's convention: 0 on success,
+negative on error with the reason in ``get_error()``. ``set_baud`` retunes the modem link (the
+``fn:"hello"`` negotiation in ``chunking`` drives it); the byte-stream
+transports have no line rate and only record the value. After each ``receive``,
+``rx_bauds`` holds the baud that decoded each returned line when the modem
+decodes several candidate rates (``set_rx_bauds``), and is empty otherwise;
+``rx_times`` holds each line's ``(carrier_acquired, decoded, dequeued)``
+``time.monotonic()`` stamps when the modem reports them (``received_times``),
+and is empty for the byte-stream transports, which have no carrier.
+``ModemTransport.data_bits`` records the modem's character framing
+(``set_char_framing``); at 7 the framing layer refuses frames that are not
+7-bit clean. ``ModemTransport.send_cached`` is for the frames that go out
+byte for byte again -- a ``last_sent_chunks`` retransmission, a retx request,
+an error reply: it keeps their rendered waveforms in an LRU cache (bindings
+with ``render`` / ``send_pcm``), so a repeat is one sample write, not a
+re-synthesis. Plain ``send`` / ``send_many`` never touch the cache.
+"""
+
+import os
+import socket
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Protocol, runtime_checkable
+
+from .config import TX_LEADER_BITS, TX_TRAILER_BITS, logger
+from . import minimodem
+
+# Security V5 caps, matching minimodem_simple.h's defaults (MM_LINE_MAX_LEN_DEFAULT /
+# MM_QUEUE_MAX_LINES_DEFAULT) so every transport bounds untrusted input the same way.
+LINE_MAX_LEN = 8192
+QUEUE_MAX_LINES = 64
+
+DEFAULT_SOCKET_PATH = "/tmp/llm-over-sound.sock"
+
+# ModemTransport waveform cache budget, in samples across every cached frame
+# (8 MiB of float32 at 48 kHz: ~44 s of audio). A frame longer than this is
+# sent without caching.
+WAVEFORM_CACHE_SAMPLES = 1 << 21
+
+
+@runtime_checkable
+class Transport(Protocol):
+    """What the framing layer and main loops need from a link."""
+
+    baud: int   # current line rate (0 for links without one)
+    rx_bauds: list   # baud of each line of the last receive ([] if not reported)
+    rx_times: list   # (carrier_acquired, decoded, dequeued) per line ([] if not reported)
+
+    def send(self, frame: str, volume: int) -> int:
+        """Send ONE newline-terminated frame. 0 on success, negative on error."""
+        ...
+
+    def send_many(self, frames: list, volume: int) -> int:
+        """Send newline-terminated frames as one burst (for the modem: one
+        carrier lead-in for all of them). 0 on success, negative on error."""
+        ...
+
+    def receive(self, timeout: float | None = None) -> list:
+        """Drain queued lines (bytes-like, newline-stripped, oldest first).
+
+        ``timeout`` (seconds) waits for at least one line; None does not wait.
+        """
+        ...
+
+    def wait_tx(self, timeout: float | None = None) -> bool:
+        """True once no transmission is in flight (False on timeout)."""
+        ...
+
+    def set_baud(self, baud: int) -> int:
+        """Switch the link rate (this end only). 0 on success, negative on error."""
+        ...
+
+    def stats(self) -> dict:
+        """Snapshot of the transport's counters."""
+        ...
+
+    def get_error(self) -> str:
+        """Reason for the last failed call."""
+        ...
+
+    def close(self) -> None:
+        """Release the link (idempotent)."""
+        ...
+
+    @property
+    def closed(self) -> bool:
+        """True once no further lines can arrive (closed, or input at EOF)."""
+        ...
+
+
+def _new_stats() -> dict:
+    return {
+        "frames_sent": 0,
+        "bytes_sent": 0,
+        "send_errors": 0,
+        "lines_received": 0,
+        "bytes_received": 0,
+        "lines_dropped": 0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Modem (ctypes wrapper or softmodem)
+# ---------------------------------------------------------------------------
+
+class ModemTransport:
+    """Transport over a binding module with the ``lib.minimodem`` surface.
+
+    The binding must already be ``init``-ed; ``close`` calls its ``cleanup``.
+    Line queueing and caps happen inside the binding (the wrapper's RX thread).
+    ``send_cached`` goes through ``render`` + ``send_pcm`` when the binding has
+    them, caching each waveform by (burst, baud, volume), least recently used
+    first out past ``waveform_cache_samples`` (0 disables it). The other link
+    settings are fixed once the transport is built. ``send_pcm`` drops a
+    waveform's leader while the binding holds the carrier, as ``send`` does,
+    and gets the waveform's volume for the held carrier after it.
+    """
+
+    def __init__(self, modem=minimodem, baud: int = 1200):
+        self.modem = modem
+        self.baud = baud        # rate passed to init / the last set_baud
+        self.rx_bauds: list[int] = []
+        self.rx_times: list[tuple[float, float, float]] = []
+        self.tone_bits = TX_LEADER_BITS + TX_TRAILER_BITS   # per send (set_tx_framing)
+        self.data_bits = minimodem.DATA_BITS_DEFAULT        # per character (set_char_framing)
+        self.waveform_cache_samples = WAVEFORM_CACHE_SAMPLES
+        self._waveforms: OrderedDict = OrderedDict()
+        self._waveform_samples = 0
+        self._stats = _new_stats()
+        self._stats.update(waveform_hits=0, waveform_misses=0)
+        self._closed = False
+
+    def send(self, frame: str, volume: int) -> int:
+        return self._count(self.modem.send(frame, volume), [frame])
+
+    def send_many(self, frames: list, volume: int) -> int:
+        return self._count(self.modem.send_many(frames, volume), frames)
+
+    def send_cached(self, frames: list, volume: int) -> int:
+        """Send ``frames`` (one frame, or a burst as ``send_many``) through the
+        waveform cache: the first send of a burst renders and keeps it, a
+        repeat is one ``send_pcm``. Falls back to ``send`` / ``send_many`` when
+        the binding cannot render (or the cache is off)."""
+        if len(frames) == 1:
+            burst = frames[0]
+        else:
+            burst = "".join(f if f.endswith("\n") else f + "\n" for f in frames)
+        samples = self._waveform(burst, volume)
+        if samples is None:
+            if len(frames) == 1:
+                return self.send(frames[0], volume)
+            return self.send_many(frames, volume)
+        return self._count(self.modem.send_pcm(samples, len(burst.encode("utf-8")), volume),
+                           frames)
+
+    def _count(self, result: int, frames: list) -> int:
+        if result < 0:
+            self._stats["send_errors"] += 1
+        else:
+            self._stats["frames_sent"] += len(frames)
+            self._stats["bytes_sent"] += sum(len(frame) for frame in frames)
+        return result
+
+    def _waveform(self, frame: str, volume: int):
+        """The rendered samples of ``frame``: from the cache, else rendered and
+        cached. None if the binding cannot render (or refused the frame: the
+        plain send then reports why)."""
+        if self.waveform_cache_samples <= 0 or not hasattr(self.modem, "render"):
+            return None
+        key = (frame, self.baud, volume)
+        samples = self._waveforms.get(key)
+        if samples is not None:
+            self._waveforms.move_to_end(key)
+            self._stats["waveform_hits"] += 1
+            return samples
+        samples = self.modem.render(frame, volume)
+        if samples is None:
+            return None
+        self._stats["waveform_misses"] += 1
+        if len(samples) <= self.waveform_cache_samples:
+            self._waveforms[key] = samples
+            self._waveform_samples += len(samples)
+            while self._waveform_samples > self.waveform_cache_samples:
+                _, evicted = self._waveforms.popitem(last=False)
+                self._waveform_samples -= len(evicted)
+        return samples
+
+    def receive(self, timeout: float | None = None) -> list:
+        lines = self.modem.receive_many(timeout=timeout)
+        received_bauds = getattr(self.modem, "received_bauds", None)
+        self.rx_bauds = received_bauds() if lines and received_bauds else []
+        received_times = getattr(self.modem, "received_times", None)
+        self.rx_times = received_times() if lines and received_times else []
+        if lines:
+            self._stats["lines_received"] += len(lines)
+            self._stats["bytes_received"] += sum(len(line) for line in lines)
+        return lines
+
+    def wait_tx(self, timeout: float | None = None) -> bool:
+        return self.modem.wait_transmit_done(timeout)
+
+    def set_baud(self, baud: int) -> int:
+        result = self.modem.set_baud(baud)
+        if result == 0:
+            self.baud = baud
+        return result
+
+    def stats(self) -> dict:
+        """Transport counters, plus the binding's own counter block (queue
+        depth/drops, carrier locks, confidence histogram, TX time) under
+        ``"modem"`` when it has one."""
+        stats = dict(self._stats)
+        get_stats = getattr(self.modem, "get_stats", None)
+        modem_stats = get_stats() if get_stats else None
+        if modem_stats is not None:
+            stats["modem"] = modem_stats
+        return stats
+
+    def get_error(self) -> str:
+        return self.modem.get_error()
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.modem.cleanup()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+# ---------------------------------------------------------------------------
+# Byte-stream transports (shared line queue)
+# ---------------------------------------------------------------------------
+
+class _LineQueueTransport(ABC):
+    """Base for transports fed by a byte stream: splits on newline into a
+    capped line queue and implements ``receive`` / ``stats`` over it.
+    Subclasses implement ``_write`` and feed ``_feed`` / ``_push_line``.
+    """
+
+    def __init__(self):
+        self._lines: deque = deque()
+        self._accum = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False    # close() called: no more sends
+        self._eof = False       # input ended: no more lines will arrive
+        self._error = ""
+        self._stats = _new_stats()
+        self._tx_lock = threading.Lock()
+        self.baud = 0           # no line rate; set_baud only records it
+        self.rx_bauds: list[int] = []
+        self.rx_times: list[tuple[float, float, float]] = []
+        self.line_max = LINE_MAX_LEN
+        self.queue_max = QUEUE_MAX_LINES
+
+    # -- RX side -----------------------------------------------------------
+
+    def _feed(self, data: bytes) -> None:
+        """Accumulate stream bytes; queue each complete line."""
+        start = 0
+        while True:
+            nl = data.find(b"\n", start)
+            if nl < 0:
+                self._accum += data[start:]
+                if len(self._accum) > self.line_max:
+                    self._accum.clear()                # overlong line: reset (V5)
+                return
+            self._accum += data[start:nl]
+            if len(self._accum) <= self.line_max:
+                self._push_line(bytes(self._accum))
+            self._accum.clear()
+            start = nl + 1
+
+    def _push_line(self, line: bytes) -> None:
+        with self._cond:
+            if len(self._lines) >= self.queue_max:
+                self._lines.popleft()                  # drop oldest (DoS guard)
+                self._stats["lines_dropped"] += 1
+            self._lines.append(line)
+            self._stats["lines_received"] += 1
+            self._stats["bytes_received"] += len(line)
+            self._cond.notify_all()
+
+    def receive(self, timeout: float | None = None) -> list:
+        with self._cond:
+            if not self._lines and timeout and not self.closed:
+                self._cond.wait_for(lambda: self._lines or self.closed, timeout)
+            lines = list(self._lines)
+            self._lines.clear()
+        return lines
+
+    # -- TX side -----------------------------------------------------------
+
+    @abstractmethod
+    def _write(self, data: bytes) -> None:
+        """Put ``data`` (one or more whole frames) on the wire; raise OSError on failure."""
+
+    def send(self, frame: str, volume: int) -> int:
+        return self.send_many([frame], volume)
+
+    def send_many(self, frames: list, volume: int) -> int:
+        if self._closed:
+            self._error = "Transport closed"
+            return -1
+        data = "".join(frames).encode("utf-8")
+        try:
+            with self._tx_lock:
+                self._write(data)
+        except OSError as e:
+            self._error = f"Write failed: {e}"
+            self._stats["send_errors"] += 1
+            return -3
+        self._stats["frames_sent"] += len(frames)
+        self._stats["bytes_sent"] += len(data)
+        return 0
+
+    def wait_tx(self, timeout: float | None = None) -> bool:
+        # Writes complete before send() returns; nothing is ever in flight.
+        return True
+
+    def set_baud(self, baud: int) -> int:
+        if baud <= 0:
+            self._error = "Invalid baud"
+            return -1
+        self.baud = baud
+        return 0
+
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    def get_error(self) -> str:
+        return self._error
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _end_input(self) -> None:
+        """Mark the input side finished (EOF / peer gone); sends still work."""
+        with self._cond:
+            self._eof = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed or self._eof
+
+
+class StdioTransport(_LineQueueTransport):
+    """Newline-framed lines on a pair of binary streams (default stdin/stdout).
+
+    A reader thread drains the input stream. EOF ends input (``closed`` turns
+    True; lines already queued are still returned) but replies can still be
+    written.
+    Logging goes to stderr, so stdout carries frames only.
+    """
+
+    def __init__(self, stdin=None, stdout=None):
+        super().__init__()
+        self._in = stdin if stdin is not None else sys.stdin.buffer
+        self._out = stdout if stdout is not None else sys.stdout.buffer
+        self._reader = threading.Thread(target=self._read_loop, name="stdio-rx", daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        read = getattr(self._in, "read1", self._in.read)
+        while not self._closed:
+            try:
+                data = read(4096)
+            except (OSError, ValueError):
+                data = b""
+            if not data:
+                logger.info("[TRANSPORT] stdio input closed")
+                self._end_input()
+                return
+            self._feed(data)
+
+    def _write(self, data: bytes) -> None:
+        self._out.write(data)
+        self._out.flush()
+
+
+class UnixSocketTransport(_LineQueueTransport):
+    """Newline-framed lines over a UNIX-domain stream socket.
+
+    ``listen(path)`` serves one peer at a time (re-accepting after a
+    disconnect); ``connect(path)`` dials an existing listener. Frames sent with
+    no peer connected fail with an error, as a send on a dead link would.
+    """
+
+    def __init__(self, path: str, server: bool):
+        super().__init__()
+        self.path = path
+        self._server = server
+        self._listener: socket.socket | None = None
+        self._conn: socket.socket | None = None
+        if server:
+            if os.path.exists(path):
+                os.unlink(path)
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(path)
+            self._listener.listen(1)
+        else:
+            self._conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._conn.connect(path)
+        self._reader = threading.Thread(target=self._read_loop, name="unix-rx", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def listen(cls, path: str = DEFAULT_SOCKET_PATH) -> "UnixSocketTransport":
+        return cls(path, server=True)
+
+    @classmethod
+    def connect(cls, path: str = DEFAULT_SOCKET_PATH) -> "UnixSocketTransport":
+        return cls(path, server=False)
+
+    def _read_loop(self) -> None:
+        while not self._closed:
+            if self._conn is None:
+                try:
+                    conn, _ = self._listener.accept()
+                except OSError:
+                    return                              # listener closed
+                self._accum.clear()
+                self._conn = conn
+                logger.info(f"[TRANSPORT] Peer connected on {self.path}")
+            try:
+                data = self._conn.recv(4096)
+            except OSError:
+                data = b""
+            if data:
+                self._feed(data)
+                continue
+            # Peer went away.
+            self._drop_conn()
+            if not self._server:
+                self._end_input()
+                return
+            logger.info(f"[TRANSPORT] Peer disconnected from {self.path}")
+
+    def _drop_conn(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _write(self, data: bytes) -> None:
+        conn = self._conn
+        if conn is None:
+            raise OSError("no peer connected")
+        conn.sendall(data)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        super().close()
+        if self._conn is not None:
+            try:
+                self._conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._drop_conn()
+        if self._listener is not None:
+            self._listener.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+class MemoryTransport(_LineQueueTransport):
+    """One end of an in-process link; create connected ends with ``memory_pair``."""
+
+    def __init__(self):
+        super().__init__()
+        self.peer: "MemoryTransport | None" = None
+
+    def _write(self, data: bytes) -> None:
+        peer = self.peer
+        if peer is None or peer._closed:
+            raise OSError("peer closed")
+        peer._feed(data)
+
+    def close(self) -> None:
+        super().close()
+        if self.peer is not None:
+            self.peer._end_input()
+
+
+def memory_pair() -> tuple[MemoryTransport, MemoryTransport]:
+    """Two connected in-memory endpoints: what one sends, the other receives."""
+    a, b = MemoryTransport(), MemoryTransport()
+    a.peer, b.peer = b, a
+    return a, b
+
+
+# Transport names accepted by ``backend.py --transport``.
+TRANSPORT_CHOICES = ("modem", "softmodem", "stdio", "unix")
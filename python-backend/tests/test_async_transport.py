@@ -0,0 +1,113 @@
+"""Tests for lib.async_transport.AsyncModemTransport over a fake transport."""
+
+import asyncio
+import threading
+import time
+
+from lib.async_transport import AsyncModemTransport
+
+
+class QueueTransport:
+    """Minimal Transport fake: queued lines in, sends with a short airtime."""
+
+    def __init__(self):
+        self.sent: list[str] = []
+        self.closed = False
+        self.baud = 1200
+        self.rx_bauds: list[int] = []
+        self.rx_times: list[tuple[float, float, float]] = []
+        self._rx: list[bytes] = []
+        self._cond = threading.Condition()
+        self._busy = False
+
+    def inject(self, *lines: str) -> None:
+        with self._cond:
+            self._rx.extend(line.encode("utf-8") for line in lines)
+            self._cond.notify_all()
+
+    def end_input(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def receive(self, timeout: float | None = None):
+        with self._cond:
+            if timeout:
+                self._cond.wait_for(lambda: self._rx or self.closed, timeout)
+            lines, self._rx = self._rx, []
+        return [memoryview(b) for b in lines]
+
+    def send(self, message: str, volume: int = 50) -> int:
+        with self._cond:
+            self._busy = True
+        time.sleep(0.02)
+        with self._cond:
+            self._busy = False
+            self.sent.append(message)
+            self._cond.notify_all()
+        return 0
+
+    def wait_tx(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            if timeout:
+                self._cond.wait_for(lambda: not self._busy, timeout)
+            return not self._busy
+
+    def get_error(self) -> str:
+        return ""
+
+
+def test_recv_delivers_lines_in_order():
+    link = QueueTransport()
+
+    async def run():
+        async with AsyncModemTransport(transport=link, poll_timeout=0.05) as transport:
+            link.inject('{"id":"a"}', '{"id":"b"}')
+            return [await asyncio.wait_for(transport.recv(), 2) for _ in range(2)]
+
+    assert asyncio.run(run()) == ['{"id":"a"}', '{"id":"b"}']
+
+
+def test_send_serialises_frames_and_wait_tx_resolves():
+    link = QueueTransport()
+
+    async def run():
+        async with AsyncModemTransport(transport=link, poll_timeout=0.05) as transport:
+            results = await asyncio.gather(*(transport.send(f"f{i}\n", 50) for i in range(3)))
+            idle = await transport.wait_tx(timeout=1)
+            return results, idle
+
+    results, idle = asyncio.run(run())
+    assert results == [True, True, True]
+    assert idle is True
+    assert link.sent == ["f0\n", "f1\n", "f2\n"]
+
+
+def test_recv_not_blocked_by_in_flight_send():
+    """A line arriving during a transmission is delivered before TX ends."""
+    link = QueueTransport()
+
+    async def run():
+        async with AsyncModemTransport(transport=link, poll_timeout=0.05) as transport:
+            tx = asyncio.create_task(transport.send("long\n", 50))
+            link.inject("during")
+            line = await asyncio.wait_for(transport.recv(), 2)
+            tx_done_first = tx.done()
+            await tx
+            return line, tx_done_first
+
+    line, tx_done_first = asyncio.run(run())
+    assert line == "during"
+    assert tx_done_first is False
+
+
+def test_recv_returns_none_at_end_of_input():
+    link = QueueTransport()
+
+    async def run():
+        async with AsyncModemTransport(transport=link, poll_timeout=0.05) as transport:
+            link.inject("last")
+            link.end_input()
+            return [await asyncio.wait_for(transport.recv(), 2) for _ in range(2)]
+
+    assert asyncio.run(run()) == ["last", None]
@@ -0,0 +1,171 @@
+"""Tests for the fn:"hello" baud negotiation in lib.chunking."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from lib.chunking import HelloResponder, Transmitter, extract_json_frame, negotiate_baud
+from lib.config import HELLO_DONE_ATTEMPTS
+from lib.transport import MemoryTransport
+
+CANDIDATES = (1200, 2400, 4800, 9600)
+
+
+class RatedLink(MemoryTransport):
+    """In-memory end with a line rate: a frame arrives only if both ends are
+    on the same baud and that baud is at most ``max_baud`` (the channel's
+    limit); otherwise it is lost, as a mis-tuned or overdriven FSK frame is.
+    ``lose`` maps a hello phase to how many more of its frames to drop."""
+
+    def __init__(self, baud: int, max_baud: int):
+        super().__init__()
+        self.baud = baud
+        self.max_baud = max_baud
+        self.lose: dict[str, int] = {}
+
+    def _write(self, data: bytes) -> None:
+        ph = json.loads(data).get("ph")
+        if self.lose.get(ph, 0) > 0:
+            self.lose[ph] -= 1
+            return
+        if self.peer.baud == self.baud <= self.max_baud:
+            super()._write(data)
+
+
+def rated_pair(max_baud: int) -> tuple[RatedLink, RatedLink]:
+    a, b = RatedLink(1200, max_baud), RatedLink(1200, max_baud)
+    a.peer, b.peer = b, a
+    return a, b
+
+
+def run_responder(link, responder: HelloResponder, stop: threading.Event) -> None:
+    """Minimal main loop: hand hello frames to the responder, tick its timers."""
+    while not stop.is_set():
+        for raw in link.receive(timeout=0.02):
+            frame = extract_json_frame(bytes(raw).decode("utf-8", "replace"))
+            msg = json.loads(frame) if frame else {}
+            if msg.get("fn") == "hello":
+                responder.handle(msg, 50)
+        responder.check_timeout(50)
+
+
+@pytest.fixture
+def negotiate():
+    threads = []
+    stop = threading.Event()
+
+    def start(initiator, responder_link, **kwargs):
+        responder = HelloResponder(Transmitter(responder_link, inter_frame_delay=0.0),
+                                   timeout=0.5, probe_slack=0.2)
+        t = threading.Thread(target=run_responder, args=(responder_link, responder, stop),
+                             daemon=True)
+        t.start()
+        threads.append(t)
+        return negotiate_baud(50, CANDIDATES, timeout=0.5,
+                              tx=Transmitter(initiator, inter_frame_delay=0.0), **kwargs)
+
+    yield start
+    stop.set()
+    for t in threads:
+        t.join()
+
+
+def test_clean_link_settles_on_highest_rate(negotiate):
+    a, b = rated_pair(max_baud=9600)
+    assert negotiate(a, b) == 9600
+    assert a.baud == b.baud == 9600
+
+
+def test_stops_below_the_channel_limit(negotiate):
+    a, b = rated_pair(max_baud=4800)
+    assert negotiate(a, b) == 4800
+    assert a.baud == b.baud == 4800
+
+
+def test_silent_peer_keeps_safe_rate():
+    a, b = rated_pair(max_baud=9600)          # nobody answers on b
+    tx = Transmitter(a, inter_frame_delay=0.0)
+    assert negotiate_baud(50, CANDIDATES, timeout=0.2, tx=tx) == 1200
+    assert a.baud == 1200
+
+
+def test_lost_ready_is_answered_again(negotiate):
+    a, b = rated_pair(max_baud=9600)
+    b.lose["ready"] = 1
+    assert negotiate(a, b) == 9600
+    time.sleep(0.7)                           # past the responder's confirm window
+    assert a.baud == b.baud == 9600
+
+
+def test_no_ready_falls_back_on_both_ends(negotiate):
+    a, b = rated_pair(max_baud=9600)
+    b.lose["ready"] = HELLO_DONE_ATTEMPTS
+    assert negotiate(a, b) == 1200
+    deadline = time.monotonic() + 2.0
+    while b.baud != 1200 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert a.baud == b.baud == 1200
+
+
+def test_softmodem_link_negotiates_over_fsk(negotiate):
+    pytest.importorskip("numpy")
+    from lib.softmodem import SoftModem
+    from lib.transport import ModemTransport
+
+    a, b = SoftModem(), SoftModem()
+    assert a.init(1, 2, 1200) == 0
+    assert b.init(2, 1, 1200) == 0
+    try:
+        ta, tb = ModemTransport(a, 1200), ModemTransport(b, 1200)
+        assert negotiate(ta, tb) == 9600
+        assert ta.baud == tb.baud == 9600
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_backend_answers_a_sender_that_changed_rate(monkeypatch):
+    pytest.importorskip("numpy")
+    import backend
+    from lib import chunking
+    from lib.chunking import LinkController, build_single_frame
+    from lib.softmodem import SoftModem
+    from lib.transport import ModemTransport
+
+    front, back = SoftModem(), SoftModem()
+    assert back.set_rx_bauds([1200, 2400]) == 0
+    assert front.init(1, 2, 2400) == 0            # the frontend moved up on its own
+    assert back.init(2, 1, 1200) == 0
+    try:
+        link = ModemTransport(back, 1200)
+        tx = Transmitter(link, inter_frame_delay=0.0)
+        monkeypatch.setattr(chunking, "transmitter", tx)
+        monkeypatch.setattr(chunking, "link_controller", LinkController(tx))
+        monkeypatch.setattr(chunking, "last_sent_chunks", {})
+        monkeypatch.setattr(backend, "transmitter", tx)
+
+        def deliver(frame: str) -> list[dict]:
+            front.send(frame, 50)
+            accepted = []
+            deadline = time.monotonic() + 2.0
+            while time.monotonic() < deadline:
+                lines = link.receive(timeout=0.1)
+                bauds = link.rx_bauds
+                accepted += [backend.accept_line(raw, 50, bd) for raw, bd in zip(lines, bauds)]
+                if 2400 in bauds:
+                    break
+            return [msg for msg in accepted if msg is not None]
+
+        frame = build_single_frame({"id": "r1", "fn": "test", "ct": "Liver normal"})
+        assert deliver(frame.replace("normal", "NORMAL")) == []    # CRC fails: stay put
+        assert link.baud == 1200
+
+        assert [msg["id"] for msg in deliver(frame)] == ["r1"]
+        assert link.baud == 2400
+        assert tx.send('{"id":"r1","st":"S","ct":"ok"}\n', 50)
+        assert front.receive(timeout=2.0) == '{"id":"r1","st":"S","ct":"ok"}'
+    finally:
+        front.cleanup()
+        back.cleanup()
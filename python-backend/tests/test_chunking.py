@@ -0,0 +1,218 @@
+"""Unit tests for the outbound send path and inbound frame recovery in lib.chunking.
+
+The transport is an in-process fake, so these run without the wrapper .so or
+any audio device.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from lib import chunking
+from lib.chunking import Transmitter
+
+
+class FakeClock:
+    """Stand-in for chunking's ``time`` module: ``monotonic`` reads a virtual
+    clock that only ``sleep`` (and the test) advances; every sleep is recorded."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeTransport:
+    """Stand-in for the modem transport: each send "plays" for ``airtime``
+    seconds on a background thread and signals completion through a Condition,
+    like the wrapper's tx_cond."""
+
+    def __init__(self, airtime: float = 0.05, fail: bool = False):
+        self.airtime = airtime
+        self.fail = fail
+        self.baud = 1200
+        self.tone_bits = 4
+        self.sent: list[str] = []
+        self.bursts: list[list[str]] = []
+        self.tx_end: list[float] = []
+        self._cond = threading.Condition()
+        self._busy = False
+
+    def send(self, message: str, volume: int = 50) -> int:
+        if self.fail:
+            return -3
+        with self._cond:
+            self._busy = True
+        self.sent.append(message)
+        threading.Thread(target=self._play, daemon=True).start()
+        return 0
+
+    def send_many(self, frames: list, volume: int = 50) -> int:
+        self.bursts.append(list(frames))
+        return self.send("".join(frames), volume)
+
+    def _play(self):
+        time.sleep(self.airtime)
+        with self._cond:
+            self._busy = False
+            self.tx_end.append(time.monotonic())
+            self._cond.notify_all()
+
+    def wait_tx(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            if timeout:
+                self._cond.wait_for(lambda: not self._busy, timeout)
+            return not self._busy
+
+    def is_transmitting(self) -> bool:
+        return self._busy
+
+    def get_error(self) -> str:
+        return "fake failure"
+
+
+@pytest.fixture
+def fake_transmitter(monkeypatch):
+    """Route the module-level transmitter through a FakeTransport."""
+    link = FakeTransport()
+    tx = Transmitter(link, inter_frame_delay=0.1)
+    monkeypatch.setattr(chunking, "transmitter", tx)
+    monkeypatch.setattr(chunking, "last_sent_chunks", {})
+    return link
+
+
+def test_transmitter_returns_when_tx_done():
+    """send() returns right after the fake's airtime, not on a poll tick."""
+    link = FakeTransport(airtime=0.05)
+    tx = Transmitter(link)
+    assert tx.send("frame\n", 50)
+    returned = time.monotonic()
+    assert not link.is_transmitting()
+    assert returned - link.tx_end[-1] < 0.02
+
+
+def test_transmitter_reports_send_failure():
+    tx = Transmitter(FakeTransport(fail=True))
+    assert tx.send("frame\n", 50) is False
+
+
+def test_transmitter_refuses_frames_a_7_bit_link_would_strip():
+    link = FakeTransport(airtime=0.0)
+    link.data_bits = 7
+    tx = Transmitter(link)
+    frame = chunking.build_single_frame({"id": "a7", "ct": "Liver 12 mm \u00b1 2"})
+    assert frame.isascii() and tx.send(frame, 50)      # json.dumps escapes non-ASCII
+    assert tx.send('{"ct":"\u00b1"}\n', 50) is False
+    assert tx.send_many(["a\n", '{"ct":"\u00b1"}\n'], 50) is False
+    assert link.sent == [frame]
+    link.data_bits = 8
+    assert tx.send('{"ct":"\u00b1"}\n', 50)
+
+
+def test_transmitter_spaces_frames_only_between(monkeypatch):
+    """INTER_CHUNK_DELAY separates spaced frames but is not paid after the last one."""
+    clock = FakeClock()
+    monkeypatch.setattr(chunking, "time", clock)
+    link = FakeTransport(airtime=0.0)
+    tx = Transmitter(link, inter_frame_delay=0.1)
+    for i, frame in enumerate(["a\n", "b\n", "c\n"]):
+        clock.now += 0.05                               # the caller builds the next frame
+        assert tx.send(frame, 50, spaced=i > 0)
+
+    assert link.sent == ["a\n", "b\n", "c\n"]
+    # each gap only tops up the 0.05 s already spent to 0.1; nothing after "c"
+    assert clock.sleeps == pytest.approx([0.05, 0.05])
+
+
+def test_send_chunks_sends_one_burst(fake_transmitter, caplog):
+    """All frames share one transmission: no per-frame lead-in or gap."""
+    t0 = time.monotonic()
+    with caplog.at_level("INFO", logger="minimodem_backend"):
+        chunking.send_chunks(["a\n", "b\n", "c\n"], 50, "m1")
+    elapsed = time.monotonic() - t0
+
+    assert fake_transmitter.bursts == [["a\n", "b\n", "c\n"]]
+    assert chunking.last_sent_chunks["m1"] == ["a\n", "b\n", "c\n"]
+    assert elapsed < 0.15                               # one 0.05 airtime, no 0.1 gaps
+    # 2 x (4 tone bits at 1200 baud + 0.1 gap)
+    assert "Airtime saved: 0.207s" in caplog.text
+
+
+def test_retransmission_resends_stored_frame(fake_transmitter):
+    chunking.send_chunks(["frame\n"], 50, "m2")
+    chunking.handle_retransmission_request({"id": "m2", "fn": "retx", "ci": [0, 5]}, 50)
+    assert fake_transmitter.sent == ["frame\n", "frame\n"]
+    assert fake_transmitter.bursts == []                # a lone frame goes through send
+
+
+def test_retransmission_bursts_the_requested_frames(fake_transmitter):
+    chunking.last_sent_chunks["m3"] = ["a\n", "b\n", "c\n"]
+    chunking.handle_retransmission_request({"id": "m3", "fn": "retx", "ci": [2, 0]}, 50)
+    assert fake_transmitter.bursts == [["c\n", "a\n"]]
+
+
+def test_only_repeated_frames_use_the_waveform_cache(fake_transmitter):
+    """First sends go out plainly; resends and retx requests ask for the cache."""
+    cached = []
+    fake_transmitter.send_cached = lambda frames, volume: (
+        cached.append(list(frames)) or fake_transmitter.send("".join(frames), volume))
+    chunking.send_chunks(["frame\n"], 50, "m4")
+    chunking.handle_retransmission_request({"id": "m4", "fn": "retx", "ci": [0]}, 50)
+    chunking._request_full_retransmit("m5")
+    assert cached == [["frame\n"], ['{"id":"m5","fn":"retx","ci":[0]}\n']]
+    assert fake_transmitter.sent[0] == "frame\n"
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"id":"c","cc":1,"ct":"x","crc":1}',
+    b'\x8f{+\xe2\x00&{"id":"c","cc":1,"ct":"x","crc":1}\xff}',    # stray brace in junk
+    '\u00e9{"id":"c","cc":1,"ct":"x","crc":1}tail'.encode(),
+])
+def test_parse_json_frame_matches_extract_then_loads(raw):
+    expected = json.loads(chunking.extract_json_frame(raw.decode("utf-8", "replace")))
+    assert chunking.parse_json_frame(raw) == expected
+    assert chunking.parse_json_frame(memoryview(bytearray(raw))) == expected
+    assert chunking.parse_json_frame(raw.decode("utf-8", "replace")) == expected
+
+
+@pytest.mark.parametrize("raw", [b"", b"\x00\x81noise", b"{not json", memoryview(b"{{{")])
+def test_parse_json_frame_noise_is_none(raw):
+    assert chunking.parse_json_frame(raw) is None
+
+
+def test_verified_frame_object_is_reused():
+    frame = chunking.parse_json_frame(chunking.build_single_frame({"id": "r", "fn": "t", "ct": "ok"}).encode())
+    assert chunking.handle_received_chunk(frame) is frame
+    assert "crc" not in frame and "cc" not in frame
+
+
+def test_timeout_sweep_runs_alongside_chunk_intake(monkeypatch):
+    """serve_async feeds chunks from a worker thread while the loop sweeps
+    timeouts; the sweep must never see the buffer change under it."""
+    monkeypatch.setattr(chunking, "chunk_receive_buffer", {})
+    monkeypatch.setattr(chunking, "CHUNK_REASSEMBLY_TIMEOUT", -1)   # every entry is due
+    done = threading.Event()
+
+    def intake():
+        for i in range(3000):
+            chunking.handle_received_chunk({"id": f"m{i}", "ci": 0, "cc": 2, "ct": "x"})
+        done.set()
+
+    worker = threading.Thread(target=intake)
+    worker.start()
+    requests = []
+    while not done.is_set():
+        requests += chunking.check_chunk_timeouts()
+    worker.join()
+    requests += chunking.check_chunk_timeouts()
+
+    assert {r["id"] for r in requests} == {f"m{i}" for i in range(3000)}
+    assert all(r["ci"] == [1] for r in requests)
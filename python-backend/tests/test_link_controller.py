@@ -0,0 +1,261 @@
+"""Simulation tests for lib.chunking.LinkController (runtime baud adaptation).
+
+Two in-memory endpoints talk over a byte-level error-injecting channel whose
+corruption rate depends on the baud: the backend end runs the real receive
+path (``backend.accept_line``, CRC check, retx requests, hello routing) with the
+module transmitter / responder / link controller patched onto it; the peer end
+sends requests, resends on retx or silence, and answers steps with its own
+``HelloResponder``. Airtime is accounted virtually (10 bits per byte).
+"""
+
+import json
+import random
+import threading
+import time
+
+import backend
+from lib import chunking
+from lib.chunking import (
+    HelloResponder,
+    LinkController,
+    Transmitter,
+    build_single_frame,
+    chunk_message,
+    extract_json_frame,
+    send_chunks,
+)
+from lib.compression import crc32_str
+from lib.config import HELLO_DONE_ATTEMPTS
+from lib.transport import MemoryTransport
+
+# Per-byte corruption probability by baud: 4800 is degraded, 2400 is clean.
+BYTE_ERROR = {4800: 0.008, 2400: 0.0}
+CANDIDATES = (1200, 2400, 4800)
+PAYLOAD = "Liver normal in size and echotexture. No focal lesion. " * 4
+
+
+ALNUM = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+
+class NoisyLink(MemoryTransport):
+    """One end of an error-injecting link. A frame reaches the peer only if
+    both ends are on the same baud; each letter/digit byte is then replaced by
+    another with probability ``BYTE_ERROR[baud]``. Punctuation survives, so a
+    damaged frame still parses and the CRC (not the JSON parser) catches it,
+    keeping the simulation free of silent-loss timeouts."""
+
+    def __init__(self, channel: dict, rng: random.Random):
+        super().__init__()
+        self.baud = 4800
+        self.channel = channel
+        self.rng = rng
+
+    def _write(self, data: bytes) -> None:
+        self.channel["airtime"] += len(data) * 10 / self.baud
+        if self.peer.baud != self.baud:
+            return
+        p = BYTE_ERROR.get(self.baud, 0.0)
+        out = bytearray(data)
+        for i, b in enumerate(out):
+            if b in ALNUM and self.rng.random() < p:
+                out[i] = self.rng.choice(ALNUM)
+        super()._write(bytes(out))
+
+
+class LossyLink(MemoryTransport):
+    """One end of a clean link that delivers a frame only if both ends are
+    on the same baud, and drops the next ``lose[ph]`` hello frames of each
+    phase ``ph``."""
+
+    def __init__(self, baud: int):
+        super().__init__()
+        self.baud = baud
+        self.lose: dict[str, int] = {}
+
+    def _write(self, data: bytes) -> None:
+        ph = json.loads(data).get("ph")
+        if self.lose.get(ph, 0) > 0:
+            self.lose[ph] -= 1
+            return
+        if self.peer.baud == self.baud:
+            super()._write(data)
+
+
+def pump(link, handle) -> None:
+    """Hand every hello frame waiting on ``link`` to ``handle(msg, volume)``."""
+    for raw in link.receive(timeout=0.01):
+        frame = extract_json_frame(bytes(raw).decode("utf-8", "replace"))
+        msg = json.loads(frame) if frame else {}
+        if msg.get("fn") == "hello":
+            handle(msg, 50)
+
+
+def backend_loop(link, stop):
+    while not stop.is_set():
+        for raw in link.receive(timeout=0.02):
+            msg = backend.accept_line(bytes(raw).decode("utf-8", "replace"), 50)
+            if msg is not None:
+                reply = {"id": msg.get("id", ""), "st": "S", "ct": "ok"}
+                send_chunks(chunk_message(reply), 50, reply["id"])
+        chunking.check_hello_timeout(50)
+
+
+def peer_loop(link, tx, responder, frames, delivered, stop):
+    while not stop.is_set():
+        for raw in link.receive(timeout=0.02):
+            frame = extract_json_frame(bytes(raw).decode("utf-8", "replace"))
+            try:
+                msg = json.loads(frame) if frame else {}
+            except json.JSONDecodeError:
+                continue
+            if msg.get("fn") == "hello":
+                responder.handle(msg, 50)
+            elif msg.get("fn") == "retx" and msg.get("id") in frames:
+                tx.send(frames[msg["id"]], 50)
+            elif "st" in msg and msg.get("crc") == crc32_str(msg.get("ct", "")):
+                delivered.add(msg.get("id"))
+                responder.heard_frame()
+        responder.check_timeout(50)
+
+
+def run_session(monkeypatch, adaptive: bool, messages: int = 40, seed: int = 7) -> tuple[float, LinkController]:
+    """Deliver ``messages`` requests; return (virtual airtime, controller)."""
+    channel = {"airtime": 0.0}
+    a, b = NoisyLink(channel, random.Random(seed)), NoisyLink(channel, random.Random(seed + 1))
+    a.peer, b.peer = b, a
+
+    tx_a = Transmitter(a, inter_frame_delay=0.0)
+    controller = LinkController(tx_a, candidates=CANDIDATES, fail_threshold=3,
+                                clean_streak=20, timeout=0.1, enabled=adaptive)
+    monkeypatch.setattr(chunking, "transmitter", tx_a)
+    monkeypatch.setattr(chunking, "link_controller", controller)
+    monkeypatch.setattr(chunking, "hello_responder", HelloResponder(tx_a, timeout=0.1))
+    monkeypatch.setattr(chunking, "last_sent_chunks", {})
+    monkeypatch.setattr(backend, "transmitter", tx_a)
+
+    tx_b = Transmitter(b, inter_frame_delay=0.0)
+    frames: dict[str, str] = {}
+    delivered: set = set()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=backend_loop, args=(a, stop), daemon=True),
+        threading.Thread(target=peer_loop,
+                         args=(b, tx_b, HelloResponder(tx_b, timeout=0.1), frames, delivered, stop),
+                         daemon=True),
+    ]
+    for t in threads:
+        t.start()
+    try:
+        for i in range(messages):
+            msg_id = f"m{i:03d}"
+            frames[msg_id] = build_single_frame({"id": msg_id, "fn": "test", "ct": PAYLOAD})
+            deadline = time.monotonic() + 30
+            while msg_id not in delivered and time.monotonic() < deadline:
+                tx_b.send(frames[msg_id], 50)
+                wait_until = time.monotonic() + 0.05
+                while msg_id not in delivered and time.monotonic() < wait_until:
+                    time.sleep(0.005)
+            assert msg_id in delivered
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    return channel["airtime"], controller
+
+
+def test_step_down_improves_goodput(monkeypatch):
+    fixed_airtime, _ = run_session(monkeypatch, adaptive=False)
+    adaptive_airtime, controller = run_session(monkeypatch, adaptive=True)
+
+    payload_bits = 40 * len(PAYLOAD) * 8
+    assert controller.steps["down"] >= 1
+    assert adaptive_airtime < 0.8 * fixed_airtime, (
+        f"goodput fixed {payload_bits / fixed_airtime:.0f} bit/s, "
+        f"adaptive {payload_bits / adaptive_airtime:.0f} bit/s")
+
+
+def test_failures_schedule_one_step_down():
+    link = MemoryTransport()
+    link.baud = 4800
+    controller = LinkController(Transmitter(link), candidates=CANDIDATES, fail_threshold=3)
+    controller.record_failure("x")
+    controller.record_failure("x")
+    assert controller._target == 0
+    controller.record_failure("x")
+    assert controller._target == 2400
+    assert controller.stats()["pending_retx"] == {"x": 3}
+
+
+def test_clean_streak_steps_back_up_to_ceiling():
+    link = MemoryTransport()
+    link.baud = 4800
+    controller = LinkController(Transmitter(link), candidates=CANDIDATES, clean_streak=5)
+    controller.record_success()                   # ceiling = 4800, streak 1
+    link.baud = 2400
+    for _ in range(3):
+        controller.record_success()
+    assert controller._target == 0
+    controller.record_success()
+    assert controller._target == 4800
+
+
+def test_disabled_controller_never_steps():
+    link = MemoryTransport()
+    link.baud = 4800
+    controller = LinkController(Transmitter(link), candidates=CANDIDATES, enabled=False)
+    for _ in range(10):
+        controller.record_failure()
+    assert controller._target == 0
+
+
+def test_lost_ready_does_not_split_the_link():
+    a, b = LossyLink(4800), LossyLink(4800)
+    a.peer, b.peer = b, a
+    b.lose["ready"] = HELLO_DONE_ATTEMPTS - 1          # every done but the last
+    controller = LinkController(Transmitter(a, inter_frame_delay=0.0), candidates=CANDIDATES,
+                                fail_threshold=1, timeout=0.2)
+    responder = HelloResponder(Transmitter(b, inter_frame_delay=0.0), timeout=0.2)
+    controller.record_failure("x")
+    assert controller._target == 2400
+
+    deadline = time.monotonic() + 3.0
+    while time.monotonic() < deadline:
+        controller.tick(50)
+        pump(b, responder.handle)
+        responder.check_timeout(50)
+        pump(a, controller.handle_reply)
+        if controller.steps["down"] or controller.steps["failed"]:
+            break
+    pump(b, responder.handle)                           # the confirm
+    time.sleep(0.3)                                     # past the responder's window
+    responder.check_timeout(50)
+
+    assert controller.steps == {"down": 1, "up": 0, "failed": 0}
+    assert a.baud == b.baud == 2400
+
+
+def test_outcomes_record_while_a_step_frame_is_on_air():
+    class SlowLink(MemoryTransport):
+        def _write(self, data: bytes) -> None:
+            on_air.set()
+            release.wait(2.0)                           # the frame's airtime
+
+    on_air, release = threading.Event(), threading.Event()
+    link = SlowLink()
+    link.baud = 4800
+    controller = LinkController(Transmitter(link, inter_frame_delay=0.0), candidates=CANDIDATES,
+                                fail_threshold=1)
+    controller.record_failure("x")
+    ticker = threading.Thread(target=controller.tick, args=(50,), daemon=True)
+    ticker.start()
+    try:
+        assert on_air.wait(1.0)
+        recorder = threading.Thread(target=controller.record_success, args=("x",), daemon=True)
+        recorder.start()
+        recorder.join(0.5)
+        assert not recorder.is_alive()
+    finally:
+        release.set()
+        ticker.join()
+    assert controller._state == "stepping"
+    assert controller._deadline < float("inf")
@@ -0,0 +1,529 @@
+"""Tests for lib.softmodem (NumPy software FSK modem)."""
+
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lib import softmodem  # noqa: E402
+from lib.chunking import Transmitter  # noqa: E402
+from lib.transport import ModemTransport  # noqa: E402
+from lib.softmodem import (  # noqa: E402
+    Demodulator,
+    MultiCarrierDemodulator,
+    SoftModem,
+    fsk_tones,
+    max_carriers,
+    modulate,
+    rx_decimation,
+)
+
+
+def test_tones_match_wrapper_derivation():
+    """Bell 202 at 1200 baud, and the baud/2+600 rule above it."""
+    assert fsk_tones(1200) == (1200, 2200)
+    assert fsk_tones(9600) == (5400, 13400)
+    assert fsk_tones(300) == (1270, 1070)
+
+
+@pytest.mark.parametrize("baud", [1200, 4800, 9600])
+def test_modulate_demodulate_round_trip(baud):
+    data = '{"id":"t1","ct":"Liver normal é"}\n'.encode("utf-8") * 5
+    samples = modulate(data, baud, 0.3)
+    demod = Demodulator(baud)
+    out = bytearray()
+    for i in range(0, len(samples), 777):               # odd block size on purpose
+        out += demod.feed(samples[i:i + 777])
+    out += demod.feed(np.zeros(1024, dtype=np.float32))
+    assert bytes(out) == data
+
+
+def test_silence_decodes_nothing():
+    demod = Demodulator(1200)
+    assert demod.feed(np.zeros(48000, dtype=np.float32)) == b""
+
+
+@pytest.mark.parametrize("baud", [1200, 9600])
+def test_loopback_through_module_api(baud):
+    assert softmodem.init(-1, -1, baud) == 0
+    try:
+        assert softmodem.send('{"id":"a"}\n{"id":"b"}\n', 50) == 0
+        assert softmodem.receive(timeout=2.0) == '{"id":"a"}'
+        lines = softmodem.receive_many(timeout=2.0)
+        assert [bytes(v) for v in lines] == [b'{"id":"b"}']
+    finally:
+        softmodem.cleanup()
+
+
+def test_two_endpoints_on_crossed_pipes():
+    a, b = SoftModem(), SoftModem()
+    assert a.init(1, 2, 4800) == 0
+    assert b.init(2, 1, 4800) == 0
+    try:
+        assert Transmitter(ModemTransport(a)).send('{"id":"ping"}\n', 50)
+        assert b.receive(timeout=2.0) == '{"id":"ping"}'
+        b.send('{"id":"pong"}\n', 50)
+        assert a.receive(timeout=2.0) == '{"id":"pong"}'
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_errors_mirror_wrapper_codes():
+    modem = SoftModem()
+    assert modem.send("x\n", 50) == -1
+    assert modem.get_error() == "Not initialized"
+    assert modem.init(-1, -1, 0) == -1
+    assert modem.get_error() == "Invalid baud"
+    assert modem.set_detector("fft") == 0 and modem.set_detector(2) == 0
+    assert modem.set_detector("dft") == -1
+    assert modem.get_error() == "Unknown bit detector"
+
+
+def test_stats_count_lines_carrier_and_confidence():
+    a, b = SoftModem(), SoftModem()
+    assert a.init(1, 2, 4800) == 0
+    assert b.init(2, 1, 4800) == 0
+    try:
+        frame = '{"id":"a"}\n{"id":"b"}\n{"id":"c"}\n'
+        assert a.send(frame, 50) == 0
+        assert len(b.receive_many(timeout=2.0)) == 3
+        stats = b.get_stats()
+        assert stats["lines_queued"] == 3
+        assert stats["queue_high_water"] >= 1
+        assert stats["bytes_demodulated"] == len(frame)
+        assert sum(stats["confidence_hist"]) == len(frame)
+        assert stats["carrier_acquired"] == 1
+        assert a.get_stats()["tx_bytes"] == len(frame)
+
+        # An idle pipe drops the carrier; counters survive a baud change.
+        deadline = time.monotonic() + 2.0
+        while b.get_stats()["carrier_lost"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert b.get_stats()["carrier_lost"] == 1
+        assert b.set_baud(1200) == 0
+        assert b.get_stats()["carrier_acquired"] == 1
+
+        assert ModemTransport(b).stats()["modem"]["lines_queued"] == 3
+    finally:
+        a.cleanup()
+        b.cleanup()
+    assert b.get_stats() is None
+
+
+def test_squelch_skips_silence_without_losing_a_quiet_frame():
+    demod = Demodulator(1200)
+    assert demod.feed(np.zeros(48000, dtype=np.float32)) == b""
+    assert demod.counters["squelch_skipped"] == 48000 and not demod.squelch_open
+
+    line = b'{"id":"sq","ct":"quiet"}\n'
+    signal = np.concatenate((np.zeros(4000, dtype=np.float32), modulate(line, 1200, 0.01)))
+    out = bytearray()
+    for i in range(0, len(signal), 1000):                # tone starts mid-block
+        out += demod.feed(signal[i:i + 1000])
+    out += demod.feed(np.zeros(2048, dtype=np.float32))
+    assert bytes(out) == line
+    assert demod.counters["squelch_opened"] == 1
+
+    # below the open level nothing is searched; SQUELCH_OFF searches it all
+    faint = modulate(line, 1200, 0.0005)
+    for squelch_dbfs, skipped in ((softmodem.SQUELCH_DEFAULT_DBFS, len(faint)),
+                                  (softmodem.SQUELCH_OFF, 0)):
+        demod = Demodulator(1200, squelch_dbfs=squelch_dbfs)
+        assert demod.feed(faint) == b""
+        assert demod.counters["squelch_skipped"] == skipped
+
+
+def test_decimated_rx_matches_full_rate():
+    # mm_pick_decimation's choices; tones too close to the RX Nyquist get none
+    assert [rx_decimation(b) for b in (300, 1200, 2400, 4800, 9600)] == [10, 4, 2, 1, 1]
+    assert rx_decimation(1200, max_factor=3) == 2        # 16 kHz: not whole samples per bit
+    assert rx_decimation(1200, carrier=2) == 1
+
+    data = b'{"id":"dec","ct":"Liver normal in size."}\n' * 2
+    samples = modulate(data, 1200, 0.5)
+    for factor in (softmodem.DECIMATION_OFF, softmodem.DECIMATION_AUTO):
+        demod = Demodulator(1200, decimation=factor)
+        out = bytearray()
+        for i in range(0, len(samples), 999):              # not a multiple of D
+            out += demod.feed(samples[i:i + 999])
+        out += demod.feed(np.zeros(1024, dtype=np.float32))
+        assert bytes(out) == data
+
+    modem = SoftModem()
+    assert modem.set_decimation(13) == -1
+    assert modem.get_error() == "Decimation factor out of range"
+    assert modem.set_decimation(softmodem.DECIMATION_OFF) == 0
+    assert modem.init(-1, -1, 1200) == 0
+    try:
+        for factor in (softmodem.DECIMATION_OFF, softmodem.DECIMATION_AUTO):
+            assert modem.set_decimation(factor) == 0
+            modem.send('{"id":"dec"}\n', 50)
+            assert modem.receive(timeout=2.0) == '{"id":"dec"}'
+    finally:
+        modem.cleanup()
+
+
+def test_band_plan_matches_wrapper():
+    assert [max_carriers(b) for b in (1200, 2400, 4800, 9600)] == [6, 3, 1, 1]
+    assert fsk_tones(1200, 1) == (1200 + 3400, 2200 + 3400)
+
+
+@pytest.mark.parametrize("baud,carriers", [(1200, 3), (1200, 6), (2400, 3)])
+def test_multi_carrier_round_trip(baud, carriers):
+    data = b'{"id":"mc","ct":"Liver normal"}\n' * 3 + b"x"   # not a whole stripe
+    samples = modulate(data, baud, 0.5, carriers=carriers)
+    assert len(samples) < len(modulate(data, baud, 0.5)) / (carriers - 1)
+    demod = MultiCarrierDemodulator(baud, carriers)
+    out = bytearray()
+    for i in range(0, len(samples), 777):
+        out += demod.feed(samples[i:i + 777])
+    out += demod.feed(np.zeros(1024, dtype=np.float32))
+    assert bytes(out) == data
+
+
+@pytest.mark.parametrize("baud,tones", [(300, 8), (1200, 4), (1200, 8), (2400, 8)])
+def test_mfsk_round_trip(baud, tones):
+    data = bytes(range(256)) + b'{"id":"mf","ct":"Liver normal"}\n'
+    samples = modulate(data, baud, 0.5, tones=tones)
+    bfsk = len(modulate(data, baud, 0.5))
+    assert len(samples) < bfsk * (softmodem.frame_symbols(tones) + 0.5) / 10
+    demod = Demodulator(baud, tones=tones)
+    out = bytearray()
+    for i in range(0, len(samples), 777):
+        out += demod.feed(samples[i:i + 777])
+    out += demod.feed(np.zeros(1024, dtype=np.float32))
+    assert bytes(out) == data
+
+
+@pytest.mark.parametrize("tones,stop_bits", [(2, 1), (2, 2), (8, 1)])
+def test_7_bit_framing_round_trip(tones, stop_bits):
+    data = b'{"id":"a7","ct":"Liver normal"}\n' * 4
+    samples = modulate(data, 1200, 0.5, tones=tones, data_bits=7, stop_bits=stop_bits)
+    eight = modulate(data, 1200, 0.5, tones=tones, stop_bits=stop_bits)
+    if tones == 2:
+        assert len(eight) - len(samples) == len(data) * softmodem.bit_nsamples(1200)
+        assert Demodulator(1200).feed(samples) != data  # ends must agree
+    else:
+        assert len(samples) == len(eight)               # ceil(7 / 3) == ceil(8 / 3)
+    assert Demodulator(1200, tones=tones, data_bits=7).feed(
+        np.concatenate((samples, np.zeros(4800, dtype=np.float32)))) == data
+
+
+def test_7_bit_endpoints_refuse_what_they_cannot_send():
+    a, b = SoftModem(), SoftModem()
+    assert a.set_char_framing(6, 1) == -1 and a.set_char_framing(7, 3) == -1
+    assert a.get_error() == "Character framing out of range"
+    assert a.set_char_framing(7, 2) == 0
+    assert a.init(1, 2, 1200) == 0
+    assert b.init(2, 1, 1200) == 0
+    try:
+        assert b.set_char_framing(softmodem.DATA_BITS_ASCII, 2) == 0      # live
+        assert a.send('{"ct":"\u00b1 2 mm"}\n', 50) == -2
+        assert a.get_error() == "Frame is not 7-bit clean"
+        assert a.send_many(['{"id":"p1"}', '{"id":"p2"}'], 50) == 0
+        assert b.receive_many(max_lines=2, timeout=2.0) == [b'{"id":"p1"}', b'{"id":"p2"}']
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_mfsk_endpoints_and_refusals():
+    a, b = SoftModem(), SoftModem()
+    assert a.set_tones(3) == -1
+    assert a.get_error() == "Invalid tone count"
+    assert softmodem.max_tones(1200) == 8 and softmodem.max_tones(4800) == 4
+    assert a.set_tones(8) == 0
+    assert a.init(1, 2, 1200, carriers=2) == -1
+    assert a.get_error() == "MFSK needs a single carrier in half duplex"
+    assert a.init(1, 2, 4800) == -1
+    assert a.get_error() == "Tones do not fit the band plan at this baud"
+    assert a.init(1, 2, 1200) == 0
+    assert b.init(2, 1, 1200) == 0                      # BFSK until switched live
+    try:
+        assert b.set_tones(8) == 0
+        assert a.send('{"id":"ping"}\n', 50) == 0
+        assert b.receive(timeout=2.0) == '{"id":"ping"}'
+        assert a.set_baud(4800) == -1                   # 8 tones do not fit, link kept
+        assert a.set_tones(4) == 0 and b.set_tones(4) == 0
+        assert a.set_baud(4800) == 0 and b.set_baud(4800) == 0
+        assert a.send('{"id":"pong"}\n', 50) == 0
+        assert b.receive(timeout=2.0) == '{"id":"pong"}'
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_multi_carrier_endpoints_and_refusals():
+    a, b = SoftModem(), SoftModem()
+    assert a.init(1, 2, 4800, carriers=2) == -1
+    assert a.get_error() == "Carrier count does not fit the band plan at this baud"
+    assert a.init(1, 2, 1200, carriers=4) == 0
+    assert b.init(2, 1, 1200, carriers=4) == 0
+    try:
+        assert a.send('{"id":"ping"}\n', 50) == 0
+        assert b.receive(timeout=2.0) == '{"id":"ping"}'
+        assert b.set_baud(9600) == -1
+        assert b.set_baud(2400) == -1                   # 2400 fits only 3
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_duplex_bands_share_the_air():
+    """Both directions on the air at once: each side's demodulator picks its
+    peer's half of the band plan out of the sum, and the band-share gate keeps
+    the other half's leakage from decoding once the peer goes quiet."""
+    up = b'{"id":"up","ct":"Liver normal"}\n'
+    down = b'{"id":"down","fn":"retx","ci":[0]}\n'
+    rx_low, tx_low = softmodem.duplex_bands(softmodem.DUPLEX_LOW, 1)
+    rx_high, tx_high = softmodem.duplex_bands(softmodem.DUPLEX_HIGH, 1)
+    assert (rx_low, tx_low, rx_high, tx_high) == (1, 0, 0, 1)
+    a, b = modulate(up, 1200, 0.5, band=tx_low), modulate(down, 1200, 0.5, band=tx_high)
+    air = np.zeros(max(len(a), len(b)) + 4800, dtype=np.float32)
+    air[:len(a)] += a
+    air[:len(b)] += b
+    share = softmodem.DUPLEX_BAND_SHARE
+    assert Demodulator(1200, carrier=rx_high, band_share=share).feed(air) == up
+    assert Demodulator(1200, carrier=rx_low, band_share=share).feed(air) == down
+    assert Demodulator(1200, carrier=rx_low).feed(a) != b""      # ungated: own echo decodes
+    assert Demodulator(1200, carrier=rx_low, band_share=share).feed(a) == b""
+
+
+def test_full_duplex_endpoints_send_at_the_same_time():
+    a, b = SoftModem(realtime=True), SoftModem(realtime=True)
+    assert a.set_duplex("both") == -1
+    assert a.get_error() == "Invalid duplex mode"
+    assert a.set_duplex("low") == 0 and b.set_duplex(softmodem.DUPLEX_HIGH) == 0
+    assert a.init(1, 2, 4800) == -1
+    assert a.get_error() == "Duplex bands do not fit the band plan at this baud"
+    assert a.init(1, 2, 2400) == 0
+    assert b.init(2, 1, 2400) == 0
+    try:
+        assert a.set_baud(4800) == -1                   # refused, link kept
+        report = '{"id":"fd","ct":"' + "Liver normal. " * 20 + '"}'
+        request = '{"id":"rq","fn":"retx","ci":[0],"pad":"' + "x" * 250 + '"}'
+        airtime = (len(report) + 1) * 10 / 2400
+        start = time.monotonic()
+        sender = threading.Thread(target=a.send, args=(report + "\n", 50))
+        sender.start()
+        assert b.send(request + "\n", 50) == 0         # while a is still on the air
+        sender.join()
+        elapsed = time.monotonic() - start
+        assert elapsed < 1.5 * airtime                  # both directions in one airtime
+        assert b.receive(timeout=2.0) == report
+        assert a.receive(timeout=2.0) == request
+        assert a.receive(timeout=0.3) is None           # never heard itself
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_candidate_bauds_tag_lines_with_the_sender_rate():
+    a, b = SoftModem(), SoftModem()
+    assert b.set_rx_bauds([1200, 2400, 4800, 9600, 300]) == -1
+    assert b.get_error() == "Invalid candidate baud list"
+    assert b.set_rx_bauds([0]) == -1
+    assert b.set_rx_bauds([1200, 2400]) == 0
+    assert a.init(1, 2, 2400) == 0                      # the sender is at 2400
+    assert b.init(2, 1, 1200) == 0
+    try:
+        line = b'{"id":"rate","ct":"Liver normal"}'
+        assert a.send(line.decode() + "\n", 50) == 0
+        heard = []
+        deadline = time.monotonic() + 2.0
+        while (line, 2400) not in heard and time.monotonic() < deadline:
+            lines = b.receive_many(timeout=0.2)
+            heard += zip((bytes(v) for v in lines), b.received_bauds())
+        assert (line, 2400) in heard
+        assert b.get_stats()["bytes_demodulated"] < len(line)   # the link decoder's noise only
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_long_lines_arrive_whole_within_the_line_limits():
+    modem = SoftModem()
+    assert modem.set_line_limits(0, 8) == -1
+    assert modem.get_error() == "Line length limit out of range"
+    assert modem.set_line_limits(2048, 8) == 0          # applied at init
+    assert modem.init(-1, -1, 9600) == 0
+    try:
+        line = '{"id":"long","ct":"' + "Liver normal in size. " * 60 + '"}'
+        assert 512 < len(line) <= 2048
+        modem.send(line + "\n", 50)
+        assert modem.peek_length(timeout=2.0) == len(line)
+        assert modem.receive() == line                  # not cut at 512
+        modem.send(line + "\n", 50)
+        assert modem.receive(512, timeout=2.0) == line[:511]
+
+        modem.send("x" * 2049 + line + "\n", 50)
+        assert modem.receive(timeout=2.0) == line       # the overlong run was reset
+        assert modem.get_stats()["lines_truncated"] == 1
+    finally:
+        modem.cleanup()
+
+
+def test_send_many_is_one_burst_of_separate_lines():
+    modem = SoftModem()
+    assert modem.send_many(["a\n"], 50) == -1           # not initialized
+    assert modem.init(-1, -1, 9600) == 0
+    try:
+        assert modem.send_many([], 50) == -2
+        assert modem.send_many(["a\n", ""], 50) == -2
+        frames = ['{"id":"b1","ct":"Liver normal"}\n', '{"id":"b2","ct":"No ascites"}']
+        link = ModemTransport(modem, 9600)
+        assert link.send_many(frames, 50) == 0
+        assert link.stats()["frames_sent"] == 2
+        lines, deadline = [], time.monotonic() + 2.0
+        while len(lines) < 2 and time.monotonic() < deadline:
+            lines += [bytes(line).decode() for line in link.receive(timeout=0.5)]
+        assert lines == [frames[0][:-1], frames[1]]     # the bare frame gained its newline
+        assert modem.get_stats()["tx_bytes"] == len(frames[0]) + len(frames[1]) + 1
+    finally:
+        modem.cleanup()
+
+
+def test_held_carrier_lets_a_quick_reply_skip_its_leader():
+    modem = SoftModem()
+    assert modem.set_tx_framing(-1, 2) == -1
+    assert modem.get_error() == "Leader/trailer length out of range"
+    assert modem.set_tx_hold(11) == -1
+    assert modem.set_tx_framing(8, 2) == 0
+    assert modem.set_tx_hold(0.5) == 0
+    assert modem.init(-1, -1, 2400) == 0
+    try:
+        first, reply = '{"id":"h1","ct":"Liver normal"}', '{"id":"h2","fn":"retx","ci":[0]}'
+        modem.send(first + "\n", 50)
+        assert modem.receive(timeout=2.0) == first
+        modem.send(reply + "\n", 50)                    # inside the hold: no leader
+        assert modem.receive(timeout=2.0) == reply
+        assert modem.get_stats()["tx_leaders_skipped"] == 1
+
+        assert modem.set_tx_hold(0) == 0                # carrier drops at once
+        modem.send(first + "\n", 50)
+        assert modem.receive(timeout=2.0) == first
+        assert modem.get_stats()["tx_leaders_skipped"] == 1
+    finally:
+        modem.cleanup()
+
+
+def test_lines_carry_carrier_decode_and_dequeue_times():
+    modem = SoftModem()
+    assert modem.init(-1, -1, 4800) == 0
+    try:
+        link = ModemTransport(modem, 4800)
+        before = time.monotonic()
+        assert link.send_many(['{"id":"t1","ct":"Liver normal"}', '{"id":"t2"}'], 50) == 0
+        lines, times, deadline = [], [], time.monotonic() + 2.0
+        while len(lines) < 2 and time.monotonic() < deadline:
+            lines += link.receive(timeout=0.5)
+            times += link.rx_times
+        assert len(times) == len(lines) == 2
+        for t_carrier, t_decoded, t_dequeued in times:
+            assert before <= t_carrier <= t_decoded <= t_dequeued <= time.monotonic()
+        assert times[0][0] == times[1][0]               # one burst, one carrier lock
+    finally:
+        modem.cleanup()
+
+
+@pytest.mark.parametrize("baud", [300, 1200, 9600])
+def test_hdlc_round_trip_in_less_airtime(baud):
+    data = bytes(range(256)) + b"\xff" * 8 + b"~~\x7e" + b'{"id":"hd","ct":"Liver normal"}\n'
+    samples = modulate(data, baud, 0.3, framing=softmodem.FRAMING_HDLC)
+    assert len(samples) < 0.9 * len(modulate(data, baud, 0.3))
+    demod = softmodem.HdlcDemodulator(baud)
+    out = bytearray()
+    burst = np.tile(np.concatenate((samples, np.zeros(4096, dtype=np.float32))), 2)
+    for i in range(0, len(burst), 777):                 # the same burst twice
+        out += demod.feed(burst[i:i + 777])
+    assert bytes(out) == data * 2
+    assert demod.counters["carrier_acquired"] == demod.counters["carrier_lost"] == 2
+
+
+def test_hdlc_endpoints_and_refusals():
+    a, b = SoftModem(), SoftModem()
+    assert a.set_framing_mode("sync") == -1
+    assert a.get_error() == "Invalid framing mode"
+    assert a.set_framing_mode("hdlc") == 0 and a.set_char_framing(7, 1) == 0
+    assert a.init(1, 2, 1200, carriers=2) == -1
+    assert a.get_error() == "HDLC framing needs a single BFSK carrier in half duplex"
+    assert a.init(1, 2, 1200) == 0
+    assert b.init(2, 1, 1200) == 0                      # async until switched live
+    try:
+        assert b.set_framing_mode(softmodem.FRAMING_HDLC) == 0
+        assert a.send('{"ct":"± 2 mm"}\n', 50) == 0     # whole octets: no 7-bit refusal
+        assert b.receive(timeout=2.0) == '{"ct":"± 2 mm"}'
+        assert a.set_tones(4) == -1                     # MFSK has no HDLC, link kept
+        assert a.send_many(['{"id":"p1"}', '{"id":"p2"}'], 50) == 0
+        assert b.receive_many(max_lines=2, timeout=2.0) == [b'{"id":"p1"}', b'{"id":"p2"}']
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_rendered_waveform_replays_as_one_write():
+    a, b = SoftModem(), SoftModem()
+    assert a.render('{"id":"r"}\n', 50) is None and a.get_error() == "Not initialized"
+    assert a.send_pcm(np.zeros(8, dtype=np.float32)) == -1
+    assert a.set_char_framing(7, 1) == 0 and b.set_char_framing(7, 1) == 0
+    assert a.init(1, 2, 1200) == 0
+    assert b.init(2, 1, 1200) == 0
+    try:
+        line = '{"id":"r","fn":"retx"}\n'
+        samples = a.render(line, 50)
+        assert np.array_equal(samples, a.render(line, 50))
+        assert len(samples) == len(modulate(line.encode(), 1200, 0.5, data_bits=7))
+        assert a.render('{"ct":"±"}\n', 50) is None
+        assert a.get_error() == "Frame is not 7-bit clean"
+        assert a.send_pcm(samples[:0]) == -2
+        for _ in range(2):
+            assert a.send_pcm(samples, len(line)) == 0
+            assert b.receive(timeout=2.0) == line[:-1]
+        assert a.get_stats()["tx_bytes"] == 2 * len(line)
+
+        link = ModemTransport(a, 1200)
+        assert link.send_cached([line], 50) == 0 and link.send_cached([line], 50) == 0
+        assert b.receive_many(max_lines=2, timeout=2.0) == [line[:-1].encode()] * 2
+        assert (link.stats()["waveform_hits"], link.stats()["waveform_misses"]) == (1, 1)
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def test_cached_waveform_skips_its_leader_on_a_held_carrier():
+    modem = SoftModem()
+    assert modem.set_tx_framing(8, 2) == 0
+    assert modem.set_tx_hold(1.0) == 0
+    assert modem.init(-1, -1, 2400) == 0
+    try:
+        link = ModemTransport(modem, 2400)
+        frames = ['{"id":"c1","fn":"retx","ci":[0]}\n', '{"id":"c2","fn":"retx","ci":[0]}\n',
+                  '{"id":"c3","fn":"retx","ci":[0]}\n']
+        for frame in frames:                            # 2nd and 3rd start inside the hold
+            assert link.send_cached([frame], 50) == 0
+            assert modem.receive(timeout=2.0) == frame[:-1]
+        assert link.stats()["waveform_misses"] == 3
+        assert modem.get_stats()["tx_leaders_skipped"] == 2
+        assert modem.get_stats()["tx_bytes"] == sum(len(frame) for frame in frames)
+    finally:
+        modem.cleanup()
+
+
+def test_cached_waveform_holds_the_carrier_at_its_volume():
+    modem = SoftModem()
+    assert modem.set_tx_hold(1.0) == 0
+    assert modem.init(-1, -1, 2400) == 0
+    try:
+        link = ModemTransport(modem, 2400)
+        frame = '{"id":"v1","fn":"retx","ci":[0]}\n'
+        assert link.send_cached([frame], 20) == 0       # rendered at 20
+        assert modem.send('{"id":"v2"}\n', 80) == 0
+        assert modem._tx_amplitude == 0.8
+        assert link.send_cached([frame], 20) == 0       # replayed from the cache
+        assert link.stats()["waveform_hits"] == 1
+        assert modem._tx_amplitude == 0.2               # the idle marks after it
+    finally:
+        modem.cleanup()
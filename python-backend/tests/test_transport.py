@@ -0,0 +1,165 @@
+"""Tests for lib.transport (stdio, UNIX-socket and in-memory line transports)."""
+
+import io
+import os
+import time
+
+import pytest
+
+from lib import transport as tp
+from lib.transport import (
+    ModemTransport,
+    StdioTransport,
+    Transport,
+    UnixSocketTransport,
+    memory_pair,
+)
+
+
+def test_memory_pair_round_trip():
+    a, b = memory_pair()
+    assert a.send('{"id":"a"}\n{"id":"b"}\n', 50) == 0
+    assert b.receive(timeout=1) == [b'{"id":"a"}', b'{"id":"b"}']
+    assert b.send("pong\n", 50) == 0
+    assert a.receive(timeout=1) == [b"pong"]
+    assert a.stats()["frames_sent"] == 1
+    assert b.stats()["lines_received"] == 2
+
+
+def test_partial_lines_are_joined():
+    a, b = memory_pair()
+    a.send("hel", 50)
+    assert b.receive() == []
+    a.send("lo\n", 50)
+    assert b.receive() == [b"hello"]
+
+
+def test_caps_drop_oldest_and_overlong():
+    a, b = memory_pair()
+    a.send("x" * (tp.LINE_MAX_LEN + 1) + "\n", 50)
+    a.send("".join(f"{i}\n" for i in range(tp.QUEUE_MAX_LINES + 3)), 50)
+    lines = b.receive()
+    assert len(lines) == tp.QUEUE_MAX_LINES
+    assert lines[0] == b"3"
+    assert b.stats()["lines_dropped"] == 3
+
+
+def test_raised_caps_keep_long_lines():
+    a, b = memory_pair()
+    b.line_max, b.queue_max = 4 * tp.LINE_MAX_LEN, 2
+    long_line = "x" * (tp.LINE_MAX_LEN + 1)
+    a.send(f"{long_line}\n1\n2\n", 50)
+    assert b.receive() == [b"1", b"2"]                  # the long line was dropped oldest
+    a.send(f"{long_line}\n", 50)
+    assert b.receive() == [long_line.encode()]
+
+
+def test_close_ends_peer_input():
+    a, b = memory_pair()
+    a.send("last\n", 50)
+    a.close()
+    assert b.closed
+    assert b.receive(timeout=1) == [b"last"]
+    assert b.receive(timeout=1) == []
+    assert a.send("x\n", 50) == -1
+
+
+def test_stdio_reads_until_eof():
+    out = io.BytesIO()
+    link = StdioTransport(stdin=io.BytesIO(b'{"id":"a"}\n{"id":"b"}\n'), stdout=out)
+    deadline = time.monotonic() + 2
+    while not link.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert link.receive() == [b'{"id":"a"}', b'{"id":"b"}']
+    assert link.send("reply\n", 50) == 0
+    assert out.getvalue() == b"reply\n"
+
+
+def test_unix_socket_listen_connect(tmp_path):
+    path = str(tmp_path / "link.sock")
+    server = UnixSocketTransport.listen(path)
+    client = UnixSocketTransport.connect(path)
+    try:
+        assert client.send("ping\n", 50) == 0
+        assert server.receive(timeout=2) == [b"ping"]
+        assert server.send("pong\n", 50) == 0
+        assert client.receive(timeout=2) == [b"pong"]
+    finally:
+        client.close()
+        server.close()
+    assert not os.path.exists(path)
+
+
+def test_implementations_satisfy_protocol():
+    a, b = memory_pair()
+    assert isinstance(a, Transport)
+    assert isinstance(ModemTransport(), Transport)
+
+
+def test_byte_stream_transport_must_write():
+    class NoWrite(tp._LineQueueTransport):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWrite()
+
+
+class _RenderingModem:
+    """TX side of a binding with render / send_pcm: one 'sample' per byte."""
+
+    def __init__(self):
+        self.renders, self.played, self.sent = [], [], []
+
+    def render(self, message, volume):
+        self.renders.append(message)
+        return None if not message.isascii() else [volume / 100.0] * len(message)
+
+    def send_pcm(self, samples, nbytes, volume):
+        self.played.append((len(samples), nbytes))
+        return 0
+
+    def send(self, message, volume):
+        self.sent.append(message)
+        return 0
+
+    def set_baud(self, baud):
+        return 0
+
+
+def test_modem_transport_replays_cached_waveforms():
+    modem = _RenderingModem()
+    link = ModemTransport(modem, 1200)
+    report, retx, error = '{"ct":"ok"}\n', '{"fn":"retx"}\n', '{"st":"E"}\n'
+    assert link.send(report, 50) == 0                   # plain send: never rendered
+    for frame in (retx, error, retx, retx):
+        assert link.send_cached([frame], 50) == 0
+    assert modem.sent == [report]
+    assert modem.renders == [retx, error]               # repeats are not re-rendered
+    assert modem.played == [(len(retx), len(retx)), (len(error), len(error))] + \
+        [(len(retx), len(retx))] * 2
+    assert link.send_cached([retx], 60) == 0            # keyed on volume and baud
+    assert link.set_baud(2400) == 0 and link.send_cached([retx], 60) == 0
+    assert len(modem.renders) == 4
+    assert link.send_cached(["a\n", "b"], 50) == 0       # a burst renders as one joined send
+    assert modem.renders[-1] == "a\nb\n" and modem.played[-1] == (4, 4)
+    assert link.send_cached(["\u00b1\n"], 50) == 0      # cannot render: plain send
+    assert modem.sent == [report, "\u00b1\n"]
+    stats = link.stats()
+    assert (stats["waveform_hits"], stats["waveform_misses"]) == (2, 5)
+    assert stats["frames_sent"] == 10
+
+
+def test_waveform_cache_evicts_least_recently_used():
+    modem = _RenderingModem()
+    link = ModemTransport(modem, 1200)
+    link.waveform_cache_samples = 20
+    a, b, c = "a" * 9 + "\n", "b" * 9 + "\n", "c" * 9 + "\n"
+    for frame in (a, b, a, c, a, b):                    # c pushes out b, not the fresher a
+        link.send_cached([frame], 50)
+    assert modem.renders == [a, b, c, b]
+    link.send_cached(["x" * 30 + "\n"], 50)             # over budget: sent, never cached
+    link.send_cached([a], 50)                           # still cached
+    assert modem.renders[4:] == ["x" * 30 + "\n"]
+    link.waveform_cache_samples = 0                     # disabled: plain sends
+    link.send_cached([a], 50)
+    assert modem.sent == [a]
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Main-loop latency benchmark -- backend.serve() vs. backend.serve_async().
+
+Drives both main loops over an in-process fake transport (no wrapper .so, no audio
+device) with a deliberately slow pipeline, and measures from the moment a line
+is queued:
+  * reply latency: until the pipeline's reply frame is transmitted.
+  * retx latency:  until a retransmission request arriving WHILE the pipeline
+    is busy has been served (the stored frame resent).
+
+The synchronous loop handles lines inline, so a retx request waits behind
+whatever pipeline run is in progress; the asyncio loop serves it from the RX
+task immediately.
+
+Usage:
+    cd python-backend
+    python tools/bench_async.py [--requests 10] [--gap 0.6] [--pipeline 0.5] [--airtime 0.05]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backend  # noqa: E402
+from lib import chunking, logger  # noqa: E402
+from lib.async_transport import AsyncModemTransport  # noqa: E402
+from lib.chunking import Transmitter, build_single_frame  # noqa: E402
+
+SEED_ID = "seed"
+
+
+class FakeLink:
+    """A Transport backed by an in-memory queue.
+
+    ``send`` blocks for ``airtime`` like the wrapper's send does."""
+
+    def __init__(self, airtime: float):
+        self.airtime = airtime
+        self.baud = 1200
+        self.rx_bauds: list[int] = []
+        self.rx_times: list[tuple[float, float, float]] = []
+        self.sent: list[tuple[float, str]] = []
+        self._rx: deque = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+
+    def inject(self, line: str) -> None:
+        with self._cond:
+            self._rx.append(line.rstrip("\n").encode("utf-8"))
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def receive(self, timeout: float | None = None) -> list[bytes]:
+        with self._cond:
+            if timeout:
+                self._cond.wait_for(lambda: self._rx or self._closed, timeout)
+            lines = list(self._rx)
+            self._rx.clear()
+        return lines
+
+    def send(self, message: str, volume: int = 50) -> int:
+        with self._cond:
+            self._busy = True
+        time.sleep(self.airtime)
+        with self._cond:
+            self._busy = False
+            self.sent.append((time.perf_counter(), message))
+            self._cond.notify_all()
+        return 0
+
+    def wait_tx(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            if timeout:
+                self._cond.wait_for(lambda: not self._busy, timeout)
+            return not self._busy
+
+    def stats(self) -> dict:
+        return {"frames_sent": len(self.sent)}
+
+    def get_error(self) -> str:
+        return ""
+
+
+class SlowPipeline:
+    """Stands in for the LLM pipeline: fixed processing time per message."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def process(self, msg: dict) -> dict:
+        time.sleep(self.delay)
+        return {"id": msg.get("id", ""), "st": "S", "ct": "ok"}
+
+
+def install(link: FakeLink) -> None:
+    """Point backend + chunking at the fake link and seed a retx target."""
+    tx = Transmitter(link, inter_frame_delay=0.0)
+    backend.transmitter = tx
+    chunking.transmitter = tx
+    chunking.last_sent_chunks.clear()
+    chunking.last_sent_chunks[SEED_ID] = [build_single_frame({"id": SEED_ID, "st": "S", "ct": "seed"})]
+
+
+def drive(link: FakeLink, requests: int, gap: float) -> dict[str, float]:
+    """Inject requests (each followed, mid-gap, by a retx request for the seed
+    frame) and return {tag: inject_time}."""
+    injected: dict[str, float] = {}
+    for i in range(requests):
+        req_id = f"r{i:03d}"
+        injected[req_id] = time.perf_counter()
+        link.inject(build_single_frame({"id": req_id, "fn": "test", "ct": f"request {i}"}))
+        time.sleep(gap / 2)
+        injected[f"x{i:03d}"] = time.perf_counter()
+        link.inject(f'{{"id":"{SEED_ID}","fn":"retx","ci":[0]}}\n')
+        time.sleep(gap / 2)
+    return injected
+
+
+def collect(link: FakeLink, injected: dict[str, float]) -> tuple[list[float], list[float]]:
+    """Match transmitted frames to injections -> (reply latencies, retx latencies)."""
+    replies, retx = [], []
+    seed_sends = [t for t, m in link.sent if f'"id":"{SEED_ID}"' in m]
+    retx_injects = sorted(t for k, t in injected.items() if k.startswith("x"))
+    for t_in, t_out in zip(retx_injects, seed_sends):
+        retx.append(t_out - t_in)
+    for t_out, msg in link.sent:
+        for req_id, t_in in injected.items():
+            if req_id.startswith("r") and f'"id":"{req_id}"' in msg:
+                replies.append(t_out - t_in)
+    return replies, retx
+
+
+def wait_for_sends(link: FakeLink, count: int, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while len(link.sent) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def run_sync(args) -> tuple[list[float], list[float]]:
+    link = FakeLink(args.airtime)
+    install(link)
+    pipeline = SlowPipeline(args.pipeline)
+
+    t = threading.Thread(target=backend.serve, args=(pipeline, 50, link), daemon=True)
+    t.start()
+    injected = drive(link, args.requests, args.gap)
+    wait_for_sends(link, 2 * args.requests)
+    link.close()
+    t.join()
+    return collect(link, injected)
+
+
+def run_async(args) -> tuple[list[float], list[float]]:
+    link = FakeLink(args.airtime)
+    install(link)
+    pipeline = SlowPipeline(args.pipeline)
+
+    async def bench():
+        transport = AsyncModemTransport(transport=link, transmitter=chunking.transmitter,
+                                        poll_timeout=0.05)
+        server = asyncio.create_task(backend.serve_async(pipeline, 50, transport))
+        injected = await asyncio.to_thread(drive, link, args.requests, args.gap)
+        await asyncio.to_thread(wait_for_sends, link, 2 * args.requests)
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+        return injected
+
+    injected = asyncio.run(bench())
+    return collect(link, injected)
+
+
+def fmt(samples: list[float]) -> str:
+    if not samples:
+        return f"{'-':>10}{'-':>10}"
+    samples = sorted(samples)
+    p95 = samples[int(0.95 * (len(samples) - 1))]
+    return f"{statistics.median(samples) * 1e3:>8.1f}ms{p95 * 1e3:>8.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="serve() vs serve_async() latency")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--gap", type=float, default=0.6, help="seconds between requests")
+    parser.add_argument("--pipeline", type=float, default=0.5, help="pipeline seconds per message")
+    parser.add_argument("--airtime", type=float, default=0.05, help="seconds per transmitted frame")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+
+    print(f"{'loop':<8}{'reply p50':>10}{'p95':>10}{'retx p50':>10}{'p95':>10}")
+    for name, run in (("sync", run_sync), ("async", run_async)):
+        replies, retx = run(args)
+        print(f"{name:<8}{fmt(replies)}{fmt(retx)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Multi-carrier benchmark -- link bytes/sec by carrier count.
+
+For each baud, modulates the same block of newline-framed JSON lines with
+``lib.softmodem`` at 1..max_carriers(baud) carriers, decodes it through the
+matching (multi-carrier) demodulator, and reports per carrier count:
+  * airtime of the burst (samples / sample rate) and the resulting link rate
+    in payload bytes per second of audio, plus the speed-up over one carrier,
+  * byte errors against the original payload.
+
+Also runs one loopback round trip through two SoftModem endpoints on crossed
+pipes at each carrier count to confirm the full line path.
+
+Usage:
+    cd python-backend
+    python tools/bench_carriers.py [--bauds 1200 2400] [--bytes 4096] [--block 1024]
+"""
+
+import argparse
+import os
+import sys
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib import softmodem  # noqa: E402
+
+
+def payload(nbytes: int) -> bytes:
+    line = b'{"id":"bench0001","fn":"render","ct":"Liver normal in size and echotexture."}\n'
+    reps = nbytes // len(line) + 1
+    return (line * reps)[:nbytes]
+
+
+def bench_carriers(baud: int, carriers: int, data: bytes, block: int) -> dict:
+    samples = softmodem.modulate(data, baud, 0.5, carriers=carriers)
+    if carriers > 1:
+        demod = softmodem.MultiCarrierDemodulator(baud, carriers)
+    else:
+        demod = softmodem.Demodulator(baud)
+    out = bytearray()
+    for i in range(0, len(samples), block):
+        out += demod.feed(samples[i:i + block])
+    out += demod.feed(softmodem.np.zeros(block, dtype=softmodem.np.float32))
+
+    airtime = len(samples) / softmodem.SAMPLE_RATE
+    errors = sum(a != b for a, b in zip(out, data)) + abs(len(out) - len(data))
+    return {"airtime": airtime, "rate": len(data) / airtime, "errors": errors}
+
+
+def loopback_check(baud: int, carriers: int) -> bool:
+    a, b = softmodem.SoftModem(), softmodem.SoftModem()
+    if a.init(1, 2, baud, carriers) < 0 or b.init(2, 1, baud, carriers) < 0:
+        sys.exit(f"init failed: {a.get_error() or b.get_error()}")
+    try:
+        line = '{"id":"loop","fn":"test","ct":"round trip across the carriers"}'
+        a.send(line + "\n", 50)
+        return b.receive(timeout=2.0) == line
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="multi-carrier FSK bytes/sec by carrier count")
+    parser.add_argument("--bauds", type=int, nargs="+", default=[1200, 2400])
+    parser.add_argument("--bytes", type=int, default=4096, help="payload size")
+    parser.add_argument("--block", type=int, default=1024, help="samples per demod call")
+    args = parser.parse_args()
+
+    if softmodem.np is None:
+        sys.exit("NumPy is required for the software modem")
+
+    data = payload(args.bytes)
+    print(f"{'baud':>6}{'carriers':>10}{'airtime s':>11}{'link B/s':>10}"
+          f"{'speed-up':>10}{'errors':>8}{'loopback':>10}")
+    for baud in args.bauds:
+        base = None
+        for carriers in range(1, softmodem.max_carriers(baud) + 1):
+            r = bench_carriers(baud, carriers, data, args.block)
+            base = base or r["rate"]
+            ok = loopback_check(baud, carriers)
+            print(f"{baud:>6}{carriers:>10}{r['airtime']:>11.2f}{r['rate']:>10.0f}"
+                  f"{r['rate'] / base:>10.2f}{r['errors']:>8}{'ok' if ok else 'FAIL':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Frame recovery microbenchmark -- decode + extract + re-parse vs. one pass.
+
+Builds a batch of CRC frames, wraps them in FSK-style garbage (random leading
+and trailing junk bytes, some containing a stray ``{``), packs them into one
+buffer the way ``receive_many`` does, and times, per line:
+  * legacy: ``str(view, "utf-8", "replace")`` of the whole line, then
+    ``extract_json_frame`` (which already parses the object) and a second
+    ``json.loads`` of the extracted substring;
+  * single: ``parse_json_frame`` on the ``memoryview`` slice itself -- brace
+    search in place, one decode from the first brace, one parse.
+
+Both must recover the same objects; the clean (unwrapped) case is reported too.
+
+Usage:
+    cd python-backend
+    python tools/bench_frames.py [--lines 2000] [--junk 12] [--stray 0.3] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib.chunking import build_single_frame, extract_json_frame, parse_json_frame  # noqa: E402
+
+REPORT = "Liver normal in size and echotexture. No focal lesion. Spleen 10 cm. " * 4
+
+
+def build_lines(count: int, junk: int, stray: float, rng: random.Random) -> list[bytes]:
+    lines = []
+    for i in range(count):
+        frame = build_single_frame({"id": f"m{i:05d}", "fn": "render", "ct": REPORT})
+        line = frame.rstrip("\n").encode()
+        if junk:
+            lead = bytes(rng.randrange(0x80, 0x100) for _ in range(rng.randrange(junk + 1)))
+            if rng.random() < stray:
+                lead += b"{+\x9a&"
+            tail = bytes(rng.randrange(0x80, 0x100) for _ in range(rng.randrange(junk + 1)))
+            line = lead + line + tail
+        lines.append(line)
+    return lines
+
+
+def pack(lines: list[bytes]) -> list[memoryview]:
+    """One contiguous buffer + per-line views, as receive_many hands them out."""
+    view = memoryview(b"".join(lines))
+    views, pos = [], 0
+    for line in lines:
+        views.append(view[pos:pos + len(line)])
+        pos += len(line)
+    return views
+
+
+def legacy(view) -> dict | None:
+    frame = extract_json_frame(str(view, "utf-8", "replace"))
+    return json.loads(frame) if frame is not None else None
+
+
+def single(view) -> dict | None:
+    return parse_json_frame(view)
+
+
+def bench(fn, views: list, repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = [fn(v) for v in views]
+        best = min(best, time.perf_counter() - t0)
+    return best / len(views) * 1e6, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="frame recovery: legacy vs single-pass")
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--junk", type=int, default=12, help="max junk bytes on each side")
+    parser.add_argument("--stray", type=float, default=0.3, help="fraction with a stray '{' in the junk")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'lines':<10}{'legacy us':>11}{'single us':>11}{'speed-up':>10}{'same':>6}")
+    for label, junk in (("clean", 0), ("garbage", args.junk)):
+        views = pack(build_lines(args.lines, junk, args.stray, random.Random(1)))
+        t_legacy, a = bench(legacy, views, args.repeat)
+        t_single, b = bench(single, views, args.repeat)
+        print(f"{label:<10}{t_legacy:>11.2f}{t_single:>11.2f}"
+              f"{t_legacy / t_single:>10.2f}{'yes' if a == b else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
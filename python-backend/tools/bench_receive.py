@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Receive-path benchmark -- poll loop vs. receive_wait, receive vs. receive_many.
+
+Measures, for each consumer strategy:
+  * idle CPU: CPU seconds burned by the consumer thread per wall second while
+    the line is silent (``time.thread_time``; the wrapper RX thread's demod
+    cost is identical in both modes and excluded).
+  * frame-to-handler latency: time from ``send()`` returning to the consumer
+    holding the decoded line (needs a loopback: the playback device wired to
+    the capture device, or a loopback ALSA device).
+
+  * burst drain: per-line cost of emptying a queue of ``--burst`` lines with
+    one ``receive()`` per line vs. a single ``receive_many()``.
+
+Strategies:
+  poll  the pre-receive_wait backend loop: process(); receive(); sleep(10 ms)
+  wait  receive(timeout=0.5) -- parks in minimodem_simple_receive_wait
+
+Usage:
+    cd python-backend
+    python tools/bench_receive.py --lib ../minimodem-wrapper/build/minimodem_simple.so
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib import minimodem
+
+POLL_SLEEP = 0.01  # the retired backend.POLL_SLEEP
+WAIT_TIMEOUT = 0.5
+
+
+def next_line(mode: str) -> str | None:
+    """One consumer iteration in the given mode."""
+    if mode == "poll":
+        minimodem.process()
+        msg = minimodem.receive()
+        if msg is None:
+            time.sleep(POLL_SLEEP)
+        return msg
+    return minimodem.receive(timeout=WAIT_TIMEOUT)
+
+
+def measure_idle(mode: str, seconds: float) -> float:
+    """CPU seconds per wall second spent by the consumer on a silent line."""
+    cpu0, wall0 = time.thread_time(), time.monotonic()
+    while time.monotonic() - wall0 < seconds:
+        next_line(mode)
+    return (time.thread_time() - cpu0) / (time.monotonic() - wall0)
+
+
+def measure_latency(mode: str, frames: int, gap: float) -> list[float]:
+    """Frame-to-handler latencies (seconds) over a loopback link."""
+    sent_at: dict[str, float] = {}
+    latencies: list[float] = []
+
+    def sender():
+        for i in range(frames):
+            tag = f"{mode}{i:04d}"
+            minimodem.send(f'{{"id":"{tag}","fn":"bench","ct":""}}\n', 50)
+            sent_at[tag] = time.monotonic()
+            time.sleep(gap)
+
+    tx = threading.Thread(target=sender, daemon=True)
+    tx.start()
+    deadline = time.monotonic() + frames * gap + 5.0
+    while len(latencies) < frames and time.monotonic() < deadline:
+        msg = next_line(mode)
+        now = time.monotonic()
+        if msg is None:
+            continue
+        for tag, t in sent_at.items():
+            if tag in msg:
+                latencies.append(now - t)
+                break
+    tx.join()
+    return latencies
+
+
+def measure_burst(mode: str, burst: int, baud: int) -> tuple[int, float]:
+    """Queue ``burst`` short lines, then time draining them. Returns
+    (lines drained, microseconds per line)."""
+    payload = "".join(f'{{"id":"b{i:03d}"}}\n' for i in range(burst))
+    minimodem.send(payload, 50)
+    # Let the RX thread demodulate everything (10 bits/byte) before timing.
+    time.sleep(len(payload) * 10 / baud + 1.0)
+
+    t0 = time.perf_counter()
+    if mode == "single":
+        n = 0
+        while minimodem.receive() is not None:
+            n += 1
+    else:
+        n = len(minimodem.receive_many())
+    elapsed = time.perf_counter() - t0
+    return n, (elapsed / n * 1e6) if n else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lib", default=None, help="path to minimodem_simple.so")
+    parser.add_argument("--baud", type=int, default=1200)
+    parser.add_argument("--idle", type=float, default=5.0, help="idle seconds per mode")
+    parser.add_argument("--frames", type=int, default=20, help="loopback frames per mode")
+    parser.add_argument("--gap", type=float, default=0.7, help="seconds between frames")
+    parser.add_argument("--burst", type=int, default=48, help="lines per burst-drain run")
+    args = parser.parse_args()
+
+    minimodem.load(args.lib)
+    if minimodem.init(-1, -1, args.baud) < 0:
+        sys.exit(f"init failed: {minimodem.get_error()}")
+    try:
+        print(f"{'mode':<6}{'idle CPU':>12}{'lat p50':>12}{'lat p95':>12}{'frames':>8}")
+        for mode in ("poll", "wait"):
+            idle = measure_idle(mode, args.idle)
+            lat = sorted(measure_latency(mode, args.frames, args.gap))
+            if lat:
+                p50 = statistics.median(lat) * 1000
+                p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000
+                print(f"{mode:<6}{idle * 100:>11.3f}%{p50:>10.1f}ms{p95:>10.1f}ms{len(lat):>8}")
+            else:
+                print(f"{mode:<6}{idle * 100:>11.3f}%{'-':>12}{'-':>12}{0:>8}")
+
+        print(f"\n{'drain':<8}{'lines':>8}{'us/line':>12}")
+        for mode in ("single", "many"):
+            n, per_line = measure_burst(mode, args.burst, args.baud)
+            print(f"{mode:<8}{n:>8}{per_line:>12.2f}")
+    finally:
+        minimodem.cleanup()
+
+
+if __name__ == "__main__":
+    main()
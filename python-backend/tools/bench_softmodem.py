@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Software modem benchmark -- throughput and CPU per decoded byte by baud.
+
+Modulates a block of newline-framed JSON lines with ``lib.softmodem``, feeds
+the samples through the streaming demodulator in audio-sized blocks, and
+reports, per baud:
+  * mod / demod CPU per byte (``time.process_time``),
+  * demod throughput (decoded bytes per CPU second) vs. the link's airtime rate
+    (baud / 10 bytes per second for 8-N-1),
+  * byte errors against the original payload.
+
+Also runs one loopback round trip through the module API (init/send/receive)
+to confirm the full line path.
+
+Usage:
+    cd python-backend
+    python tools/bench_softmodem.py [--bauds 1200 4800 9600] [--bytes 8192] [--block 1024]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib import softmodem  # noqa: E402
+
+
+def payload(nbytes: int) -> bytes:
+    line = b'{"id":"bench0001","fn":"render","ct":"Liver normal in size and echotexture."}\n'
+    reps = nbytes // len(line) + 1
+    return (line * reps)[:nbytes]
+
+
+def bench_baud(baud: int, data: bytes, block: int) -> dict:
+    t0 = time.process_time()
+    samples = softmodem.modulate(data, baud, 0.5)
+    t_mod = time.process_time() - t0
+
+    demod = softmodem.Demodulator(baud)
+    out = bytearray()
+    t0 = time.process_time()
+    for i in range(0, len(samples), block):
+        out += demod.feed(samples[i:i + block])
+    out += demod.feed(softmodem.np.zeros(block, dtype=softmodem.np.float32))
+    t_demod = time.process_time() - t0
+
+    errors = sum(a != b for a, b in zip(out, data)) + abs(len(out) - len(data))
+    return {
+        "mod_us": t_mod / len(data) * 1e6,
+        "demod_us": t_demod / len(data) * 1e6,
+        "throughput": len(out) / t_demod if t_demod else float("inf"),
+        "airtime": baud / 10,
+        "errors": errors,
+    }
+
+
+def loopback_check(baud: int) -> bool:
+    if softmodem.init(-1, -1, baud) < 0:
+        sys.exit(f"init failed: {softmodem.get_error()}")
+    try:
+        line = '{"id":"loop","fn":"test","ct":"round trip"}'
+        softmodem.send(line + "\n", 50)
+        return softmodem.receive(timeout=2.0) == line
+    finally:
+        softmodem.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="softmodem throughput / CPU per byte")
+    parser.add_argument("--bauds", type=int, nargs="+", default=[1200, 4800, 9600])
+    parser.add_argument("--bytes", type=int, default=8192, help="payload size")
+    parser.add_argument("--block", type=int, default=1024, help="samples per demod call")
+    args = parser.parse_args()
+
+    if softmodem.np is None:
+        sys.exit("NumPy is required for the software modem")
+
+    data = payload(args.bytes)
+    print(f"{'baud':>6}{'mod us/B':>10}{'demod us/B':>12}{'demod B/s':>12}"
+          f"{'air B/s':>9}{'x realtime':>12}{'errors':>8}{'loopback':>10}")
+    for baud in args.bauds:
+        r = bench_baud(baud, data, args.block)
+        ok = loopback_check(baud)
+        print(f"{baud:>6}{r['mod_us']:>10.2f}{r['demod_us']:>12.2f}{r['throughput']:>12.0f}"
+              f"{r['airtime']:>9.0f}{r['throughput'] / r['airtime']:>12.1f}{r['errors']:>8}"
+              f"{'ok' if ok else 'FAIL':>10}")
+
+
+if __name__ == "__main__":
+    main()
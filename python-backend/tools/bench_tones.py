@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""MFSK benchmark -- link bytes/sec and byte error rate, BFSK vs 4 / 8 tones.
+
+For each baud (symbol rate), modulates the same block of newline-framed JSON
+lines with ``lib.softmodem`` at every tone count that fits (2 = BFSK, 4, 8),
+adds white noise at each requested SNR, decodes it through the matching
+demodulator, and reports per tone count:
+  * airtime of the burst (samples / sample rate) and the resulting link rate
+    in payload bytes per second of audio, plus the speed-up over BFSK at the
+    same symbol rate,
+  * byte error rate against the original payload (mismatched bytes plus the
+    length difference, over the payload length).
+
+Also runs one loopback round trip through two SoftModem endpoints on crossed
+pipes at each tone count to confirm the full line path. ``--wrapper`` adds a
+round trip through the C wrapper's own loopback (``lib.minimodem``; needs the
+built library and an audio device or loopback that hears its own output).
+
+Usage:
+    cd python-backend
+    python tools/bench_tones.py [--bauds 300 1200 2400] [--bytes 4096]
+        [--snr 30 15 10] [--block 1024] [--wrapper]
+"""
+
+import argparse
+import os
+import sys
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib import softmodem  # noqa: E402
+
+
+def payload(nbytes: int) -> bytes:
+    line = b'{"id":"bench0001","fn":"render","ct":"Liver normal in size and echotexture."}\n'
+    reps = nbytes // len(line) + 1
+    return (line * reps)[:nbytes]
+
+
+def add_noise(samples, snr_db: float, seed: int = 1):
+    """White Gaussian noise at ``snr_db`` below the signal's mean power."""
+    np = softmodem.np
+    power = float(np.mean(samples.astype(np.float64) ** 2))
+    sigma = (power / 10 ** (snr_db / 10)) ** 0.5
+    noise = np.random.default_rng(seed).normal(0.0, sigma, len(samples))
+    return (samples + noise).astype(np.float32)
+
+
+def bench_tones(baud: int, tones: int, data: bytes, snr_db: float | None, block: int) -> dict:
+    samples = softmodem.modulate(data, baud, 0.5, tones=tones)
+    airtime = len(samples) / softmodem.SAMPLE_RATE
+    if snr_db is not None:
+        samples = add_noise(samples, snr_db)
+    demod = softmodem.Demodulator(baud, tones=tones)
+    out = bytearray()
+    for i in range(0, len(samples), block):
+        out += demod.feed(samples[i:i + block])
+    out += demod.feed(softmodem.np.zeros(block, dtype=softmodem.np.float32))
+
+    errors = sum(a != b for a, b in zip(out, data)) + abs(len(out) - len(data))
+    return {"airtime": airtime, "rate": len(data) / airtime, "ber": errors / len(data)}
+
+
+def loopback_check(baud: int, tones: int) -> bool:
+    a, b = softmodem.SoftModem(), softmodem.SoftModem()
+    a.set_tones(tones)
+    b.set_tones(tones)
+    if a.init(1, 2, baud) < 0 or b.init(2, 1, baud) < 0:
+        sys.exit(f"init failed: {a.get_error() or b.get_error()}")
+    try:
+        line = '{"id":"loop","fn":"test","ct":"round trip across the tones"}'
+        a.send(line + "\n", 50)
+        return b.receive(timeout=2.0) == line
+    finally:
+        a.cleanup()
+        b.cleanup()
+
+
+def wrapper_check(baud: int, tones: int) -> str:
+    """Send one line through the C wrapper and wait to hear it back."""
+    from lib import minimodem
+    if minimodem.set_tones(tones) < 0 or minimodem.init(-1, -1, baud) < 0:
+        return "init: " + minimodem.get_error()
+    try:
+        line = '{"id":"loop","fn":"test","ct":"wrapper round trip"}'
+        minimodem.send(line + "\n", 50)
+        got = minimodem.receive(timeout=3.0)
+        return "no rx" if got is None else "ok" if got == line else "garbled"
+    finally:
+        minimodem.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MFSK vs BFSK bytes/sec and error rate")
+    parser.add_argument("--bauds", type=int, nargs="+", default=[300, 1200, 2400])
+    parser.add_argument("--bytes", type=int, default=4096, help="payload size")
+    parser.add_argument("--snr", type=float, nargs="+", default=[30.0, 15.0, 10.0],
+                        help="SNRs in dB (the clean signal is always included)")
+    parser.add_argument("--block", type=int, default=1024, help="samples per demod call")
+    parser.add_argument("--wrapper", action="store_true",
+                        help="also round-trip through the C wrapper's loopback")
+    args = parser.parse_args()
+
+    if softmodem.np is None:
+        sys.exit("NumPy is required for the software modem")
+    if args.wrapper:
+        from lib import minimodem
+        minimodem.load()
+
+    data = payload(args.bytes)
+    snrs = [None] + args.snr
+    print(f"{'baud':>6}{'tones':>7}{'airtime s':>11}{'link B/s':>10}{'speed-up':>10}"
+          + "".join(f"{'BER ' + ('clean' if s is None else f'{s:g}dB'):>12}" for s in snrs)
+          + f"{'loopback':>10}" + (f"{'wrapper':>10}" if args.wrapper else ""))
+    for baud in args.bauds:
+        base = None
+        for tones in softmodem.TONE_COUNTS:
+            if tones > softmodem.max_tones(baud):
+                continue
+            runs = [bench_tones(baud, tones, data, snr, args.block) for snr in snrs]
+            base = base or runs[0]["rate"]
+            ok = loopback_check(baud, tones)
+            row = (f"{baud:>6}{tones:>7}{runs[0]['airtime']:>11.2f}{runs[0]['rate']:>10.0f}"
+                   f"{runs[0]['rate'] / base:>10.2f}"
+                   + "".join(f"{r['ber']:>12.4f}" for r in runs)
+                   + f"{'ok' if ok else 'FAIL':>10}")
+            if args.wrapper:
+                row += f"{wrapper_check(baud, tones):>10}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""TX turnaround benchmark -- is_transmitting() polling vs. wait_transmit_done.
+
+A sender thread transmits frames over the wrapper; a waiter thread detects the
+end of each transmission either by the old ``while is_transmitting():
+sleep(0.05)`` loop or by parking in ``minimodem.wait_transmit_done``. The
+reported turnaround is the time from ``send()`` returning (TX finished) to the
+waiter noticing.
+
+Usage:
+    python tools/bench_transmit.py [--lib PATH] [--baud 1200] [--frames 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import minimodem  # noqa: E402
+
+FRAME = '{"id":"bench","fn":"test","ct":"turnaround"}\n'
+
+
+def measure(mode: str, frames: int) -> list[float]:
+    """Return the per-frame turnaround (seconds) for one detection strategy."""
+    turnaround: list[float] = []
+    for _ in range(frames):
+        started = threading.Event()
+        ended: list[float] = []
+
+        def sender():
+            started.set()
+            minimodem.send(FRAME, 50)
+            ended.append(time.perf_counter())
+
+        t = threading.Thread(target=sender)
+        t.start()
+        started.wait()
+        while not minimodem.is_transmitting() and t.is_alive():
+            time.sleep(0.0005)
+
+        if mode == "poll":
+            while minimodem.is_transmitting():
+                time.sleep(0.05)
+        else:
+            minimodem.wait_transmit_done(timeout=60)
+        noticed = time.perf_counter()
+        t.join()
+        turnaround.append(max(0.0, noticed - ended[0]))
+    return turnaround
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lib", default=None, help="path to libminimodem_simple.so")
+    parser.add_argument("--baud", type=int, default=1200)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    minimodem.load(args.lib)
+    if minimodem.init(-1, -1, args.baud) < 0:
+        sys.exit(f"init failed: {minimodem.get_error()}")
+    try:
+        print(f"{'mode':<8}{'p50':>12}{'p95':>12}{'max':>12}")
+        for mode in ("poll", "wait"):
+            samples = sorted(measure(mode, args.frames))
+            p50 = statistics.median(samples)
+            p95 = samples[int(0.95 * (len(samples) - 1))]
+            print(f"{mode:<8}{p50 * 1e6:>10.0f}us{p95 * 1e6:>10.0f}us{samples[-1] * 1e6:>10.0f}us")
+    finally:
+        minimodem.cleanup()
+
+
+if __name__ == "__main__":
+    main()
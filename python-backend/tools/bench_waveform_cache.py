@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Waveform cache benchmark -- TX CPU per send during a resend storm, with
+``ModemTransport``'s rendered-waveform LRU off vs on.
+
+Sends the frames a retransmit storm repeats byte for byte (the fixed-shape
+retx request, an error reply, a report resent from ``last_sent_chunks``)
+round-robin through ``ModemTransport.send_cached`` over the C wrapper (or,
+with ``--softmodem``, over ``lib.softmodem``), first with the cache disabled
+(every send is a plain ``send`` that re-synthesises its tones) and then
+enabled (the first send of each frame renders it, every repeat is one
+``send_pcm`` sample write). Reports the sending thread's CPU time per send --
+the synthesis the cache saves, not the airtime, which is unchanged -- plus the
+cache hits / misses and how many frames came back intact through the loopback
+(the two runs send identical samples, so the counts should match).
+
+Usage:
+    cd python-backend
+    python tools/bench_waveform_cache.py [--lib PATH | --softmodem] [--baud 1200]
+        [--sends 60]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib.transport import WAVEFORM_CACHE_SAMPLES, ModemTransport  # noqa: E402
+
+FRAMES = [
+    '{"id":"","fn":"retx","ct":"a1b2c3d4"}\n',
+    '{"id":"","st":"E","ct":"Template not found: us_abdo","ci":0,"cc":1,"crc":"3f1a0c9e"}\n',
+    '{"id":"a1b2c3d4","st":"S","ct":"LIVER: Normal in size and echotexture. No focal lesion. '
+    'GALLBLADDER: No calculi. BILE DUCTS: Not dilated. SPLEEN: Normal.","ci":0,"cc":1,'
+    '"crc":"9c2e4b71"}\n',
+]
+
+
+def storm(modem, baud: int, sends: int, cache: bool) -> dict:
+    link = ModemTransport(modem, baud)
+    link.waveform_cache_samples = WAVEFORM_CACHE_SAMPLES if cache else 0
+    cpu, received = 0.0, 0
+    for i in range(sends):
+        frame = FRAMES[i % len(FRAMES)]
+        t0 = time.thread_time()
+        if link.send_cached([frame], 50) < 0:
+            sys.exit(f"send failed: {link.get_error()}")
+        cpu += time.thread_time() - t0
+        received += modem.receive(timeout=3.0) == frame[:-1]
+    stats = link.stats()
+    return {"cpu": cpu / sends, "received": received,
+            "hits": stats["waveform_hits"], "misses": stats["waveform_misses"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TX CPU per send, waveform cache off vs on")
+    parser.add_argument("--lib", default=None, help="path to libminimodem_simple.so")
+    parser.add_argument("--softmodem", action="store_true",
+                        help="use lib.softmodem instead of the C wrapper")
+    parser.add_argument("--baud", type=int, default=1200)
+    parser.add_argument("--sends", type=int, default=60, help="sends per run")
+    args = parser.parse_args()
+
+    if args.softmodem:
+        from lib import softmodem as modem
+    else:
+        from lib import minimodem as modem
+        modem.load(args.lib)
+    if modem.init(-1, -1, args.baud) < 0:
+        sys.exit(f"init failed: {modem.get_error()}")
+    try:
+        print(f"{'cache':>6}{'cpu ms/send':>13}{'hits':>6}{'misses':>8}{'received':>10}")
+        runs = {}
+        for cache in (False, True):
+            runs[cache] = r = storm(modem, args.baud, args.sends, cache)
+            print(f"{'on' if cache else 'off':>6}{r['cpu'] * 1000:>13.3f}{r['hits']:>6}"
+                  f"{r['misses']:>8}{r['received']:>6}/{args.sends}")
+        if runs[True]["cpu"] > 0:
+            print(f"TX CPU per send: {runs[False]['cpu'] / runs[True]['cpu']:.1f}x lower with the cache")
+    finally:
+        modem.cleanup()
+
+
+if __name__ == "__main__":
+    main()
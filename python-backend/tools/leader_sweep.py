@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Leader sweep -- the shortest TX leader the receiver still acquires on, per baud.
+
+Every transmission starts with ``set_tx_framing`` leader mark bits; the far
+demodulator has to find the first start bit after them, possibly while still
+chewing on noise it mistook for a frame. For each baud and leader length this
+sends ``--trials`` frames and counts how many arrive intact, then reports the
+shortest leader whose pass rate reaches ``--pass-rate``:
+
+  * default: ``lib.softmodem`` offline -- each frame is modulated after a
+    random stretch of pre-roll (noise at ``--snr`` dB below the tone, or
+    silence with ``--clean``) and decoded by a fresh ``Demodulator``, so the
+    numbers are deterministic for a given ``--seed``.
+  * ``--wrapper``: the ctypes wrapper over real devices (a loopback cable or
+    speaker/mic pair); frames go out with ``send`` and come back through
+    ``receive``, with the line's own noise as the pre-roll.
+
+Usage:
+    cd python-backend
+    python tools/leader_sweep.py [--bauds 1200 2400 4800 9600] [--leaders 0 1 2 4 8 16]
+        [--trials 50] [--snr 20 | --clean] [--pass-rate 0.98] [--seed 1]
+    python tools/leader_sweep.py --wrapper [--lib path/to/libminimodem_simple.so]
+        [--playback -1] [--capture -1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib import minimodem, softmodem  # noqa: E402
+
+LINE = b'{"id":"lead0001","fn":"retx","ci":[0],"crc":123456789}'
+
+
+def soft_trials(baud: int, leader: int, trials: int, snr: float | None, rng) -> int:
+    np = softmodem.np
+    tail = np.zeros(softmodem.SAMPLE_RATE // 10, dtype=np.float32)
+    signal = softmodem.modulate(LINE + b"\n", baud, 0.5, leader_bits=leader)
+    passed = 0
+    for _ in range(trials):
+        pre = np.zeros(int(rng.integers(0, softmodem.SAMPLE_RATE // 10)), dtype=np.float32)
+        samples = np.concatenate((pre, signal, tail))
+        if snr is not None:
+            sigma = 0.5 / np.sqrt(2) / 10 ** (snr / 20)
+            samples = samples + rng.normal(0, sigma, len(samples)).astype(np.float32)
+        passed += LINE in softmodem.Demodulator(baud).feed(samples)
+    return passed
+
+
+def wrapper_trials(baud: int, leader: int, trials: int) -> int:
+    if minimodem.set_baud(baud) < 0 or minimodem.set_tx_framing(leader) < 0:
+        sys.exit(f"baud {baud} / leader {leader}: {minimodem.get_error()}")
+    passed = 0
+    for _ in range(trials):
+        minimodem.receive_many(timeout=0)                  # drop stale lines
+        minimodem.send(LINE.decode() + "\n", 50)
+        line = minimodem.receive(timeout=2.0)
+        passed += line is not None and LINE.decode() in line
+        time.sleep(0.05)                                   # let the carrier drop
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="shortest reliable TX leader per baud")
+    parser.add_argument("--bauds", type=int, nargs="+", default=[1200, 2400, 4800, 9600])
+    parser.add_argument("--leaders", type=int, nargs="+", default=[0, 1, 2, 3, 4, 6, 8, 12, 16])
+    parser.add_argument("--trials", type=int, default=50, help="frames per baud and leader")
+    parser.add_argument("--snr", type=float, default=20.0, help="pre-roll noise, dB below the tone")
+    parser.add_argument("--clean", action="store_true", help="silent pre-roll instead of noise")
+    parser.add_argument("--pass-rate", type=float, default=0.98,
+                        help="fraction of frames a leader must deliver to count as reliable")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--wrapper", action="store_true", help="sweep the wrapper over real devices")
+    parser.add_argument("--lib", default=None, help="wrapper .so path (default: the usual search)")
+    parser.add_argument("--playback", type=int, default=-1)
+    parser.add_argument("--capture", type=int, default=-1)
+    args = parser.parse_args()
+
+    if args.wrapper:
+        minimodem.load(args.lib)
+        if minimodem.init(args.playback, args.capture, args.bauds[0]) < 0:
+            sys.exit(f"init failed: {minimodem.get_error()}")
+        run = wrapper_trials
+    else:
+        if softmodem.np is None:
+            sys.exit("NumPy is required for the software modem")
+        rng = softmodem.np.random.default_rng(args.seed)
+        snr = None if args.clean else args.snr
+        run = lambda baud, leader, trials: soft_trials(baud, leader, trials, snr, rng)  # noqa: E731
+
+    leaders = sorted(set(args.leaders))
+    print(f"{'baud':>6}" + "".join(f"{'L' + str(n):>6}" for n in leaders) + "   shortest reliable")
+    try:
+        for baud in args.bauds:
+            counts = [run(baud, leader, args.trials) for leader in leaders]
+            need = args.pass_rate * args.trials
+            # shortest leader from which every longer one is reliable too
+            best = None
+            for leader, count in reversed(list(zip(leaders, counts))):
+                if count < need:
+                    break
+                best = leader
+            verdict = (f"{best} bits ({best * 1000 / baud:.1f} ms)" if best is not None
+                       else f"> {leaders[-1]} bits")
+            print(f"{baud:>6}" + "".join(f"{c:>6}" for c in counts) + f"   {verdict}")
+    finally:
+        if args.wrapper:
+            minimodem.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Offline capture replay -- recorded RX audio through the demodulator and the
+backend's receive path, as fast as the CPU allows.
+
+Loads each capture (the wrapper's / softmodem's memory-mapped ring file from
+``capture_start``, a WAV recording, or headerless float32 samples; see
+``lib.capture``), demodulates it with ``lib.softmodem``'s demodulator (the
+mirror of mm_core.c; multi-carrier captures use ``MultiCarrierDemodulator``,
+MFSK captures the header's tone count, HDLC-framed ones ``HdlcDemodulator``),
+splits the byte stream into newline-framed lines as the wrapper does, and runs
+every line through ``backend.accept_line`` (``parse_json_frame`` frame
+recovery and JSON parse -> ``handle_received_chunk`` CRC check). Replies (retx
+requests) go to an in-memory sink and are counted, so nothing reaches a sound
+device.
+
+Reports, per capture: audio seconds, decode CPU seconds and the x-realtime
+factor, decoded bytes, lines, JSON frames recovered, frames that passed the CRC
+check, retx requests issued (CRC failures), and noise lines. Deterministic:
+replaying the same capture twice gives the same numbers, so it doubles as a
+regression check for decoder and framing changes (``--expect-frames``).
+
+Usage:
+    cd python-backend
+    python tools/replay_capture.py rx.mmcap [more captures ...] [--baud 1200]
+        [--carriers 1] [--tones 2] [--data-bits 8] [--framing async] [--rate 48000] [--block 4096] [--repeat 1] [--show]
+        [--expect-frames N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Ensure python-backend is on the path when running from tools/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backend  # noqa: E402
+from lib import chunking, logger, softmodem  # noqa: E402
+from lib.capture import read_capture  # noqa: E402
+from lib.chunking import parse_json_frame  # noqa: E402
+from lib.transport import memory_pair  # noqa: E402
+
+
+def demodulate(samples, baud: int, carriers: int, sample_rate: int, block: int,
+               tones: int = softmodem.TONES_BFSK,
+               data_bits: int = softmodem.DATA_BITS_DEFAULT,
+               framing: int = softmodem.FRAMING_ASYNC) -> bytes:
+    if framing == softmodem.FRAMING_HDLC:
+        demod = softmodem.HdlcDemodulator(baud, sample_rate)
+    elif carriers > 1:
+        demod = softmodem.MultiCarrierDemodulator(baud, carriers, sample_rate,
+                                                  data_bits=data_bits)
+    else:
+        demod = softmodem.Demodulator(baud, sample_rate, tones=tones, data_bits=data_bits)
+    out = bytearray()
+    for i in range(0, len(samples), block):
+        out += demod.feed(samples[i:i + block])
+    out += demod.feed(softmodem.np.zeros(block, dtype=softmodem.np.float32))
+    return bytes(out)
+
+
+def replay_lines(data: bytes, sink, show: bool) -> dict:
+    """Run the complete lines of ``data`` through the backend receive path."""
+    counts = {"lines": 0, "frames": 0, "accepted": 0, "retx": 0, "noise": 0}
+    view = memoryview(data)
+    start = 0
+    while (end := data.find(b"\n", start)) != -1:   # the tail has no newline yet
+        line, start = view[start:end], end + 1
+        counts["lines"] += 1
+        if parse_json_frame(line) is None:
+            counts["noise"] += 1
+            continue
+        counts["frames"] += 1
+        msg = backend.accept_line(line, 50)
+        if msg is not None:
+            counts["accepted"] += 1
+            if show:
+                print(f"    {msg.get('id', '')}: {json.dumps(msg)[:100]}")
+    for reply in sink.receive(timeout=0):
+        if b'"fn":"retx"' in bytes(reply):
+            counts["retx"] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="replay RX captures through the decoder")
+    parser.add_argument("captures", nargs="+", help="ring file, WAV, or raw float32 capture")
+    parser.add_argument("--baud", type=int, default=None,
+                        help="link baud (default: from the ring file header)")
+    parser.add_argument("--carriers", type=int, default=None,
+                        help="carrier count (default: from the ring file header, else 1)")
+    parser.add_argument("--tones", type=int, default=None, choices=softmodem.TONE_COUNTS,
+                        help="tones per symbol (default: from the ring file header, else 2)")
+    parser.add_argument("--data-bits", type=int, default=softmodem.DATA_BITS_DEFAULT,
+                        choices=(softmodem.DATA_BITS_ASCII, softmodem.DATA_BITS_DEFAULT),
+                        help="data bits per character the capture was sent with (default: 8)")
+    parser.add_argument("--framing", choices=tuple(softmodem.FRAMING_MODES), default="async",
+                        help="link framing the capture was sent with (default: async)")
+    parser.add_argument("--rate", type=int, default=48000, help="sample rate of raw captures")
+    parser.add_argument("--block", type=int, default=4096, help="samples per demod call")
+    parser.add_argument("--repeat", type=int, default=1, help="decode passes (timing only)")
+    parser.add_argument("--show", action="store_true", help="print each accepted message")
+    parser.add_argument("--expect-frames", type=int, default=None,
+                        help="exit non-zero unless every capture yields this many CRC-valid frames")
+    args = parser.parse_args()
+
+    if softmodem.np is None:
+        sys.exit("NumPy is required for the software demodulator")
+
+    logger.setLevel(logging.WARNING)
+    tx_end, sink = memory_pair()
+    chunking.transmitter.transport = tx_end
+    chunking.transmitter.inter_frame_delay = 0.0
+    chunking.link_controller.enabled = False
+
+    ok = True
+    print(f"{'capture':<28}{'audio s':>9}{'cpu s':>8}{'x rt':>8}{'bytes':>8}"
+          f"{'lines':>7}{'frames':>8}{'crc ok':>8}{'retx':>6}{'noise':>7}")
+    for path in args.captures:
+        cap = read_capture(path, args.rate)
+        baud = args.baud or cap.baud
+        if not baud:
+            sys.exit(f"{path}: no baud in the capture; pass --baud")
+        carriers = args.carriers or cap.carriers
+        tones = args.tones or cap.tones
+
+        t0 = time.process_time()
+        for _ in range(args.repeat):
+            data = demodulate(cap.samples, baud, carriers, cap.sample_rate, args.block,
+                              tones, args.data_bits, softmodem.FRAMING_MODES[args.framing])
+        cpu = (time.process_time() - t0) / args.repeat
+
+        if args.show:
+            print(f"  {path}:")
+        counts = replay_lines(data, sink, args.show)
+        audio = len(cap.samples) / cap.sample_rate
+        print(f"{os.path.basename(path)[:27]:<28}{audio:>9.2f}{cpu:>8.3f}"
+              f"{audio / cpu if cpu else float('inf'):>8.0f}{len(data):>8}"
+              f"{counts['lines']:>7}{counts['frames']:>8}{counts['accepted']:>8}"
+              f"{counts['retx']:>6}{counts['noise']:>7}")
+        if args.expect_frames is not None and counts["accepted"] != args.expect_frames:
+            ok = False
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()